@@ -510,13 +510,11 @@ class MainWindow(QMainWindow):
                 self,
                 "Save Queue",
                 "",
-                "Pickle Files (*.pkl);;All Files (*)"
+                "PyBirch Queue (*.pbq);;All Files (*)"
             )
             if file_path:
                 try:
-                    import pickle
-                    with open(file_path, 'wb') as f:
-                        pickle.dump(self.queue, f)
+                    self.queue.save(file_path)
                     self.has_unsaved_changes = False
                     QMessageBox.information(self, "Success", f"Queue saved to {file_path}")
                 except Exception as e:
@@ -530,26 +528,25 @@ class MainWindow(QMainWindow):
             self,
             "Load Queue",
             "",
-            "Pickle Files (*.pkl);;All Files (*)"
+            "PyBirch Queue (*.pbq);;Pickle Files (*.pkl);;All Files (*)"
         )
         if file_path:
             try:
-                import pickle
-                with open(file_path, 'rb') as f:
-                    loaded_queue = pickle.load(f)
-                    if isinstance(loaded_queue, Queue):
-                        self.queue = loaded_queue
-                        # Update queue bar with new queue
-                        self.queue_bar.queue = self.queue
-                        # Update queue page with new queue
-                        self.queue_page.queue = self.queue
-                        self.queue_page.refresh_scan_list()
-                        # Sync to info page
-                        self.sync_queue_to_info_page()
-                        self.has_unsaved_changes = False
-                        QMessageBox.information(self, "Success", f"Queue loaded from {file_path}")
-                    else:
-                        QMessageBox.warning(self, "Error", "File does not contain a valid Queue")
+                # Queue.load reads snapshots and legacy pickle files
+                loaded_queue = Queue.load(file_path)
+                if isinstance(loaded_queue, Queue):
+                    self.queue = loaded_queue
+                    # Update queue bar with new queue
+                    self.queue_bar.queue = self.queue
+                    # Update queue page with new queue
+                    self.queue_page.queue = self.queue
+                    self.queue_page.refresh_scan_list()
+                    # Sync to info page
+                    self.sync_queue_to_info_page()
+                    self.has_unsaved_changes = False
+                    QMessageBox.information(self, "Success", f"Queue loaded from {file_path}")
+                else:
+                    QMessageBox.warning(self, "Error", "File does not contain a valid Queue")
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to load: {str(e)}")
     
@@ -7,6 +7,7 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 from pybirch.scan.measurements import Measurement, VisaMeasurement
 from pybirch.scan.movements import Movement, VisaMovement
+from pybirch.Instruments.probing import AdapterProber, ProbeCache
 from PySide6 import QtCore, QtWidgets, QtGui
 import pyvisa
 
@@ -69,6 +70,8 @@ class InstrumentManager(QtWidgets.QWidget):
         self.placeholder_count = 0
         self.instrument_names = ["None"]
         self.instrument_classes = [BaseInstrument]  # Add actual instrument classes here
+        # Autopair results, keyed by resource and *IDN? response, persist between sessions
+        self.probe_cache = ProbeCache()
 
         # UI Layout
         layout = QtWidgets.QVBoxLayout(self)
@@ -595,11 +598,25 @@ class InstrumentManager(QtWidgets.QWidget):
 
     def check_connections(self):
         """Check connection to each adapter and display status."""
+        # Enumerate once for all rows instead of once per row
+        current_resources = self._list_resources()
         for row in range(self.table.rowCount()):
-            self.check_connection_for_row(row)
+            self.check_connection_for_row(row, current_resources)
 
-    def check_connection_for_row(self, row):
-        """Check connection for a specific row."""
+    def _list_resources(self):
+        """Enumerate the VISA resources currently detected."""
+        try:
+            return list(self.rm.list_resources())
+        except Exception:
+            return []
+
+    def check_connection_for_row(self, row, current_resources=None):
+        """Check connection for a specific row.
+        
+        Args:
+            row: Table row to check
+            current_resources: Resources from a previous enumeration (enumerates if None)
+        """
         adapter = self.table.item(row, 0).text()
         status_item = self.table.item(row, 3)
         adapter_item = self.table.item(row, 0)
@@ -610,10 +627,8 @@ class InstrumentManager(QtWidgets.QWidget):
             return
         
         # Check if adapter is in current VISA resources
-        try:
-            current_resources = list(self.rm.list_resources())
-        except Exception:
-            current_resources = []
+        if current_resources is None:
+            current_resources = self._list_resources()
         
         if adapter not in current_resources:
             # Adapter not currently detected
@@ -642,20 +657,27 @@ class InstrumentManager(QtWidgets.QWidget):
             status_item.setText("Connected" if connected else "Failed")
 
     def auto_pair(self, instrument_classes):
-        """Automatically pair adapters with instruments by doing a pairwise search with the check_connection method."""
+        """Automatically pair adapters with instruments using each class's check_connection method.
+        
+        Adapters are probed concurrently with a timeout per probe, and results
+        are cached by resource and identity so known racks pair instantly.
+        """
+        rows = {}
         for row in range(self.table.rowCount()):
             adapter = self.table.item(row, 0).text()
-            if adapter.startswith("placeholder_"):
-                continue  # Skip placeholders
-
-            for inst_class in instrument_classes:
-                instrument = inst_class(adapter)
-                if instrument.check_connection():
-                    # Found a match, set the instrument name
-                    combo = self.table.cellWidget(row, 1)
-                    index = combo.findText(inst_class.__name__)
-                    if index >= 0:
-                        combo.setCurrentIndex(index)
+            if not adapter.startswith("placeholder_"):  # Skip placeholders
+                rows[adapter] = row
+
+        prober = AdapterProber(instrument_classes, resource_manager=getattr(self, 'rm', None), cache=self.probe_cache)
+        for adapter, inst_class in prober.auto_pair(list(rows)).items():
+            if inst_class is None:
+                continue
+            # Found a match, set the instrument name
+            combo = self.table.cellWidget(rows[adapter], 1)
+            for label in (inst_class.__name__, getattr(inst_class, 'name', None)):
+                index = combo.findText(label) if isinstance(label, str) else -1
+                if index >= 0:
+                    combo.setCurrentIndex(index)
                     break
 
     def get_selected_instrument(self):
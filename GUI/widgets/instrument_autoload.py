@@ -7,6 +7,7 @@ import logging
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 from pybirch.scan.measurements import Measurement, VisaMeasurement
 from pybirch.scan.movements import Movement, VisaMovement
+from pybirch.Instruments.discovery import LazyClass, discover_classes
 from PySide6 import QtCore, QtWidgets, QtGui
 from shiboken6 import isValid
 
@@ -31,25 +32,21 @@ def get_classes_from_file(file_path: str, acceptable_class_types: tuple = (type,
     filtered_classes = [(cls_name, cls_obj) for cls_name, cls_obj in all_classes if issubclass(cls_obj, acceptable_class_types) and (cls_obj not in acceptable_class_types)]
     return filtered_classes
 
-def get_classes_from_directory(directory: str, acceptable_class_types: tuple = (type,)) -> dict[str, list[tuple[str, type]]]:
-    """Return a dictionary of class names defined in all modules within the specified directory."""
+def get_classes_from_directory(directory: str, acceptable_class_types: tuple = (type,)) -> dict[str, list[tuple[str, LazyClass]]]:
+    """Return a dictionary of the classes defined in all modules within the specified directory.
+
+    Files are parsed rather than imported (see pybirch.Instruments.discovery); each
+    class is a LazyClass that imports its module when it is instantiated or inspected.
+    """
+    directory = os.path.abspath(directory)
     directory_name = os.path.basename(directory)
     classes_dict = {}
-    for file in os.listdir(directory):
-        if file.endswith(".py") and not file.startswith("__"):
-            file_path = os.path.join(directory, file)
-            classes = get_classes_from_file(file_path, acceptable_class_types)
-            if classes:
-                classes_dict.setdefault(directory_name, []).extend(classes)
-
-    for subdir in os.listdir(directory):
-
-        subdir_path = os.path.join(directory, subdir)
-        if os.path.isdir(subdir_path) and not subdir.startswith("__"):
-            subdir_classes = get_classes_from_directory(subdir_path, acceptable_class_types)
-            if subdir_classes:
-                classes_dict[subdir] = subdir_classes
-
+    for lazy in discover_classes(directory, acceptable_class_types):
+        current = classes_dict
+        folders = Path(os.path.relpath(os.path.dirname(lazy.path), directory)).parts
+        for folder in folders:
+            current = current.setdefault(folder, {})
+        current.setdefault(folders[-1] if folders else directory_name, []).append((lazy.__name__, lazy))
     return classes_dict
 
 class InstrumentAutoLoadWidget(QtWidgets.QWidget):
@@ -117,8 +114,11 @@ class InstrumentAutoLoadWidget(QtWidgets.QWidget):
             if self._instrument_factory is None:
                 self._instrument_factory = InstrumentFactory(self.db_service)
             
+            # Keep cached code in step with the drivers' version history
+            self._instrument_factory.sync_with_versions()
+            
             # Get all definitions from database
-            definitions = self._instrument_factory.get_available_definitions()
+            definitions = self._instrument_factory.get_available_drivers()
             
             # Filter by computer binding if enabled
             allowed_driver_ids = None
@@ -146,8 +146,8 @@ class InstrumentAutoLoadWidget(QtWidgets.QWidget):
                     continue
                 
                 try:
-                    # Create the class from the definition
-                    cls = self._instrument_factory.create_class_from_definition(defn)
+                    # Listing a driver does not compile it; the class is built on first use
+                    cls = self._instrument_factory.lazy_class(defn)
                     if cls:
                         instrument_type = defn.get('instrument_type', 'measurement')
                         display_name = defn.get('display_name', defn['name'])
@@ -575,7 +575,7 @@ class InstrumentAutoLoadWidget(QtWidgets.QWidget):
         for key, value in selections.items():
             if isinstance(value, dict):
                 result[key] = self._serialize_selections(value)
-            elif isinstance(value, type):
+            elif isinstance(value, (type, LazyClass)):
                 # Store class name and module for later restoration
                 result[key] = {
                     '__class_name__': value.__name__,
@@ -26,6 +26,7 @@ except ImportError:
         Theme = None
 
 from pybirch.queue.queue import Queue
+from pybirch.queue import snapshot
 from pybirch.scan.scan import Scan
 
 
@@ -100,6 +101,101 @@ class PresetManager:
         self.settings["show_overwrite_warning"] = value
         self._save_settings()
     
+    def _snapshot_file(self, kind: str, index: int) -> Path:
+        """Get the snapshot file for a preset slot ("queue" or "scan")."""
+        if kind == "queue":
+            return self.queue_path / f"preset_{index}{snapshot.QUEUE_SUFFIX}"
+        return self.scan_path / f"preset_{index}{snapshot.SCAN_SUFFIX}"
+
+    def _preset_file(self, kind: str, index: int) -> Path:
+        """
+        Get the file for a preset slot.
+
+        Returns the snapshot file, or a legacy pickle file if only that exists.
+        """
+        preset_file = self._snapshot_file(kind, index)
+        legacy_file = preset_file.with_suffix(".pkl")
+        if not preset_file.exists() and legacy_file.exists():
+            return legacy_file
+        return preset_file
+
+    def _remove_preset_files(self, kind: str, index: int, legacy_only: bool = False):
+        """Remove the snapshot and any legacy pickle file for a slot."""
+        preset_file = self._snapshot_file(kind, index)
+        files = [preset_file.with_suffix(".pkl")]
+        if not legacy_only:
+            files.append(preset_file)
+        for path in files:
+            if path.exists():
+                path.unlink()
+
+    def _load_preset(self, kind: str, index: int, expected: type):
+        """Load a queue or scan preset, removing the file if it is corrupted."""
+        preset_file = self._preset_file(kind, index)
+        if not preset_file.exists():
+            return None
+
+        # Check if file is empty before trying to load
+        if preset_file.stat().st_size == 0:
+            print(f"{kind.capitalize()} preset {index} file is empty, removing corrupted file")
+            try:
+                preset_file.unlink()
+            except Exception:
+                pass
+            return None
+
+        try:
+            if preset_file.suffix == ".pkl":
+                with open(preset_file, 'rb') as f:
+                    loaded = pickle.load(f)
+            elif kind == "queue":
+                loaded = snapshot.load_queue(preset_file)
+            else:
+                loaded = snapshot.load_scan(preset_file)
+            if isinstance(loaded, expected):
+                return loaded
+        except (EOFError, pickle.UnpicklingError, snapshot.SnapshotError) as e:
+            # File is corrupted, remove it
+            print(f"{kind.capitalize()} preset {index} is corrupted, removing: {e}")
+            try:
+                preset_file.unlink()
+            except Exception:
+                pass
+        except Exception as e:
+            print(f"Error loading {kind} preset: {e}")
+
+        return None
+
+    def get_preset_info(self, kind: str, index: int) -> Optional[Dict[str, Any]]:
+        """
+        Describe a preset from its snapshot header, without loading its scans.
+
+        Args:
+            kind: "queue" or "scan"
+            index: Preset slot index (0-4)
+
+        Returns:
+            Dict with name, scan names, instruments and size, or None if the
+            slot is empty or holds a legacy pickle preset
+        """
+        if not 0 <= index < self.MAX_PRESETS:
+            return None
+        preset_file = self._preset_file(kind, index)
+        if not preset_file.exists() or preset_file.suffix == ".pkl":
+            return None
+        try:
+            index_data = snapshot.read_index(preset_file)
+        except (OSError, snapshot.SnapshotError) as e:
+            print(f"Error reading {kind} preset {index}: {e}")
+            return None
+        return {
+            "name": index_data.name,
+            "created_at": index_data.created_at,
+            "scans": index_data.names,
+            "instruments": index_data.instrument_names,
+            "size": index_data.total_size,
+        }
+
     # Queue preset methods
     def save_queue_preset(self, index: int, queue: Queue, name: str = "") -> bool:
         """
@@ -117,12 +213,12 @@ class PresetManager:
             return False
         
         try:
-            preset_file = self.queue_path / f"preset_{index}.pkl"
-            with open(preset_file, 'wb') as f:
-                pickle.dump(queue, f)
+            preset_name = name or f"Queue Preset {index + 1}"
+            snapshot.save_queue(queue, self._snapshot_file("queue", index), name=preset_name)
+            self._remove_preset_files("queue", index, legacy_only=True)
             
             # Update preset name
-            self.settings["queue_preset_names"][index] = name or f"Queue Preset {index + 1}"
+            self.settings["queue_preset_names"][index] = preset_name
             self._save_settings()
             return True
         except Exception as e:
@@ -142,45 +238,15 @@ class PresetManager:
         if not 0 <= index < self.MAX_PRESETS:
             return None
         
-        preset_file = self.queue_path / f"preset_{index}.pkl"
-        if not preset_file.exists():
-            return None
-        
-        # Check if file is empty before trying to load
-        if preset_file.stat().st_size == 0:
-            print(f"Queue preset {index} file is empty, removing corrupted file")
-            try:
-                preset_file.unlink()
-            except Exception:
-                pass
-            return None
-        
-        try:
-            with open(preset_file, 'rb') as f:
-                queue = pickle.load(f)
-                if isinstance(queue, Queue):
-                    return queue
-        except (EOFError, pickle.UnpicklingError) as e:
-            # File is corrupted, remove it
-            print(f"Queue preset {index} is corrupted, removing: {e}")
-            try:
-                preset_file.unlink()
-            except Exception:
-                pass
-        except Exception as e:
-            print(f"Error loading queue preset: {e}")
-        
-        return None
+        return self._load_preset("queue", index, Queue)
     
     def delete_queue_preset(self, index: int) -> bool:
         """Delete a queue preset."""
         if not 0 <= index < self.MAX_PRESETS:
             return False
         
-        preset_file = self.queue_path / f"preset_{index}.pkl"
         try:
-            if preset_file.exists():
-                preset_file.unlink()
+            self._remove_preset_files("queue", index)
             self.settings["queue_preset_names"][index] = ""
             self._save_settings()
             return True
@@ -194,7 +260,7 @@ class PresetManager:
     
     def queue_preset_exists(self, index: int) -> bool:
         """Check if a queue preset exists and is valid."""
-        preset_file = self.queue_path / f"preset_{index}.pkl"
+        preset_file = self._preset_file("queue", index)
         if not preset_file.exists():
             return False
         # Also check file is not empty (corrupted)
@@ -217,12 +283,12 @@ class PresetManager:
             return False
         
         try:
-            preset_file = self.scan_path / f"preset_{index}.pkl"
-            with open(preset_file, 'wb') as f:
-                pickle.dump(scan, f)
+            preset_name = name or f"Scan Preset {index + 1}"
+            snapshot.save_scan(scan, self._snapshot_file("scan", index), name=preset_name)
+            self._remove_preset_files("scan", index, legacy_only=True)
             
             # Update preset name
-            self.settings["scan_preset_names"][index] = name or f"Scan Preset {index + 1}"
+            self.settings["scan_preset_names"][index] = preset_name
             self._save_settings()
             return True
         except Exception as e:
@@ -242,45 +308,15 @@ class PresetManager:
         if not 0 <= index < self.MAX_PRESETS:
             return None
         
-        preset_file = self.scan_path / f"preset_{index}.pkl"
-        if not preset_file.exists():
-            return None
-        
-        # Check if file is empty before trying to load
-        if preset_file.stat().st_size == 0:
-            print(f"Scan preset {index} file is empty, removing corrupted file")
-            try:
-                preset_file.unlink()
-            except Exception:
-                pass
-            return None
-        
-        try:
-            with open(preset_file, 'rb') as f:
-                scan = pickle.load(f)
-                if isinstance(scan, Scan):
-                    return scan
-        except (EOFError, pickle.UnpicklingError) as e:
-            # File is corrupted, remove it
-            print(f"Scan preset {index} is corrupted, removing: {e}")
-            try:
-                preset_file.unlink()
-            except Exception:
-                pass
-        except Exception as e:
-            print(f"Error loading scan preset: {e}")
-        
-        return None
+        return self._load_preset("scan", index, Scan)
     
     def delete_scan_preset(self, index: int) -> bool:
         """Delete a scan preset."""
         if not 0 <= index < self.MAX_PRESETS:
             return False
         
-        preset_file = self.scan_path / f"preset_{index}.pkl"
         try:
-            if preset_file.exists():
-                preset_file.unlink()
+            self._remove_preset_files("scan", index)
             self.settings["scan_preset_names"][index] = ""
             self._save_settings()
             return True
@@ -294,7 +330,7 @@ class PresetManager:
     
     def scan_preset_exists(self, index: int) -> bool:
         """Check if a scan preset exists and is valid."""
-        preset_file = self.scan_path / f"preset_{index}.pkl"
+        preset_file = self._preset_file("scan", index)
         if not preset_file.exists():
             return False
         # Also check file is not empty (corrupted)
@@ -475,6 +511,7 @@ class PresetDialog(QtWidgets.QDialog):
                 name = queue_names[i] or f"Queue Preset {i + 1}"
                 item = QtWidgets.QListWidgetItem(f"{i + 1}. {name}")
                 item.setData(QtCore.Qt.UserRole, i)
+                item.setToolTip(self._preset_tooltip("queue", i))
                 self.queue_list.addItem(item)
             else:
                 item = QtWidgets.QListWidgetItem(f"{i + 1}. (Empty)")
@@ -490,6 +527,7 @@ class PresetDialog(QtWidgets.QDialog):
                 name = scan_names[i] or f"Scan Preset {i + 1}"
                 item = QtWidgets.QListWidgetItem(f"{i + 1}. {name}")
                 item.setData(QtCore.Qt.UserRole, i)
+                item.setToolTip(self._preset_tooltip("scan", i))
                 self.scan_list.addItem(item)
             else:
                 item = QtWidgets.QListWidgetItem(f"{i + 1}. (Empty)")
@@ -500,6 +538,18 @@ class PresetDialog(QtWidgets.QDialog):
         self.update_queue_button_states()
         self.update_scan_button_states()
     
+    def _preset_tooltip(self, kind: str, index: int) -> str:
+        """Summarize a preset from its snapshot header (scans are not loaded)."""
+        info = self.preset_manager.get_preset_info(kind, index)
+        if info is None:
+            return ""
+        lines = [f"Scans: {', '.join(info['scans']) or '(none)'}"]
+        if info['instruments']:
+            lines.append(f"Instruments: {', '.join(info['instruments'])}")
+        if info['created_at']:
+            lines.append(f"Saved: {info['created_at']}")
+        return "\n".join(lines)
+    
     def update_queue_button_states(self):
         """Update queue button enabled states."""
         selected = self.queue_list.currentItem()
@@ -3,7 +3,6 @@ from PySide6 import QtCore, QtWidgets, QtGui
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 from pybirch.scan.scan import Scan, get_empty_scan
-import pickle
 from pybirch.queue.queue import Queue
 
 # Import theme
@@ -292,27 +291,25 @@ class QueueBar(QtWidgets.QWidget):
         """Handle the save button click event."""
         print("Save button clicked")
         options = QtWidgets.QFileDialog.Options() # type: ignore
-        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Queue", self.default_savepath, "Pickle Files (*.pkl);;All Files (*)", options=options)
+        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Queue", self.default_savepath, "PyBirch Queue (*.pbq);;All Files (*)", options=options)
         if file_path:
             self.default_savepath = file_path
-            with open(file_path, 'wb') as f:
-                pickle.dump(self.queue, f)
+            self.queue.save(file_path)
             print(f"Queue saved to {file_path}")
 
     def on_load_clicked(self):
         """Handle the load button click event."""
         print("Load button clicked")
         options = QtWidgets.QFileDialog.Options() # type: ignore
-        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Load Queue", self.default_loadpath, "Pickle Files (*.pkl);;All Files (*)", options=options)
+        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Load Queue", self.default_loadpath, "PyBirch Queue (*.pbq);;Pickle Files (*.pkl);;All Files (*)", options=options)
         if file_path:
             self.default_loadpath = file_path
-            with open(file_path, 'rb') as f:
-                loaded_queue = pickle.load(f)
-                if isinstance(loaded_queue, Queue):
-                    self.queue = loaded_queue
-                    print(f"Queue loaded from {file_path}")
-                else:
-                    print("Error: Loaded file is not a Queue instance")
+            loaded_queue = Queue.load(file_path)
+            if isinstance(loaded_queue, Queue):
+                self.queue = loaded_queue
+                print(f"Queue loaded from {file_path}")
+            else:
+                print("Error: Loaded file is not a Queue instance")
     
     def on_extensions_clicked(self):
         """Handle the extensions button click event."""
@@ -7,7 +7,6 @@ try:
 except ImportError:
     # Fallback if queue module doesn't exist
     Queue = object
-import pickle
 
 # Import theme
 try:
@@ -242,13 +241,12 @@ class QueueTitleBar(QtWidgets.QWidget):
                 self.default_savepath = os.path.dirname(file_path)
             
     def save_queue_to_file(self, file_path: str):
-        with open(file_path, 'wb') as f:
-            pickle.dump(self.queue, f)
+        self.queue.save(file_path)
 
     def on_load_clicked(self):
         dialog = QtWidgets.QFileDialog(self)
         dialog.setFileMode(QtWidgets.QFileDialog.ExistingFile) # type: ignore
-        dialog.setNameFilter("Pickle Files (*.pkl *.pickle);;JSON Files (*.json)")
+        dialog.setNameFilter("PyBirch Queue (*.pbq);;Pickle Files (*.pkl *.pickle)")
         if self.default_loadpath:
             dialog.setDirectory(self.default_loadpath)
         if dialog.exec():
@@ -260,9 +258,8 @@ class QueueTitleBar(QtWidgets.QWidget):
                 self.default_loadpath = os.path.dirname(file_path)
 
     def load_queue_from_file(self, file_path: str):
-        with open(file_path, 'rb') as f:
-            self.queue = pickle.load(f)
-            self.update_ui()
+        self.queue = Queue.load(file_path)
+        self.update_ui()
 
     def update_ui(self):
         """Update the UI elements based on the current queue state."""
@@ -4,7 +4,6 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 from pybirch.scan.scan import Scan, get_empty_scan
 from pybirch.queue.queue import Queue
-import pickle
 
 # Import theme
 try:
@@ -275,15 +274,14 @@ class ScanTableWidget(QtWidgets.QWidget):
     def save_queue(self):
         """Save the current queue to a file."""
         options = QtWidgets.QFileDialog.Options() # type: ignore
-        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Queue", "", "Pickle Files (*.pkl);;All Files (*)", options=options)
+        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Queue", "", "PyBirch Queue (*.pbq);;All Files (*)", options=options)
         if file_path:
-            with open(file_path, 'wb') as f:
-                pickle.dump(self.queue, f)
+            self.queue.save(file_path)
     
     def load_queue(self):
         """Load a queue from a file."""
         options = QtWidgets.QFileDialog.Options() # type: ignore
-        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Load Queue", "", "Pickle Files (*.pkl);;All Files (*)", options=options)
+        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Load Queue", "", "PyBirch Queue (*.pbq);;Pickle Files (*.pkl);;All Files (*)", options=options)
         
         # if there are scans in the current queue, confirm before loading
         if self.queue.scans:
@@ -292,8 +290,7 @@ class ScanTableWidget(QtWidgets.QWidget):
                 return
 
         if file_path:
-            with open(file_path, 'rb') as f:
-                self.queue = pickle.load(f)
+            self.queue = Queue.load(file_path)
             self.refresh_table()
 
 if __name__ == "__main__":
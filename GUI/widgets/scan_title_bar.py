@@ -4,6 +4,7 @@ from PySide6.QtCore import Signal
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 from pybirch.scan.scan import Scan, get_empty_scan
+from pybirch.queue import snapshot
 import pickle
 
 # Import theme
@@ -286,13 +287,12 @@ class ScanTitleBar(QtWidgets.QWidget):
                 self.default_savepath = os.path.dirname(file_path)
             
     def save_scan_to_file(self, file_path: str):
-        with open(file_path, 'wb') as f:
-            pickle.dump(self.scan, f)
+        snapshot.save_scan(self.scan, file_path)
 
     def on_load_clicked(self):
         dialog = QtWidgets.QFileDialog(self)
         dialog.setFileMode(QtWidgets.QFileDialog.ExistingFile) # type: ignore
-        dialog.setNameFilter("Pickle Files (*.pkl *.pickle);;JSON Files (*.json)")
+        dialog.setNameFilter("PyBirch Scan (*.pbs);;Pickle Files (*.pkl *.pickle)")
         if self.default_loadpath:
             dialog.setDirectory(self.default_loadpath)
         if dialog.exec():
@@ -304,9 +304,12 @@ class ScanTitleBar(QtWidgets.QWidget):
                 self.default_loadpath = os.path.dirname(file_path)
 
     def load_scan_from_file(self, file_path: str):
-        with open(file_path, 'rb') as f:
-            self.scan = pickle.load(f)
-            self.update_ui()
+        if snapshot.is_snapshot(file_path):
+            self.scan = snapshot.load_scan(file_path)
+        else:
+            with open(file_path, 'rb') as f:
+                self.scan = pickle.load(f)
+        self.update_ui()
 
     def update_ui(self):
         """Update the UI elements based on the current scan state."""
@@ -1,43 +1,48 @@
 # Copyright (C) 2022 The Qt Company Ltd.
 # SPDX-License-Identifier: LicenseRef-Qt-Commercial OR BSD-3-Clause
+"""
+Qt item model for scan trees.
+
+ScanTreeModel is a thin QAbstractItemModel adapter over the headless
+pybirch.scan.tree.ScanTree: tree data, serialization and queries live in the
+core, and this class only adds indexes, roles and change signals for views.
+"""
 from __future__ import annotations
 from typing import Callable, Optional
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
-from PySide6.QtCore import QModelIndex, Qt, QAbstractItemModel, QPersistentModelIndex, QThreadPool
+from PySide6.QtCore import QModelIndex, Qt, QAbstractItemModel, QPersistentModelIndex
 
-# Import treeitem from the same directory
-current_dir = os.path.dirname(__file__)
-if current_dir not in sys.path:
-    sys.path.insert(0, current_dir)
-from treeitem import InstrumentTreeItem
+from pybirch.scan.tree import ScanTree, InstrumentTreeItem
 from pybirch.scan.movements import Movement, VisaMovement, MovementItem
 from pybirch.scan.measurements import Measurement, VisaMeasurement, MeasurementItem
-import pickle
 
 
 
-class ScanTreeModel(QAbstractItemModel):
+class ScanTreeModel(QAbstractItemModel, ScanTree):
 
     def __init__(self, filename: Optional[str] = None, root_item: Optional[InstrumentTreeItem] = None, parent=None, update_interface: Optional[Callable] = None, next_item: Optional[InstrumentTreeItem] = None):
-        super().__init__(parent)
+        QAbstractItemModel.__init__(self, parent)
+        ScanTree.__init__(self, filename=filename, root_item=root_item, update_interface=update_interface, next_item=next_item)
+
+    @classmethod
+    def from_tree(cls, tree: ScanTree, parent=None) -> 'ScanTreeModel':
+        """Wrap a headless ScanTree (sharing its items) for display in Qt views."""
+        model = cls(root_item=tree.root_item, parent=parent, update_interface=tree.update_interface, next_item=tree.next_item)
+        model.root_data = tree.root_data
+        model.completed = tree.completed
+        model.paused = tree.paused
+        model.stopped = tree.stopped
+        return model
+
+    def _on_layout_changed(self) -> None:
+        self.layoutChanged.emit()
 
-        if filename:
-            self.restore_model_from_pickle(filename)
-        elif root_item:
-            self.root_item = root_item
-        else:
-            self.root_item = InstrumentTreeItem()
-        
-        # Set the headers on the root item
-        self.root_item.headers = ["Name", "Type", "Adapter", "Semaphores"]
-        self.update_interface = update_interface
-        self.threadpool = QThreadPool()
-        self.threadpool.setMaxThreadCount(20)  # Limit to 20 threads for safety
-        self.completed = False
-        self.paused = False
-        self.stopped = False
-        self.next_item = next_item
+    def _on_check_states_changed(self) -> None:
+        self._emit_all_checkbox_changes()
+
+    def __repr__(self) -> str:
+        return ScanTree.__repr__(self)
 
     def flags(self, index: QModelIndex) -> Qt.ItemFlags:  # type: ignore
         if not index.isValid():
@@ -239,7 +244,7 @@ class ScanTreeModel(QAbstractItemModel):
 
         # Handle checkbox state for the first column
         if role == Qt.ItemDataRole.CheckStateRole and index.column() == 0:
-            return item.get_check_state()
+            return Qt.CheckState(item.check_state())
 
         if role != Qt.ItemDataRole.DisplayRole and role != Qt.ItemDataRole.EditRole:
             return None
@@ -253,61 +258,6 @@ class ScanTreeModel(QAbstractItemModel):
         # The number of columns is determined by the headers
         return len(self.root_item.headers)
     
-    def serialize_model(self) -> dict:
-        return {
-            "root_data": self.root_data,
-            "root_item": self.root_item.serialize()
-        }
-
-    def deserialize_model(self, data: dict) -> None:
-        self.root_data = data.get("root_data", {})
-        self.root_item = InstrumentTreeItem.deserialize(data.get("root_item", {}))
-        self.layoutChanged.emit()
-
-## NEEDS TO BE FINISHED ##
-    def pickle_model(self, filename: str) -> None:
-        with open(filename, 'wb') as f:
-            pickle.dump(self.serialize_model(), f)
-
-    def restore_model_from_pickle(self, filename: str):
-        with open(filename, 'rb') as input:
-            data = pickle.load(input)
-            self.deserialize_model(data)
-
-    def _repr_recursion(self, item: InstrumentTreeItem, indent: int = 0) -> str:
-        result = " " * indent + repr(item) + "\n"
-        for child in item.child_items:
-            result += self._repr_recursion(child, indent + 2)
-        return result
-
-    def __repr__(self) -> str:
-        return self._repr_recursion(self.root_item)
-
-    def get_selected_instruments(self) -> list[InstrumentTreeItem]:
-        """Return a list of selected (checked) instrument items."""
-        selected_items = []
-
-        def traverse(item: InstrumentTreeItem):
-            # Only include items that are checked and have a valid instrument object
-            if item.checked and item.instrument_object and item != self.root_item:
-                selected_items.append(item)
-            for child in item.child_items:
-                traverse(child)
-
-        traverse(self.root_item)
-        return selected_items
-
-    def set_all_checked(self, checked: bool) -> None:
-        """Set all items to checked or unchecked state."""
-        def traverse(item: InstrumentTreeItem):
-            item.set_checked(checked, update_children=False, update_parent=False)
-            for child in item.child_items:
-                traverse(child)
-
-        traverse(self.root_item)
-        # Emit dataChanged for all items with instruments
-        self._emit_all_checkbox_changes()
-
     def _emit_all_checkbox_changes(self) -> None:
         """Emit dataChanged for all items in the tree"""
         def emit_for_item(item: InstrumentTreeItem, parent_index: QModelIndex):
@@ -320,127 +270,3 @@ class ScanTreeModel(QAbstractItemModel):
                         emit_for_item(child_item, child_index)
         
         emit_for_item(self.root_item, QModelIndex())
-
-    def get_instrument_count(self) -> int:
-        """Return the total number of instrument items in the tree."""
-        count = 0
-
-        def traverse(item: InstrumentTreeItem):
-            nonlocal count
-            if item.instrument_object and item != self.root_item:
-                count += 1
-            for child in item.child_items:
-                traverse(child)
-
-        traverse(self.root_item)
-        return count
-    
-    def get_movement_items(self) -> list[InstrumentTreeItem]:
-        """Return a list of all movement instrument items."""
-        movement_items = []
-
-        def traverse(item: InstrumentTreeItem):
-            if item.instrument_object and item.instrument_object.instrument.__base_class__() is Movement:
-                movement_items.append(item)
-            for child in item.child_items:
-                traverse(child)
-
-        traverse(self.root_item)
-        return movement_items
-    
-    def get_measurement_items(self) -> list[InstrumentTreeItem]:
-        """Return a list of all measurement instrument items."""
-        measurement_items = []
-
-        def traverse(item: InstrumentTreeItem):
-            if item.instrument_object and item.instrument_object.instrument.__base_class__() is Measurement:
-                measurement_items.append(item)
-            for child in item.child_items:
-                traverse(child)
-
-        traverse(self.root_item)
-        return measurement_items
-    
-    def get_all_instrument_items(self) -> list[InstrumentTreeItem]:
-        """Return a list of all instrument items."""
-        all_items = []
-
-        def traverse(item: InstrumentTreeItem):
-            if item.instrument_object:
-                all_items.append(item)
-            for child in item.child_items:
-                traverse(child)
-
-        traverse(self.root_item)
-        return all_items
-    
-    def pair_all_pybirch_objects(self, pybirch_objects: list[type]) -> tuple[list[str], list[str], list[bool]]:
-        """Attempt to pair all instrument items with their corresponding PyBirch objects.
-        
-        Returns a tuple of three lists:
-        - A list of instrument item names.
-        - A list of found PyBirch object class names.
-        - A list of booleans indicating whether a match was found for each item.
-        """
-        instrument_names = []
-        found_classes = []
-        match_statuses = []
-
-        all_items = self.get_all_instrument_items()
-        for item in all_items:
-            name, class_name, found = item.find_pybirch_object(pybirch_objects)
-            instrument_names.append(name)
-            found_classes.append(class_name)
-            match_statuses.append(found)
-
-        return instrument_names, found_classes, match_statuses
-    
-    def pair_all_instrument_adapters(self, known_adapters: list[str]) -> tuple[list[str], list[str], list[bool]]:
-        """Attempt to pair all instrument items with their corresponding adapters.
-        
-        Returns a tuple of three lists:
-        - A list of instrument item names.
-        - A list of found adapter strings.
-        - A list of booleans indicating whether a match was found for each item.
-        """
-        instrument_names = []
-        found_adapters = []
-        match_statuses = []
-
-        all_items = self.get_all_instrument_items()
-        for item in all_items:
-            adapter, found = item.find_instrument_adapter(known_adapters)
-            if item.instrument_object and item.instrument_object.instrument:
-                instrument_names.append(item.instrument_object.instrument.name)  # Use the instrument name from the first column
-            else:
-                instrument_names.append("Unknown Instrument")
-            found_adapters.append(adapter)
-            match_statuses.append(found)
-
-        return instrument_names, found_adapters, match_statuses
-    
-
-    def serialize(self) -> dict:
-        """Serialize the entire model to a dictionary."""
-        return {
-            "all_instruments": [item.serialize() for item in self.get_all_instrument_items()],
-            "tree_structure": self.root_item.structure_to_dict(),
-            "root_item": self.root_item.serialize(),
-            "completed": self.completed,
-            "paused": self.paused,
-            "stopped": self.stopped,
-            "next_item": self.next_item.serialize() if self.next_item else None         
-        }
-
-    def deserialize(self, data: dict) -> None:
-        """Deserialize the model from a dictionary."""
-        self.root_item = InstrumentTreeItem.deserialize(data.get("root_item", {}))
-        self.completed = data.get("completed", False)
-        self.paused = data.get("paused", False)
-        self.stopped = data.get("stopped", False)
-        next_item_data = data.get("next_item", None)
-        if next_item_data:
-            self.next_item = InstrumentTreeItem.deserialize(next_item_data)
-        else:
-            self.next_item = None
-        self.layoutChanged.emit()
\ No newline at end of file
@@ -21,6 +21,7 @@ from PySide6.QtGui import QAction, QIcon, QColor, QFont
 
 from pybirch.queue.queue import Queue, ScanState, QueueState, ExecutionMode, ScanHandle, LogEntry
 from pybirch.scan.scan import Scan, get_empty_scan
+from pybirch.scan.progress import format_eta
 
 # Import theme
 try:
@@ -92,7 +93,10 @@ class ScanListItemWidget(QWidget):
         # Status with progress if applicable
         status_text = state.name
         if self.handle.progress > 0:
-            status_text += f" ({self.handle.progress * 100:.0f}%)"
+            status_text += f" ({self.handle.progress * 100:.0f}%"
+            if state == ScanState.RUNNING and self.handle.eta_seconds:
+                status_text += f", {format_eta(self.handle.eta_seconds)} left"
+            status_text += ")"
         self.status_label.setText(status_text)
         
         # Status color
@@ -28,7 +28,10 @@ from database.models import (
     Scan,
     MeasurementObject,
     MeasurementDataPoint,
+    MeasurementDataChunk,
+    MeasurementLODBin,
     MeasurementDataArray,
+    MeasurementBlob,
     AnalysisMethod,
     Analysis,
     AnalysisInput,
@@ -75,11 +78,13 @@ from database.utils import (
     generate_sample_id,
     generate_scan_id,
     get_scan_data_as_dataframe,
+    iter_scan_frames,
     get_sample_scan_history,
     create_sample_from_template,
     add_tags_to_entity,
     get_entity_tags,
     search_samples,
+    export_scan,
     export_scan_to_csv,
     get_database_stats,
 )
@@ -126,7 +131,10 @@ __all__ = [
     "Scan",
     "MeasurementObject",
     "MeasurementDataPoint",
+    "MeasurementDataChunk",
+    "MeasurementLODBin",
     "MeasurementDataArray",
+    "MeasurementBlob",
     "AnalysisMethod",
     "Analysis",
     "AnalysisInput",
@@ -0,0 +1,199 @@
+"""
+PyBirch Blob Store
+==================
+Compressed, content-addressed storage for measurement array blobs.
+
+Arrays saved with DataManager.save_array (spectra, images, dark frames) are
+stored once per distinct content: each MeasurementDataArray points at a
+MeasurementBlob keyed by the SHA-256 of the serialized array, so a reference
+spectrum saved at every scan point takes the space of one copy.
+
+Blobs are compressed with the chosen codec (zlib and lzma from the standard
+library; zstd and lz4 when the zstandard / lz4 packages are installed). If
+compression does not make a blob smaller it is stored with codec 'none'.
+
+Blobs whose stored size reaches EXTERNAL_THRESHOLD are written to a local
+object directory instead of the database when one is configured, either with
+the PYBIRCH_OBJECT_DIR environment variable or set_object_dir(). Objects are
+laid out as <dir>/<hash[:2]>/<hash[2:4]>/<hash> and are only read when an
+array's data is requested.
+
+Usage:
+    from database.blob_store import compress, decompress, serialize_array
+
+    raw = serialize_array(spectrum)
+    blob = compress(raw, 'zlib')
+    assert decompress(blob, 'zlib') == raw
+"""
+
+import hashlib
+import io
+import lzma
+import os
+import tempfile
+import zlib
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# Fastest available codec first
+DEFAULT_CODEC = 'zstd' if zstandard is not None else 'lz4' if lz4_frame is not None else 'zlib'
+
+# Compressed blobs of at least this many bytes go to the object directory (if configured)
+EXTERNAL_THRESHOLD = 1024 * 1024
+
+OBJECT_DIR_ENV = 'PYBIRCH_OBJECT_DIR'
+
+_object_dir: Optional[str] = None
+
+
+def available_codecs() -> List[str]:
+    """Codecs usable in this environment."""
+    codecs = ['none', 'zlib', 'lzma']
+    if zstandard is not None:
+        codecs.append('zstd')
+    if lz4_frame is not None:
+        codecs.append('lz4')
+    return codecs
+
+
+def compress(raw: bytes, codec: str = DEFAULT_CODEC) -> bytes:
+    """Compress bytes with a codec from available_codecs()."""
+    if codec == 'none':
+        return raw
+    if codec == 'zlib':
+        return zlib.compress(raw, 6)
+    if codec == 'lzma':
+        return lzma.compress(raw)
+    if codec == 'zstd' and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    if codec == 'lz4' and lz4_frame is not None:
+        return lz4_frame.compress(raw)
+    raise ValueError(f"Unknown or unavailable blob codec '{codec}'")
+
+
+def decompress(blob: bytes, codec: str) -> bytes:
+    """Decompress bytes written by compress()."""
+    if codec == 'none':
+        return blob
+    if codec == 'zlib':
+        return zlib.decompress(blob)
+    if codec == 'lzma':
+        return lzma.decompress(blob)
+    if codec == 'zstd' and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(blob)
+    if codec == 'lz4' and lz4_frame is not None:
+        return lz4_frame.decompress(blob)
+    raise ValueError(f"Unknown or unavailable blob codec '{codec}'")
+
+
+def serialize_array(data: np.ndarray, data_format: str = 'numpy') -> bytes:
+    """
+    Serialize an array for storage.
+
+    Args:
+        data: Array to store
+        data_format: 'numpy' (.npy bytes, self-describing) or 'raw' (bare buffer;
+            shape and dtype must be stored alongside)
+    """
+    if data_format == 'numpy':
+        buffer = io.BytesIO()
+        np.save(buffer, data, allow_pickle=False)
+        return buffer.getvalue()
+    return np.ascontiguousarray(data).tobytes()
+
+
+def deserialize_array(
+    raw: bytes,
+    data_format: Optional[str] = 'numpy',
+    shape: Optional[Sequence[int]] = None,
+    dtype: Optional[str] = None,
+) -> np.ndarray:
+    """Rebuild an array written by serialize_array()."""
+    if data_format == 'numpy':
+        return np.load(io.BytesIO(raw), allow_pickle=False)
+    array = np.frombuffer(raw, dtype=np.dtype(dtype or 'float64')).copy()
+    return array.reshape(shape) if shape is not None else array
+
+
+def content_hash(raw: bytes) -> str:
+    """SHA-256 hex digest identifying a blob's uncompressed content."""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def get_object_dir() -> Optional[str]:
+    """Object directory for large blobs, or None to keep every blob in the database."""
+    return _object_dir or os.environ.get(OBJECT_DIR_ENV) or None
+
+
+def set_object_dir(path: Optional[str]):
+    """Set the object directory (overrides PYBIRCH_OBJECT_DIR; None restores it)."""
+    global _object_dir
+    _object_dir = os.path.abspath(path) if path else None
+
+
+def object_path(digest: str) -> str:
+    """Path of an object relative to the object directory."""
+    return os.path.join(digest[:2], digest[2:4], digest)
+
+
+def write_object(digest: str, blob: bytes, object_dir: Optional[str] = None) -> str:
+    """
+    Write a blob to the object directory.
+
+    Objects are immutable and named by content, so an existing file is kept.
+    The write goes through a temporary file so readers never see partial objects.
+
+    Args:
+        digest: Content hash of the blob
+        blob: Stored (compressed) bytes
+        object_dir: Object directory (default: get_object_dir())
+
+    Returns:
+        Path of the object relative to the object directory
+    """
+    root = object_dir or get_object_dir()
+    if not root:
+        raise ValueError(f"No object directory configured (set {OBJECT_DIR_ENV})")
+    relative = object_path(digest)
+    path = os.path.join(root, relative)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    return relative
+
+
+def read_object(relative: str, object_dir: Optional[str] = None) -> bytes:
+    """Read a blob written by write_object()."""
+    root = object_dir or get_object_dir()
+    if not root:
+        raise FileNotFoundError(f"Blob '{relative}' is in the object directory, but none is configured")
+    with open(os.path.join(root, relative), 'rb') as f:
+        return f.read()
+
+
+def remove_object(relative: str, object_dir: Optional[str] = None):
+    """Delete an object file if it exists."""
+    root = object_dir or get_object_dir()
+    if root:
+        path = os.path.join(root, relative)
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,227 @@
+"""
+PyBirch Columnar Chunk Storage
+==============================
+Encoding of measurement data as compressed per-column blocks.
+
+MeasurementDataPoint stores one row per data point with a JSON dict that
+repeats every column name. Chunk storage instead splits a measurement's
+DataFrame into blocks of up to `chunk_rows` rows and stores each column of a
+block as one compressed binary value (MeasurementDataChunk), together with the
+block's sequence range and the column's min/max. Readers skip blocks outside a
+requested sequence range or column set without decompressing them.
+
+Two reserved columns travel with every block:
+    _sequence_index   Sequence index of each row (int64)
+    _timestamp        Acquisition time of each row (datetime64[ns])
+
+Column encodings:
+    float64 / int64 / bool / datetime64[ns]   Raw little-endian bytes
+    json                                      JSON list (strings, mixed objects)
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+SEQUENCE_COLUMN = '_sequence_index'
+TIMESTAMP_COLUMN = '_timestamp'
+RESERVED_COLUMNS = (SEQUENCE_COLUMN, TIMESTAMP_COLUMN)
+
+DEFAULT_CHUNK_ROWS = 4096
+
+# zlib level 1 compresses measurement floats nearly as well as 6 at a fraction of the cost
+CODEC = 'zlib'
+COMPRESSION_LEVEL = 1
+
+# Stored dtype -> NumPy dtype of its raw bytes
+_NUMERIC_DTYPES = {'float64': '<f8', 'int64': '<i8', 'bool': '?'}
+_DATETIME_DTYPE = 'datetime64[ns]'
+
+
+def _compress(raw: bytes, codec: str = CODEC) -> bytes:
+    if codec == 'zlib':
+        return zlib.compress(raw, COMPRESSION_LEVEL)
+    if codec == 'none':
+        return raw
+    raise ValueError(f"Unknown chunk codec '{codec}'")
+
+
+def _decompress(blob: bytes, codec: str) -> bytes:
+    if codec == 'zlib':
+        return zlib.decompress(blob)
+    if codec == 'none':
+        return blob
+    raise ValueError(f"Unknown chunk codec '{codec}'")
+
+
+def _json_value(value: Any) -> Any:
+    """Make one object-column value JSON-serializable."""
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        value = value.item()
+    elif isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if value is pd.NaT or value is None:
+        return None
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    return value
+
+
+def encode_column(values: Any) -> Dict[str, Any]:
+    """
+    Encode one column of a block.
+
+    Args:
+        values: Column values (Series or array-like)
+
+    Returns:
+        Dict with 'dtype', 'codec', 'data_blob', 'min_value' and 'max_value'
+        (min/max are None for non-numeric columns or all-NaN blocks)
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    kind = series.dtype.kind
+    min_value = max_value = None
+
+    if kind == 'M':
+        array = series.to_numpy(dtype='datetime64[ns]')
+        dtype, raw = _DATETIME_DTYPE, array.view('<i8').tobytes()
+    elif kind in 'biuf':
+        if kind == 'b':
+            dtype, array = 'bool', series.to_numpy(dtype=bool)
+        elif kind == 'f':
+            dtype, array = 'float64', series.to_numpy(dtype='<f8')
+        else:
+            dtype, array = 'int64', series.to_numpy(dtype='<i8')
+        raw = array.tobytes()
+        if dtype != 'bool':
+            present = array[~np.isnan(array)] if dtype == 'float64' else array
+            if len(present):
+                min_value, max_value = float(present.min()), float(present.max())
+    else:
+        dtype = 'json'
+        raw = json.dumps([_json_value(v) for v in series.tolist()]).encode('utf-8')
+
+    return {
+        'dtype': dtype,
+        'codec': CODEC,
+        'data_blob': _compress(raw),
+        'min_value': min_value,
+        'max_value': max_value,
+    }
+
+
+def decode_column(dtype: str, codec: str, blob: bytes) -> np.ndarray:
+    """Decode one column of a block back into an array."""
+    raw = _decompress(blob, codec)
+    if dtype in _NUMERIC_DTYPES:
+        return np.frombuffer(raw, dtype=_NUMERIC_DTYPES[dtype]).copy()
+    if dtype == _DATETIME_DTYPE:
+        return np.frombuffer(raw, dtype='<i8').view('datetime64[ns]').copy()
+    if dtype == 'json':
+        return np.array(json.loads(raw.decode('utf-8')), dtype=object)
+    raise ValueError(f"Unknown chunk dtype '{dtype}'")
+
+
+def split_frame(
+    frame: pd.DataFrame,
+    sequence_indices: Sequence[int],
+    timestamps: Optional[Any] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Split a DataFrame into encoded column blocks.
+
+    Args:
+        frame: Measurement data (reserved columns are ignored)
+        sequence_indices: Sequence index of each row
+        timestamps: Acquisition time of each row (None for no timestamps)
+        chunk_rows: Rows per block
+
+    Yields:
+        One dict per (block, column) with the MeasurementDataChunk fields
+        except measurement_object_id
+    """
+    sequence = np.asarray(sequence_indices, dtype='<i8')
+    if len(sequence) != len(frame):
+        raise ValueError(f"Got {len(sequence)} sequence indices for {len(frame)} rows")
+    stamps = None
+    if timestamps is not None:
+        stamps = pd.Series(pd.to_datetime(np.asarray(timestamps)))
+    columns = [c for c in frame.columns if c not in RESERVED_COLUMNS]
+
+    for start in range(0, len(frame), chunk_rows):
+        stop = min(start + chunk_rows, len(frame))
+        block_sequence = sequence[start:stop]
+        block = {
+            'start_sequence': int(block_sequence.min()),
+            'end_sequence': int(block_sequence.max()),
+            'row_count': stop - start,
+        }
+        yield {**block, 'column_name': SEQUENCE_COLUMN, **encode_column(block_sequence)}
+        if stamps is not None:
+            yield {**block, 'column_name': TIMESTAMP_COLUMN, **encode_column(stamps.iloc[start:stop])}
+        for column in columns:
+            yield {**block, 'column_name': str(column), **encode_column(frame[column].iloc[start:stop])}
+
+
+def assemble_frame(
+    chunks: Iterable[Any],
+    columns: Optional[Sequence[str]] = None,
+    start_index: Optional[int] = None,
+    end_index: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Rebuild a DataFrame from column blocks.
+
+    Args:
+        chunks: MeasurementDataChunk rows (or dicts with the same fields)
+        columns: Data columns to include (None for all); reserved columns are always included
+        start_index: First sequence index included
+        end_index: Sequence index to stop before (exclusive)
+
+    Returns:
+        DataFrame in sequence order with `_sequence_index` (and `_timestamp` if stored)
+        after the data columns
+    """
+    blocks: Dict[tuple, Dict[str, np.ndarray]] = {}
+    order: List[str] = []
+    for chunk in chunks:
+        get = chunk.get if isinstance(chunk, dict) else lambda field: getattr(chunk, field)
+        name = get('column_name')
+        if columns is not None and name not in columns and name not in RESERVED_COLUMNS:
+            continue
+        key = (get('start_sequence'), get('end_sequence'), get('row_count'))
+        blocks.setdefault(key, {})[name] = decode_column(get('dtype'), get('codec'), get('data_blob'))
+        if name not in order and name not in RESERVED_COLUMNS:
+            order.append(name)
+
+    if columns is not None:
+        order = [c for c in columns if c in order]
+    frames = []
+    for key in sorted(blocks):
+        data = blocks[key]
+        if SEQUENCE_COLUMN not in data:
+            continue
+        part = pd.DataFrame({name: data[name] for name in order if name in data})
+        part[SEQUENCE_COLUMN] = data[SEQUENCE_COLUMN]
+        if TIMESTAMP_COLUMN in data:
+            part[TIMESTAMP_COLUMN] = data[TIMESTAMP_COLUMN]
+        frames.append(part)
+    if not frames:
+        return pd.DataFrame(columns=order + [SEQUENCE_COLUMN])
+
+    frame = pd.concat(frames, ignore_index=True)
+    if start_index is not None or end_index is not None:
+        sequence = frame[SEQUENCE_COLUMN]
+        mask = np.ones(len(frame), dtype=bool)
+        if start_index is not None:
+            mask &= (sequence >= start_index).to_numpy()
+        if end_index is not None:
+            mask &= (sequence < end_index).to_numpy()
+        frame = frame[mask]
+    return frame.sort_values(SEQUENCE_COLUMN, kind='stable').reset_index(drop=True)
@@ -587,6 +587,7 @@ class ScanCRUD(BaseCRUD[Scan]):
             timestamp=timestamp or datetime.utcnow()
         )
         session.add(point)
+        self._invalidate_counters(session, measurement_object_id)
         return point
     
     def add_measurement_data_batch(
@@ -608,8 +609,15 @@ class ScanCRUD(BaseCRUD[Scan]):
             points.append(point)
         
         session.bulk_save_objects(points)
+        self._invalidate_counters(session, measurement_object_id)
         return len(points)
     
+    def _invalidate_counters(self, session: Session, measurement_object_id: int):
+        """Mark a measurement's counters for recomputation (DatabaseService maintains them on its own inserts)."""
+        session.query(MeasurementObject).filter(
+            MeasurementObject.id == measurement_object_id
+        ).update({MeasurementObject.row_count: None}, synchronize_session=False)
+    
     def get_with_data(self, session: Session, id: int) -> Optional[Scan]:
         """Get scan with measurement data loaded."""
         query = select(Scan).where(Scan.id == id).options(
@@ -0,0 +1,469 @@
+"""
+PyBirch Data Cubes
+==================
+Gridded N-D arrays rebuilt from a measurement's flat rows.
+
+Scans store one row per measured point, with the position of every ancestral
+movement in a column named '<position_column> M(<units>)' (see
+pybirch/scan/scan.py). A data cube puts the rows back on the scan grid: each
+position column becomes an axis whose coordinates are its distinct positions,
+and each other numeric column becomes a channel array of shape
+(len(coords[0]), len(coords[1]), ...). Cells never measured are NaN; cells
+measured more than once hold the mean.
+
+Positions are read back from the stages, so one commanded position arrives as
+slightly different values. Values closer than a snapping tolerance to their
+neighbour are merged into one coordinate (their mean), with a warning. The
+tolerance is given in axis units. By default it is found from the gaps between
+distinct positions: read-back jitter shows up as gaps at least SNAP_GAP_RATIO
+times smaller than the step between setpoints, and without such a separation
+(e.g. clean or log-spaced positions) nothing is merged.
+
+Cubes are built in two streaming passes over the chunked reader (coordinates,
+then values) straight into .npy files, and cached on disk under a key made of
+the scan, the measurement and its data version (a digest of the counters in
+database/measurement_stats.py), so a cube is rebuilt only after new data
+arrives. Cached cubes are opened as memory maps; slices, projections and line
+cuts (reduce_cube) only read the cells they need, and can be block-averaged
+down to a cell budget for display (coarsen).
+
+Layout of a cached cube:
+
+    <cache dir>/scan_<scan id>/mo_<measurement id>_<version>_<axes digest>/
+        cube.json     Axes, coordinates, channels, shape and version
+        counts.npy    Rows that landed in each cell
+        <n>.npy       Channel n (order of 'channels' in cube.json)
+
+The cache directory is set with the PYBIRCH_CUBE_DIR environment variable or
+set_cache_dir() and defaults to <temp dir>/pybirch-cubes.
+
+Usage:
+    from database.data_cube import reduce_cube
+
+    result = reduce_cube(cube, 'X (V)', [{'dimension': 'z M(um)', 'method': 'max'}],
+                         display_axes=['x M(um)', 'y M(um)'])
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import warnings
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from database.chunk_storage import RESERVED_COLUMNS
+
+# Movement position columns written by Scan: '<position_column> M(<units>)'
+POSITION_PATTERN = re.compile(r' M\((.*)\)$')
+
+# Positions are rounded to this many decimals before snapping
+COORD_DECIMALS = 9
+
+# Jitter gaps must be this many times smaller than setpoint steps to be snapped
+# by default (see default_tolerance)
+SNAP_GAP_RATIO = 100.0
+
+# Largest cube built (cells per channel)
+MAX_CUBE_CELLS = 50_000_000
+
+REDUCTION_METHODS = ('slice', 'max', 'min', 'mean', 'sum', 'std')
+
+CUBE_DIR_ENV = 'PYBIRCH_CUBE_DIR'
+
+_cache_dir: Optional[str] = None
+
+_PROJECTIONS = {
+    'max': np.nanmax,
+    'min': np.nanmin,
+    'mean': np.nanmean,
+    'sum': np.nansum,
+    'std': np.nanstd,
+}
+
+
+def position_columns(columns: Iterable[str]) -> List[str]:
+    """Columns holding movement positions, in their original order."""
+    return [c for c in columns if isinstance(c, str) and POSITION_PATTERN.search(c)]
+
+
+def data_version(stats: Dict[str, Any]) -> str:
+    """Short digest of a measurement's counters; changes whenever its data does."""
+    text = json.dumps(stats, default=str, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def get_cache_dir() -> str:
+    """Directory holding cached cubes."""
+    return _cache_dir or os.environ.get(CUBE_DIR_ENV) or os.path.join(tempfile.gettempdir(), 'pybirch-cubes')
+
+
+def set_cache_dir(path: Optional[str]):
+    """Set the cube cache directory (overrides PYBIRCH_CUBE_DIR; None restores it)."""
+    global _cache_dir
+    _cache_dir = os.path.abspath(path) if path else None
+
+
+def cube_path(scan_id: int, measurement_id: int, version: str, axes: Sequence[str],
+              tolerance: Optional[float] = None) -> str:
+    """Cache directory of a measurement's cube for one data version, set of axes and tolerance."""
+    key = '\x1f'.join(list(axes) + ([repr(float(tolerance))] if tolerance is not None else []))
+    axes_key = hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(get_cache_dir(), f"scan_{scan_id}", f"mo_{measurement_id}_{version}_{axes_key}")
+
+
+def _grid_values(frame: pd.DataFrame, axis: str) -> np.ndarray:
+    return np.round(pd.to_numeric(frame[axis], errors='coerce').to_numpy(dtype='<f8'), COORD_DECIMALS)
+
+
+def default_tolerance(values: np.ndarray) -> float:
+    """
+    Snapping tolerance of an axis from the gaps between its distinct positions.
+
+    Sorted gaps of a jittery grid fall into two groups, read-back jitter and
+    setpoint steps, separated by a jump of at least SNAP_GAP_RATIO. The
+    tolerance lies in the highest such jump; without one it is 0 (no merging).
+
+    Args:
+        values: Sorted distinct positions of one axis
+    """
+    gaps = np.sort(np.diff(values))
+    if len(gaps) < 2:
+        return 0.0
+    jumps = np.flatnonzero(gaps[1:] >= SNAP_GAP_RATIO * gaps[:-1])
+    if not len(jumps):
+        return 0.0
+    i = jumps[-1]
+    return float(np.sqrt(gaps[i] * gaps[i + 1]))
+
+
+def snap_positions(values: np.ndarray, tolerance: Optional[float] = None, axis: str = ''):
+    """
+    Merge sorted distinct positions closer than tolerance into grid coordinates.
+
+    Warns when positions are merged, so averaging is never silent.
+
+    Args:
+        values: Sorted distinct positions of one axis
+        tolerance: Largest gap within one grid position, in axis units
+            (None for default_tolerance())
+        axis: Axis name used in the warning
+
+    Returns:
+        (coords, lows): the coordinate of each grid position (mean of its
+        values) and its lowest value, for np.searchsorted(lows, v, 'right') - 1
+    """
+    if len(values) < 2:
+        return values, values
+    if tolerance is None:
+        tolerance = default_tolerance(values)
+    starts = np.concatenate([[True], np.diff(values) > tolerance])
+    if starts.all():
+        return values, values
+    labels = np.cumsum(starts) - 1
+    coords = np.bincount(labels, weights=values) / np.bincount(labels)
+    warnings.warn(
+        f"Snapped {len(values)} distinct positions of axis '{axis}' to {len(coords)} "
+        f"grid coordinates (tolerance {tolerance:.3g})",
+        stacklevel=2,
+    )
+    return np.round(coords, COORD_DECIMALS), values[starts]
+
+
+def build_cube(
+    read_frames: Callable[[], Iterable[pd.DataFrame]],
+    axes: Sequence[str],
+    path: str,
+    version: str = '',
+    tolerance: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Grid a measurement's rows into a cube and write it to a cache directory.
+
+    Args:
+        read_frames: Returns a fresh iterator over the measurement's frames
+            (called twice: once for coordinates, once for values)
+        axes: Position columns to use as axes
+        path: Cache directory to create (see cube_path)
+        version: Data version recorded with the cube
+        tolerance: Snapping tolerance in axis units (None for each axis'
+            default_tolerance(); 0 keeps every distinct value)
+
+    Returns:
+        The cube, as returned by load_cube()
+
+    Raises:
+        ValueError: If an axis is missing, no row has a full position, or the
+            grid is larger than MAX_CUBE_CELLS
+    """
+    axes = list(axes)
+    if not axes:
+        raise ValueError("A data cube needs at least one axis")
+
+    # Pass 1: distinct positions and channels
+    values_seen: List[np.ndarray] = [np.empty(0) for _ in axes]
+    channels: List[str] = []
+    for frame in read_frames():
+        missing = [axis for axis in axes if axis not in frame.columns]
+        if missing:
+            raise ValueError(f"Position column(s) not found: {', '.join(missing)}")
+        for i, axis in enumerate(axes):
+            values = _grid_values(frame, axis)
+            values_seen[i] = np.union1d(values_seen[i], values[~np.isnan(values)])
+        for column in frame.columns:
+            if (column not in RESERVED_COLUMNS and column not in axes and column not in channels
+                    and frame[column].dtype.kind in 'biuf'):
+                channels.append(column)
+
+    snapped = [snap_positions(values, tolerance, axis) for values, axis in zip(values_seen, axes)]
+    coords = [c for c, _ in snapped]
+    lows = [low for _, low in snapped]
+    shape = tuple(len(c) for c in coords)
+    cells = int(np.prod(shape))
+    if cells == 0:
+        raise ValueError("No rows with a value on every axis")
+    if cells > MAX_CUBE_CELLS:
+        raise ValueError(
+            f"Grid of shape {shape} has {cells} cells (limit {MAX_CUBE_CELLS}); "
+            f"the positions may not lie on a grid, or need a larger snapping tolerance"
+        )
+
+    # Pass 2: values, written into memory-mapped files next to the final directory
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    work = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+    try:
+        counts = np.lib.format.open_memmap(os.path.join(work, 'counts.npy'), mode='w+', dtype='<i4', shape=shape)
+        sums = [
+            np.lib.format.open_memmap(os.path.join(work, f"{n}.npy"), mode='w+', dtype='<f8', shape=shape)
+            for n in range(len(channels))
+        ]
+        hits = [
+            np.lib.format.open_memmap(os.path.join(work, f"{n}.hits.npy"), mode='w+', dtype='<i4', shape=shape)
+            for n in range(len(channels))
+        ]
+        for frame in read_frames():
+            positions = np.column_stack([_grid_values(frame, axis) for axis in axes])
+            placed = ~np.isnan(positions).any(axis=1)
+            if not placed.any():
+                continue
+            index = np.ravel_multi_index(
+                [np.searchsorted(lows[i], positions[placed, i], side='right') - 1 for i in range(len(axes))],
+                shape
+            )
+            np.add.at(counts.reshape(-1), index, 1)
+            for n, channel in enumerate(channels):
+                if channel not in frame.columns:
+                    continue
+                values = pd.to_numeric(frame[channel], errors='coerce').to_numpy(dtype='<f8')[placed]
+                present = ~np.isnan(values)
+                np.add.at(sums[n].reshape(-1), index[present], values[present])
+                np.add.at(hits[n].reshape(-1), index[present], 1)
+
+        for n in range(len(channels)):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                sums[n][...] = np.where(hits[n] > 0, sums[n] / hits[n], np.nan)
+            sums[n].flush()
+        counts.flush()
+        del counts, sums, hits
+        for n in range(len(channels)):
+            os.remove(os.path.join(work, f"{n}.hits.npy"))
+
+        with open(os.path.join(work, 'cube.json'), 'w') as f:
+            json.dump({
+                'axes': axes,
+                'coords': [c.tolist() for c in coords],
+                'channels': [str(c) for c in channels],
+                'shape': list(shape),
+                'version': version,
+            }, f)
+        try:
+            os.rename(work, path)
+        except OSError:
+            # Built concurrently by another request; keep that one
+            if not os.path.exists(os.path.join(path, 'cube.json')):
+                raise
+    finally:
+        if os.path.exists(work):
+            shutil.rmtree(work, ignore_errors=True)
+    return load_cube(path)
+
+
+def load_cube(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Open a cached cube, or return None if there is none at path.
+
+    Returns:
+        Dict with 'axes', 'coords' (NumPy arrays), 'channels', 'shape',
+        'version', 'path', 'counts' and 'arrays' (channel -> read-only memory map)
+    """
+    meta_path = os.path.join(path, 'cube.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    return {
+        'axes': meta['axes'],
+        'coords': [np.asarray(c, dtype='<f8') for c in meta['coords']],
+        'channels': meta['channels'],
+        'shape': tuple(meta['shape']),
+        'version': meta['version'],
+        'path': path,
+        'counts': np.load(os.path.join(path, 'counts.npy'), mmap_mode='r'),
+        'arrays': {
+            channel: np.load(os.path.join(path, f"{n}.npy"), mmap_mode='r')
+            for n, channel in enumerate(meta['channels'])
+        },
+    }
+
+
+def prune_cubes(scan_id: int, measurement_id: int, version: str):
+    """Delete a measurement's cached cubes built for data versions other than version.
+
+    Cubes of the current version for other axes or tolerances are kept.
+    """
+    parent = os.path.join(get_cache_dir(), f"scan_{scan_id}")
+    if not os.path.isdir(parent):
+        return
+    for name in os.listdir(parent):
+        if name.startswith(f"mo_{measurement_id}_") and not name.startswith(f"mo_{measurement_id}_{version}_"):
+            shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+
+
+def nearest_index(coords: np.ndarray, value: float) -> int:
+    """Index of the coordinate closest to value."""
+    return int(np.abs(coords - value).argmin())
+
+
+def coarsen(array: np.ndarray, coords: Sequence[np.ndarray], max_cells: int):
+    """
+    Block-average an array until it has at most max_cells cells.
+
+    Every axis is shrunk by the same factor; empty (NaN) cells are left out of
+    the block means, and each coordinate becomes the mean of its block.
+
+    Returns:
+        (array, coords, factor); factor is 1 if the array already fits
+    """
+    if array.ndim == 0 or array.size <= max_cells:
+        return array, list(coords), 1
+    factor = int(np.ceil((array.size / max(1, max_cells)) ** (1.0 / array.ndim)))
+    while np.prod([-(-n // factor) for n in array.shape]) > max_cells:
+        factor += 1
+
+    def blocks(values, axis):
+        pad = [(0, 0)] * values.ndim
+        pad[axis] = (0, -values.shape[axis] % factor)
+        values = np.pad(values.astype('<f8'), pad, constant_values=np.nan)
+        shape = values.shape[:axis] + (values.shape[axis] // factor, factor) + values.shape[axis + 1:]
+        return np.nanmean(values.reshape(shape), axis=axis + 1)
+
+    with warnings.catch_warnings():
+        # All-empty blocks average to NaN without a warning
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        for axis in range(array.ndim):
+            array = blocks(array, axis)
+        coords = [blocks(np.asarray(c), 0) for c in coords]
+    return array, coords, factor
+
+
+def reduce_cube(
+    cube: Dict[str, Any],
+    channel: Optional[str],
+    reductions: Optional[Sequence[Dict[str, Any]]] = None,
+    display_axes: Optional[Sequence[str]] = None,
+    max_cells: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Slice and project a cube channel down to the axes to display.
+
+    Reductions are applied in order. A 'slice' keeps the cells nearest to a
+    coordinate ('value') or at a grid index ('index'); 'max', 'min', 'mean',
+    'sum' and 'std' project over the whole axis, ignoring empty cells. Slicing
+    every axis but one gives a line cut. Axes that are neither reduced nor
+    displayed are averaged out.
+
+    Args:
+        cube: A cube from load_cube() or build_cube()
+        channel: Channel to reduce (None for the first)
+        reductions: [{'dimension': axis, 'method': ..., 'value' or 'index': ...}]
+        display_axes: Axes of the result, in order (default: the axes left over)
+        max_cells: Block-average the result down to at most this many cells
+            (see coarsen; None keeps every cell)
+
+    Returns:
+        Dict with 'axes', 'coords' (lists), 'values' (nested lists, None for
+        empty cells), 'labels', 'original_shape' and 'reduced_shape'
+
+    Raises:
+        ValueError: On an unknown channel, axis or method
+    """
+    if channel is None and cube['channels']:
+        channel = cube['channels'][0]
+    if channel not in cube['arrays']:
+        raise ValueError(f"Unknown channel '{channel}' (available: {', '.join(cube['channels'])})")
+
+    array = cube['arrays'][channel]
+    axes = list(cube['axes'])
+    coords = list(cube['coords'])
+    labels = []
+
+    def position(axis):
+        if axis not in axes:
+            raise ValueError(f"Unknown or already reduced axis '{axis}'")
+        return axes.index(axis)
+
+    steps = list(reductions or [])
+    if display_axes:
+        for axis in display_axes:
+            position(axis)
+        reduced = {step.get('dimension') for step in steps}
+        steps += [{'dimension': axis, 'method': 'mean'} for axis in axes
+                  if axis not in display_axes and axis not in reduced]
+
+    with warnings.catch_warnings():
+        # All-empty cells reduce to NaN without a warning
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        for step in steps:
+            method = step.get('method', 'slice')
+            if method not in REDUCTION_METHODS:
+                raise ValueError(f"Unknown reduction '{method}' (use one of {', '.join(REDUCTION_METHODS)})")
+            i = position(step.get('dimension'))
+            axis = axes[i]
+            if method == 'slice':
+                if step.get('index') is not None:
+                    index = min(max(int(step['index']), 0), len(coords[i]) - 1)
+                else:
+                    index = nearest_index(coords[i], float(step.get('value', coords[i][0])))
+                array = np.take(array, index, axis=i)
+                labels.append(f"slice at {axis}={coords[i][index]:g}")
+            else:
+                array = _PROJECTIONS[method](array, axis=i)
+                labels.append(f"{method} over {axis}")
+            del axes[i], coords[i]
+
+    if display_axes:
+        order = [axes.index(axis) for axis in display_axes]
+        array = np.transpose(array, order)
+        axes = [axes[i] for i in order]
+        coords = [coords[i] for i in order]
+
+    array = np.asarray(array, dtype='<f8')
+    if max_cells is not None:
+        array, coords, factor = coarsen(array, coords, max_cells)
+        if factor > 1:
+            labels.append(f"mean of {factor}-cell blocks")
+    values = np.where(np.isnan(array), None, array).tolist()
+    return {
+        'channel': channel,
+        'axes': axes,
+        'coords': [c.tolist() for c in coords],
+        'values': values,
+        'labels': labels,
+        'original_shape': list(cube['shape']),
+        'reduced_shape': list(array.shape),
+    }
@@ -0,0 +1,262 @@
+"""
+PyBirch Measurement Data Reader
+===============================
+Streaming, chunked reads of measurement data.
+
+A measurement's data may live in columnar chunk blocks (MeasurementDataChunk),
+in legacy per-row storage (MeasurementDataPoint), or both. The reader streams
+both sources with `yield_per` (a server-side cursor on PostgreSQL), merges them
+in sequence order and yields fixed-size pieces, so memory use is bounded by
+the chunk size rather than by the size of the scan. Legacy rows stored without
+a sequence index follow the ordered rows, with `_sequence_index` missing (NA).
+
+Every piece carries the reserved `_sequence_index` and `_timestamp` columns
+(see database.chunk_storage) after the data columns; with row_fields=True it
+also carries `_row_id` and `_extra_data` (missing for chunk-stored rows).
+
+Usage:
+    from database.session import get_session
+    from database.data_reader import iter_measurement_frames
+
+    with get_session() as session:
+        for frame in iter_measurement_frames(session, measurement_id, columns=['X (V)'],
+                                             start_index=0, end_index=100000):
+            process(frame)
+"""
+
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+
+from database.chunk_storage import RESERVED_COLUMNS, SEQUENCE_COLUMN, TIMESTAMP_COLUMN, assemble_frame
+from database.models import MeasurementDataChunk, MeasurementDataPoint
+
+DEFAULT_READ_ROWS = 10000
+
+# Chunk blocks store one row per column; fetch enough to cover a few blocks per round trip
+_CHUNK_FETCH_ROWS = 256
+
+# MeasurementDataPoint fields carried with row_fields=True
+ROW_ID_COLUMN = '_row_id'
+EXTRA_DATA_COLUMN = '_extra_data'
+ROW_FIELD_COLUMNS = (ROW_ID_COLUMN, EXTRA_DATA_COLUMN)
+
+
+def _chunk_frames(
+    session,
+    measurement_id: int,
+    columns: Optional[Sequence[str]],
+    start_index: Optional[int],
+    end_index: Optional[int],
+) -> Iterator[pd.DataFrame]:
+    """Yield one decoded DataFrame per chunk block, in sequence order."""
+    query = select(MeasurementDataChunk).where(
+        MeasurementDataChunk.measurement_object_id == measurement_id
+    )
+    if columns is not None:
+        query = query.where(MeasurementDataChunk.column_name.in_(list(columns) + list(RESERVED_COLUMNS)))
+    if start_index is not None:
+        query = query.where(MeasurementDataChunk.end_sequence >= start_index)
+    if end_index is not None:
+        query = query.where(MeasurementDataChunk.start_sequence < end_index)
+    query = query.order_by(
+        MeasurementDataChunk.start_sequence,
+        MeasurementDataChunk.end_sequence,
+        MeasurementDataChunk.id,
+    ).execution_options(yield_per=_CHUNK_FETCH_ROWS)
+
+    block: List[MeasurementDataChunk] = []
+    key = None
+    for chunk in session.execute(query).scalars():
+        chunk_key = (chunk.start_sequence, chunk.end_sequence, chunk.row_count)
+        if block and chunk_key != key:
+            yield assemble_frame(block, columns, start_index, end_index)
+            block = []
+        key = chunk_key
+        block.append(chunk)
+    if block:
+        yield assemble_frame(block, columns, start_index, end_index)
+
+
+def _row_frames(
+    session,
+    measurement_id: int,
+    columns: Optional[Sequence[str]],
+    start_index: Optional[int],
+    end_index: Optional[int],
+    chunk_size: int,
+    row_fields: bool = False,
+    sequenced: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield DataFrames of up to chunk_size legacy rows.
+
+    With sequenced=True the rows with a sequence index, in sequence order;
+    otherwise the rows without one, in insertion order.
+    """
+    fields = [MeasurementDataPoint.values, MeasurementDataPoint.sequence_index, MeasurementDataPoint.timestamp]
+    if row_fields:
+        fields += [MeasurementDataPoint.id, MeasurementDataPoint.extra_data]
+    query = select(*fields).where(MeasurementDataPoint.measurement_object_id == measurement_id)
+    if sequenced:
+        query = query.where(MeasurementDataPoint.sequence_index.isnot(None))
+        if start_index is not None:
+            query = query.where(MeasurementDataPoint.sequence_index >= start_index)
+        if end_index is not None:
+            query = query.where(MeasurementDataPoint.sequence_index < end_index)
+        query = query.order_by(MeasurementDataPoint.sequence_index, MeasurementDataPoint.id)
+    else:
+        query = query.where(MeasurementDataPoint.sequence_index.is_(None)).order_by(MeasurementDataPoint.id)
+    query = query.execution_options(yield_per=chunk_size)
+
+    for partition in session.execute(query).partitions():
+        frame = pd.DataFrame([row[0] or {} for row in partition])
+        if columns is not None:
+            frame = frame.reindex(columns=[c for c in columns if c in frame.columns])
+        if sequenced:
+            frame[SEQUENCE_COLUMN] = np.array([row[1] for row in partition], dtype='<i8')
+        else:
+            frame[SEQUENCE_COLUMN] = pd.array([None] * len(partition), dtype='Int64')
+        frame[TIMESTAMP_COLUMN] = pd.to_datetime([row[2] for row in partition])
+        if row_fields:
+            frame[ROW_ID_COLUMN] = pd.array([row[3] for row in partition], dtype='Int64')
+            frame[EXTRA_DATA_COLUMN] = [row[4] for row in partition]
+        yield frame
+
+
+def _merge_sorted(sources: List[Iterator[pd.DataFrame]]) -> Iterator[pd.DataFrame]:
+    """
+    Merge streams of sequence-sorted frames into one sequence-sorted stream.
+
+    Each round takes, from every stream's current frame, the rows up to the
+    smallest last sequence index among them; no later frame can hold a row
+    before that point.
+    """
+    sources = [(frame for frame in source if len(frame)) for source in sources]
+    current = [next(source, None) for source in sources]
+    while True:
+        active = [i for i, frame in enumerate(current) if frame is not None]
+        if not active:
+            return
+        if len(active) == 1:
+            i = active[0]
+            yield current[i]
+            current[i] = next(sources[i], None)
+            continue
+
+        watermark = min(current[i][SEQUENCE_COLUMN].iloc[-1] for i in active)
+        taken = []
+        for i in active:
+            frame = current[i]
+            split = int(np.searchsorted(frame[SEQUENCE_COLUMN].to_numpy(), watermark, side='right'))
+            taken.append(frame.iloc[:split])
+            current[i] = frame.iloc[split:] if split < len(frame) else next(sources[i], None)
+        merged = pd.concat([t for t in taken if len(t)], ignore_index=True)
+        yield merged.sort_values(SEQUENCE_COLUMN, kind='stable')
+
+
+def _reserved_last(frame: pd.DataFrame) -> pd.DataFrame:
+    trailing = RESERVED_COLUMNS + ROW_FIELD_COLUMNS
+    order = [c for c in frame.columns if c not in trailing]
+    order += [c for c in trailing if c in frame.columns]
+    return frame[order]
+
+
+def _rechunk(frames: Iterable[pd.DataFrame], chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Re-split a stream of frames into frames of exactly chunk_size rows (the last may be shorter)."""
+    pending: List[pd.DataFrame] = []
+    pending_rows = 0
+    for frame in frames:
+        if not len(frame):
+            continue
+        pending.append(frame)
+        pending_rows += len(frame)
+        if pending_rows < chunk_size:
+            continue
+        combined = pd.concat(pending, ignore_index=True) if len(pending) > 1 else frame
+        full = len(combined) - len(combined) % chunk_size
+        for start in range(0, full, chunk_size):
+            yield _reserved_last(combined.iloc[start:start + chunk_size].reset_index(drop=True))
+        rest = combined.iloc[full:]
+        pending = [rest] if len(rest) else []
+        pending_rows = len(rest)
+    if pending_rows:
+        yield _reserved_last(pd.concat(pending, ignore_index=True))
+
+
+def iter_measurement_frames(
+    session,
+    measurement_id: int,
+    columns: Optional[Sequence[str]] = None,
+    start_index: Optional[int] = None,
+    end_index: Optional[int] = None,
+    chunk_size: int = DEFAULT_READ_ROWS,
+    include_unsequenced: bool = True,
+    row_fields: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a measurement's data as DataFrames of chunk_size rows.
+
+    Args:
+        session: Open SQLAlchemy session (must stay open while iterating)
+        measurement_id: MeasurementObject ID
+        columns: Data columns to include (None for all)
+        start_index: First sequence index included
+        end_index: Sequence index to stop before (exclusive)
+        chunk_size: Rows per yielded frame (the last frame may be shorter)
+        include_unsequenced: Append legacy rows without a sequence index after
+            the ordered rows (only when no sequence range is given)
+        row_fields: Add the `_row_id` and `_extra_data` columns of legacy rows
+
+    Yields:
+        DataFrames in sequence order; reserved columns come after the data columns
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    sources = [
+        _chunk_frames(session, measurement_id, columns, start_index, end_index),
+        _row_frames(session, measurement_id, columns, start_index, end_index, chunk_size, row_fields),
+    ]
+    frames: Iterable[pd.DataFrame] = _merge_sorted(sources)
+    if include_unsequenced and start_index is None and end_index is None:
+        frames = chain(frames, _row_frames(
+            session, measurement_id, columns, None, None, chunk_size, row_fields, sequenced=False,
+        ))
+    yield from _rechunk(frames, chunk_size)
+
+
+def frame_to_arrays(frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Convert a frame yielded by iter_measurement_frames into column arrays."""
+    return {str(column): frame[column].to_numpy() for column in frame.columns}
+
+
+def frame_to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a frame into JSON-ready data point dicts.
+
+    Returns:
+        One dict per row with 'sequence_index' (None for rows without one),
+        'timestamp' (ISO string or None) and 'values' (NaN becomes None, NumPy
+        scalars become Python values); frames read with row_fields=True add
+        'id' and 'extra_data' (None for chunk-stored rows)
+    """
+    data_columns = [c for c in frame.columns if c not in RESERVED_COLUMNS + ROW_FIELD_COLUMNS]
+    values = frame[data_columns].astype(object)
+    values = values.where(values.notna(), None).to_dict('records')
+    sequence = [None if pd.isna(seq) else int(seq) for seq in frame[SEQUENCE_COLUMN]]
+    if TIMESTAMP_COLUMN in frame.columns:
+        stamps = [None if pd.isna(t) else t.isoformat() for t in frame[TIMESTAMP_COLUMN]]
+    else:
+        stamps = [None] * len(frame)
+    records = [
+        {'sequence_index': seq, 'timestamp': stamp, 'values': row}
+        for seq, stamp, row in zip(sequence, stamps, values)
+    ]
+    if ROW_ID_COLUMN in frame.columns:
+        for record, row_id, extra in zip(records, frame[ROW_ID_COLUMN], frame[EXTRA_DATA_COLUMN]):
+            record['id'] = None if pd.isna(row_id) else int(row_id)
+            record['extra_data'] = None if isinstance(extra, float) and np.isnan(extra) else extra
+    return records
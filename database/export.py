@@ -0,0 +1,236 @@
+"""
+PyBirch Scan Export
+===================
+Streaming export of measurement data as CSV, Parquet or Arrow IPC.
+
+Exports read measurements through the chunked reader (database.data_reader)
+and encode one piece at a time, so a multi-GB scan is written or downloaded
+with memory bounded by the read chunk size:
+
+    csv       Text; one section per measurement (optional '#' metadata lines,
+              header row, rows, blank line)
+    parquet   One row group per read chunk (needs pyarrow)
+    arrow     Arrow IPC stream, one record batch per read chunk (needs pyarrow)
+
+Parquet and Arrow hold a single table, so they export one measurement.
+Exported columns are 'sequence_index', the data columns and 'timestamp'.
+Their schema is fixed before the first chunk is written (numeric data columns
+as float64, others as text; see arrow_schema), and every chunk is cast to it
+safely, so a value that does not fit raises instead of being truncated.
+
+Usage:
+    from database.export import frames_to_csv
+
+    with open('map.csv', 'w') as f:
+        for text in frames_to_csv(frames):
+            f.write(text)
+"""
+
+import io
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from database.chunk_storage import RESERVED_COLUMNS, SEQUENCE_COLUMN, TIMESTAMP_COLUMN
+from database.lod import numeric_channels
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Format -> (MIME type, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+# Formats holding a single table, i.e. one measurement
+TABLE_FORMATS = ('parquet', 'arrow')
+
+_CSV_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+def available_formats() -> List[str]:
+    """Export formats usable in this environment."""
+    return [fmt for fmt in EXPORT_FORMATS if fmt not in TABLE_FORMATS or pa is not None]
+
+
+def export_columns(data_columns: Sequence[str], columns: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Columns of an export, in order.
+
+    Args:
+        data_columns: The measurement's data columns
+        columns: Exported column names to keep (None for all)
+    """
+    names = ['sequence_index'] + [str(c) for c in data_columns] + ['timestamp']
+    return [c for c in names if c in columns] if columns else names
+
+
+def _export_frame(frame: pd.DataFrame, names: Sequence[str]) -> pd.DataFrame:
+    """Rename the reserved columns of a reader frame and align it to the export columns."""
+    frame = frame.rename(columns={SEQUENCE_COLUMN: 'sequence_index', TIMESTAMP_COLUMN: 'timestamp'})
+    frame.columns = [str(c) for c in frame.columns]
+    return frame.reindex(columns=list(names))
+
+
+def _first_names(frame: pd.DataFrame, data_columns: Optional[Sequence[str]],
+                 columns: Optional[Sequence[str]]) -> List[str]:
+    if data_columns is None:
+        data_columns = [c for c in frame.columns if c not in RESERVED_COLUMNS]
+    return export_columns(data_columns, columns)
+
+
+def csv_metadata(title: str, fields: Dict[str, Any]) -> str:
+    """'#' comment lines for a CSV export, e.g. csv_metadata('PyBirch Scan Export', {'Scan ID': 3})."""
+    lines = [f"# {title}"] + [f"# {key}: {'-' if value is None else value}" for key, value in fields.items()]
+    return '\n'.join(lines) + '\n#\n'
+
+
+def frames_to_csv(
+    frames: Iterable[pd.DataFrame],
+    data_columns: Optional[Sequence[str]] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[str]:
+    """
+    Encode reader frames as CSV text, one piece per frame.
+
+    Args:
+        frames: Frames from iter_measurement_frames
+        data_columns: Data columns to export (default: those of the first frame)
+        columns: Exported column names to keep (None for all)
+
+    Yields:
+        The header row, then the rows of each frame. With data_columns given
+        the header is written even if there are no frames.
+    """
+    names = export_columns(data_columns, columns) if data_columns is not None else None
+    if names is not None:
+        yield _csv_header(names)
+    for frame in frames:
+        if names is None:
+            names = _first_names(frame, None, columns)
+            yield _csv_header(names)
+        buffer = io.StringIO()
+        _export_frame(frame, names).to_csv(
+            buffer, header=False, index=False, date_format=_CSV_DATE_FORMAT, lineterminator='\n'
+        )
+        yield buffer.getvalue()
+
+
+def _csv_header(names: Sequence[str]) -> str:
+    buffer = io.StringIO()
+    pd.DataFrame(columns=list(names)).to_csv(buffer, index=False, lineterminator='\n')
+    return buffer.getvalue()
+
+
+def arrow_schema(names: Sequence[str], numeric_columns: Iterable[str] = ()):
+    """
+    Arrow schema of an export: int64 sequence index, nanosecond timestamps,
+    float64 for numeric data columns and text for the others.
+
+    Args:
+        names: Exported columns, from export_columns()
+        numeric_columns: Data columns holding numbers (e.g. the measurement's
+            column_ranges, which cover every chunk)
+    """
+    numeric = {str(c) for c in numeric_columns}
+    fields = []
+    for name in names:
+        if name == 'sequence_index':
+            fields.append((name, pa.int64()))
+        elif name == 'timestamp':
+            fields.append((name, pa.timestamp('ns')))
+        else:
+            fields.append((name, pa.float64() if name in numeric else pa.string()))
+    return pa.schema(fields)
+
+
+def frames_to_arrow(
+    frames: Iterable[pd.DataFrame],
+    fmt: str = 'parquet',
+    data_columns: Optional[Sequence[str]] = None,
+    columns: Optional[Sequence[str]] = None,
+    numeric_columns: Optional[Iterable[str]] = None,
+) -> Iterator[bytes]:
+    """
+    Encode reader frames as a Parquet file or Arrow IPC stream.
+
+    The schema (arrow_schema) is fixed before the first frame is encoded, and
+    every frame is cast to it safely. Each frame becomes one Parquet row group
+    or one Arrow record batch, and the encoded bytes are yielded as soon as
+    they are written.
+
+    Args:
+        frames: Frames from iter_measurement_frames
+        fmt: 'parquet' or 'arrow'
+        data_columns: Data columns to export (default: those of the first frame)
+        columns: Exported column names to keep (None for all)
+        numeric_columns: Data columns exported as float64 (default: the
+            numeric columns of the first frame)
+
+    Yields:
+        Pieces of the encoded file
+
+    Raises:
+        ValueError: If pyarrow is missing, or a value does not fit its column type
+    """
+    if pa is None:
+        raise ValueError(f"Export format '{fmt}' needs pyarrow, which is not installed")
+    if fmt not in TABLE_FORMATS:
+        raise ValueError(f"Unknown table export format '{fmt}'")
+
+    sink = io.BytesIO()
+    writer = None
+    names = export_columns(data_columns, columns) if data_columns is not None else None
+    schema = arrow_schema(names, numeric_columns) if names is not None and numeric_columns is not None else None
+    for frame in frames:
+        if names is None:
+            names = _first_names(frame, None, columns)
+        if schema is None:
+            numeric = numeric_columns if numeric_columns is not None else numeric_channels(_export_frame(frame, names))
+            schema = arrow_schema(names, numeric)
+        table = _to_table(_export_frame(frame, names), schema)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, schema) if fmt == 'parquet' else pa.ipc.new_stream(sink, schema)
+        writer.write_table(table)
+        yield _drain(sink)
+
+    if writer is None:
+        # No data: an empty file with the known columns
+        schema = schema or arrow_schema(names or export_columns([], columns), numeric_columns or ())
+        writer = pq.ParquetWriter(sink, schema) if fmt == 'parquet' else pa.ipc.new_stream(sink, schema)
+    writer.close()
+    yield _drain(sink)
+
+
+def _to_table(frame: pd.DataFrame, schema):
+    """Arrow table of an export frame, converted to the export schema without loss."""
+    for field in schema:
+        values = frame[field.name]
+        if field.type == pa.string():
+            frame[field.name] = values.where(values.isna(), values.astype(str)).astype(object)
+        elif field.type == pa.float64():
+            try:
+                frame[field.name] = pd.to_numeric(values).astype('<f8')
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Column '{field.name}' has non-numeric values: {e}") from None
+        elif field.type == pa.int64():
+            frame[field.name] = pd.array(pd.to_numeric(values), dtype='Int64')
+        else:
+            frame[field.name] = pd.to_datetime(values)
+    try:
+        return pa.Table.from_pandas(frame, schema=schema, preserve_index=False, safe=True)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+        raise ValueError(f"Chunk does not fit the export schema: {e}") from None
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
@@ -0,0 +1,129 @@
+"""
+PyBirch Level-of-Detail Pyramid
+===============================
+Min/max/mean decimation of measurement channels for visualization.
+
+Every numeric column of a measurement is a channel. For each channel, rows are
+grouped into bins by sequence index at LOD_LEVELS levels; level L bins cover
+LOD_BASE_BIN * LOD_FACTOR**L consecutive sequence indices. Each bin
+(MeasurementLODBin) keeps the count, min, max and sum of the channel's values
+and the sequence range it covers.
+
+Bin statistics are mergeable, so the pyramid is built incrementally: every
+insert computes bins for the new rows only and folds them into the stored
+bins. Any channel can serve as the x axis of a plot; its own bins give each
+bin's x range (min/max) and position (mean).
+
+A viewer asks for an x range and a pixel width and gets the coarsest level
+that still has at least one bin per pixel, so the response size follows the
+screen rather than the scan.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from database.chunk_storage import RESERVED_COLUMNS
+
+# Level 0 bins hold 32 rows, so a pyramid adds about one bin row per 24 values
+LOD_BASE_BIN = 32
+LOD_FACTOR = 4
+LOD_LEVELS = 8
+
+# Raw points are served instead of level 0 while there are at most this many per pixel
+RAW_POINTS_PER_PIXEL = 8
+
+
+def bin_size(level: int) -> int:
+    """Sequence indices covered by one bin at a level."""
+    return LOD_BASE_BIN * LOD_FACTOR ** level
+
+
+def numeric_channels(frame: pd.DataFrame) -> List[str]:
+    """Columns of a frame that get a pyramid (numeric and boolean data columns)."""
+    return [
+        column for column in frame.columns
+        if column not in RESERVED_COLUMNS and frame[column].dtype.kind in 'biuf'
+    ]
+
+
+def compute_bins(frame: pd.DataFrame, sequence_indices: Sequence[int]) -> List[Dict[str, Any]]:
+    """
+    Aggregate rows into pyramid bins for every channel and level.
+
+    Args:
+        frame: Measurement data (non-numeric columns are ignored)
+        sequence_indices: Sequence index of each row
+
+    Returns:
+        One dict per (channel, level, bin) with the MeasurementLODBin fields
+        except measurement_object_id
+    """
+    sequence = np.asarray(sequence_indices, dtype='<i8')
+    bins: List[Dict[str, Any]] = []
+    for channel in numeric_channels(frame):
+        values = frame[channel].to_numpy(dtype='<f8')
+        present = ~np.isnan(values)
+        if not present.any():
+            continue
+        order = np.argsort(sequence[present], kind='stable')
+        seq, vals = sequence[present][order], values[present][order]
+
+        for level in range(LOD_LEVELS):
+            index = seq // bin_size(level)
+            starts = np.flatnonzero(np.r_[True, index[1:] != index[:-1]])
+            ends = np.r_[starts[1:], len(index)]
+            columns = zip(
+                index[starts].tolist(),
+                (ends - starts).tolist(),
+                seq[starts].tolist(),
+                seq[ends - 1].tolist(),
+                np.minimum.reduceat(vals, starts).tolist(),
+                np.maximum.reduceat(vals, starts).tolist(),
+                np.add.reduceat(vals, starts).tolist(),
+            )
+            bins.extend(
+                {
+                    'channel': str(channel),
+                    'level': level,
+                    'bin_index': bin_index,
+                    'count': count,
+                    'sequence_start': first,
+                    'sequence_end': last,
+                    'min_value': low,
+                    'max_value': high,
+                    'sum_value': total,
+                }
+                for bin_index, count, first, last, low, high, total in columns
+            )
+    return bins
+
+
+def merge_bin(stored: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine the statistics of a stored bin with those of new rows in the same bin."""
+    return {
+        'count': stored['count'] + new['count'],
+        'sequence_start': min(stored['sequence_start'], new['sequence_start']),
+        'sequence_end': max(stored['sequence_end'], new['sequence_end']),
+        'min_value': min(stored['min_value'], new['min_value']),
+        'max_value': max(stored['max_value'], new['max_value']),
+        'sum_value': stored['sum_value'] + new['sum_value'],
+    }
+
+
+def select_level(bins_per_level: Dict[int, int], width: int) -> Optional[int]:
+    """
+    Pick the coarsest level with at least one bin per pixel.
+
+    Args:
+        bins_per_level: Level -> number of bins in the requested x range
+        width: Pixel width of the plot
+
+    Returns:
+        The level, or None if even level 0 has fewer bins than pixels
+    """
+    for level in sorted(bins_per_level, reverse=True):
+        if bins_per_level[level] >= width:
+            return level
+    return None
@@ -0,0 +1,108 @@
+"""
+PyBirch Measurement Statistics
+==============================
+Summary counters kept on each MeasurementObject.
+
+Every insert updates the measurement's row count, sequence range, time range
+and per-column value ranges in the same transaction, so scan lists and detail
+pages can show sizes and axis ranges without reading the data tables.
+
+Like the level-of-detail pyramid (database/lod.py), the statistics of new rows
+are computed on their own and merged into the stored ones.
+
+Stored fields (MeasurementObject):
+    row_count                        Rows stored
+    min_sequence, max_sequence       Sequence index range
+    first_timestamp, last_timestamp  Acquisition time range
+    column_ranges                    {column: [min, max]} for numeric columns
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from database.lod import numeric_channels
+
+STAT_FIELDS = (
+    'row_count', 'min_sequence', 'max_sequence',
+    'first_timestamp', 'last_timestamp', 'column_ranges',
+)
+
+
+def compute_stats(
+    frame: pd.DataFrame,
+    sequence_indices: Sequence[int],
+    timestamps: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """
+    Summarize new rows of a measurement.
+
+    Args:
+        frame: Measurement data (reserved columns are ignored)
+        sequence_indices: Sequence index of each row (None for rows without one)
+        timestamps: Acquisition time of each row (optional)
+
+    Returns:
+        Dict with the STAT_FIELDS
+    """
+    try:
+        sequence = np.asarray(sequence_indices, dtype='<i8')
+    except (TypeError, ValueError):
+        # Some rows have no sequence index
+        sequence = pd.to_numeric(pd.Series(sequence_indices, dtype=object), errors='coerce').dropna()
+    stats: Dict[str, Any] = {
+        'row_count': len(sequence_indices),
+        'min_sequence': int(sequence.min()) if len(sequence) else None,
+        'max_sequence': int(sequence.max()) if len(sequence) else None,
+        'first_timestamp': None,
+        'last_timestamp': None,
+        'column_ranges': {},
+    }
+
+    if timestamps is not None:
+        stamps = pd.to_datetime(pd.Series(timestamps), errors='coerce').dropna()
+        if len(stamps):
+            stats['first_timestamp'] = stamps.min().to_pydatetime()
+            stats['last_timestamp'] = stamps.max().to_pydatetime()
+
+    for column in numeric_channels(frame):
+        values = frame[column].to_numpy(dtype='<f8')
+        values = values[~np.isnan(values)]
+        if len(values):
+            stats['column_ranges'][str(column)] = [float(values.min()), float(values.max())]
+    return stats
+
+
+def _bound(stored, new, pick):
+    if stored is None:
+        return new
+    if new is None:
+        return stored
+    return pick(stored, new)
+
+
+def merge_stats(stored: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine stored statistics with those of new rows."""
+    ranges = dict(stored.get('column_ranges') or {})
+    for column, (low, high) in (new.get('column_ranges') or {}).items():
+        if column in ranges:
+            ranges[column] = [min(ranges[column][0], low), max(ranges[column][1], high)]
+        else:
+            ranges[column] = [low, high]
+    return {
+        'row_count': (stored.get('row_count') or 0) + new['row_count'],
+        'min_sequence': _bound(stored.get('min_sequence'), new['min_sequence'], min),
+        'max_sequence': _bound(stored.get('max_sequence'), new['max_sequence'], max),
+        'first_timestamp': _bound(stored.get('first_timestamp'), new['first_timestamp'], min),
+        'last_timestamp': _bound(stored.get('last_timestamp'), new['last_timestamp'], max),
+        'column_ranges': ranges,
+    }
+
+
+def empty_stats() -> Dict[str, Any]:
+    """Statistics of a measurement without data."""
+    return {
+        'row_count': 0, 'min_sequence': None, 'max_sequence': None,
+        'first_timestamp': None, 'last_timestamp': None, 'column_ranges': {},
+    }
@@ -0,0 +1,100 @@
+"""
+Add InstrumentStatus Telemetry Migration
+========================================
+Adds the telemetry column to the instrument_status table.
+
+This migration adds:
+- telemetry JSON column holding per-operation performance statistics
+  (call counts, error rates, latency percentiles, bytes transferred)
+
+Run with:
+    python database/migrations/add_instrument_status_telemetry.py --db database/pybirch.db
+"""
+
+import sys
+
+from sqlalchemy import create_engine, inspect, text
+
+
+def check_column_exists(engine, table_name: str, column_name: str) -> bool:
+    """Check if a column exists in a table."""
+    inspector = inspect(engine)
+    if table_name not in inspector.get_table_names():
+        return False
+    return column_name in [col['name'] for col in inspector.get_columns(table_name)]
+
+
+def migrate(db_path: str):
+    """Run the migration to add the telemetry column."""
+    if not db_path:
+        print("Error: Database path required. Use --db <path>")
+        return False
+    
+    engine = create_engine(f'sqlite:///{db_path}')
+    
+    if 'instrument_status' not in inspect(engine).get_table_names():
+        print("Table 'instrument_status' does not exist. Run add_instrument_status.py first.")
+        return False
+    
+    if check_column_exists(engine, 'instrument_status', 'telemetry'):
+        print("Column 'instrument_status.telemetry' already exists. Skipping migration.")
+        return True
+    
+    print("Adding telemetry column to instrument_status...")
+    
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("ALTER TABLE instrument_status ADD COLUMN telemetry JSON"))
+            conn.commit()
+        
+        print("Successfully added instrument_status.telemetry.")
+        return True
+        
+    except Exception as e:
+        print(f"Error during migration: {e}")
+        return False
+
+
+def rollback(db_path: str):
+    """Rollback the migration by dropping the telemetry column."""
+    if not db_path:
+        print("Error: Database path required. Use --db <path>")
+        return False
+    
+    engine = create_engine(f'sqlite:///{db_path}')
+    
+    if not check_column_exists(engine, 'instrument_status', 'telemetry'):
+        print("Column 'instrument_status.telemetry' does not exist. Nothing to rollback.")
+        return True
+    
+    print("Dropping instrument_status.telemetry...")
+    
+    try:
+        with engine.connect() as conn:
+            # DROP COLUMN needs SQLite 3.35+
+            conn.execute(text("ALTER TABLE instrument_status DROP COLUMN telemetry"))
+            conn.commit()
+        
+        print("Successfully dropped instrument_status.telemetry.")
+        return True
+        
+    except Exception as e:
+        print(f"Error during rollback: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='InstrumentStatus telemetry column migration')
+    parser.add_argument('--db', type=str, required=True, help='Path to database file')
+    parser.add_argument('--rollback', action='store_true', help='Rollback the migration')
+    
+    args = parser.parse_args()
+    
+    if args.rollback:
+        success = rollback(args.db)
+    else:
+        success = migrate(args.db)
+    
+    sys.exit(0 if success else 1)
@@ -0,0 +1,168 @@
+"""
+Add MeasurementBlob Table Migration
+===================================
+Creates the measurement_blobs table holding compressed, content-addressed
+array data (see database/blob_store.py) and links measurement_data_arrays to it.
+
+This migration adds:
+- measurement_blobs table (unique content_hash, codec, sizes, inline data or object path)
+- blob_id column and index on measurement_data_arrays
+
+Existing arrays keep their inline data_blob and stay readable. --backfill moves
+them into deduplicated, compressed blobs.
+
+Run with:
+    python database/migrations/add_measurement_blobs.py --db database/pybirch.db
+    python database/migrations/add_measurement_blobs.py --db database/pybirch.db --backfill
+"""
+
+import os
+import sys
+
+from sqlalchemy import create_engine, inspect, text
+
+
+def check_table_exists(engine, table_name: str) -> bool:
+    """Check if a table exists in the database."""
+    inspector = inspect(engine)
+    return table_name in inspector.get_table_names()
+
+
+def check_column_exists(engine, table_name: str, column_name: str) -> bool:
+    """Check if a column exists in a table."""
+    inspector = inspect(engine)
+    return column_name in [c['name'] for c in inspector.get_columns(table_name)]
+
+
+def migrate(db_path: str):
+    """Run the migration to add the measurement_blobs table."""
+    if not db_path:
+        print("Error: Database path required. Use --db <path>")
+        return False
+    
+    engine = create_engine(f'sqlite:///{db_path}')
+    
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS measurement_blobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        content_hash VARCHAR(64) NOT NULL UNIQUE,
+        codec VARCHAR(20) NOT NULL DEFAULT 'none',
+        size INTEGER NOT NULL,
+        stored_size INTEGER NOT NULL,
+        data_blob BLOB,
+        object_path VARCHAR(500),
+        created_at DATETIME
+    )
+    """
+    
+    try:
+        with engine.connect() as conn:
+            if check_table_exists(engine, 'measurement_blobs'):
+                print("Table 'measurement_blobs' already exists.")
+            else:
+                print("Creating measurement_blobs table...")
+                conn.execute(text(create_table_sql))
+            
+            if check_column_exists(engine, 'measurement_data_arrays', 'blob_id'):
+                print("Column 'measurement_data_arrays.blob_id' already exists.")
+            else:
+                print("Adding blob_id to measurement_data_arrays...")
+                conn.execute(text(
+                    "ALTER TABLE measurement_data_arrays "
+                    "ADD COLUMN blob_id INTEGER REFERENCES measurement_blobs (id)"
+                ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_data_arrays_blob ON measurement_data_arrays (blob_id)"
+            ))
+            conn.commit()
+        
+        print("Successfully migrated measurement blob storage.")
+        return True
+    
+    except Exception as e:
+        print(f"Error during migration: {e}")
+        return False
+
+
+def backfill(db_path: str):
+    """Move inline array data into deduplicated, compressed blobs."""
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+    from database.models import MeasurementDataArray
+    from database.services import DatabaseService
+    
+    db = DatabaseService(db_path)
+    try:
+        with db.session_scope() as session:
+            arrays = session.query(MeasurementDataArray).filter(
+                MeasurementDataArray.blob_id.is_(None),
+                MeasurementDataArray.data_blob.isnot(None),
+            ).all()
+            print(f"Moving {len(arrays)} arrays into blob storage...")
+            rows = db._prepare_data_arrays(session, [
+                {'measurement_object_id': array.measurement_object_id, 'data_blob': array.data_blob}
+                for array in arrays
+            ])
+            for array, row in zip(arrays, rows):
+                array.blob_id = row['blob_id']
+                array.data_blob = None
+            blobs = len({row['blob_id'] for row in rows})
+        print(f"Stored {len(rows)} arrays as {blobs} distinct blobs.")
+        return True
+    except Exception as e:
+        print(f"Error during backfill: {e}")
+        return False
+
+
+def rollback(db_path: str):
+    """Rollback the migration by dropping the measurement_blobs table."""
+    if not db_path:
+        print("Error: Database path required. Use --db <path>")
+        return False
+    
+    engine = create_engine(f'sqlite:///{db_path}')
+    
+    if not check_table_exists(engine, 'measurement_blobs'):
+        print("Table 'measurement_blobs' does not exist. Nothing to rollback.")
+        return True
+    
+    with engine.connect() as conn:
+        moved = conn.execute(text(
+            "SELECT COUNT(*) FROM measurement_data_arrays WHERE blob_id IS NOT NULL"
+        )).scalar()
+    if moved:
+        print(f"Error: {moved} arrays store their data in measurement_blobs; rollback would lose it.")
+        return False
+    
+    print("Dropping measurement_blobs table...")
+    
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS idx_data_arrays_blob"))
+            # SQLite cannot drop a column with a foreign key; blob_id stays, always NULL
+            conn.execute(text("DROP TABLE IF EXISTS measurement_blobs"))
+            conn.commit()
+        
+        print("Successfully dropped measurement_blobs table.")
+        return True
+    
+    except Exception as e:
+        print(f"Error during rollback: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='MeasurementBlob table migration')
+    parser.add_argument('--db', type=str, required=True, help='Path to database file')
+    parser.add_argument('--rollback', action='store_true', help='Rollback the migration')
+    parser.add_argument('--backfill', action='store_true', help='Move existing array data into blob storage')
+    
+    args = parser.parse_args()
+    
+    if args.rollback:
+        success = rollback(args.db)
+    else:
+        success = migrate(args.db) and (not args.backfill or backfill(args.db))
+    
+    sys.exit(0 if success else 1)
@@ -0,0 +1,131 @@
+"""
+Add Measurement Counter Columns Migration
+========================================
+Adds the counters maintained on measurement_objects (see
+database/measurement_stats.py): row count, sequence range, time range and
+per-column value ranges.
+
+This migration adds to measurement_objects:
+- row_count, min_sequence, max_sequence (INTEGER)
+- first_timestamp, last_timestamp (DATETIME)
+- column_ranges (JSON)
+
+Existing measurements get row_count NULL and are counted the first time they
+are read, or all at once with --backfill. New data updates the counters as it
+is inserted.
+
+Run with:
+    python database/migrations/add_measurement_counters.py --db database/pybirch.db
+    python database/migrations/add_measurement_counters.py --db database/pybirch.db --backfill
+"""
+
+import os
+import sys
+
+from sqlalchemy import create_engine, inspect, text
+
+COUNTER_COLUMNS = [
+    ('row_count', 'INTEGER'),
+    ('min_sequence', 'INTEGER'),
+    ('max_sequence', 'INTEGER'),
+    ('first_timestamp', 'DATETIME'),
+    ('last_timestamp', 'DATETIME'),
+    ('column_ranges', 'JSON'),
+]
+
+
+def get_columns(engine, table_name: str) -> list:
+    """Get the column names of a table."""
+    inspector = inspect(engine)
+    return [c['name'] for c in inspector.get_columns(table_name)]
+
+
+def migrate(db_path: str):
+    """Run the migration to add the counter columns."""
+    if not db_path:
+        print("Error: Database path required. Use --db <path>")
+        return False
+    
+    engine = create_engine(f'sqlite:///{db_path}')
+    existing = get_columns(engine, 'measurement_objects')
+    
+    try:
+        with engine.connect() as conn:
+            for name, sql_type in COUNTER_COLUMNS:
+                if name in existing:
+                    print(f"Column 'measurement_objects.{name}' already exists. Skipping.")
+                    continue
+                print(f"Adding {name} to measurement_objects...")
+                conn.execute(text(f"ALTER TABLE measurement_objects ADD COLUMN {name} {sql_type}"))
+            conn.commit()
+        
+        print("Successfully added measurement counter columns.")
+        return True
+    
+    except Exception as e:
+        print(f"Error during migration: {e}")
+        return False
+
+
+def backfill(db_path: str):
+    """Compute counters for all existing measurements."""
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+    from database.models import MeasurementObject
+    from database.services import DatabaseService
+    
+    db = DatabaseService(db_path)
+    with db.session_scope() as session:
+        measurement_ids = [row[0] for row in session.query(MeasurementObject.id).all()]
+    
+    print(f"Counting {len(measurement_ids)} measurements...")
+    try:
+        for measurement_id in measurement_ids:
+            rows = db.rebuild_measurement_stats(measurement_id)
+            print(f"  Measurement {measurement_id}: {rows} rows")
+        return True
+    except Exception as e:
+        print(f"Error during backfill: {e}")
+        return False
+
+
+def rollback(db_path: str):
+    """Rollback the migration by dropping the counter columns (SQLite 3.35+)."""
+    if not db_path:
+        print("Error: Database path required. Use --db <path>")
+        return False
+    
+    engine = create_engine(f'sqlite:///{db_path}')
+    existing = get_columns(engine, 'measurement_objects')
+    
+    try:
+        with engine.connect() as conn:
+            for name, _ in COUNTER_COLUMNS:
+                if name in existing:
+                    print(f"Dropping measurement_objects.{name}...")
+                    conn.execute(text(f"ALTER TABLE measurement_objects DROP COLUMN {name}"))
+            conn.commit()
+        
+        print("Successfully dropped measurement counter columns.")
+        return True
+    
+    except Exception as e:
+        print(f"Error during rollback: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Measurement counter columns migration')
+    parser.add_argument('--db', type=str, required=True, help='Path to database file')
+    parser.add_argument('--rollback', action='store_true', help='Rollback the migration')
+    parser.add_argument('--backfill', action='store_true', help='Compute counters for existing measurements')
+    
+    args = parser.parse_args()
+    
+    if args.rollback:
+        success = rollback(args.db)
+    else:
+        success = migrate(args.db) and (not args.backfill or backfill(args.db))
+    
+    sys.exit(0 if success else 1)
@@ -0,0 +1,120 @@
+"""
+Add MeasurementDataChunk Table Migration
+========================================
+Creates the measurement_data_chunks table for columnar measurement storage.
+
+This migration adds:
+- measurement_data_chunks table holding compressed per-column blocks
+- Index on (measurement_object_id, start_sequence) for range reads
+
+Existing measurement_data_points rows are left in place and stay readable.
+
+Run with:
+    python database/migrations/add_measurement_data_chunks.py --db database/pybirch.db
+"""
+
+import sys
+
+from sqlalchemy import create_engine, inspect, text
+
+
+def check_table_exists(engine, table_name: str) -> bool:
+    """Check if a table exists in the database."""
+    inspector = inspect(engine)
+    return table_name in inspector.get_table_names()
+
+
+def migrate(db_path: str):
+    """Run the migration to add the measurement_data_chunks table."""
+    if not db_path:
+        print("Error: Database path required. Use --db <path>")
+        return False
+    
+    engine = create_engine(f'sqlite:///{db_path}')
+    
+    if check_table_exists(engine, 'measurement_data_chunks'):
+        print("Table 'measurement_data_chunks' already exists. Skipping migration.")
+        return True
+    
+    print("Creating measurement_data_chunks table...")
+    
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS measurement_data_chunks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        measurement_object_id INTEGER NOT NULL,
+        column_name VARCHAR(255) NOT NULL,
+        start_sequence INTEGER NOT NULL,
+        end_sequence INTEGER NOT NULL,
+        row_count INTEGER NOT NULL,
+        dtype VARCHAR(50) NOT NULL,
+        codec VARCHAR(20) NOT NULL DEFAULT 'zlib',
+        data_blob BLOB NOT NULL,
+        min_value FLOAT,
+        max_value FLOAT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (measurement_object_id) REFERENCES measurement_objects (id) ON DELETE CASCADE
+    )
+    """
+    
+    create_indexes_sql = [
+        "CREATE INDEX IF NOT EXISTS idx_data_chunks_measurement "
+        "ON measurement_data_chunks (measurement_object_id, start_sequence)",
+    ]
+    
+    try:
+        with engine.connect() as conn:
+            conn.execute(text(create_table_sql))
+            for index_sql in create_indexes_sql:
+                conn.execute(text(index_sql))
+            conn.commit()
+        
+        print("Successfully created measurement_data_chunks table with indexes.")
+        return True
+        
+    except Exception as e:
+        print(f"Error during migration: {e}")
+        return False
+
+
+def rollback(db_path: str):
+    """Rollback the migration by dropping the measurement_data_chunks table."""
+    if not db_path:
+        print("Error: Database path required. Use --db <path>")
+        return False
+    
+    engine = create_engine(f'sqlite:///{db_path}')
+    
+    if not check_table_exists(engine, 'measurement_data_chunks'):
+        print("Table 'measurement_data_chunks' does not exist. Nothing to rollback.")
+        return True
+    
+    print("Dropping measurement_data_chunks table...")
+    
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS measurement_data_chunks"))
+            conn.commit()
+        
+        print("Successfully dropped measurement_data_chunks table.")
+        return True
+        
+    except Exception as e:
+        print(f"Error during rollback: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='MeasurementDataChunk table migration')
+    parser.add_argument('--db', type=str, required=True, help='Path to database file')
+    parser.add_argument('--rollback', action='store_true', help='Rollback the migration')
+    
+    args = parser.parse_args()
+    
+    if args.rollback:
+        success = rollback(args.db)
+    else:
+        success = migrate(args.db)
+    
+    sys.exit(0 if success else 1)
@@ -0,0 +1,140 @@
+"""
+Add MeasurementLODBin Table Migration
+=====================================
+Creates the measurement_lod_bins table holding the level-of-detail pyramid
+used to plot large measurements (see database/lod.py).
+
+This migration adds:
+- measurement_lod_bins table with min/max/sum statistics per channel bin
+- Unique index on (measurement_object_id, level, bin_index, channel)
+
+New data updates the pyramid as it is inserted. Pyramids for existing
+measurements are built the first time a large measurement is plotted, or all
+at once with --backfill.
+
+Run with:
+    python database/migrations/add_measurement_lod_bins.py --db database/pybirch.db
+    python database/migrations/add_measurement_lod_bins.py --db database/pybirch.db --backfill
+"""
+
+import os
+import sys
+
+from sqlalchemy import create_engine, inspect, text
+
+
+def check_table_exists(engine, table_name: str) -> bool:
+    """Check if a table exists in the database."""
+    inspector = inspect(engine)
+    return table_name in inspector.get_table_names()
+
+
+def migrate(db_path: str):
+    """Run the migration to add the measurement_lod_bins table."""
+    if not db_path:
+        print("Error: Database path required. Use --db <path>")
+        return False
+    
+    engine = create_engine(f'sqlite:///{db_path}')
+    
+    if check_table_exists(engine, 'measurement_lod_bins'):
+        print("Table 'measurement_lod_bins' already exists. Skipping migration.")
+        return True
+    
+    print("Creating measurement_lod_bins table...")
+    
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS measurement_lod_bins (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        measurement_object_id INTEGER NOT NULL,
+        channel VARCHAR(255) NOT NULL,
+        level INTEGER NOT NULL,
+        bin_index INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        sequence_start INTEGER NOT NULL,
+        sequence_end INTEGER NOT NULL,
+        min_value FLOAT NOT NULL,
+        max_value FLOAT NOT NULL,
+        sum_value FLOAT NOT NULL,
+        FOREIGN KEY (measurement_object_id) REFERENCES measurement_objects (id) ON DELETE CASCADE,
+        CONSTRAINT uq_lod_bin UNIQUE (measurement_object_id, level, bin_index, channel)
+    )
+    """
+    
+    try:
+        with engine.connect() as conn:
+            conn.execute(text(create_table_sql))
+            conn.commit()
+        
+        print("Successfully created measurement_lod_bins table.")
+        return True
+    
+    except Exception as e:
+        print(f"Error during migration: {e}")
+        return False
+
+
+def backfill(db_path: str):
+    """Build pyramids for all existing measurements."""
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+    from database.models import MeasurementObject
+    from database.services import DatabaseService
+    
+    db = DatabaseService(db_path)
+    with db.session_scope() as session:
+        measurement_ids = [row[0] for row in session.query(MeasurementObject.id).all()]
+    
+    print(f"Building pyramids for {len(measurement_ids)} measurements...")
+    try:
+        for measurement_id in measurement_ids:
+            rows = db.rebuild_lod(measurement_id)
+            print(f"  Measurement {measurement_id}: {rows} rows")
+        return True
+    except Exception as e:
+        print(f"Error during backfill: {e}")
+        return False
+
+
+def rollback(db_path: str):
+    """Rollback the migration by dropping the measurement_lod_bins table."""
+    if not db_path:
+        print("Error: Database path required. Use --db <path>")
+        return False
+    
+    engine = create_engine(f'sqlite:///{db_path}')
+    
+    if not check_table_exists(engine, 'measurement_lod_bins'):
+        print("Table 'measurement_lod_bins' does not exist. Nothing to rollback.")
+        return True
+    
+    print("Dropping measurement_lod_bins table...")
+    
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS measurement_lod_bins"))
+            conn.commit()
+        
+        print("Successfully dropped measurement_lod_bins table.")
+        return True
+    
+    except Exception as e:
+        print(f"Error during rollback: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='MeasurementLODBin table migration')
+    parser.add_argument('--db', type=str, required=True, help='Path to database file')
+    parser.add_argument('--rollback', action='store_true', help='Rollback the migration')
+    parser.add_argument('--backfill', action='store_true', help='Build pyramids for existing measurements')
+    
+    args = parser.parse_args()
+    
+    if args.rollback:
+        success = rollback(args.db)
+    else:
+        success = migrate(args.db) and (not args.backfill or backfill(args.db))
+    
+    sys.exit(0 if success else 1)
@@ -0,0 +1,109 @@
+"""
+Add Scan Jobs Table Migration
+=============================
+Creates the scan_jobs table backing the distributed scan queue, where scans are
+enqueued centrally and claimed by workers on the computers owning their instruments.
+
+Run with:
+    python database/migrations/add_scan_jobs.py --db database/pybirch.db
+"""
+
+import sys
+import os
+
+from sqlalchemy import create_engine, inspect, text
+
+
+def check_table_exists(engine, table_name: str) -> bool:
+    """Check if a table exists in the database."""
+    inspector = inspect(engine)
+    return table_name in inspector.get_table_names()
+
+
+def migrate(db_path: str):
+    """Run the migration to add scan_jobs table."""
+    if not db_path:
+        print("Error: Database path required. Use --db <path>")
+        return False
+
+    # Create engine directly
+    engine = create_engine(f'sqlite:///{db_path}')
+
+    # Create scan_jobs table
+    if not check_table_exists(engine, 'scan_jobs'):
+        print("Creating scan_jobs table...")
+
+        create_table_sql = """
+        CREATE TABLE scan_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            lab_id INTEGER,
+            queue_id INTEGER,
+            project_id INTEGER,
+            sample_id INTEGER,
+            scan_id INTEGER,
+            name VARCHAR(255),
+            priority INTEGER DEFAULT 0,
+            required_instruments JSON,
+            scan_data BLOB,
+            created_by VARCHAR(100),
+            status VARCHAR(50) DEFAULT 'pending',
+            lease_owner VARCHAR(255),
+            computer_name VARCHAR(255),
+            lease_expires_at DATETIME,
+            heartbeat_at DATETIME,
+            attempts INTEGER DEFAULT 0,
+            max_attempts INTEGER DEFAULT 3,
+            error_message TEXT,
+            result JSON,
+            started_at DATETIME,
+            completed_at DATETIME,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (lab_id) REFERENCES labs (id),
+            FOREIGN KEY (queue_id) REFERENCES queues (id),
+            FOREIGN KEY (project_id) REFERENCES projects (id),
+            FOREIGN KEY (sample_id) REFERENCES samples (id),
+            FOREIGN KEY (scan_id) REFERENCES scans (id)
+        )
+        """
+
+        with engine.connect() as conn:
+            conn.execute(text(create_table_sql))
+            conn.commit()
+        print("  ✓ scan_jobs table created")
+
+        # Create indexes
+        print("Creating indexes...")
+        indexes = [
+            "CREATE INDEX idx_scan_jobs_status ON scan_jobs(status)",
+            "CREATE INDEX idx_scan_jobs_queue ON scan_jobs(queue_id)",
+            "CREATE INDEX idx_scan_jobs_lease ON scan_jobs(status, lease_expires_at)",
+            "CREATE INDEX idx_scan_jobs_priority ON scan_jobs(priority, id)",
+        ]
+
+        with engine.connect() as conn:
+            for idx_sql in indexes:
+                conn.execute(text(idx_sql))
+            conn.commit()
+        print("  ✓ Indexes created")
+
+    else:
+        print("scan_jobs table already exists, skipping creation")
+
+    print("\nMigration completed successfully!")
+    return True
+
+
+def main():
+    """Main entry point."""
+    import argparse
+    parser = argparse.ArgumentParser(description='Add scan_jobs table migration')
+    parser.add_argument('--db', required=True, help='Path to SQLite database file')
+    args = parser.parse_args()
+
+    success = migrate(args.db)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
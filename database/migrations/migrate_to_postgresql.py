@@ -60,6 +60,7 @@ TABLE_ORDER = [
     'scans',
     'measurement_objects',
     'measurement_data_points',
+    'measurement_blobs',
     'measurement_data_arrays',
     'tags',
     'entity_tags',
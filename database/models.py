@@ -787,6 +787,7 @@ class InstrumentStatus(Base):
     current_settings: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Current instrument settings
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     error_traceback: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    telemetry: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Per-operation latency/error/byte statistics
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
@@ -2203,6 +2204,61 @@ class Scan(TrashableMixin, ArchivableMixin, Base):
         return f"<Scan(id={self.id}, scan_id='{self.scan_id}', status='{self.status}')>"
 
 
+class ScanJob(Base):
+    """
+    Distributed scan job queue.
+    Scans are enqueued centrally and claimed by worker processes running on
+    the lab computers that own the required instruments (via ComputerBinding).
+    A claimed job holds a time-limited lease that its worker renews with
+    heartbeats; jobs whose lease expires can be reclaimed by another worker.
+    """
+    __tablename__ = "scan_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    lab_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('labs.id'), nullable=True)
+    queue_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('queues.id'), nullable=True)
+    project_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('projects.id'), nullable=True)
+    sample_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('samples.id'), nullable=True)
+    scan_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('scans.id'), nullable=True)  # Set once a worker runs it
+
+    # Job definition
+    name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    priority: Mapped[int] = mapped_column(Integer, default=0)  # Higher runs first
+    required_instruments: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)  # Instrument names
+    scan_data: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)  # Scan snapshot (pybirch.queue.snapshot)
+    created_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+
+    # Execution / lease state
+    status: Mapped[str] = mapped_column(String(50), default='pending')  # 'pending', 'claimed', 'running', 'completed', 'failed', 'aborted'
+    lease_owner: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # Worker ID
+    computer_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # Host of the lease owner
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=3)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    result: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    queue: Mapped[Optional["Queue"]] = relationship("Queue", foreign_keys=[queue_id])
+    scan: Mapped[Optional["Scan"]] = relationship("Scan", foreign_keys=[scan_id])
+
+    __table_args__ = (
+        Index('idx_scan_jobs_status', 'status'),
+        Index('idx_scan_jobs_queue', 'queue_id'),
+        Index('idx_scan_jobs_lease', 'status', 'lease_expires_at'),
+        Index('idx_scan_jobs_priority', 'priority', 'id'),
+    )
+
+    def __repr__(self):
+        return f"<ScanJob(id={self.id}, name='{self.name}', status='{self.status}', owner='{self.lease_owner}')>"
+
+
 # ============================================================
 # MEASUREMENT DATA
 # ============================================================
@@ -2224,10 +2280,20 @@ class MeasurementObject(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
+    # Counters maintained on insert (see database/measurement_stats.py); NULL row_count = not computed yet
+    row_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, default=0)
+    min_sequence: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    max_sequence: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    first_timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    column_ranges: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # {column: [min, max]}
+    
     # Relationships
     scan: Mapped["Scan"] = relationship("Scan", back_populates="measurement_objects")
     data_points: Mapped[List["MeasurementDataPoint"]] = relationship("MeasurementDataPoint", back_populates="measurement_object", cascade="all, delete-orphan")
     data_arrays: Mapped[List["MeasurementDataArray"]] = relationship("MeasurementDataArray", back_populates="measurement_object", cascade="all, delete-orphan")
+    data_chunks: Mapped[List["MeasurementDataChunk"]] = relationship("MeasurementDataChunk", back_populates="measurement_object", cascade="all, delete-orphan")
+    lod_bins: Mapped[List["MeasurementLODBin"]] = relationship("MeasurementLODBin", back_populates="measurement_object", cascade="all, delete-orphan")
     analysis_inputs: Mapped[List["AnalysisInput"]] = relationship("AnalysisInput", back_populates="measurement_object")
     
     __table_args__ = (
@@ -2267,6 +2333,67 @@ class MeasurementDataPoint(Base):
         return f"<MeasurementDataPoint(id={self.id}, seq={self.sequence_index})>"
 
 
+class MeasurementDataChunk(Base):
+    """
+    Compressed block of one column of measurement data (columnar storage).
+    A block covers up to N consecutive rows; see database/chunk_storage.py.
+    """
+    __tablename__ = "measurement_data_chunks"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    measurement_object_id: Mapped[int] = mapped_column(Integer, ForeignKey('measurement_objects.id'), nullable=False)
+    column_name: Mapped[str] = mapped_column(String(255), nullable=False)  # Data column, or '_sequence_index' / '_timestamp'
+    start_sequence: Mapped[int] = mapped_column(Integer, nullable=False)  # Lowest sequence index in the block
+    end_sequence: Mapped[int] = mapped_column(Integer, nullable=False)  # Highest sequence index in the block
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    dtype: Mapped[str] = mapped_column(String(50), nullable=False)  # 'float64', 'int64', 'bool', 'datetime64[ns]', 'json'
+    codec: Mapped[str] = mapped_column(String(20), nullable=False, default='zlib')
+    data_blob: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    min_value: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Column min within the block (numeric only)
+    max_value: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    measurement_object: Mapped["MeasurementObject"] = relationship("MeasurementObject", back_populates="data_chunks")
+    
+    __table_args__ = (
+        Index('idx_data_chunks_measurement', 'measurement_object_id', 'start_sequence'),
+    )
+    
+    def __repr__(self):
+        return f"<MeasurementDataChunk(id={self.id}, column='{self.column_name}', seq={self.start_sequence}-{self.end_sequence})>"
+
+
+class MeasurementLODBin(Base):
+    """
+    One bin of a channel's level-of-detail pyramid (min/max/sum over a sequence range).
+    Level L bins cover LOD_BASE_BIN * LOD_FACTOR**L sequence indices; see database/lod.py.
+    """
+    __tablename__ = "measurement_lod_bins"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    measurement_object_id: Mapped[int] = mapped_column(Integer, ForeignKey('measurement_objects.id'), nullable=False)
+    channel: Mapped[str] = mapped_column(String(255), nullable=False)  # Numeric data column
+    level: Mapped[int] = mapped_column(Integer, nullable=False)  # 0 = finest
+    bin_index: Mapped[int] = mapped_column(Integer, nullable=False)  # sequence_index // bin size
+    count: Mapped[int] = mapped_column(Integer, nullable=False)  # Non-NaN values in the bin
+    sequence_start: Mapped[int] = mapped_column(Integer, nullable=False)
+    sequence_end: Mapped[int] = mapped_column(Integer, nullable=False)
+    min_value: Mapped[float] = mapped_column(Float, nullable=False)
+    max_value: Mapped[float] = mapped_column(Float, nullable=False)
+    sum_value: Mapped[float] = mapped_column(Float, nullable=False)
+    
+    # Relationships
+    measurement_object: Mapped["MeasurementObject"] = relationship("MeasurementObject", back_populates="lod_bins")
+    
+    __table_args__ = (
+        UniqueConstraint('measurement_object_id', 'level', 'bin_index', 'channel', name='uq_lod_bin'),
+    )
+    
+    def __repr__(self):
+        return f"<MeasurementLODBin(channel='{self.channel}', level={self.level}, bin={self.bin_index})>"
+
+
 class MeasurementDataArray(Base):
     """
     Array/vector data from measurements (for spectra, images, etc.).
@@ -2278,7 +2405,8 @@ class MeasurementDataArray(Base):
     measurement_object_id: Mapped[int] = mapped_column(Integer, ForeignKey('measurement_objects.id'), nullable=False)
     timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     sequence_index: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    data_blob: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)  # Binary data
+    data_blob: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)  # Inline binary data (legacy)
+    blob_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('measurement_blobs.id'), nullable=True)  # Deduplicated content
     data_format: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # 'numpy', 'json', 'png'
     shape: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)  # Array dimensions
     dtype: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # Data type
@@ -2287,15 +2415,40 @@ class MeasurementDataArray(Base):
     
     # Relationships
     measurement_object: Mapped["MeasurementObject"] = relationship("MeasurementObject", back_populates="data_arrays")
+    blob: Mapped[Optional["MeasurementBlob"]] = relationship("MeasurementBlob", back_populates="arrays")
     
     __table_args__ = (
         Index('idx_data_arrays_measurement', 'measurement_object_id'),
+        Index('idx_data_arrays_blob', 'blob_id'),
     )
     
     def __repr__(self):
         return f"<MeasurementDataArray(id={self.id}, format='{self.data_format}')>"
 
 
+class MeasurementBlob(Base):
+    """
+    Compressed, content-addressed array data shared by MeasurementDataArray rows.
+    Stored inline or in the local object directory; see database/blob_store.py.
+    """
+    __tablename__ = "measurement_blobs"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)  # SHA-256 of the uncompressed bytes
+    codec: Mapped[str] = mapped_column(String(20), nullable=False, default='none')  # 'none', 'zlib', 'lzma', 'zstd', 'lz4'
+    size: Mapped[int] = mapped_column(Integer, nullable=False)  # Uncompressed bytes
+    stored_size: Mapped[int] = mapped_column(Integer, nullable=False)  # Compressed bytes
+    data_blob: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)  # Inline data
+    object_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # Path in the object directory
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    arrays: Mapped[List["MeasurementDataArray"]] = relationship("MeasurementDataArray", back_populates="blob")
+    
+    def __repr__(self):
+        return f"<MeasurementBlob(id={self.id}, hash='{self.content_hash[:12]}', codec='{self.codec}')>"
+
+
 # ============================================================
 # ANALYSIS
 # ============================================================
@@ -6,7 +6,7 @@ This module is shared between the Flask web UI and PyBirch Qt application.
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from sqlalchemy import select, and_, or_, func, desc, case
 from sqlalchemy.orm import Session, joinedload
 from contextlib import contextmanager
@@ -28,6 +28,10 @@ from database.models import (
 from database.session import get_session, init_db
 
 
+class _ScanJobConflict(Exception):
+    """Rolls back a job claim that collides with another claim on a shared instrument."""
+
+
 class DatabaseService:
     """
     High-level database service providing business operations.
@@ -642,7 +646,24 @@ class DatabaseService:
             offset = (page - 1) * per_page
             scans = query.options(joinedload(Scan.queue)).order_by(desc(Scan.created_at)).offset(offset).limit(per_page).all()
             
-            return [self._scan_to_dict(s) for s in scans], total
+            # Sizes from the maintained counters; None if any measurement's are not computed yet
+            sizes = dict(session.query(
+                MeasurementObject.scan_id,
+                case(
+                    (func.count(MeasurementObject.id) == func.count(MeasurementObject.row_count),
+                     func.coalesce(func.sum(MeasurementObject.row_count), 0)),
+                    else_=None,
+                ),
+            ).filter(
+                MeasurementObject.scan_id.in_([s.id for s in scans])
+            ).group_by(MeasurementObject.scan_id).all()) if scans else {}
+            
+            results = []
+            for s in scans:
+                scan_dict = self._scan_to_dict(s)
+                scan_dict['data_point_count'] = sizes.get(s.id, 0)
+                results.append(scan_dict)
+            return results, total
     
     def get_scan(self, scan_id: int) -> Optional[Dict]:
         """Get a single scan by ID with measurement data, parent queue, project, and logs."""
@@ -662,6 +683,8 @@ class DatabaseService:
             result['sample'] = self._sample_to_dict(scan.sample) if scan.sample else None
             result['queue'] = self._queue_to_dict(scan.queue) if scan.queue else None
             result['project'] = self._project_to_dict(scan.project) if scan.project else None
+            for mo in scan.measurement_objects:
+                self._measurement_stats(session, mo)
             result['measurement_objects'] = [
                 self._measurement_object_to_dict(mo) 
                 for mo in scan.measurement_objects
@@ -670,35 +693,74 @@ class DatabaseService:
             return result
     
     def get_scan_data_points(self, scan_id: int, measurement_name: Optional[str] = None) -> List[Dict]:
-        """Get measurement data points for a scan."""
+        """Get measurement data points for a scan.
+        
+        Prefer iter_scan_data_points() for large scans.
+        """
+        return list(self.iter_scan_data_points(scan_id, measurement_name))
+    
+    def iter_scan_data_points(
+        self,
+        scan_id: int,
+        measurement_name: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        """Stream a scan's data points, one measurement after another, in sequence order.
+        
+        Args:
+            scan_id: Database ID of the scan
+            measurement_name: Optional measurement name to filter by
+            chunk_size: Rows read from the database at a time
+            
+        Yields:
+            Dicts with 'measurement', 'id', 'sequence_index', 'timestamp', 'values'
+            and 'extra_data' ('id' and 'extra_data' are None for chunk-stored
+            rows); rows without a sequence index follow the ordered rows
+        """
+        from database.data_reader import DEFAULT_READ_ROWS, frame_to_records, iter_measurement_frames
+        
         with self.session_scope() as session:
-            query = session.query(MeasurementDataPoint).join(MeasurementObject).filter(
+            query = session.query(MeasurementObject.id, MeasurementObject.name).filter(
                 MeasurementObject.scan_id == scan_id
             )
-            
             if measurement_name:
                 query = query.filter(MeasurementObject.name == measurement_name)
             
-            points = query.order_by(MeasurementDataPoint.sequence_index).all()
-            return [
-                {
-                    'id': p.id,
-                    'sequence_index': p.sequence_index,
-                    'values': p.values,
-                    'timestamp': p.timestamp.isoformat() if p.timestamp else None,
-                    'extra_data': p.extra_data,
-                }
-                for p in points
-            ]
+            for mo_id, name in query.order_by(MeasurementObject.id).all():
+                frames = iter_measurement_frames(
+                    session, mo_id, chunk_size=chunk_size or DEFAULT_READ_ROWS, row_fields=True,
+                )
+                for frame in frames:
+                    for record in frame_to_records(frame):
+                        record['measurement'] = name
+                        yield record
 
-    def get_visualization_data(self, scan_id: int) -> Dict[str, Dict]:
+    def get_visualization_data(
+        self,
+        scan_id: int,
+        max_points: Optional[int] = 5000,
+        width: int = 2000,
+        preview_rows: int = 100,
+    ) -> Dict[str, Dict]:
         """Get measurement data organized for visualization.
         
         Returns data grouped by measurement object with metadata for proper charting.
         Each measurement object gets its own data set with column information.
         
+        Measurements with more than max_points rows are decimated: 'data_points'
+        holds one min/max/mean point per level-of-detail bin (about `width` of
+        them, see get_visualization_window), plotted against 'chart_x_column'
+        and 'chart_y_column', 'all_values' only the first preview_rows rows, and
+        'decimated' is True. Decimated maps (measurements with more than one
+        movement position column) also get a 'heatmap': the chart channel on
+        the grid of their first two position columns, from the data cube (see
+        get_data_cube), block-averaged down to at most max_points cells.
+        
         Args:
             scan_id: Database ID of the scan
+            max_points: Largest measurement returned in full (None never decimates)
+            width: Pixel width the decimated overview is computed for
+            preview_rows: Rows of a decimated measurement included in 'all_values'
             
         Returns:
             Dictionary mapping measurement names to visualization data:
@@ -718,10 +780,15 @@ class DatabaseService:
                     'all_values': [  # All raw values for table display
                         {'current': -0.001, 'voltage': -0.016, 'sequence_index': 0},
                         ...
-                    ]
+                    ],
+                    'point_count': 1200,
+                    'decimated': False,
                 }
             }
         """
+        from database.data_cube import position_columns
+        from database.data_reader import frame_to_records, iter_measurement_frames
+        
         result = {}
         
         with self.session_scope() as session:
@@ -744,45 +811,7 @@ class DatabaseService:
                     x_column = None
                     y_column = None
                 
-                # Get data points for this measurement object
-                points = session.query(MeasurementDataPoint).filter(
-                    MeasurementDataPoint.measurement_object_id == mo.id
-                ).order_by(MeasurementDataPoint.sequence_index).all()
-                
-                # Build chart-ready data
-                chart_data = []
-                all_values = []
-                
-                for p in points:
-                    values = p.values or {}
-                    
-                    # For chart: extract X and Y values
-                    if x_column and x_column in values:
-                        x_val = values[x_column]
-                    else:
-                        x_val = p.sequence_index
-                    
-                    if y_column and y_column in values:
-                        y_val = values[y_column]
-                    else:
-                        # If no y_column, try to get the first value
-                        y_val = next(iter(values.values()), None) if values else None
-                    
-                    chart_data.append({
-                        'x': x_val,
-                        'y': y_val,
-                        'index': p.sequence_index
-                    })
-                    
-                    # For table: all values plus metadata
-                    row = dict(values)
-                    row['sequence_index'] = p.sequence_index
-                    row['timestamp'] = p.timestamp.isoformat() if p.timestamp else None
-                    if p.extra_data:
-                        row['extra_data'] = p.extra_data
-                    all_values.append(row)
-                
-                result[mo.name] = {
+                entry = {
                     'id': mo.id,
                     'name': mo.name,
                     'columns': columns,
@@ -791,16 +820,420 @@ class DatabaseService:
                     'data_type': mo.data_type,
                     'x_column': x_column or 'sequence_index',
                     'y_column': y_column,
-                    'data_points': chart_data,
-                    'all_values': all_values,
-                    'point_count': len(points)
+                    'decimated': False,
                 }
+                result[mo.name] = entry
+                
+                stats = self._measurement_stats(session, mo)
+                point_count = stats['row_count']
+                entry['column_ranges'] = dict(stats['column_ranges'] or {})
+                if point_count:
+                    entry['column_ranges']['sequence_index'] = [stats['min_sequence'], stats['max_sequence']]
+                if max_points is not None and point_count > max_points:
+                    numeric = [c for c in entry['column_ranges'] if c != 'sequence_index']
+                    axes = position_columns(columns)
+                    if len(axes) > 1:
+                        # Plot a measured channel rather than a position against the first axis
+                        y_column = next((c for c in numeric if c not in axes), y_column)
+                    overview = self._decimated_overview(mo.id, x_column, y_column, width, numeric)
+                    if overview is not None:
+                        if len(axes) > 1:
+                            overview['heatmap'] = self._heatmap_overview(mo.id, axes, overview['chart_y_column'], max_points)
+                        preview = next(iter_measurement_frames(session, mo.id, chunk_size=preview_rows), None)
+                        entry.update(overview)
+                        entry['all_values'] = [
+                            {**p['values'], 'sequence_index': p['sequence_index'], 'timestamp': p['timestamp']}
+                            for p in (frame_to_records(preview) if preview is not None else [])
+                        ]
+                        entry['point_count'] = point_count
+                        entry['decimated'] = True
+                        continue
+                
+                # Build chart-ready data, streaming chunk and row storage
+                chart_data = []
+                all_values = []
+                
+                for frame in iter_measurement_frames(session, mo.id):
+                    for p in frame_to_records(frame):
+                        values = p['values']
+                        
+                        # For chart: extract X and Y values
+                        if x_column and x_column in values:
+                            x_val = values[x_column]
+                        else:
+                            x_val = p['sequence_index']
+                        
+                        if y_column and y_column in values:
+                            y_val = values[y_column]
+                        else:
+                            # If no y_column, try to get the first value
+                            y_val = next(iter(values.values()), None) if values else None
+                        
+                        chart_data.append({
+                            'x': x_val,
+                            'y': y_val,
+                            'index': p['sequence_index']
+                        })
+                        
+                        # For table: all values plus metadata
+                        row = dict(values)
+                        row['sequence_index'] = p['sequence_index']
+                        row['timestamp'] = p['timestamp']
+                        all_values.append(row)
+                
+                entry['data_points'] = chart_data
+                entry['all_values'] = all_values
+                entry['point_count'] = len(chart_data)
         
         return result
-
+    
+    def _decimated_overview(
+        self,
+        measurement_id: int,
+        x_column: Optional[str],
+        y_column: Optional[str],
+        width: int,
+        numeric_columns: List[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Chart data for a large measurement from its level-of-detail pyramid.
+        
+        Builds the pyramid first if the measurement predates it. Returns None if
+        the measurement has no numeric channels to plot; numeric_columns (from
+        the stored counters) answers that without reading the data.
+        """
+        if not numeric_columns:
+            return None
+        channels = self.get_lod_channels(measurement_id)
+        if not channels:
+            self.rebuild_lod(measurement_id, missing_only=True)
+            channels = self.get_lod_channels(measurement_id)
+        if not channels:
+            return None
+        
+        channel = y_column if y_column in channels else channels[0]
+        axis = x_column if x_column in channels else None
+        window = self.get_visualization_window(measurement_id, channel, x_column=axis, width=width)
+        return {
+            'chart_x_column': axis or 'sequence_index',
+            'chart_y_column': channel,
+            'lod_level': window['level'],
+            'data_points': [
+                {'x': x, 'y': mean, 'y_min': low, 'y_max': high, 'index': index}
+                for x, mean, low, high, index in zip(
+                    window['x'], window['mean'], window['min'], window['max'], window['index']
+                )
+            ],
+        }
+    
+    def _heatmap_overview(
+        self,
+        measurement_id: int,
+        axes: List[str],
+        channel: str,
+        max_cells: int,
+    ) -> Optional[Dict[str, Any]]:
+        """A map channel on the grid of its first two axes, at most max_cells cells.
+        
+        Returns None if the rows cannot be gridded. The result has the layout of
+        the /scans/<id>/reduce heatmaps: 'z' (z[y][x]), 'x', 'y' and labels.
+        """
+        try:
+            result = self.reduce_data_cube(
+                measurement_id, channel, display_axes=axes[:2], axes=axes, max_cells=max_cells,
+            )
+        except ValueError:
+            return None
+        if result is None:
+            return None
+        values = result['values']
+        return {
+            'z': [list(row) for row in zip(*values)] if values else [],
+            'x': result['coords'][0],
+            'y': result['coords'][1],
+            'x_label': result['axes'][0],
+            'y_label': result['axes'][1],
+            'z_label': result['channel'] + (f" ({', '.join(result['labels'])})" if result['labels'] else ''),
+        }
+    
+    def get_visualization_window(
+        self,
+        measurement_id: int,
+        channel: str,
+        x_column: Optional[str] = None,
+        x_min: Optional[float] = None,
+        x_max: Optional[float] = None,
+        width: int = 1000,
+    ) -> Dict[str, Any]:
+        """Get one channel of a measurement at the resolution a plot needs.
+        
+        Picks the coarsest level-of-detail level with at least one bin per
+        pixel inside [x_min, x_max]. Small ranges (at most RAW_POINTS_PER_PIXEL
+        points per pixel) are served as raw points instead.
+        
+        Args:
+            measurement_id: Measurement object ID
+            channel: Column plotted on the y axis
+            x_column: Column plotted on the x axis (None or 'sequence_index' for sequence index)
+            x_min: Lower end of the visible x range (None for unbounded)
+            x_max: Upper end of the visible x range (None for unbounded)
+            width: Plot width in pixels
+            
+        Returns:
+            Dict with 'level' (None for raw points), 'bin_size', 'point_count'
+            and parallel lists 'x', 'min', 'max', 'mean', 'count' and 'index'
+            (first sequence index of each bin or point)
+        """
+        from database.chunk_storage import SEQUENCE_COLUMN
+        from database.data_reader import iter_measurement_frames
+        from database.lod import RAW_POINTS_PER_PIXEL, bin_size, select_level
+        from database.models import MeasurementLODBin
+        
+        table = MeasurementLODBin.__table__
+        width = max(1, int(width))
+        if x_column == 'sequence_index':
+            x_column = None
+        
+        def in_range(query):
+            """Restrict a bin query to the axis bins inside the x range."""
+            query = query.where(
+                table.c.measurement_object_id == measurement_id,
+                table.c.channel == (x_column or channel),
+            )
+            if x_column:
+                low, high = table.c.max_value, table.c.min_value
+            else:
+                low, high = table.c.sequence_end, table.c.sequence_start
+            if x_min is not None:
+                query = query.where(low >= x_min)
+            if x_max is not None:
+                query = query.where(high <= x_max)
+            return query
+        
+        result = {
+            'measurement_id': measurement_id,
+            'channel': channel,
+            'x_column': x_column or 'sequence_index',
+            'width': width,
+            'level': None,
+            'bin_size': 1,
+            'x': [], 'min': [], 'max': [], 'mean': [], 'count': [], 'index': [],
+        }
+        
+        with self.session_scope() as session:
+            bins_per_level = dict(session.execute(
+                in_range(select(table.c.level, func.count())).group_by(table.c.level)
+            ).all())
+            level = select_level(bins_per_level, width)
+            
+            if level is None:
+                points, first, last = session.execute(in_range(
+                    select(func.sum(table.c.count), func.min(table.c.sequence_start), func.max(table.c.sequence_end))
+                ).where(table.c.level == 0)).one()
+                if not points:
+                    result['point_count'] = 0
+                    return result
+                if points > RAW_POINTS_PER_PIXEL * width:
+                    level = 0
+            
+            if level is None:
+                # Raw points of the sequence range the axis bins cover
+                wanted = list(dict.fromkeys([c for c in (x_column, channel) if c]))
+                for frame in iter_measurement_frames(session, measurement_id, columns=wanted,
+                                                     start_index=first, end_index=last + 1):
+                    x = frame[x_column] if x_column else frame[SEQUENCE_COLUMN]
+                    keep = frame[channel].notna() & x.notna()
+                    if x_min is not None:
+                        keep &= x >= x_min
+                    if x_max is not None:
+                        keep &= x <= x_max
+                    y = frame[channel][keep].astype(float).tolist()
+                    result['x'].extend(x[keep].astype(float).tolist())
+                    result['min'].extend(y)
+                    result['max'].extend(y)
+                    result['mean'].extend(y)
+                    result['count'].extend([1] * len(y))
+                    result['index'].extend(frame[SEQUENCE_COLUMN][keep].tolist())
+                result['point_count'] = len(result['x'])
+                return result
+            
+            axis_bins = {
+                row.bin_index: row
+                for row in session.execute(in_range(select(table)).where(table.c.level == level))
+            }
+            value_bins = session.execute(select(table).where(
+                table.c.measurement_object_id == measurement_id,
+                table.c.channel == channel,
+                table.c.level == level,
+                table.c.bin_index.in_(in_range(select(table.c.bin_index)).where(table.c.level == level)),
+            ).order_by(table.c.bin_index)).all()
+            
+            for row in value_bins:
+                axis = axis_bins.get(row.bin_index)
+                if axis is None:
+                    continue
+                if x_column:
+                    x = axis.sum_value / axis.count
+                else:
+                    x = (row.sequence_start + row.sequence_end) / 2
+                result['x'].append(x)
+                result['min'].append(row.min_value)
+                result['max'].append(row.max_value)
+                result['mean'].append(row.sum_value / row.count)
+                result['count'].append(row.count)
+                result['index'].append(row.sequence_start)
+        
+        result['level'] = level
+        result['bin_size'] = bin_size(level)
+        result['point_count'] = sum(result['count'])
+        return result
+    
+    def get_lod_channels(self, measurement_id: int) -> List[str]:
+        """Get the channels that have a level-of-detail pyramid."""
+        from database.lod import LOD_LEVELS
+        from database.models import MeasurementLODBin
+        
+        with self.session_scope() as session:
+            # The coarsest level has the fewest bins to scan; keep column order
+            rows = session.query(MeasurementLODBin.channel).filter(
+                MeasurementLODBin.measurement_object_id == measurement_id,
+                MeasurementLODBin.level == LOD_LEVELS - 1,
+            ).group_by(MeasurementLODBin.channel).order_by(func.min(MeasurementLODBin.id)).all()
+            return [row[0] for row in rows]
+    
+    def _data_cube(
+        self,
+        measurement_id: int,
+        axes: Optional[List[str]] = None,
+        tolerance: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Open a measurement's cached data cube, building it if its data changed.
+        
+        See database/data_cube.py. Axes default to the measurement's movement
+        position columns; tolerance is the position snapping tolerance.
+        """
+        from database.data_cube import (
+            build_cube, cube_path, data_version, load_cube, position_columns, prune_cubes
+        )
+        from database.data_reader import iter_measurement_frames
+        
+        with self.session_scope() as session:
+            mo = session.get(MeasurementObject, measurement_id)
+            if mo is None:
+                return None
+            if not axes:
+                columns = mo.columns
+                if not columns:
+                    first = next(iter_measurement_frames(session, mo.id, chunk_size=1), None)
+                    columns = list(first.columns) if first is not None else []
+                axes = position_columns(columns)
+                if not axes:
+                    raise ValueError(f"Measurement '{mo.name}' has no movement position columns to grid on")
+            
+            version = data_version(self._measurement_stats(session, mo))
+            path = cube_path(mo.scan_id, mo.id, version, axes, tolerance)
+            cube = load_cube(path)
+            if cube is None:
+                cube = build_cube(
+                    lambda: iter_measurement_frames(session, mo.id), axes, path, version, tolerance=tolerance
+                )
+                prune_cubes(mo.scan_id, mo.id, version)
+            cube['measurement_id'] = mo.id
+            cube['scan_id'] = mo.scan_id
+            return cube
+    
+    def get_data_cube(
+        self,
+        measurement_id: int,
+        axes: Optional[List[str]] = None,
+        tolerance: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Describe a measurement's data cube: its rows put back on the scan grid.
+        
+        The cube is rebuilt from the stored rows only when the measurement's
+        data has changed since it was cached.
+        
+        Args:
+            measurement_id: Measurement object ID
+            axes: Position columns to grid on (default: the movement position columns)
+            tolerance: Positions closer than this (in axis units) are one grid
+                position (default: found from the gaps between positions, see
+                database.data_cube.default_tolerance)
+            
+        Returns:
+            Dict with 'axes', 'coords' (one list per axis), 'channels', 'shape',
+            'version' and 'filled' (cells with data), or None if the
+            measurement does not exist
+            
+        Raises:
+            ValueError: If there are no axes to grid on or the grid is too large
+        """
+        import numpy as np
+        
+        cube = self._data_cube(measurement_id, axes, tolerance)
+        if cube is None:
+            return None
+        return {
+            'measurement_id': cube['measurement_id'],
+            'scan_id': cube['scan_id'],
+            'axes': cube['axes'],
+            'coords': [c.tolist() for c in cube['coords']],
+            'channels': cube['channels'],
+            'shape': list(cube['shape']),
+            'version': cube['version'],
+            'filled': int(np.count_nonzero(cube['counts'])),
+        }
+    
+    def reduce_data_cube(
+        self,
+        measurement_id: int,
+        channel: Optional[str] = None,
+        reductions: Optional[List[Dict[str, Any]]] = None,
+        display_axes: Optional[List[str]] = None,
+        axes: Optional[List[str]] = None,
+        tolerance: Optional[float] = None,
+        max_cells: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get a slice, projection or line cut of a measurement's data cube.
+        
+        Works on the cached cube (see get_data_cube), so only the cells needed
+        are read. Reductions follow docs/DIMENSION_REDUCTION.md, e.g.
+        [{'dimension': 'z M(um)', 'method': 'max'}] or
+        [{'dimension': 'z M(um)', 'method': 'slice', 'value': 2.5}].
+        
+        Args:
+            measurement_id: Measurement object ID
+            channel: Column to reduce (None for the first)
+            reductions: Steps applied in order (see database.data_cube.reduce_cube)
+            display_axes: Axes of the result, in order; axes neither reduced
+                nor displayed are averaged out
+            axes: Position columns to grid on (default: the movement position columns)
+            tolerance: Position snapping tolerance (see get_data_cube)
+            max_cells: Block-average the result down to at most this many cells
+                (None keeps every cell)
+            
+        Returns:
+            Dict with 'axes', 'coords', 'values' (None for empty cells),
+            'labels', 'original_shape' and 'reduced_shape', or None if the
+            measurement does not exist
+            
+        Raises:
+            ValueError: On an unknown channel, axis or reduction method
+        """
+        from database.data_cube import reduce_cube
+        
+        cube = self._data_cube(measurement_id, axes, tolerance)
+        if cube is None:
+            return None
+        result = reduce_cube(cube, channel, reductions, display_axes, max_cells=max_cells)
+        result['measurement_id'] = cube['measurement_id']
+        result['version'] = cube['version']
+        return result
+    
     def generate_scan_csv(self, scan_id: int, columns: List[str] = None, include_metadata: bool = True) -> str:
         """Generate CSV content for scan data export.
         
+        Builds the whole file in memory; prefer export_scan() for large scans.
+        
         Args:
             scan_id: Database ID of the scan
             columns: List of columns to include (None = all)
@@ -809,58 +1242,104 @@ class DatabaseService:
         Returns:
             CSV content as string, or None if scan not found
         """
-        import csv
-        import io
-        from datetime import datetime
+        pieces = self.export_scan(scan_id, 'csv', columns=columns, include_metadata=include_metadata)
+        return ''.join(pieces) if pieces is not None else None
+    
+    def export_scan(
+        self,
+        scan_id: int,
+        fmt: str = 'csv',
+        measurement_name: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        include_metadata: bool = True,
+        chunk_size: Optional[int] = None,
+    ) -> Optional[Iterator[Any]]:
+        """Stream a scan's data as CSV, Parquet or Arrow IPC.
         
-        with self.session_scope() as session:
-            scan = session.query(Scan).get(scan_id)
-            if not scan:
-                return None
+        Data is read with the chunked reader and encoded one chunk at a time
+        (see database/export.py), so memory use does not grow with the scan.
+        The request is checked before anything is streamed; the session stays
+        open until the returned iterator is exhausted or closed.
+        
+        Args:
+            scan_id: Database ID of the scan
+            fmt: One of database.export.available_formats()
+            measurement_name: Export only this measurement (required for Parquet
+                and Arrow if the scan has several)
+            columns: Exported columns to include (None = all)
+            include_metadata: Write '#' comment lines with scan and measurement
+                details (CSV only)
+            chunk_size: Rows read from the database at a time
             
-            # Get visualization data to build CSV
-            viz_data = self.get_visualization_data(scan_id)
+        Returns:
+            Iterator of str pieces (CSV) or bytes pieces (Parquet, Arrow),
+            or None if the scan or measurement is not found
             
-            output = io.StringIO()
+        Raises:
+            ValueError: If the format is unknown or unavailable, or a table
+                format is requested for several measurements
+        """
+        from database.export import TABLE_FORMATS, available_formats
+        
+        if fmt not in available_formats():
+            raise ValueError(
+                f"Unknown or unavailable export format '{fmt}' (available: {', '.join(available_formats())})"
+            )
+        
+        with self.session_scope() as session:
+            if session.query(Scan.id).filter(Scan.id == scan_id).first() is None:
+                return None
+            query = session.query(MeasurementObject.id).filter(MeasurementObject.scan_id == scan_id)
+            if measurement_name:
+                query = query.filter(MeasurementObject.name == measurement_name)
+            mo_ids = [row[0] for row in query.order_by(MeasurementObject.id).all()]
+        
+        if measurement_name and not mo_ids:
+            return None
+        if fmt in TABLE_FORMATS and len(mo_ids) > 1:
+            raise ValueError(f"Format '{fmt}' holds one measurement; choose one of the scan's {len(mo_ids)}")
+        return self._iter_scan_export(scan_id, mo_ids, fmt, columns, include_metadata, chunk_size)
+    
+    def _iter_scan_export(self, scan_id, mo_ids, fmt, columns, include_metadata, chunk_size) -> Iterator[Any]:
+        """Encode the measurements of export_scan(), one chunk at a time."""
+        from datetime import datetime
+        from database.data_reader import DEFAULT_READ_ROWS, iter_measurement_frames
+        from database.export import csv_metadata, frames_to_arrow, frames_to_csv
+        
+        with self.session_scope() as session:
+            if fmt != 'csv':
+                if not mo_ids:
+                    yield from frames_to_arrow([], fmt, [], columns)
+                    return
+                mo = session.query(MeasurementObject).get(mo_ids[0])
+                frames = iter_measurement_frames(session, mo.id, chunk_size=chunk_size or DEFAULT_READ_ROWS)
+                # Numeric columns over all chunks, so the schema is known up front
+                numeric = list(self._measurement_stats(session, mo)['column_ranges'] or {})
+                yield from frames_to_arrow(frames, fmt, mo.columns or None, columns, numeric_columns=numeric)
+                return
             
-            # Write metadata header
             if include_metadata:
-                output.write(f"# PyBirch Scan Export\n")
-                output.write(f"# Scan ID: {scan.id}\n")
-                output.write(f"# Scan Name: {scan.scan_name or 'Unnamed'}\n")
-                output.write(f"# Scan Type: {scan.scan_type or '-'}\n")
-                output.write(f"# Project: {scan.project_name or '-'}\n")
-                output.write(f"# Queue ID: {scan.queue_id or '-'}\n")
-                output.write(f"# Export Date: {datetime.now().isoformat()}\n")
-                output.write(f"#\n")
-            
-            # For each measurement object, write a section
-            for mo_name, data in viz_data.items():
-                if include_metadata:
-                    output.write(f"# Measurement Object: {mo_name}\n")
-                    output.write(f"# Instrument: {data.get('instrument_name', '-')}\n")
-                    output.write(f"# Unit: {data.get('unit', '-')}\n")
-                    output.write(f"# Total Points: {data.get('point_count', 0)}\n")
-                    output.write(f"#\n")
-                
-                # Determine columns to include
-                all_cols = ['sequence_index'] + (data.get('columns') or []) + ['timestamp']
-                if columns:
-                    # Filter to requested columns
-                    csv_cols = [c for c in all_cols if c in columns]
-                else:
-                    csv_cols = all_cols
-                
-                # Write CSV data
-                writer = csv.DictWriter(output, fieldnames=csv_cols, extrasaction='ignore')
-                writer.writeheader()
-                
-                for row in data.get('all_values', []):
-                    writer.writerow(row)
-                
-                output.write("\n")  # Blank line between measurement objects
+                scan = session.query(Scan).get(scan_id)
+                yield csv_metadata('PyBirch Scan Export', {
+                    'Scan ID': scan.id,
+                    'Scan Name': scan.scan_name or 'Unnamed',
+                    'Scan Type': scan.scan_type,
+                    'Project': scan.project_name,
+                    'Queue ID': scan.queue_id,
+                    'Export Date': datetime.now().isoformat(),
+                })
             
-            return output.getvalue()
+            for mo_id in mo_ids:
+                mo = session.query(MeasurementObject).get(mo_id)
+                if include_metadata:
+                    yield csv_metadata(f"Measurement Object: {mo.name}", {
+                        'Instrument': mo.instrument_name,
+                        'Unit': mo.unit,
+                        'Total Points': self._measurement_stats(session, mo)['row_count'],
+                    })
+                frames = iter_measurement_frames(session, mo.id, chunk_size=chunk_size or DEFAULT_READ_ROWS)
+                yield from frames_to_csv(frames, mo.columns or None, columns)
+                yield "\n"  # Blank line between measurement objects
 
     def _scan_to_dict(self, scan: Scan) -> Dict:
         """Convert Scan model to dictionary."""
@@ -885,6 +1364,7 @@ class DatabaseService:
             'pybirch_uri': f"pybirch://scan/{scan.id}",
             'lab_id': scan.lab_id,
             'project_id': scan.project_id,
+            'progress': (scan.extra_data or {}).get('progress'),
         }
     
     def _measurement_object_to_dict(self, mo: MeasurementObject) -> Dict:
@@ -897,6 +1377,11 @@ class DatabaseService:
             'instrument_name': mo.instrument_name,
             'columns': mo.columns,
             'description': mo.description,
+            'data_point_count': mo.row_count,
+            'sequence_range': [mo.min_sequence, mo.max_sequence] if mo.row_count else None,
+            'first_timestamp': mo.first_timestamp.isoformat() if mo.first_timestamp else None,
+            'last_timestamp': mo.last_timestamp.isoformat() if mo.last_timestamp else None,
+            'column_ranges': mo.column_ranges or {},
         }
 
     def create_scan(self, data: Dict[str, Any]) -> Dict:
@@ -965,6 +1450,26 @@ class DatabaseService:
         data = {'status': status, **kwargs}
         return self.update_scan(scan_id, data)
     
+    def update_scan_progress(self, scan_id: int, progress: Dict[str, Any]) -> bool:
+        """Record live progress of a running scan in its extra_data['progress'].
+        
+        Args:
+            scan_id: Database scan ID
+            progress: Progress details (fraction, points, rate, ETA)
+            
+        Returns:
+            True if updated, False if not found
+        """
+        with self.session_scope() as session:
+            scan = session.query(Scan).filter(Scan.id == scan_id).first()
+            if not scan:
+                return False
+            # Reassign so SQLAlchemy detects the JSON change
+            extra_data = dict(scan.extra_data or {})
+            extra_data['progress'] = progress
+            scan.extra_data = extra_data
+            return True
+    
     def get_scan_by_scan_id(self, scan_id_str: str) -> Optional[Dict]:
         """Get a scan by its scan_id string (not database ID).
         
@@ -1076,7 +1581,10 @@ class DatabaseService:
         self,
         measurement_id: int,
         page: int = 1,
-        per_page: int = 1000
+        per_page: int = 1000,
+        columns: Optional[List[str]] = None,
+        start_index: Optional[int] = None,
+        end_index: Optional[int] = None,
     ) -> List[Dict]:
         """Get data points for a measurement.
         
@@ -1084,25 +1592,29 @@ class DatabaseService:
             measurement_id: Measurement object ID
             page: Page number (1-indexed)
             per_page: Items per page (default 1000)
+            columns: Data columns to include (None for all)
+            start_index: First sequence index included
+            end_index: Sequence index to stop before (exclusive)
             
         Returns:
             List of data points as dictionaries
         """
-        with self.session_scope() as session:
-            points = session.query(MeasurementDataPoint).filter(
-                MeasurementDataPoint.measurement_id == measurement_id
-            ).order_by(
-                MeasurementDataPoint.sequence_index
-            ).offset((page - 1) * per_page).limit(per_page).all()
-            
-            return [{
-                'id': point.id,
-                'measurement_id': point.measurement_id,
-                'sequence_index': point.sequence_index,
-                'values': point.values,
-                'timestamp': point.timestamp.isoformat() if point.timestamp else None,
-                'extra_data': point.extra_data,
-            } for point in points]
+        from database.data_reader import frame_to_records
+        
+        pieces = self.iter_measurement_data(
+            measurement_id, columns=columns, start_index=start_index,
+            end_index=end_index, chunk_size=per_page,
+        )
+        try:
+            for number, frame in enumerate(pieces, start=1):
+                if number == page:
+                    records = frame_to_records(frame)
+                    for record in records:
+                        record['measurement_id'] = measurement_id
+                    return records
+        finally:
+            pieces.close()
+        return []
     
     def create_data_point(
         self,
@@ -1156,27 +1668,35 @@ class DatabaseService:
         Returns:
             Number of data points created
         """
+        from database.bulk_copy import insert_rows
+        
+        if not data_points:
+            return 0
+        
+        now = datetime.now()
+        rows = [
+            {
+                'measurement_object_id': measurement_id,
+                'values': dp.get('values', dp),
+                'sequence_index': dp.get('sequence_index', i),
+                'timestamp': dp.get('timestamp', now),
+                'extra_data': dp.get('extra_data'),
+            }
+            for i, dp in enumerate(data_points)
+        ]
+        
+        # COPY on PostgreSQL, Core executemany elsewhere
         with self.session_scope() as session:
-            points = []
-            for i, dp in enumerate(data_points):
-                point = MeasurementDataPoint(
-                    measurement_object_id=measurement_id,  # Fixed: use measurement_object_id not measurement_id
-                    values=dp.get('values', dp),
-                    sequence_index=dp.get('sequence_index', i),
-                    timestamp=dp.get('timestamp', datetime.now()),
-                    extra_data=dp.get('extra_data'),
-                )
-                points.append(point)
-            
-            session.bulk_save_objects(points)
-            return len(points)
+            insert_rows(session, MeasurementDataPoint.__table__, rows)
+            self._update_summaries_from_rows(session, rows)
+            return len(rows)
 
     def get_data_point_count(
         self,
         scan_id: int,
         measurement_name: Optional[str] = None,
     ) -> int:
-        """Get count of data points for a scan.
+        """Get count of data points for a scan, across chunk and row storage.
         
         Args:
             scan_id: Database scan ID
@@ -1186,31 +1706,622 @@ class DatabaseService:
             Count of data points
         """
         with self.session_scope() as session:
-            query = session.query(func.count(MeasurementDataPoint.id)).join(
-                MeasurementObject
-            ).filter(MeasurementObject.scan_id == scan_id)
+            query = session.query(MeasurementObject).filter(MeasurementObject.scan_id == scan_id)
             
             if measurement_name:
                 query = query.filter(MeasurementObject.name == measurement_name)
             
-            return query.scalar() or 0
+            # Maintained counters; no scan of the data tables
+            return sum(self._measurement_stats(session, mo)['row_count'] for mo in query.all())
 
-    # ==================== Queues ====================
+    def create_data_chunks(
+        self,
+        measurement_id: int,
+        data: 'pd.DataFrame',
+        sequence_indices: Optional[List[int]] = None,
+        timestamps: Optional[List[datetime]] = None,
+        chunk_rows: Optional[int] = None,
+    ) -> int:
+        """Store measurement data as compressed column blocks.
+        
+        Args:
+            measurement_id: Measurement object ID
+            data: DataFrame with one column per measured quantity
+            sequence_indices: Sequence index of each row (default: continue after
+                the highest index already stored for the measurement)
+            timestamps: Acquisition time of each row (optional)
+            chunk_rows: Rows per block (default chunk_storage.DEFAULT_CHUNK_ROWS)
+            
+        Returns:
+            Number of rows stored
+        """
+        if data is None or len(data) == 0:
+            return 0
+        
+        with self.session_scope() as session:
+            return self._insert_data_chunks(session, measurement_id, data, sequence_indices,
+                                            timestamps, chunk_rows)
     
-    def get_queues(
+    def _insert_data_chunks(
         self,
-        search: Optional[str] = None,
-        status: Optional[str] = None,
-        lab_id: Optional[int] = None,
-        project_id: Optional[int] = None,
-        page: int = 1,
-        per_page: int = 20
-    ) -> Tuple[List[Dict], int]:
-        """Get paginated list of queues with optional filtering."""
+        session,
+        measurement_id: int,
+        data: 'pd.DataFrame',
+        sequence_indices: Optional[List[int]] = None,
+        timestamps: Optional[List[datetime]] = None,
+        chunk_rows: Optional[int] = None,
+    ) -> int:
+        """Encode a DataFrame into column blocks and insert them in the given session."""
+        from database.bulk_copy import insert_rows
+        from database.chunk_storage import DEFAULT_CHUNK_ROWS, split_frame
+        from database.models import MeasurementDataChunk
+        
+        if sequence_indices is None:
+            start = self._next_sequence_index(session, measurement_id)
+            sequence_indices = range(start, start + len(data))
+        
+        rows = [
+            {'measurement_object_id': measurement_id, **chunk}
+            for chunk in split_frame(data, sequence_indices, timestamps,
+                                     chunk_rows=chunk_rows or DEFAULT_CHUNK_ROWS)
+        ]
+        insert_rows(session, MeasurementDataChunk.__table__, rows)
+        self._update_summaries(session, measurement_id, data, sequence_indices, timestamps)
+        return len(data)
+    
+    def _update_summaries(self, session, measurement_id: int, frame: 'pd.DataFrame',
+                          sequence_indices, timestamps=None) -> None:
+        """Fold newly inserted rows into a measurement's pyramid and counters."""
+        self._update_lod(session, measurement_id, frame, sequence_indices)
+        self._update_measurement_stats(session, measurement_id, frame, sequence_indices, timestamps)
+    
+    def _update_measurement_stats(self, session, measurement_id: int, frame: 'pd.DataFrame',
+                                  sequence_indices, timestamps=None) -> None:
+        """Merge new rows into a measurement's counters (see database/measurement_stats.py)."""
+        from database.measurement_stats import compute_stats, merge_stats
+        
+        # Lock the row so concurrent inserts into one measurement merge in turn (PostgreSQL)
+        mo = session.query(MeasurementObject).filter(
+            MeasurementObject.id == measurement_id
+        ).with_for_update().one_or_none()
+        if mo is None or mo.row_count is None:
+            # Counters not computed yet; the first read rebuilds them including these rows
+            return
+        self._set_measurement_stats(mo, merge_stats(
+            self._get_stored_stats(mo), compute_stats(frame, sequence_indices, timestamps)
+        ))
+    
+    @staticmethod
+    def _get_stored_stats(mo: MeasurementObject) -> Dict[str, Any]:
+        from database.measurement_stats import STAT_FIELDS
+        return {field: getattr(mo, field) for field in STAT_FIELDS}
+    
+    @staticmethod
+    def _set_measurement_stats(mo: MeasurementObject, stats: Dict[str, Any]) -> None:
+        for field, value in stats.items():
+            setattr(mo, field, value)
+    
+    def _measurement_stats(self, session, mo: MeasurementObject, rebuild: bool = False) -> Dict[str, Any]:
+        """A measurement's counters, computed from its stored data the first time.
+        
+        Measurements written before the counters existed have row_count NULL.
+        """
+        import pandas as pd
+        from database.chunk_storage import SEQUENCE_COLUMN, TIMESTAMP_COLUMN
+        from database.data_reader import iter_measurement_frames
+        from database.measurement_stats import compute_stats, empty_stats, merge_stats
+        
+        if rebuild or mo.row_count is None:
+            # Lock first so inserts wait for the rebuild, then merge into its result
+            session.refresh(mo, with_for_update=True)
+        if rebuild or mo.row_count is None:
+            stats = empty_stats()
+            for frame in iter_measurement_frames(session, mo.id, include_unsequenced=False):
+                stats = merge_stats(stats, compute_stats(
+                    frame, frame[SEQUENCE_COLUMN].to_numpy(), frame.get(TIMESTAMP_COLUMN)
+                ))
+            # Rows without a sequence index are folded in separately
+            unplaced = session.query(MeasurementDataPoint.values, MeasurementDataPoint.timestamp).filter(
+                MeasurementDataPoint.measurement_object_id == mo.id,
+                MeasurementDataPoint.sequence_index.is_(None),
+            ).all()
+            if unplaced:
+                frame = pd.DataFrame([values if isinstance(values, dict) else {} for values, _ in unplaced])
+                stats = merge_stats(stats, compute_stats(
+                    frame, [None] * len(unplaced), [stamp for _, stamp in unplaced]
+                ))
+            self._set_measurement_stats(mo, stats)
+        return self._get_stored_stats(mo)
+    
+    def get_measurement_stats(self, measurement_id: int) -> Optional[Dict[str, Any]]:
+        """Get a measurement's row count, sequence and time ranges and column ranges.
+        
+        Args:
+            measurement_id: Measurement object ID
+            
+        Returns:
+            Dict with row_count, min_sequence, max_sequence, first_timestamp,
+            last_timestamp (ISO strings) and column_ranges ({column: [min, max]}),
+            or None if the measurement does not exist
+        """
         with self.session_scope() as session:
-            query = session.query(Queue)
+            mo = session.get(MeasurementObject, measurement_id)
+            if mo is None:
+                return None
+            stats = self._measurement_stats(session, mo)
+            for field in ('first_timestamp', 'last_timestamp'):
+                stats[field] = stats[field].isoformat() if stats[field] else None
+            return stats
+    
+    def rebuild_measurement_stats(self, measurement_id: int) -> int:
+        """Recompute a measurement's counters from its stored data.
+        
+        Args:
+            measurement_id: Measurement object ID
             
-            if search:
+        Returns:
+            Number of rows counted
+        """
+        with self.session_scope() as session:
+            mo = session.get(MeasurementObject, measurement_id)
+            if mo is None:
+                return 0
+            return self._measurement_stats(session, mo, rebuild=True)['row_count']
+    
+    def _update_lod(self, session, measurement_id: int, frame: 'pd.DataFrame', sequence_indices) -> None:
+        """Fold new rows into a measurement's level-of-detail pyramid (see database/lod.py)."""
+        from sqlalchemy import bindparam, update
+        from database.bulk_copy import insert_rows
+        from database.lod import compute_bins, merge_bin
+        from database.models import MeasurementLODBin
+        
+        new_bins = compute_bins(frame, sequence_indices)
+        if not new_bins:
+            return
+        table = MeasurementLODBin.__table__
+        
+        # Stored bins the new rows fall into; for appended data only the last bin per level
+        ranges: Dict[int, Tuple[int, int]] = {}
+        for b in new_bins:
+            low, high = ranges.get(b['level'], (b['bin_index'], b['bin_index']))
+            ranges[b['level']] = (min(low, b['bin_index']), max(high, b['bin_index']))
+        stored = {}
+        for level, (low, high) in ranges.items():
+            rows = session.execute(select(table).where(
+                table.c.measurement_object_id == measurement_id,
+                table.c.level == level,
+                table.c.bin_index.between(low, high),
+            )).mappings()
+            for row in rows:
+                stored[(row['channel'], level, row['bin_index'])] = row
+        
+        inserts, updates = [], []
+        for b in new_bins:
+            row = stored.get((b['channel'], b['level'], b['bin_index']))
+            if row is None:
+                inserts.append({'measurement_object_id': measurement_id, **b})
+            else:
+                updates.append({'bin_id': row['id'], **merge_bin(row, b)})
+        if updates:
+            session.execute(update(table).where(table.c.id == bindparam('bin_id')), updates)
+        insert_rows(session, table, inserts)
+    
+    def _update_summaries_from_rows(self, session, rows: List[Dict[str, Any]]) -> None:
+        """Fold MeasurementDataPoint rows into their measurements' pyramids and counters."""
+        import pandas as pd
+        
+        grouped: Dict[int, List[Dict[str, Any]]] = {}
+        for row in rows:
+            grouped.setdefault(row['measurement_object_id'], []).append(row)
+        for measurement_id, group in grouped.items():
+            frame = pd.DataFrame([row['values'] if isinstance(row.get('values'), dict) else {} for row in group])
+            sequence = [row.get('sequence_index') for row in group]
+            self._update_measurement_stats(
+                session, measurement_id, frame, sequence, [row.get('timestamp') for row in group]
+            )
+            # Rows without a sequence index have no place in the pyramid
+            placed = [i for i, seq in enumerate(sequence) if seq is not None]
+            if placed:
+                self._update_lod(session, measurement_id, frame.iloc[placed], [sequence[i] for i in placed])
+    
+    def rebuild_lod(self, measurement_id: int, missing_only: bool = False) -> int:
+        """Rebuild a measurement's level-of-detail pyramid from its stored data.
+        
+        Used for measurements written before the pyramid existed; new data
+        updates it as it is inserted. The old bins are replaced in one
+        transaction, with the measurement locked so concurrent inserts and
+        rebuilds wait for it.
+        
+        Args:
+            measurement_id: Measurement object ID
+            missing_only: Leave the pyramid alone if it already has bins
+                (checked under the lock, so racing readers build it once)
+            
+        Returns:
+            Number of rows folded into the pyramid
+        """
+        from database.chunk_storage import SEQUENCE_COLUMN
+        from database.data_reader import iter_measurement_frames
+        from database.models import MeasurementLODBin
+        
+        rows = 0
+        with self.session_scope() as session:
+            mo = session.query(MeasurementObject).filter(
+                MeasurementObject.id == measurement_id
+            ).with_for_update().one_or_none()
+            if mo is None:
+                return 0
+            bins = session.query(MeasurementLODBin).filter(
+                MeasurementLODBin.measurement_object_id == measurement_id
+            )
+            if missing_only and bins.first() is not None:
+                return 0
+            bins.delete(synchronize_session=False)
+            
+            for frame in iter_measurement_frames(session, measurement_id, include_unsequenced=False):
+                self._update_lod(session, measurement_id, frame, frame[SEQUENCE_COLUMN].to_numpy())
+                rows += len(frame)
+        return rows
+    
+    def get_measurement_dataframe(
+        self,
+        measurement_id: int,
+        columns: Optional[List[str]] = None,
+        start_index: Optional[int] = None,
+        end_index: Optional[int] = None,
+    ) -> 'pd.DataFrame':
+        """Get a measurement's data as a DataFrame, from chunk and row storage.
+        
+        Blocks outside the requested columns or sequence range are skipped
+        without being decompressed. Rows stored as MeasurementDataPoint are
+        merged in, so measurements written before chunk storage stay readable.
+        
+        Args:
+            measurement_id: Measurement object ID
+            columns: Data columns to include (None for all)
+            start_index: First sequence index included
+            end_index: Sequence index to stop before (exclusive)
+            
+        Returns:
+            DataFrame in sequence order, with `_sequence_index` and `_timestamp` columns
+        """
+        import pandas as pd
+        from database.chunk_storage import SEQUENCE_COLUMN
+        
+        frames = list(self.iter_measurement_data(
+            measurement_id, columns=columns, start_index=start_index, end_index=end_index,
+        ))
+        if not frames:
+            return pd.DataFrame(columns=list(columns or []) + [SEQUENCE_COLUMN])
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    
+    def iter_measurement_data(
+        self,
+        measurement_id: int,
+        columns: Optional[List[str]] = None,
+        start_index: Optional[int] = None,
+        end_index: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        as_numpy: bool = False,
+        include_unsequenced: bool = True,
+    ) -> Iterator[Any]:
+        """Stream a measurement's data in fixed-size pieces, in sequence order.
+        
+        Chunk blocks and legacy rows are streamed from the database (server-side
+        cursor on PostgreSQL) and merged, so memory use is bounded by chunk_size.
+        The session stays open until the iterator is exhausted or closed.
+        
+        Args:
+            measurement_id: Measurement object ID
+            columns: Data columns to include (None for all)
+            start_index: First sequence index included
+            end_index: Sequence index to stop before (exclusive)
+            chunk_size: Rows per piece (default database.data_reader.DEFAULT_READ_ROWS)
+            as_numpy: Yield dicts of column name -> NumPy array instead of DataFrames
+            include_unsequenced: Append rows stored without a sequence index after
+                the ordered rows (ignored when a sequence range is given)
+            
+        Yields:
+            DataFrames (or dicts of arrays) with `_sequence_index` and `_timestamp`
+            after the data columns
+        """
+        from database.data_reader import DEFAULT_READ_ROWS, frame_to_arrays, iter_measurement_frames
+        
+        with self.session_scope() as session:
+            for frame in iter_measurement_frames(
+                session, measurement_id, columns=columns, start_index=start_index,
+                end_index=end_index, chunk_size=chunk_size or DEFAULT_READ_ROWS,
+                include_unsequenced=include_unsequenced,
+            ):
+                yield frame_to_arrays(frame) if as_numpy else frame
+    
+    def create_measurement_data_array(self, data: Dict[str, Any]) -> Dict:
+        """Create an array/blob record for a measurement.
+        
+        The serialized array in `data_blob` is compressed and stored once per
+        distinct content (MeasurementBlob); see database/blob_store.py.
+        
+        Args:
+            data: MeasurementDataArray fields (measurement_object_id, data_blob,
+                data_format, shape, dtype, sequence_index, timestamp, extra_data),
+                plus an optional 'codec' for the blob
+        
+        Returns:
+            Created data array as dictionary (without the blob)
+        """
+        from database.models import MeasurementDataArray
+        
+        with self.session_scope() as session:
+            row = self._prepare_data_arrays(session, [data])[0]
+            array = MeasurementDataArray(**row)
+            session.add(array)
+            session.flush()
+            return self._data_array_to_dict(array)
+    
+    def _prepare_data_arrays(self, session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Move the raw bytes of MeasurementDataArray rows into deduplicated blobs.
+        
+        Returns:
+            Rows with the same keys, holding blob_id instead of data_blob
+        """
+        from database.blob_store import DEFAULT_CODEC
+        
+        blob_ids: Dict[str, int] = {}
+        prepared = []
+        for data in rows:
+            raw = data.get('data_blob')
+            prepared.append({
+                'measurement_object_id': data['measurement_object_id'],
+                'timestamp': data.get('timestamp'),
+                'sequence_index': data.get('sequence_index'),
+                'data_blob': None,
+                'blob_id': (
+                    self._store_blob(session, raw, data.get('codec') or DEFAULT_CODEC, blob_ids)
+                    if raw is not None else data.get('blob_id')
+                ),
+                'data_format': data.get('data_format'),
+                'shape': data.get('shape'),
+                'dtype': data.get('dtype'),
+                'file_path': data.get('file_path'),
+                'extra_data': data.get('extra_data'),
+            })
+        return prepared
+    
+    def _store_blob(self, session, raw: bytes, codec: str, blob_ids: Dict[str, int]) -> int:
+        """Get or create the MeasurementBlob for some bytes.
+        
+        Args:
+            session: Open session
+            raw: Uncompressed bytes
+            codec: Compression codec for a new blob
+            blob_ids: Content hash -> blob ID cache for the current transaction
+            
+        Returns:
+            Blob ID
+        """
+        from database import blob_store
+        from database.models import MeasurementBlob
+        
+        digest = blob_store.content_hash(raw)
+        if digest in blob_ids:
+            return blob_ids[digest]
+        
+        blob_id = session.query(MeasurementBlob.id).filter(
+            MeasurementBlob.content_hash == digest
+        ).scalar()
+        if blob_id is None:
+            stored = blob_store.compress(raw, codec)
+            if len(stored) >= len(raw):
+                codec, stored = 'none', raw
+            
+            object_dir = blob_store.get_object_dir()
+            external = object_dir is not None and len(stored) >= blob_store.EXTERNAL_THRESHOLD
+            blob = MeasurementBlob(
+                content_hash=digest,
+                codec=codec,
+                size=len(raw),
+                stored_size=len(stored),
+                data_blob=None if external else stored,
+                object_path=blob_store.write_object(digest, stored, object_dir) if external else None,
+            )
+            session.add(blob)
+            session.flush()
+            blob_id = blob.id
+        
+        blob_ids[digest] = blob_id
+        return blob_id
+    
+    def _data_array_to_dict(self, array) -> Dict[str, Any]:
+        return {
+            'id': array.id,
+            'measurement_object_id': array.measurement_object_id,
+            'sequence_index': array.sequence_index,
+            'data_format': array.data_format,
+            'shape': array.shape,
+            'dtype': array.dtype,
+            'blob_id': array.blob_id,
+            'extra_data': array.extra_data,
+            'timestamp': array.timestamp.isoformat() if array.timestamp else None,
+        }
+    
+    def get_measurement_data_arrays(self, measurement_id: int) -> List[Dict]:
+        """List a measurement's arrays without loading their data.
+        
+        Args:
+            measurement_id: MeasurementObject ID
+            
+        Returns:
+            Array records in sequence order (use load_measurement_data_array() for the data)
+        """
+        from database.models import MeasurementDataArray
+        
+        with self.session_scope() as session:
+            arrays = session.query(MeasurementDataArray).filter(
+                MeasurementDataArray.measurement_object_id == measurement_id
+            ).order_by(MeasurementDataArray.sequence_index, MeasurementDataArray.id).all()
+            return [self._data_array_to_dict(array) for array in arrays]
+    
+    def load_measurement_data_array(self, array_id: int):
+        """Load the data of one array record.
+        
+        Args:
+            array_id: MeasurementDataArray ID
+            
+        Returns:
+            NumPy array, or None if the record does not exist or has no data
+        """
+        from database.blob_store import deserialize_array
+        from database.models import MeasurementDataArray
+        
+        with self.session_scope() as session:
+            array = session.get(MeasurementDataArray, array_id)
+            if array is None:
+                return None
+            raw = self._read_array_bytes(array)
+            if raw is None:
+                return None
+            return deserialize_array(raw, array.data_format, array.shape, array.dtype)
+    
+    def _read_array_bytes(self, array) -> Optional[bytes]:
+        """Serialized bytes of an array, from its blob, inline column or external file."""
+        from database import blob_store
+        
+        blob = array.blob
+        if blob is not None:
+            stored = blob.data_blob if blob.object_path is None else blob_store.read_object(blob.object_path)
+            return blob_store.decompress(stored, blob.codec)
+        if array.data_blob is not None:
+            return array.data_blob
+        if array.file_path:
+            with open(array.file_path, 'rb') as f:
+                return f.read()
+        return None
+    
+    def prune_measurement_blobs(self) -> int:
+        """Delete blobs (and their object files) no longer referenced by any array.
+        
+        Returns:
+            Number of blobs deleted
+        """
+        from database import blob_store
+        from database.models import MeasurementBlob, MeasurementDataArray
+        
+        with self.session_scope() as session:
+            unused = session.query(MeasurementBlob).filter(
+                ~session.query(MeasurementDataArray.id).filter(
+                    MeasurementDataArray.blob_id == MeasurementBlob.id
+                ).exists()
+            ).all()
+            paths = [blob.object_path for blob in unused if blob.object_path]
+            for blob in unused:
+                session.delete(blob)
+        # Remove files only after the rows are gone, so a failed commit loses nothing
+        for path in paths:
+            blob_store.remove_object(path)
+        return len(unused)
+    
+    def write_batch(
+        self,
+        data_points: Optional[List[Dict[str, Any]]] = None,
+        data_chunks: Optional[List[Dict[str, Any]]] = None,
+        data_arrays: Optional[List[Dict[str, Any]]] = None,
+        scan_logs: Optional[List[Dict[str, Any]]] = None,
+        scan_updates: Optional[Dict[int, Dict[str, Any]]] = None,
+        scan_progress: Optional[Dict[int, Dict[str, Any]]] = None,
+    ) -> int:
+        """Write a group of pending changes from any number of scans in one transaction.
+        
+        Used by the write-behind DatabaseWriter to turn many small commits into
+        one. Rows are inserted with COPY on PostgreSQL and Core executemany
+        elsewhere.
+        
+        Args:
+            data_points: MeasurementDataPoint rows (with measurement_object_id)
+            data_chunks: create_data_chunks() keyword arguments, one dict per DataFrame
+            data_arrays: MeasurementDataArray rows (raw bytes in data_blob, see
+                create_measurement_data_array())
+            scan_logs: ScanLog rows
+            scan_updates: Scan ID -> fields to set
+            scan_progress: Scan ID -> latest progress (stored in extra_data['progress'])
+            
+        Returns:
+            Number of rows and records written
+        """
+        from sqlalchemy import insert
+        from database.bulk_copy import insert_rows
+        from database.models import MeasurementDataArray
+        
+        written = 0
+        with self.session_scope() as session:
+            if data_points:
+                # executemany and COPY need the same keys in every row
+                rows = [
+                    {
+                        'measurement_object_id': dp['measurement_object_id'],
+                        'values': dp.get('values'),
+                        'sequence_index': dp.get('sequence_index'),
+                        'timestamp': dp.get('timestamp'),
+                        'extra_data': dp.get('extra_data'),
+                    }
+                    for dp in data_points
+                ]
+                written += insert_rows(session, MeasurementDataPoint.__table__, rows)
+                self._update_summaries_from_rows(session, rows)
+            for chunk in data_chunks or []:
+                written += self._insert_data_chunks(session, **chunk)
+            if data_arrays:
+                rows = self._prepare_data_arrays(session, data_arrays)
+                session.execute(insert(MeasurementDataArray.__table__), rows)
+                written += len(rows)
+            if scan_logs:
+                session.execute(insert(ScanLog.__table__), scan_logs)
+                written += len(scan_logs)
+            
+            scan_ids = set(scan_updates or {}) | set(scan_progress or {})
+            if scan_ids:
+                scans = {scan.id: scan for scan in session.query(Scan).filter(Scan.id.in_(scan_ids))}
+                for scan_id, fields in (scan_updates or {}).items():
+                    scan = scans.get(scan_id)
+                    for key, value in fields.items():
+                        if scan is not None and hasattr(scan, key):
+                            setattr(scan, key, value)
+                for scan_id, progress in (scan_progress or {}).items():
+                    scan = scans.get(scan_id)
+                    if scan is not None:
+                        # Reassign so SQLAlchemy detects the JSON change
+                        scan.extra_data = {**(scan.extra_data or {}), 'progress': progress}
+                written += len(scans)
+        return written
+    
+    def _next_sequence_index(self, session, measurement_id: int) -> int:
+        """Sequence index following the highest one stored for a measurement."""
+        from database.models import MeasurementDataChunk
+        
+        last_chunk = session.query(func.max(MeasurementDataChunk.end_sequence)).filter(
+            MeasurementDataChunk.measurement_object_id == measurement_id
+        ).scalar()
+        last_point = session.query(func.max(MeasurementDataPoint.sequence_index)).filter(
+            MeasurementDataPoint.measurement_object_id == measurement_id
+        ).scalar()
+        last = max((v for v in (last_chunk, last_point) if v is not None), default=-1)
+        return last + 1
+
+    # ==================== Queues ====================
+    
+    def get_queues(
+        self,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        lab_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        page: int = 1,
+        per_page: int = 20
+    ) -> Tuple[List[Dict], int]:
+        """Get paginated list of queues with optional filtering."""
+        with self.session_scope() as session:
+            query = session.query(Queue)
+            
+            if search:
                 search_term = f"%{search}%"
                 query = query.filter(
                     or_(
@@ -1563,6 +2674,519 @@ class DatabaseService:
             instrument = session.query(Instrument).filter(Instrument.name == name).first()
             return self._instrument_to_dict(instrument, session=session) if instrument else None
 
+    # ==================== Scan Jobs (Distributed Queue) ====================
+
+    SCAN_JOB_ACTIVE_STATES = ('claimed', 'running')
+    SCAN_JOB_FINISHED_STATES = ('completed', 'failed', 'aborted')
+
+    def create_scan_job(self, data: Dict[str, Any]) -> Dict:
+        """Enqueue a scan job for execution by a distributed worker.
+
+        Args:
+            data: Dictionary with job data including:
+                - name: Human-readable job name
+                - scan_data: Serialized PyBirch Scan (bytes)
+                - required_instruments: List of instrument names the scan uses
+                - queue_id: Parent database queue ID (optional)
+                - lab_id, project_id, sample_id: Ownership (optional, inherited from queue)
+                - priority: Higher values are claimed first (default 0)
+                - max_attempts: Claims allowed before the job is failed (default 3)
+                - created_by: Operator name
+
+        Returns:
+            Created job as dictionary (without the serialized scan)
+        """
+        from database.models import ScanJob
+
+        with self.session_scope() as session:
+            data = dict(data)
+            if data.get('queue_id'):
+                queue = session.query(Queue).filter(Queue.id == data['queue_id']).first()
+                if queue:
+                    data.setdefault('lab_id', queue.lab_id)
+                    data.setdefault('project_id', queue.project_id)
+                    data.setdefault('sample_id', queue.sample_id)
+
+            job = ScanJob(**data)
+            session.add(job)
+            session.flush()
+
+            if job.queue_id:
+                self._sync_queue_from_scan_jobs(session, job.queue_id)
+
+            return self._scan_job_to_dict(job)
+
+    def get_scan_job(self, job_id: int, include_data: bool = False) -> Optional[Dict]:
+        """Get a scan job by ID.
+
+        Args:
+            job_id: Database job ID
+            include_data: If True, include the serialized scan bytes
+
+        Returns:
+            Job as dictionary, or None if not found
+        """
+        from database.models import ScanJob
+
+        with self.session_scope() as session:
+            job = session.query(ScanJob).filter(ScanJob.id == job_id).first()
+            return self._scan_job_to_dict(job, include_data=include_data) if job else None
+
+    def get_scan_jobs(
+        self,
+        status: Optional[str] = None,
+        queue_id: Optional[int] = None,
+        lease_owner: Optional[str] = None,
+    ) -> List[Dict]:
+        """Get scan jobs in claim order (priority, then submission).
+
+        Args:
+            status: Filter by status
+            queue_id: Filter by parent queue
+            lease_owner: Filter by worker ID
+
+        Returns:
+            List of jobs as dictionaries
+        """
+        from database.models import ScanJob
+
+        with self.session_scope() as session:
+            query = session.query(ScanJob)
+            if status:
+                query = query.filter(ScanJob.status == status)
+            if queue_id:
+                query = query.filter(ScanJob.queue_id == queue_id)
+            if lease_owner:
+                query = query.filter(ScanJob.lease_owner == lease_owner)
+
+            jobs = query.order_by(desc(ScanJob.priority), ScanJob.id).all()
+            return [self._scan_job_to_dict(job) for job in jobs]
+
+    def get_instrument_names_for_computer(self, computer_name: str) -> List[str]:
+        """Get names of the instruments bound to a computer.
+
+        Args:
+            computer_name: The hostname of the computer
+
+        Returns:
+            List of instrument names
+        """
+        from database.models import ComputerBinding
+
+        with self.session_scope() as session:
+            rows = session.query(Instrument.name).join(
+                ComputerBinding,
+                ComputerBinding.instrument_id == Instrument.id
+            ).filter(
+                ComputerBinding.computer_name == computer_name
+            ).distinct().all()
+            return [row[0] for row in rows]
+
+    def claim_scan_job(
+        self,
+        worker_id: str,
+        computer_name: str,
+        instrument_names: Optional[List[str]] = None,
+        lease_seconds: float = 30.0,
+    ) -> Optional[Dict]:
+        """Atomically claim the next job this worker is able to run.
+
+        A job is claimable when it is pending, or when its lease has expired
+        and it has attempts left; expired jobs without attempts left are
+        failed first. The worker must own every instrument the job requires,
+        and none of those instruments may be leased by another active job.
+        The claim itself is a conditional UPDATE, so two workers racing for
+        the same job cannot both win. Instrument exclusivity is checked again
+        inside the claiming transaction and once more after it commits, so two
+        workers claiming different jobs that share an instrument cannot both
+        keep them (the later claim is released).
+
+        Args:
+            worker_id: Unique ID of the claiming worker
+            computer_name: Hostname of the worker
+            instrument_names: Instruments the worker owns. If None, they are
+                looked up from the computer's ComputerBindings.
+            lease_seconds: Lease duration; renew it with heartbeat_scan_job()
+
+        Returns:
+            Claimed job as dictionary (including 'scan_data'), or None
+        """
+        from database.models import ScanJob
+        from sqlalchemy.exc import OperationalError
+
+        if instrument_names is None:
+            instrument_names = self.get_instrument_names_for_computer(computer_name)
+        owned = set(instrument_names)
+
+        # Jobs whose lease expired on their last attempt are never claimable
+        self.requeue_expired_scan_jobs()
+
+        now = datetime.utcnow()
+        claimable = or_(
+            ScanJob.status == 'pending',
+            and_(
+                ScanJob.status.in_(self.SCAN_JOB_ACTIVE_STATES),
+                ScanJob.lease_expires_at < now,
+                ScanJob.attempts < ScanJob.max_attempts,
+            ),
+        )
+
+        with self.session_scope() as session:
+            candidates = session.query(ScanJob.id, ScanJob.required_instruments).filter(
+                claimable
+            ).order_by(desc(ScanJob.priority), ScanJob.id).all()
+            busy = self._leased_instruments(session, now)
+
+        for job_id, required in candidates:
+            required = set(required or [])
+            if not required.issubset(owned) or required & busy:
+                continue
+
+            # Each attempt runs in its own write transaction so the UPDATE is
+            # the first statement (avoids stale-snapshot lock upgrades on SQLite)
+            try:
+                with self.session_scope() as session:
+                    claimed = session.query(ScanJob).filter(
+                        ScanJob.id == job_id, claimable
+                    ).update({
+                        ScanJob.status: 'claimed',
+                        ScanJob.lease_owner: worker_id,
+                        ScanJob.computer_name: computer_name,
+                        ScanJob.lease_expires_at: now + timedelta(seconds=lease_seconds),
+                        ScanJob.heartbeat_at: now,
+                        ScanJob.attempts: ScanJob.attempts + 1,
+                        ScanJob.error_message: None,
+                    }, synchronize_session=False)
+
+                    if claimed != 1:
+                        continue
+                    if required & self._leased_instruments(session, now, exclude_job_id=job_id):
+                        # Another claim on a shared instrument committed first
+                        raise _ScanJobConflict()
+
+                    job = session.query(ScanJob).filter(ScanJob.id == job_id).first()
+                    if job.queue_id:
+                        queue = session.query(Queue).filter(Queue.id == job.queue_id).first()
+                        if queue and queue.status in ('pending', 'idle'):
+                            queue.status = 'running'
+                            queue.started_at = queue.started_at or now
+                    session.flush()
+                    claimed_job = self._scan_job_to_dict(job, include_data=True)
+            except (OperationalError, _ScanJobConflict):
+                # Lost a race against another worker; try the next job
+                continue
+
+            # A concurrent claim may have been invisible to the transaction
+            # above (e.g. READ COMMITTED on PostgreSQL); whoever sees it backs off
+            with self.session_scope() as session:
+                conflict = required & self._leased_instruments(session, now, exclude_job_id=job_id)
+            if conflict:
+                self.release_scan_job(job_id, worker_id)
+                continue
+            return claimed_job
+
+        return None
+
+    def _leased_instruments(self, session: Session, now: datetime, exclude_job_id: Optional[int] = None) -> set:
+        """Instruments required by active jobs whose lease has not expired."""
+        from database.models import ScanJob
+
+        query = session.query(ScanJob.required_instruments).filter(
+            ScanJob.status.in_(self.SCAN_JOB_ACTIVE_STATES),
+            ScanJob.lease_expires_at >= now,
+        )
+        if exclude_job_id is not None:
+            query = query.filter(ScanJob.id != exclude_job_id)
+        busy = set()
+        for (required,) in query.all():
+            busy.update(required or [])
+        return busy
+
+    def heartbeat_scan_job(
+        self,
+        job_id: int,
+        worker_id: str,
+        lease_seconds: float = 30.0,
+        status: Optional[str] = None,
+    ) -> bool:
+        """Renew a job lease.
+
+        Args:
+            job_id: Database job ID
+            worker_id: Worker holding the lease
+            lease_seconds: New lease duration from now
+            status: Optionally move the job to a new active status ('running')
+
+        Returns:
+            True if the lease was renewed, False if the worker no longer owns it
+        """
+        from database.models import ScanJob
+
+        now = datetime.utcnow()
+        values = {
+            ScanJob.lease_expires_at: now + timedelta(seconds=lease_seconds),
+            ScanJob.heartbeat_at: now,
+        }
+        if status:
+            values[ScanJob.status] = status
+            if status == 'running':
+                values[ScanJob.started_at] = func.coalesce(ScanJob.started_at, now)
+
+        with self.session_scope() as session:
+            updated = session.query(ScanJob).filter(
+                ScanJob.id == job_id,
+                ScanJob.lease_owner == worker_id,
+                ScanJob.status.in_(self.SCAN_JOB_ACTIVE_STATES),
+            ).update(values, synchronize_session=False)
+            return updated == 1
+
+    def complete_scan_job(
+        self,
+        job_id: int,
+        worker_id: str,
+        status: str = 'completed',
+        scan_id: Optional[int] = None,
+        result: Optional[Dict] = None,
+        error_message: Optional[str] = None,
+    ) -> bool:
+        """Record the final outcome of a job held by a worker.
+
+        Args:
+            job_id: Database job ID
+            worker_id: Worker holding the lease
+            status: Final status ('completed', 'failed', 'aborted')
+            scan_id: Database scan ID created while running the job
+            result: Summary data to store with the job
+            error_message: Error text for failed jobs
+
+        Returns:
+            True if recorded, False if the worker no longer owns the job
+        """
+        from database.models import ScanJob
+
+        with self.session_scope() as session:
+            job = session.query(ScanJob).filter(
+                ScanJob.id == job_id,
+                ScanJob.lease_owner == worker_id,
+                ScanJob.status.in_(self.SCAN_JOB_ACTIVE_STATES),
+            ).first()
+            if not job:
+                return False
+
+            job.status = status
+            job.completed_at = datetime.utcnow()
+            job.lease_expires_at = None
+            if scan_id is not None:
+                job.scan_id = scan_id
+            if result is not None:
+                job.result = result
+            if error_message is not None:
+                job.error_message = error_message
+            session.flush()
+
+            if job.queue_id:
+                self._sync_queue_from_scan_jobs(session, job.queue_id)
+            return True
+
+    def fail_scan_job(
+        self,
+        job_id: int,
+        worker_id: str,
+        error_message: str,
+        retry: bool = True,
+        scan_id: Optional[int] = None,
+    ) -> bool:
+        """Fail a job, returning it to the pending pool if attempts remain.
+
+        Args:
+            job_id: Database job ID
+            worker_id: Worker holding the lease
+            error_message: Error description
+            retry: If True and attempts remain, the job becomes pending again
+            scan_id: Database scan ID created while running the job
+
+        Returns:
+            True if recorded, False if the worker no longer owns the job
+        """
+        from database.models import ScanJob
+
+        with self.session_scope() as session:
+            job = session.query(ScanJob).filter(
+                ScanJob.id == job_id,
+                ScanJob.lease_owner == worker_id,
+                ScanJob.status.in_(self.SCAN_JOB_ACTIVE_STATES),
+            ).first()
+            if not job:
+                return False
+
+            job.error_message = error_message
+            if scan_id is not None:
+                job.scan_id = scan_id
+            if retry and job.attempts < job.max_attempts:
+                job.status = 'pending'
+                job.lease_owner = None
+                job.lease_expires_at = None
+            else:
+                job.status = 'failed'
+                job.completed_at = datetime.utcnow()
+                job.lease_expires_at = None
+            session.flush()
+
+            if job.queue_id:
+                self._sync_queue_from_scan_jobs(session, job.queue_id)
+            return True
+
+    def release_scan_job(self, job_id: int, worker_id: str) -> bool:
+        """Hand a claimed job back to the pending pool without consuming an attempt.
+
+        Args:
+            job_id: Database job ID
+            worker_id: Worker holding the lease
+
+        Returns:
+            True if released, False if the worker no longer owns the job
+        """
+        from database.models import ScanJob
+
+        with self.session_scope() as session:
+            released = session.query(ScanJob).filter(
+                ScanJob.id == job_id,
+                ScanJob.lease_owner == worker_id,
+                ScanJob.status.in_(self.SCAN_JOB_ACTIVE_STATES),
+            ).update({
+                ScanJob.status: 'pending',
+                ScanJob.lease_owner: None,
+                ScanJob.lease_expires_at: None,
+                ScanJob.attempts: ScanJob.attempts - 1,
+            }, synchronize_session=False)
+            return released == 1
+
+    def cancel_scan_job(self, job_id: int) -> bool:
+        """Abort a job that has not finished yet.
+
+        A running worker notices the cancellation on its next heartbeat.
+
+        Args:
+            job_id: Database job ID
+
+        Returns:
+            True if cancelled, False if not found or already finished
+        """
+        from database.models import ScanJob
+
+        with self.session_scope() as session:
+            job = session.query(ScanJob).filter(
+                ScanJob.id == job_id,
+                ScanJob.status.notin_(self.SCAN_JOB_FINISHED_STATES),
+            ).first()
+            if not job:
+                return False
+
+            job.status = 'aborted'
+            job.lease_owner = None
+            job.lease_expires_at = None
+            job.completed_at = datetime.utcnow()
+            session.flush()
+
+            if job.queue_id:
+                self._sync_queue_from_scan_jobs(session, job.queue_id)
+            return True
+
+    def requeue_expired_scan_jobs(self) -> int:
+        """Return jobs whose worker stopped heartbeating to the pending pool.
+
+        Jobs that have used all their attempts are marked failed instead.
+        claim_scan_job() calls this first, so jobs whose lease expired on
+        their last attempt are failed and their queue can finish.
+
+        Returns:
+            Number of jobs requeued or failed
+        """
+        from database.models import ScanJob
+
+        now = datetime.utcnow()
+        with self.session_scope() as session:
+            expired = session.query(ScanJob).filter(
+                ScanJob.status.in_(self.SCAN_JOB_ACTIVE_STATES),
+                ScanJob.lease_expires_at < now,
+            ).all()
+
+            queue_ids = set()
+            for job in expired:
+                if job.attempts < job.max_attempts:
+                    job.status = 'pending'
+                else:
+                    job.status = 'failed'
+                    job.completed_at = now
+                    job.error_message = job.error_message or 'Worker lease expired'
+                job.lease_owner = None
+                job.lease_expires_at = None
+                if job.queue_id:
+                    queue_ids.add(job.queue_id)
+            session.flush()
+
+            for queue_id in queue_ids:
+                self._sync_queue_from_scan_jobs(session, queue_id)
+            return len(expired)
+
+    def _sync_queue_from_scan_jobs(self, session: Session, queue_id: int):
+        """Recompute a queue's progress and status from its jobs.
+
+        Several workers may finish jobs of the same queue concurrently, so the
+        counts are derived from the job table rather than incremented.
+        """
+        from database.models import ScanJob
+
+        queue = session.query(Queue).filter(Queue.id == queue_id).first()
+        if not queue:
+            return
+
+        counts = dict(session.query(ScanJob.status, func.count(ScanJob.id)).filter(
+            ScanJob.queue_id == queue_id
+        ).group_by(ScanJob.status).all())
+
+        total = sum(counts.values())
+        finished = sum(counts.get(s, 0) for s in self.SCAN_JOB_FINISHED_STATES)
+
+        queue.total_scans = total
+        queue.completed_scans = finished
+        if total and finished >= total:
+            queue.status = 'failed' if counts.get('failed') else 'completed'
+            queue.completed_at = queue.completed_at or datetime.utcnow()
+        elif finished or any(counts.get(s) for s in self.SCAN_JOB_ACTIVE_STATES):
+            queue.status = 'running'
+        session.flush()
+
+    def _scan_job_to_dict(self, job, include_data: bool = False) -> Dict:
+        """Convert ScanJob model to dictionary."""
+        result = {
+            'id': job.id,
+            'name': job.name,
+            'status': job.status,
+            'priority': job.priority,
+            'required_instruments': job.required_instruments or [],
+            'lab_id': job.lab_id,
+            'queue_id': job.queue_id,
+            'project_id': job.project_id,
+            'sample_id': job.sample_id,
+            'scan_id': job.scan_id,
+            'created_by': job.created_by,
+            'lease_owner': job.lease_owner,
+            'computer_name': job.computer_name,
+            'lease_expires_at': job.lease_expires_at.isoformat() if job.lease_expires_at else None,
+            'heartbeat_at': job.heartbeat_at.isoformat() if job.heartbeat_at else None,
+            'attempts': job.attempts,
+            'max_attempts': job.max_attempts,
+            'error_message': job.error_message,
+            'result': job.result,
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'completed_at': job.completed_at.isoformat() if job.completed_at else None,
+            'created_at': job.created_at.isoformat() if job.created_at else None,
+        }
+        if include_data:
+            result['scan_data'] = job.scan_data
+        return result
+
     # ==================== Instruments (PyBirch-compatible devices) ====================
     
     def get_instruments_list(
@@ -1862,6 +3486,103 @@ class DatabaseService:
             
             return self._instrument_to_dict(instrument, session=session)
     
+    def update_instrument_status(
+        self,
+        instrument_id: int,
+        status: Optional[str] = None,
+        error_message: Optional[str] = None,
+        current_settings: Optional[Dict] = None,
+        telemetry: Optional[Dict] = None,
+    ) -> bool:
+        """Update the live status row of an instrument, creating it if needed.
+        
+        Fields left as None keep their stored values, so telemetry pushes
+        don't overwrite the connection status and vice versa.
+        
+        Args:
+            instrument_id: ID of the instrument
+            status: New status ('connected', 'disconnected', 'error', 'busy', ...)
+            error_message: Error message if status is 'error'
+            current_settings: Current instrument settings
+            telemetry: Per-operation performance statistics
+        
+        Returns:
+            True if successful, False if the instrument does not exist
+        """
+        from database.models import InstrumentStatus
+        
+        with self.session_scope() as session:
+            instrument = session.query(Instrument).filter(
+                Instrument.id == instrument_id
+            ).first()
+            if not instrument:
+                return False
+            
+            row = session.query(InstrumentStatus).filter(
+                InstrumentStatus.instrument_id == instrument_id
+            ).order_by(InstrumentStatus.updated_at.desc(), InstrumentStatus.id.desc()).first()
+            if row is None:
+                row = InstrumentStatus(instrument_id=instrument_id)
+                session.add(row)
+            
+            if status is not None:
+                row.status = status
+                if status == 'connected':
+                    row.last_connected = datetime.utcnow()
+                row.error_message = error_message
+            elif error_message is not None:
+                row.error_message = error_message
+            if current_settings is not None:
+                row.current_settings = current_settings
+            if telemetry is not None:
+                row.telemetry = telemetry
+            row.updated_at = datetime.utcnow()
+            return True
+    
+    def get_equipment_instrument_ids(self, equipment_id: int, name: Optional[str] = None) -> List[int]:
+        """Get the IDs of the instruments belonging to a piece of equipment.
+        
+        Equipment and instruments are separate tables: instruments point at
+        their equipment through Instrument.equipment_id. If none do, the
+        instruments named `name` are returned instead.
+        
+        Args:
+            equipment_id: ID of the equipment
+            name: Instrument name to fall back to
+        
+        Returns:
+            Instrument IDs (empty if there are none)
+        """
+        with self.session_scope() as session:
+            rows = session.query(Instrument.id).filter(
+                Instrument.equipment_id == equipment_id
+            ).order_by(Instrument.id).all()
+            if not rows and name:
+                rows = session.query(Instrument.id).filter(
+                    Instrument.name == name
+                ).order_by(Instrument.id).all()
+            return [row[0] for row in rows]
+    
+    def get_instrument_status(self, instrument_id: int) -> Optional[Dict]:
+        """Get the latest live status of an instrument, including its telemetry."""
+        from database.models import InstrumentStatus
+        
+        with self.session_scope() as session:
+            row = session.query(InstrumentStatus).filter(
+                InstrumentStatus.instrument_id == instrument_id
+            ).order_by(InstrumentStatus.updated_at.desc(), InstrumentStatus.id.desc()).first()
+            if row is None:
+                return None
+            return {
+                'instrument_id': row.instrument_id,
+                'status': row.status,
+                'last_connected': row.last_connected.isoformat() if row.last_connected else None,
+                'current_settings': row.current_settings,
+                'error_message': row.error_message,
+                'telemetry': row.telemetry,
+                'updated_at': row.updated_at.isoformat() if row.updated_at else None,
+            }
+    
     def _instrument_to_dict(self, instrument: Instrument, include_computer_bindings: bool = False, session=None) -> Dict:
         """Convert Instrument model to dictionary."""
         from database.models import ObjectLocation, Location
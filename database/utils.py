@@ -5,11 +5,12 @@ Utility functions for common database operations.
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 import pandas as pd
 import numpy as np
 
 from database.session import get_session, get_db
+from database.data_reader import DEFAULT_READ_ROWS, iter_measurement_frames
 from database.models import (
     Sample, Scan, Queue, MeasurementObject, MeasurementDataPoint,
     Template, Tag, EntityTag
@@ -48,30 +49,43 @@ def get_scan_data_as_dataframe(scan_id: int, measurement_name: Optional[str] = N
     """
     result = {}
     
-    with get_session() as session:
-        scan = scan_crud.get_with_data(session, scan_id)
-        if not scan:
-            return result
-        
-        for mobj in scan.measurement_objects:
-            if measurement_name and mobj.name != measurement_name:
-                continue
-            
-            # Extract data points
-            data = []
-            for point in sorted(mobj.data_points, key=lambda p: p.sequence_index or 0):
-                row = point.values.copy()
-                row['_sequence_index'] = point.sequence_index
-                row['_timestamp'] = point.timestamp
-                data.append(row)
-            
-            if data:
-                df = pd.DataFrame(data)
-                result[mobj.name] = df
+    for name, frames in iter_scan_frames(scan_id, measurement_name):
+        chunks = list(frames)
+        if chunks:
+            result[name] = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
     
     return result
 
 
+def iter_scan_frames(
+    scan_id: int,
+    measurement_name: Optional[str] = None,
+    chunk_size: int = DEFAULT_READ_ROWS,
+) -> Iterator[Tuple[str, Iterator[pd.DataFrame]]]:
+    """
+    Stream scan measurement data, one measurement at a time.
+    
+    Each measurement's frames must be consumed before moving on to the next.
+    
+    Args:
+        scan_id: Database ID of the scan
+        measurement_name: Optional filter for specific measurement
+        chunk_size: Rows per DataFrame
+        
+    Yields:
+        (measurement name, iterator of DataFrames in sequence order)
+    """
+    with get_session() as session:
+        query = session.query(MeasurementObject.id, MeasurementObject.name).filter(
+            MeasurementObject.scan_id == scan_id
+        )
+        if measurement_name:
+            query = query.filter(MeasurementObject.name == measurement_name)
+        
+        for mo_id, name in query.order_by(MeasurementObject.id).all():
+            yield name, iter_measurement_frames(session, mo_id, chunk_size=chunk_size)
+
+
 def get_sample_scan_history(sample_id: str) -> List[Dict[str, Any]]:
     """
     Get the scan history for a sample.
@@ -280,21 +294,29 @@ def search_samples(
     return results
 
 
-def export_scan_to_csv(scan_id: int, output_dir: str) -> List[str]:
+def export_scan(scan_id: int, output_dir: str, fmt: str = 'csv') -> List[str]:
     """
-    Export scan data to CSV files.
+    Export scan data to one file per measurement.
+    
+    Files are written one chunk at a time (see database/export.py), so memory
+    use does not grow with the scan.
     
     Args:
         scan_id: Database ID of the scan
-        output_dir: Directory to save CSV files
+        output_dir: Directory to save the files in
+        fmt: 'csv', or 'parquet' / 'arrow' (need pyarrow)
         
     Returns:
         List of created file paths
     """
     import os
+    from database.export import EXPORT_FORMATS, available_formats, frames_to_arrow, frames_to_csv
+    
+    if fmt not in available_formats():
+        raise ValueError(f"Unknown or unavailable export format '{fmt}'")
+    extension = EXPORT_FORMATS[fmt][1]
     
     files = []
-    data = get_scan_data_as_dataframe(scan_id)
     
     with get_session() as session:
         scan = session.get(Scan, scan_id)
@@ -305,18 +327,45 @@ def export_scan_to_csv(scan_id: int, output_dir: str) -> List[str]:
     
     os.makedirs(output_dir, exist_ok=True)
     
-    for name, df in data.items():
+    for name, frames in iter_scan_frames(scan_id):
         # Clean up measurement name for filename
         clean_name = name.replace('/', '_').replace('\\', '_').replace(' ', '_')
-        filename = f"{base_name}_{clean_name}.csv"
+        filename = f"{base_name}_{clean_name}.{extension}"
         filepath = os.path.join(output_dir, filename)
         
-        df.to_csv(filepath, index=False)
+        if fmt == 'csv':
+            written = False
+            with open(filepath, 'w', newline='') as f:
+                for text in frames_to_csv(frames):
+                    f.write(text)
+                    written = True
+            if not written:
+                # No data and no columns to write a header for
+                os.remove(filepath)
+                continue
+        else:
+            with open(filepath, 'wb') as f:
+                for data in frames_to_arrow(frames, fmt):
+                    f.write(data)
         files.append(filepath)
     
     return files
 
 
+def export_scan_to_csv(scan_id: int, output_dir: str) -> List[str]:
+    """
+    Export scan data to CSV files.
+    
+    Args:
+        scan_id: Database ID of the scan
+        output_dir: Directory to save CSV files
+        
+    Returns:
+        List of created file paths
+    """
+    return export_scan(scan_id, output_dir, 'csv')
+
+
 def get_database_stats() -> Dict[str, Any]:
     """
     Get statistics about the database contents.
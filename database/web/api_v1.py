@@ -1074,10 +1074,21 @@ def create_measurement(scan_id):
 @api_v1_bp.route('/measurements/<int:measurement_id>/data', methods=['GET'])
 @api_auth_optional
 def get_measurement_data(measurement_id):
-    """Get data points for a measurement."""
+    """Get data points for a measurement.
+    
+    Query params: page, per_page, columns (comma-separated), start_index, end_index
+    """
     try:
         db = get_db_service()
-        data_points = db.get_measurement_data_points(measurement_id)
+        columns = request.args.get('columns')
+        data_points = db.get_measurement_data_points(
+            measurement_id,
+            page=request.args.get('page', 1, type=int),
+            per_page=max(1, min(request.args.get('per_page', 1000, type=int), 10000)),
+            columns=columns.split(',') if columns else None,
+            start_index=request.args.get('start_index', type=int),
+            end_index=request.args.get('end_index', type=int),
+        )
         return api_response(data_points)
     except Exception as e:
         return api_error(str(e), code="QUERY_ERROR", status=500)
@@ -9,7 +9,7 @@ import shutil
 from datetime import datetime
 from functools import wraps
 from io import BytesIO
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, session, g, send_file, Response, current_app, make_response
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, session, g, send_file, Response, current_app, make_response, stream_with_context
 from database.services import get_db_service
 
 # Main blueprint for HTML pages
@@ -1173,15 +1173,14 @@ def scans():
 @main_bp.route('/scans/<int:scan_id>')
 def scan_detail(scan_id):
     """Scan detail page."""
+    from database.export import available_formats
+    
     db = get_db_service()
     scan = db.get_scan(scan_id)
     if not scan:
         flash('Scan not found', 'error')
         return redirect(url_for('main.scans'))
     
-    # Get data points for visualization
-    data_points = db.get_scan_data_points(scan_id)
-    
     # Get visualization data organized by measurement object
     visualization_data = db.get_visualization_data(scan_id)
     
@@ -1191,17 +1190,30 @@ def scan_detail(scan_id):
     
     return render_template('scan_detail.html', 
                           scan=scan, 
-                          data_points=data_points,
                           visualization_data=visualization_data,
                           samples=samples,
-                          projects=projects)
+                          projects=projects,
+                          export_formats=available_formats())
 
 
 @main_bp.route('/scans/<int:scan_id>/download-csv')
 def download_scan_csv(scan_id):
     """Download scan data as CSV file."""
-    import csv
-    from io import StringIO
+    return export_scan_data(scan_id, 'csv')
+
+
+@main_bp.route('/scans/<int:scan_id>/export/<fmt>')
+def export_scan_data(scan_id, fmt):
+    """Stream scan data as CSV, Parquet or Arrow IPC.
+    
+    Query parameters:
+        measurement: Measurement to export (required for parquet/arrow when
+            the scan has several)
+        columns: Comma-separated columns to include
+        metadata: '0' to leave out the '#' comment lines of a CSV
+    """
+    from werkzeug.utils import secure_filename
+    from database.export import EXPORT_FORMATS
     
     db = get_db_service()
     scan = db.get_scan(scan_id)
@@ -1209,46 +1221,26 @@ def download_scan_csv(scan_id):
         flash('Scan not found', 'error')
         return redirect(url_for('main.scans'))
     
-    # Get visualization data which has all measurement data organized
-    visualization_data = db.get_visualization_data(scan_id)
-    
-    # Create CSV content
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Write header info
-    writer.writerow([f"# Scan: {scan.get('scan_id', scan_id)}"])
-    writer.writerow([f"# Name: {scan.get('name', 'Unnamed')}"])
-    writer.writerow([f"# Status: {scan.get('status', 'unknown')}"])
-    writer.writerow([f"# Created: {scan.get('created_at', '')}"])
-    writer.writerow([])
-    
-    # Write data for each measurement object
-    for name, data in visualization_data.items():
-        writer.writerow([f"# Measurement: {name}"])
-        
-        columns = data.get('columns', [])
-        if columns:
-            writer.writerow(['index'] + columns)
-        else:
-            writer.writerow(['index', 'x', 'y'])
-        
-        all_values = data.get('all_values', [])
-        for row in all_values:
-            if columns:
-                writer.writerow([row.get('sequence_index', '')] + [row.get(col, '') for col in columns])
-            else:
-                writer.writerow([row.get('sequence_index', ''), row.get('x', ''), row.get('y', '')])
-        
-        writer.writerow([])
-    
-    # Create response
-    output.seek(0)
-    filename = f"scan_{scan.get('scan_id', scan_id)}.csv"
-    
+    measurement = request.args.get('measurement') or None
+    columns = [c.strip() for c in request.args.get('columns', '').split(',') if c.strip()] or None
+    try:
+        pieces = db.export_scan(
+            scan_id, fmt, measurement_name=measurement, columns=columns,
+            include_metadata=request.args.get('metadata', '1') != '0',
+        )
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('main.scan_detail', scan_id=scan_id))
+    if pieces is None:
+        flash('Measurement not found', 'error')
+        return redirect(url_for('main.scan_detail', scan_id=scan_id))
+    
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    name = f"scan_{scan.get('scan_id') or scan_id}" + (f"_{measurement}" if measurement else '')
+    filename = secure_filename(f"{name}.{extension}") or f"scan_{scan_id}.{extension}"
     return Response(
-        output.getvalue(),
-        mimetype='text/csv',
+        stream_with_context(pieces),
+        mimetype=mimetype,
         headers={'Content-Disposition': f'attachment; filename={filename}'}
     )
 
@@ -8301,10 +8293,120 @@ def api_scan(scan_id):
 
 @api_bp.route('/scans/<int:scan_id>/data')
 def api_scan_data(scan_id):
-    """Get scan measurement data points."""
+    """Get scan measurement data points, streamed as they are read."""
+    import json
+    
     db = get_db_service()
-    data_points = db.get_scan_data_points(scan_id)
-    return jsonify({'data_points': data_points})
+    points = db.iter_scan_data_points(scan_id, request.args.get('measurement') or None)
+    
+    def generate():
+        yield '{"data_points": ['
+        for i, point in enumerate(points):
+            yield (',' if i else '') + json.dumps(point, default=str)
+        yield ']}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+@api_bp.route('/measurements/<int:measurement_id>/visualization')
+def api_measurement_visualization(measurement_id):
+    """Get one channel of a measurement at the resolution of the viewport.
+    
+    Query params: channel (required), x_column, x_min, x_max, width (pixels)
+    """
+    channel = request.args.get('channel')
+    if not channel:
+        return jsonify({'error': 'channel is required'}), 400
+    
+    db = get_db_service()
+    window = db.get_visualization_window(
+        measurement_id,
+        channel,
+        x_column=request.args.get('x_column') or None,
+        x_min=request.args.get('x_min', type=float),
+        x_max=request.args.get('x_max', type=float),
+        width=min(request.args.get('width', 1000, type=int), 10000),
+    )
+    return jsonify(window)
+
+
+@api_bp.route('/measurements/<int:measurement_id>/cube')
+def api_measurement_cube(measurement_id):
+    """Describe a measurement's data cube (axes, coordinates, channels, shape).
+    
+    Query params: axes (comma-separated position columns; default: movement columns),
+    tolerance (position snapping tolerance in axis units)
+    """
+    axes = [a for a in request.args.get('axes', '').split(',') if a] or None
+    tolerance = request.args.get('tolerance', type=float)
+    
+    db = get_db_service()
+    try:
+        cube = db.get_data_cube(measurement_id, axes=axes, tolerance=tolerance)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if cube is None:
+        return jsonify({'error': 'Measurement not found'}), 404
+    return jsonify(cube)
+
+
+@api_bp.route('/scans/<int:scan_id>/reduce', methods=['POST'])
+def api_scan_reduce(scan_id):
+    """Slice, project or line-cut a measurement's data cube.
+    
+    JSON body (see docs/DIMENSION_REDUCTION.md):
+        measurement: Measurement name (required)
+        channel: Column to reduce (default: the first non-position column)
+        display_axes: Axes of the result, e.g. ["x M(um)", "y M(um)"]
+        reductions: [{"dimension": ..., "method": "slice"|"max"|"min"|"mean"|"sum"|"std",
+                      "value": ... or "index": ...}]
+        axes: Position columns to grid on (default: movement columns)
+        tolerance: Position snapping tolerance in axis units (default: from the gaps between positions)
+        max_cells: Block-average the result down to at most this many cells (default: every cell)
+    
+    A 2-D result is returned as a heatmap (z[y][x]), a 1-D result as a line (x, y).
+    """
+    params = request.get_json(silent=True) or {}
+    if not params.get('measurement'):
+        return jsonify({'error': 'measurement is required'}), 400
+    
+    db = get_db_service()
+    mo = db.get_measurement_object(scan_id, params['measurement'])
+    if not mo:
+        return jsonify({'error': 'Measurement not found'}), 404
+    try:
+        result = db.reduce_data_cube(
+            mo['id'],
+            params.get('channel') or None,
+            reductions=params.get('reductions') or None,
+            display_axes=params.get('display_axes') or None,
+            axes=params.get('axes') or None,
+            tolerance=float(params['tolerance']) if params.get('tolerance') is not None else None,
+            max_cells=int(params['max_cells']) if params.get('max_cells') is not None else None,
+        )
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    axes, coords, values = result['axes'], result['coords'], result['values']
+    label = result['channel'] + (f" ({', '.join(result['labels'])})" if result['labels'] else '')
+    if len(axes) == 2:
+        data = {
+            'z': [list(row) for row in zip(*values)] if values else [],
+            'x': coords[0], 'y': coords[1],
+            'x_label': axes[0], 'y_label': axes[1], 'z_label': label,
+        }
+    elif len(axes) == 1:
+        data = {'x': coords[0], 'y': values, 'x_label': axes[0], 'y_label': label}
+    else:
+        data = {'values': values, 'axes': axes, 'coords': coords, 'label': label}
+    
+    return jsonify({
+        'data': data,
+        'channel': result['channel'],
+        'version': result['version'],
+        'original_shape': result['original_shape'],
+        'reduced_shape': result['reduced_shape'],
+    })
 
 
 @api_bp.route('/queues')
@@ -16,7 +16,9 @@ Base Classes:
 Mixins:
 -------
 - InstrumentSettingsMixin: Automatic settings management
-- SimulatedDelay: Add communication delays to fake instruments
+- SimulatedDelay: Add communication delays (latency distributions, shared buses) to fake instruments
+- CancellationMixin: Interruptible waits that honour scan aborts
+- CommandBatchingMixin: Several SCPI commands per bus transaction (VISA classes)
 
 Quick Start:
 ------------
@@ -70,11 +72,32 @@ from pybirch.Instruments.base import (
     # Mixins
     InstrumentSettingsMixin,
     SimulatedDelay,
+    CancellationMixin,
+    
+    # Settings cache policies
+    SETTINGS_CACHE_OFF,
+    SETTINGS_CACHE_RECONNECT,
+    SETTINGS_CACHE_INITIALIZE,
     
     # Legacy compatibility
     get_legacy_measurement_class,
     get_legacy_movement_class,
 )
+from pybirch.Instruments.batching import (
+    CommandBatch,
+    CommandBatchingMixin,
+    SimulatedTransport,
+)
+from pybirch.Instruments.simulation import (
+    Latency,
+    SimulatedBus,
+    get_simulated_bus,
+)
+from pybirch.Instruments.telemetry import (
+    InstrumentTelemetry,
+    TelemetryMixin,
+    TelemetryReporter,
+)
 
 __all__ = [
     # Base classes
@@ -90,6 +113,27 @@ __all__ = [
     # Mixins
     "InstrumentSettingsMixin",
     "SimulatedDelay",
+    "CancellationMixin",
+    "CommandBatchingMixin",
+    "TelemetryMixin",
+    
+    # Command batching
+    "CommandBatch",
+    "SimulatedTransport",
+    
+    # Timing simulation
+    "Latency",
+    "SimulatedBus",
+    "get_simulated_bus",
+    
+    # Performance telemetry
+    "InstrumentTelemetry",
+    "TelemetryReporter",
+    
+    # Settings cache policies
+    "SETTINGS_CACHE_OFF",
+    "SETTINGS_CACHE_RECONNECT",
+    "SETTINGS_CACHE_INITIALIZE",
     
     # Legacy compatibility
     "get_legacy_measurement_class",
@@ -90,9 +90,9 @@ EXAMPLE: Real VISA instrument with proprietary commands
                 self.instrument.write(f"ISRC {settings['input_source']}")
         
         def _perform_measurement_impl(self):
-            x = float(self.instrument.query("OUTP? 1"))
-            y = float(self.instrument.query("OUTP? 2"))
-            return np.array([[x, y]])
+            # One bus transaction for both reads (see pybirch.Instruments.batching)
+            x, y = self.query_many(["OUTP? 1", "OUTP? 2"])
+            return np.array([[float(x), float(y)]])
 """
 
 import numpy as np
@@ -101,6 +101,26 @@ from abc import ABC, abstractmethod
 from typing import Any, Callable, Dict, List, Optional, Type, Union
 import time
 
+from pybirch.Instruments.batching import CommandBatchingMixin
+from pybirch.Instruments.telemetry import TelemetryMixin
+
+
+# Settings cache policies: when the last known device settings are forgotten
+SETTINGS_CACHE_OFF = "off"                # Always write every key
+SETTINGS_CACHE_RECONNECT = "reconnect"    # Forget on connect() and shutdown()
+SETTINGS_CACHE_INITIALIZE = "initialize"  # Also forget on initialize()
+
+
+def _same_setting(a: Any, b: Any) -> bool:
+    """Whether two setting values are equal (arrays compared element-wise)."""
+    try:
+        equal = a == b
+        if isinstance(equal, np.ndarray):
+            return bool(np.array_equal(a, b))
+        return bool(equal)
+    except Exception:
+        return False
+
 
 class InstrumentSettingsMixin:
     """
@@ -129,12 +149,79 @@ class InstrumentSettingsMixin:
         def settings(self, settings: dict):
             if "gain" in settings:
                 self.instrument.write(f"GAIN {settings['gain']}")
+    
+    Settings cache:
+        Every assignment to `settings` is recorded as the last known device
+        state. apply_settings() compares a settings dict against that state
+        and only assigns the keys that differ, so re-applying a scan's
+        settings to an instrument that already has them sends no commands.
+        Assigning an attribute named like a known setting (e.g. moving a
+        stage through `position`) forgets that key.
+        `settings_cache_policy` decides when the known state is forgotten:
+        SETTINGS_CACHE_INITIALIZE (default) on connect(), shutdown() and
+        initialize(); SETTINGS_CACHE_RECONNECT only on connect() and
+        shutdown(), for drivers whose initialization leaves settings alone;
+        SETTINGS_CACHE_OFF disables the cache.
     """
     
+    settings_cache_policy: str = SETTINGS_CACHE_INITIALIZE
+    
     def __init__(self):
         self._settings_keys: List[str] = []
         self._settings_defaults: Dict[str, Any] = {}
         self._use_auto_settings = False
+        self._known_settings: Dict[str, Any] = {}
+        self.settings_cache_stats: Dict[str, int] = {"written": 0, "skipped": 0, "invalidated": 0}
+    
+    def __setattr__(self, name: str, value: Any):
+        known = self.__dict__.get("_known_settings")
+        if known and name != "settings":
+            # A setting also written through its own setter (e.g. a move via
+            # `position`) no longer matches the known state
+            known.pop(name, None)
+        super().__setattr__(name, value)
+        # Write-through: whatever was assigned is now the device state
+        if name == "settings" and isinstance(value, dict):
+            if known is not None and self.settings_cache_policy != SETTINGS_CACHE_OFF:
+                known.update(value)
+    
+    def apply_settings(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Assign only the settings that differ from the last known device state.
+        
+        Args:
+            settings: Desired settings
+        
+        Returns:
+            The settings that were actually assigned.
+        """
+        known = self.__dict__.get("_known_settings")
+        if known is None or self.settings_cache_policy == SETTINGS_CACHE_OFF:
+            changed = dict(settings)
+        else:
+            changed = {key: value for key, value in settings.items()
+                       if key not in known or not _same_setting(known[key], value)}
+        
+        stats = self.__dict__.get("settings_cache_stats")
+        if stats is not None:
+            stats["written"] += len(changed)
+            stats["skipped"] += len(settings) - len(changed)
+        if changed:
+            self.settings = changed
+        return changed
+    
+    def invalidate_settings_cache(self):
+        """Forget the last known device settings; the next apply_settings() writes every key."""
+        known = self.__dict__.get("_known_settings")
+        if known:
+            known.clear()
+            self.settings_cache_stats["invalidated"] += 1
+    
+    def _invalidate_settings_cache_on(self, event: str):
+        """Apply the cache policy to a connect, shutdown or initialize event."""
+        if event == "initialize" and self.settings_cache_policy != SETTINGS_CACHE_INITIALIZE:
+            return
+        self.invalidate_settings_cache()
     
     def _define_settings(self, settings_dict: Dict[str, Any]):
         """
@@ -173,9 +260,51 @@ class InstrumentSettingsMixin:
         """Reset all settings to their default values."""
         for key, default_value in self._settings_defaults.items():
             setattr(self, f"_{key}", default_value)
+        known = self.__dict__.get("_known_settings")
+        if known is not None and self.settings_cache_policy != SETTINGS_CACHE_OFF:
+            known.update(self._settings_defaults)
+
+
+class CancellationMixin:
+    """
+    Mixin letting long instrument waits honour scan pause/abort requests.
+    
+    While a scan executes, it assigns its CancellationToken to
+    `cancellation_token` on every instrument in its tree (and clears it
+    afterwards). Use _sleep() instead of time.sleep() for settling times,
+    integrations, etc. so that an abort interrupts the wait immediately
+    instead of after it has elapsed.
+    
+    Usage:
+        def _perform_measurement_impl(self):
+            self.instrument.write("INIT")
+            if not self._sleep(self.integration_time):
+                return np.empty((0, len(self.data_columns)))  # Aborted
+            return self._read_buffer()
+    """
+    
+    cancellation_token = None
+    
+    def _sleep(self, seconds: float) -> bool:
+        """
+        Sleep unless the running scan is aborted.
+        
+        Args:
+            seconds: Time to wait in seconds.
+            
+        Returns:
+            True if the full time elapsed, False if the wait was cut short
+            by cancellation.
+        """
+        token = self.cancellation_token
+        if token is None:
+            if seconds > 0:
+                time.sleep(seconds)
+            return True
+        return not token.wait_for_cancellation(timeout=max(seconds, 0.0))
 
 
-class BaseMeasurementInstrument(InstrumentSettingsMixin, ABC):
+class BaseMeasurementInstrument(InstrumentSettingsMixin, CancellationMixin, TelemetryMixin, ABC):
     """
     Abstract base class for non-VISA measurement instruments.
     
@@ -271,7 +400,13 @@ class BaseMeasurementInstrument(InstrumentSettingsMixin, ABC):
     
     def connect(self):
         """Connect to the instrument. Calls _connect_impl()."""
-        self.status = self._connect_impl()
+        self._invalidate_settings_cache_on("connect")
+        start = time.perf_counter()
+        try:
+            self.status = self._connect_impl()
+        finally:
+            # A refused connection counts as an error too
+            self.telemetry.record("connect", time.perf_counter() - start, error=not self.status)
         return self.status
     
     def check_connection(self) -> bool:
@@ -280,16 +415,21 @@ class BaseMeasurementInstrument(InstrumentSettingsMixin, ABC):
     
     def initialize(self):
         """Initialize the instrument. Calls _initialize_impl()."""
-        self._initialize_impl()
+        self._invalidate_settings_cache_on("initialize")
+        with self._timed("initialize"):
+            self._initialize_impl()
     
     def shutdown(self):
         """Shutdown the instrument. Calls _shutdown_impl()."""
-        self._shutdown_impl()
+        with self._timed("shutdown"):
+            self._shutdown_impl()
         self.status = False
+        self._invalidate_settings_cache_on("shutdown")
     
     def perform_measurement(self) -> np.ndarray:
         """Perform a measurement. Calls _perform_measurement_impl()."""
-        return self._perform_measurement_impl()
+        with self._timed("measure"):
+            return self._perform_measurement_impl()
     
     def measurement_df(self) -> pd.DataFrame:
         """Convert the raw measurement data to a pandas DataFrame."""
@@ -352,7 +492,7 @@ class BaseMeasurementInstrument(InstrumentSettingsMixin, ABC):
             self.initialize()
 
 
-class BaseMovementInstrument(InstrumentSettingsMixin, ABC):
+class BaseMovementInstrument(InstrumentSettingsMixin, CancellationMixin, TelemetryMixin, ABC):
     """
     Abstract base class for non-VISA movement instruments.
     
@@ -369,8 +509,17 @@ class BaseMovementInstrument(InstrumentSettingsMixin, ABC):
         - self.position_units: str
         - self.position_column: str
         - Either call self._define_settings({...}) OR override settings property
+    
+    Position read-back cache:
+        Reading self.position queries the hardware. cached_position() reuses
+        the last read-back until the next move, or until it is older than
+        position_cache_max_age seconds; refresh_position() always reads.
+        The last value assigned to position is kept as commanded_position.
     """
     
+    # Seconds a read-back position stays valid (inf: until the next move, 0: never cached)
+    position_cache_max_age: float = float('inf')
+    
     def __init__(self, name: str):
         InstrumentSettingsMixin.__init__(self)
         self.name = name
@@ -380,11 +529,23 @@ class BaseMovementInstrument(InstrumentSettingsMixin, ABC):
         self.position_units: str = ''
         self.position_column: str = ''
         self.settings_UI: Callable[[], dict] = lambda: self.settings
+        self._commanded_position: Optional[float] = None
+        self._confirmed_position: Optional[float] = None
+        self._confirmed_at: float = 0.0
     
     def __base_class__(self):
         from pybirch.scan.movements import Movement
         return Movement
     
+    def __setattr__(self, name: str, value: Any):
+        if name != 'position':
+            super().__setattr__(name, value)
+            return
+        # The last read-back is stale as soon as a move starts, even if it fails
+        self.__dict__['_confirmed_position'] = None
+        super().__setattr__(name, value)
+        self.__dict__['_commanded_position'] = value
+    
     # -------------------------------------------------------------------------
     # OVERRIDE THESE with your proprietary instrument commands
     # -------------------------------------------------------------------------
@@ -450,7 +611,14 @@ class BaseMovementInstrument(InstrumentSettingsMixin, ABC):
     
     def connect(self):
         """Connect to the instrument. Calls _connect_impl()."""
-        self.status = self._connect_impl()
+        self._invalidate_settings_cache_on("connect")
+        self.invalidate_position_cache()
+        start = time.perf_counter()
+        try:
+            self.status = self._connect_impl()
+        finally:
+            # A refused connection counts as an error too
+            self.telemetry.record("connect", time.perf_counter() - start, error=not self.status)
         return self.status
     
     def check_connection(self) -> bool:
@@ -459,17 +627,58 @@ class BaseMovementInstrument(InstrumentSettingsMixin, ABC):
     
     def initialize(self):
         """Initialize the instrument. Calls _initialize_impl()."""
-        self._initialize_impl()
+        self._invalidate_settings_cache_on("initialize")
+        # Homing moves the stage without going through the position setter
+        self.invalidate_position_cache()
+        with self._timed("initialize"):
+            self._initialize_impl()
     
     def shutdown(self):
         """Shutdown the instrument. Calls _shutdown_impl()."""
-        self._shutdown_impl()
+        with self._timed("shutdown"):
+            self._shutdown_impl()
         self.status = False
+        self._invalidate_settings_cache_on("shutdown")
+        self.invalidate_position_cache()
+    
+    @property
+    def commanded_position(self) -> Optional[float]:
+        """The last position assigned, or None if it was never moved."""
+        return self.__dict__.get('_commanded_position')
+    
+    def refresh_position(self) -> float:
+        """Read the position from the instrument and cache it."""
+        with self._timed("position"):
+            position = self.position
+        self._confirmed_position = position
+        self._confirmed_at = time.monotonic()
+        return position
+    
+    def cached_position(self, max_age: Optional[float] = None) -> float:
+        """
+        Get the position, reading the instrument only if the cached one is stale.
+        
+        Args:
+            max_age: Oldest acceptable read-back in seconds
+                (defaults to position_cache_max_age)
+        
+        Returns:
+            The last confirmed position, or a fresh read-back
+        """
+        max_age = self.position_cache_max_age if max_age is None else max_age
+        confirmed = self.__dict__.get('_confirmed_position')
+        if confirmed is not None and time.monotonic() - self._confirmed_at <= max_age:
+            return confirmed
+        return self.refresh_position()
+    
+    def invalidate_position_cache(self):
+        """Forget the last read-back so the next cached_position() queries the instrument."""
+        self._confirmed_position = None
     
     def position_df(self) -> pd.DataFrame:
         """Return the current position as a pandas DataFrame."""
         column = f"{self.position_column} ({self.position_units})"
-        return pd.DataFrame({column: [self.position]})
+        return pd.DataFrame({column: [self.cached_position()]})
     
     @property
     def settings(self) -> dict:
@@ -521,7 +730,7 @@ class BaseMovementInstrument(InstrumentSettingsMixin, ABC):
             self.initialize()
 
 
-class VisaBaseMeasurementInstrument(BaseMeasurementInstrument):
+class VisaBaseMeasurementInstrument(CommandBatchingMixin, BaseMeasurementInstrument):
     """
     Base class for VISA-based measurement instruments.
     
@@ -533,6 +742,8 @@ class VisaBaseMeasurementInstrument(BaseMeasurementInstrument):
     - Implement _perform_measurement_impl() with your measurement commands
     
     The VISA instrument is available as self.instrument after connection.
+    Several commands can share one bus transaction through self.batch(),
+    self.query_many() and self.write_many() (see CommandBatchingMixin).
     
     Example:
         class MySR830(VisaBaseMeasurementInstrument):
@@ -610,12 +821,13 @@ class VisaBaseMeasurementInstrument(BaseMeasurementInstrument):
         return self.instrument is not None
 
 
-class VisaBaseMovementInstrument(BaseMovementInstrument):
+class VisaBaseMovementInstrument(CommandBatchingMixin, BaseMovementInstrument):
     """
     Base class for VISA-based movement instruments.
     
     Same pattern as VisaBaseMeasurementInstrument - override the _impl methods
-    and settings property/setter with your proprietary commands.
+    and settings property/setter with your proprietary commands. Commands can
+    be batched the same way too.
     
     Example:
         class MyESP301Axis(VisaBaseMovementInstrument):
@@ -691,24 +903,68 @@ class VisaBaseMovementInstrument(BaseMovementInstrument):
 # Helper classes for simulated/fake instruments
 # -------------------------------------------------------------------------
 
-class SimulatedDelay:
+class SimulatedDelay(CancellationMixin):
     """
     Mixin to add simulated communication delays to fake instruments.
     
+    Delays are interruptible: an aborted scan does not wait for them to elapse.
+    
+    By default every call waits `wait` seconds. For realistic timing, give
+    operations their own latency distributions with set_latency(), and put
+    instruments that share an adapter on one SimulatedBus so their calls are
+    serialised (see pybirch.Instruments.simulation).
+    
     Usage:
         class MyFakeInstrument(SimulatedDelay, BaseMeasurementInstrument):
             def __init__(self, name, wait=0.01):
                 SimulatedDelay.__init__(self, wait)
                 BaseMeasurementInstrument.__init__(self, name)
+            
+            def _perform_measurement_impl(self):
+                self._delay("measure")
+                ...
     """
     
-    def __init__(self, wait: float = 0.0):
+    latencies: Optional[Dict[str, Any]] = None
+    bus: Any = None
+    
+    def __init__(self, wait: float = 0.0, latencies: Optional[Dict[str, Any]] = None, bus: Any = None):
         self._wait = wait
+        self.latencies = dict(latencies) if latencies else None
+        self.bus = bus
     
-    def _delay(self):
-        """Apply the simulated delay."""
-        if self._wait > 0:
-            time.sleep(self._wait)
+    def set_latency(self, operation: str, latency: Any):
+        """
+        Set the latency of one operation.
+        
+        Args:
+            operation: e.g. 'connect', 'move', 'measure', or 'default' for
+                operations without their own latency
+            latency: A Latency distribution, or a number of seconds
+        """
+        if self.latencies is None:
+            self.latencies = {}
+        self.latencies[operation] = latency
+    
+    def _latency(self, operation: str) -> float:
+        """Seconds the operation takes this time."""
+        latencies = self.latencies
+        if latencies:
+            latency = latencies.get(operation, latencies.get("default"))
+            if latency is not None:
+                return latency.sample() if hasattr(latency, "sample") else float(latency)
+        return self._wait
+    
+    def _delay(self, operation: str = "default"):
+        """Apply the simulated delay of an operation, holding the bus if there is one."""
+        seconds = self._latency(operation)
+        if self.bus is None:
+            if seconds > 0:
+                self._sleep(seconds)
+            return
+        with self.bus.transaction():
+            if seconds > 0:
+                self._sleep(seconds)
 
 
 class FakeMeasurementInstrument(SimulatedDelay, BaseMeasurementInstrument):
@@ -717,15 +973,20 @@ class FakeMeasurementInstrument(SimulatedDelay, BaseMeasurementInstrument):
     
     Use this for testing and development. Fake instruments are always
     "connected" and can use the automatic settings management.
+    Initialization either leaves settings alone or resets them through
+    _reset_settings_to_defaults(), which records the defaults as known, so
+    the settings cache survives initialize().
     """
     
+    settings_cache_policy = SETTINGS_CACHE_RECONNECT
+    
     def __init__(self, name: str, wait: float = 0.0):
         SimulatedDelay.__init__(self, wait)
         BaseMeasurementInstrument.__init__(self, name)
         self.status = True  # Fake instruments are always "connected"
     
     def _connect_impl(self) -> bool:
-        self._delay()
+        self._delay("connect")
         return True
     
     def check_connection(self) -> bool:
@@ -738,15 +999,20 @@ class FakeMovementInstrument(SimulatedDelay, BaseMovementInstrument):
     
     Use this for testing and development. Fake instruments are always
     "connected" and can use the automatic settings management.
+    Initialization either leaves settings alone or resets them through
+    _reset_settings_to_defaults(), which records the defaults as known, so
+    the settings cache survives initialize().
     """
     
+    settings_cache_policy = SETTINGS_CACHE_RECONNECT
+    
     def __init__(self, name: str, wait: float = 0.0):
         SimulatedDelay.__init__(self, wait)
         BaseMovementInstrument.__init__(self, name)
         self.status = True  # Fake instruments are always "connected"
     
     def _connect_impl(self) -> bool:
-        self._delay()
+        self._delay("connect")
         return True
     
     def check_connection(self) -> bool:
@@ -0,0 +1,338 @@
+"""
+SCPI Command Batching
+=====================
+Groups SCPI writes and queries into single bus transactions.
+
+Each write or query on a GPIB/serial instrument costs a full round-trip, so a
+driver reading X, Y, R and theta one query at a time pays four bus latencies
+per point. SCPI (IEEE 488.2) lets several program messages share one
+transaction when they are joined with ';', and the instrument answers all
+queries in it with one response whose replies are also separated by ';'.
+CommandBatch collects commands, sends them that way and hands each query its
+own reply.
+
+SimulatedTransport stands in for a VISA resource so batching can be tested
+and benchmarked without hardware: it answers from a table of responses,
+remembers written values, and counts round-trips.
+
+Usage (in a VisaBaseMeasurementInstrument subclass):
+    def _perform_measurement_impl(self):
+        with self.batch() as batch:
+            x, y = batch.query("OUTP? 1"), batch.query("OUTP? 2")
+            r, theta = batch.query("OUTP? 3"), batch.query("OUTP? 4")
+        return np.array([[float(x.value), float(y.value), float(r.value), float(theta.value)]])
+
+    # Or, for queries only:
+    x, y, r, theta = self.query_many(["OUTP? 1", "OUTP? 2", "OUTP? 3", "OUTP? 4"])
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+
+class BatchError(RuntimeError):
+    """Raised when a batched response does not match the queries sent."""
+
+
+class QueryResult:
+    """
+    Placeholder for the reply to a batched query, filled in when the batch is sent.
+
+    Attributes:
+        command: The query command
+        value: The reply string (None until the batch has been sent)
+    """
+
+    __slots__ = ('command', 'value')
+
+    def __init__(self, command: str):
+        self.command = command
+        self.value: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the batch containing this query has been sent."""
+        return self.value is not None
+
+    def __float__(self) -> float:
+        return float(self._require())
+
+    def __int__(self) -> int:
+        return int(float(self._require()))
+
+    def __str__(self) -> str:
+        return self._require()
+
+    def _require(self) -> str:
+        if self.value is None:
+            raise BatchError(f"Batch containing '{self.command}' has not been sent")
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"QueryResult({self.command!r}, value={self.value!r})"
+
+
+def _transport_query(transport: Any, message: str) -> str:
+    """Query through a pyvisa resource (query) or a pymeasure instrument (ask)."""
+    query = getattr(transport, 'query', None) or getattr(transport, 'ask', None)
+    if query is not None:
+        return str(query(message))
+    transport.write(message)
+    return str(transport.read())
+
+
+class CommandBatch:
+    """
+    Queue of SCPI writes and queries sent as concatenated transactions.
+
+    Commands keep their order. Writes without queries are sent with one
+    write(); once a query is queued, the transaction is sent with query() and
+    the response is split between the queued queries. Batches longer than
+    max_length characters are split into several transactions.
+
+    Attributes:
+        transport: VISA resource (or anything with write/query)
+        separator: Joins commands in one transaction
+        reply_separator: Separates the replies in a response
+        max_length: Longest transaction sent, in characters (0 for no limit)
+    """
+
+    def __init__(self, transport: Any, separator: str = ';', reply_separator: str = ';',
+                 max_length: int = 0, telemetry: Any = None):
+        """
+        Initialize the batch.
+
+        Args:
+            transport: VISA resource (or anything with write/query)
+            separator: Joins commands in one transaction
+            reply_separator: Separates the replies in a response
+            max_length: Longest transaction sent, in characters (0 for no limit)
+            telemetry: InstrumentTelemetry recording each transaction (optional)
+        """
+        self.transport = transport
+        self.telemetry = telemetry
+        self.separator = separator
+        self.reply_separator = reply_separator
+        self.max_length = max_length
+        self._commands: List[tuple] = []
+        self.transactions = 0
+
+    def write(self, command: str) -> 'CommandBatch':
+        """Queue a command that has no reply."""
+        self._commands.append((command.strip(), None))
+        return self
+
+    def query(self, command: str) -> QueryResult:
+        """Queue a query; its reply is available from the result once sent."""
+        result = QueryResult(command.strip())
+        self._commands.append((result.command, result))
+        return result
+
+    def send(self) -> List[str]:
+        """
+        Send everything queued and fill in the query results.
+
+        Returns:
+            The replies, in query order
+
+        Raises:
+            BatchError: If a response holds a different number of replies
+                than there were queries in its transaction
+        """
+        commands, self._commands = self._commands, []
+        replies: List[str] = []
+        for chunk in self._chunks(commands):
+            message = self.separator.join(command for command, _ in chunk)
+            results = [result for _, result in chunk if result is not None]
+            self.transactions += 1
+            start = time.perf_counter()
+            response = ''
+            try:
+                if results:
+                    response = _transport_query(self.transport, message).strip()
+                else:
+                    self.transport.write(message)
+            except Exception:
+                self._record(start, message, response, error=True)
+                raise
+            if not results:
+                self._record(start, message, response)
+                continue
+
+            parts = [part.strip() for part in response.split(self.reply_separator)] if response else []
+            self._record(start, message, response, error=len(parts) != len(results))
+            if len(parts) != len(results):
+                raise BatchError(
+                    f"Expected {len(results)} replies to '{message}', got {len(parts)}: '{response}'"
+                )
+            for result, part in zip(results, parts):
+                result.value = part
+            replies.extend(parts)
+        return replies
+
+    def _record(self, start: float, message: str, response: str, error: bool = False):
+        """Record one transaction in the instrument's telemetry."""
+        if self.telemetry is not None:
+            self.telemetry.record('transaction', time.perf_counter() - start, error=error,
+                                  bytes_out=len(message), bytes_in=len(response))
+
+    def _chunks(self, commands: List[tuple]) -> List[List[tuple]]:
+        """Split commands into transactions no longer than max_length."""
+        if not self.max_length:
+            return [commands] if commands else []
+        chunks: List[List[tuple]] = []
+        current: List[tuple] = []
+        length = 0
+        for entry in commands:
+            added = len(entry[0]) + (len(self.separator) if current else 0)
+            if current and length + added > self.max_length:
+                chunks.append(current)
+                current, length = [], 0
+                added = len(entry[0])
+            current.append(entry)
+            length += added
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __enter__(self) -> 'CommandBatch':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Commands queued before an error are dropped, not half-sent
+        if exc_type is None:
+            self.send()
+        else:
+            self._commands = []
+
+
+class CommandBatchingMixin:
+    """
+    Command batching for VISA instruments, using self.instrument as the transport.
+
+    Class attributes can be overridden by drivers whose instrument uses a
+    different message separator or has a small input buffer.
+    """
+
+    batch_separator: str = ';'
+    batch_reply_separator: str = ';'
+    batch_max_length: int = 0
+
+    def batch(self) -> CommandBatch:
+        """
+        Start a batch on this instrument; it is sent when the with-block exits.
+
+        Returns:
+            A CommandBatch to queue writes and queries on
+        """
+        if getattr(self, 'instrument', None) is None:
+            raise BatchError(f"{getattr(self, 'name', self)} has no VISA instrument to send commands to")
+        return CommandBatch(self.instrument, separator=self.batch_separator,
+                            reply_separator=self.batch_reply_separator,
+                            max_length=self.batch_max_length,
+                            telemetry=getattr(self, 'telemetry', None))
+
+    def query_many(self, commands: Sequence[str]) -> List[str]:
+        """Send several queries in one transaction and return their replies."""
+        with self.batch() as batch:
+            results = [batch.query(command) for command in commands]
+        return [result.value for result in results]
+
+    def write_many(self, commands: Sequence[str]):
+        """Send several commands in one transaction."""
+        with self.batch() as batch:
+            for command in commands:
+                batch.write(command)
+
+
+Response = Union[str, Callable[[str], Any]]
+
+
+class SimulatedTransport:
+    """
+    In-memory stand-in for a VISA resource that understands batched SCPI.
+
+    Queries are answered from `responses`, looked up by the full command and
+    then by its header (the part before the first space); callables receive
+    the command's arguments. Written commands are remembered, so `SENS 5`
+    followed by `SENS?` answers '5' without a response entry. Each write() or
+    query() is one round-trip and waits `latency` seconds.
+
+    Attributes:
+        responses: Command or header -> reply (string or callable)
+        state: Header -> last written arguments
+        latency: Seconds per round-trip
+        round_trips: Number of transactions received
+        messages: Every message received, in order
+    """
+
+    def __init__(self, responses: Optional[Dict[str, Response]] = None, latency: float = 0.0,
+                 separator: str = ';', reply_separator: str = ';'):
+        """
+        Initialize the transport.
+
+        Args:
+            responses: Command or header -> reply (string or callable)
+            latency: Seconds per round-trip
+            separator: Separates commands in a received message
+            reply_separator: Joins the replies of one message
+        """
+        self.responses: Dict[str, Response] = dict(responses or {})
+        self.state: Dict[str, str] = {}
+        self.latency = latency
+        self.separator = separator
+        self.reply_separator = reply_separator
+        self.round_trips = 0
+        self.messages: List[str] = []
+        self._pending: List[str] = []
+
+    def write(self, message: str):
+        """Receive a message; replies to its queries are kept for read()."""
+        self._transact(message)
+        replies = self._process(message)
+        if replies:
+            self._pending.append(self.reply_separator.join(replies))
+
+    def read(self) -> str:
+        """Return the reply to the last message with queries."""
+        if not self._pending:
+            raise TimeoutError("No reply pending (VI_ERROR_TMO)")
+        return self._pending.pop(0)
+
+    def query(self, message: str) -> str:
+        """Send a message and return the replies to its queries."""
+        self._transact(message)
+        return self.reply_separator.join(self._process(message))
+
+    def close(self):
+        """No-op, for compatibility with pyvisa resources."""
+
+    def _transact(self, message: str):
+        self.round_trips += 1
+        self.messages.append(message)
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _process(self, message: str) -> List[str]:
+        """Execute each command in a message; return the replies to its queries."""
+        replies = []
+        for command in (c.strip() for c in message.split(self.separator)):
+            if not command:
+                continue
+            header, _, args = command.partition(' ')
+            if header.endswith('?'):
+                replies.append(self._answer(command, header, args.strip()))
+            else:
+                self.state[header.upper()] = args.strip()
+        return replies
+
+    def _answer(self, command: str, header: str, args: str) -> str:
+        response = self.responses.get(command, self.responses.get(header))
+        if response is None:
+            response = self.state.get(header[:-1].upper(), '0')
+        if callable(response):
+            response = response(args)
+        return str(response)
@@ -0,0 +1,356 @@
+"""
+Instrument Class Discovery
+==========================
+Static, cached discovery of instrument classes in setups directories.
+
+Listing the classes in a setups tree used to mean importing every Python file
+in it, which runs each driver's module-level code (and its imports, e.g.
+pymeasure or Qt for *_ui.py files) just to show class names. Discovery instead
+parses the files with `ast` and follows base-class names through the tree, so
+nothing is imported. Parse results are cached on disk keyed by each file's
+modification time and size, so only edited files are parsed again.
+
+Discovered classes are returned as LazyClass stand-ins; the module defining a
+class is only imported when the class is used (called, or an attribute other
+than its name is read).
+
+Usage:
+    from pybirch.Instruments.discovery import discover_classes
+
+    for lazy in discover_classes("pybirch/setups", (Measurement, Movement)):
+        print(lazy.__name__, lazy.path)     # No imports so far
+    instrument = lazy(name="LI")            # Imports the module and instantiates
+"""
+
+import ast
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.environ.get(
+    'PYBIRCH_DISCOVERY_INDEX',
+    os.path.join(os.path.expanduser('~'), '.pybirch', 'discovery_index.json'),
+)
+
+# Bump when the layout of cached parse results changes
+INDEX_FORMAT = 1
+
+
+def import_file(path: str) -> Any:
+    """
+    Import a Python file, by dotted module name when it is importable.
+
+    Files outside every sys.path entry are loaded under a synthetic module
+    name, without adding their folder to sys.path.
+    """
+    path = os.path.abspath(path)
+    for entry in sys.path:
+        root = os.path.abspath(entry or os.getcwd())
+        if not path.startswith(root + os.sep):
+            continue
+        module_name = os.path.relpath(path, root)[:-3].replace(os.sep, '.')
+        try:
+            return importlib.import_module(module_name)
+        except ImportError:
+            continue
+
+    module_name = f"pybirch_setup_{abs(hash(path))}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
+    return module
+
+
+def _base_name(node: ast.expr) -> str:
+    """Unqualified name of a base class expression (e.g. base.FakeMeasurementInstrument)."""
+    if isinstance(node, ast.Subscript):
+        node = node.value
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return ""
+
+
+def parse_classes(path: str) -> List[Dict[str, Any]]:
+    """
+    List the top-level classes defined in a Python file, without importing it.
+
+    Returns:
+        One dict per class with 'name', 'bases' (unqualified names) and 'lineno';
+        empty if the file cannot be read or parsed
+    """
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.warning(f"Skipping {path} during class discovery: {e}")
+        return []
+    return [
+        {
+            'name': node.name,
+            'bases': [name for name in (_base_name(b) for b in node.bases) if name],
+            'lineno': node.lineno,
+        }
+        for node in tree.body
+        if isinstance(node, ast.ClassDef)
+    ]
+
+
+class DiscoveryIndex:
+    """
+    Persistent map of source file to the classes it defines.
+
+    Entries are reused while a file's modification time and size are
+    unchanged; anything else is parsed again.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_INDEX_PATH):
+        """
+        Initialize the index.
+
+        Args:
+            path: JSON file backing the index (None keeps it in memory only)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def classes_in(self, path: str) -> List[Dict[str, Any]]:
+        """Classes defined in a file, from the index when the file is unchanged."""
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return []
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry.get('mtime') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+                return entry['classes']
+
+        classes = parse_classes(path)
+        with self._lock:
+            self._entries[path] = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'classes': classes}
+            self._dirty = True
+        return classes
+
+    def prune(self) -> int:
+        """
+        Drop entries for files that no longer exist.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            stale = [p for p in self._entries if not os.path.exists(p)]
+            for p in stale:
+                del self._entries[p]
+            self._dirty = self._dirty or bool(stale)
+        return len(stale)
+
+    def save(self):
+        """Write the index to disk if anything changed."""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            data = {'format': INDEX_FORMAT, 'files': dict(self._entries)}
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save class discovery index to {self.path}: {e}")
+
+    def _load(self):
+        """Read the index from disk, ignoring a missing, corrupt or outdated file."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get('format') == INDEX_FORMAT:
+                self._entries = data.get('files', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable class discovery index {self.path}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LazyClass:
+    """Stand-in for a class found by discovery, imported when first used.
+
+    Calling it creates an instance; any other attribute access imports the
+    defining module first and forwards to the real class. Two stand-ins for
+    the same class in the same file compare equal, so selections survive a
+    rescan.
+    """
+
+    def __init__(self, path: str, name: str, bases: Sequence[str] = ()):
+        self.path = os.path.abspath(path)
+        self.bases = tuple(bases)
+        self._class: Optional[type] = None
+        self.__name__ = name
+        self.__qualname__ = name
+        self.__module__ = os.path.splitext(os.path.basename(path))[0]
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the defining module has been imported."""
+        return self._class is not None
+
+    def resolve(self) -> type:
+        """Import the defining module and return the real class."""
+        if self._class is None:
+            module = import_file(self.path)
+            cls = getattr(module, self.__name__, None)
+            if not isinstance(cls, type):
+                raise ImportError(f"{self.path} no longer defines class {self.__name__}")
+            self._class = cls
+            self.__module__ = cls.__module__
+        return self._class
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyClass):
+            return (self.path, self.__name__) == (other.path, other.__name__)
+        if isinstance(other, type) and self._class is not None:
+            return self._class is other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.path, self.__name__))
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"LazyClass({self.__name__!r}, {os.path.basename(self.path)}, {state})"
+
+
+def base_class_names(class_types: Sequence[type]) -> Set[str]:
+    """
+    Names that mark a class as an instrument class.
+
+    Includes subclasses of the given types that are already imported (e.g.
+    pybirch's own base classes), since setups files usually derive from those.
+    """
+    names: Set[str] = set()
+    pending = list(class_types)
+    while pending:
+        cls = pending.pop()
+        if cls is type or cls.__name__ in names:
+            continue
+        names.add(cls.__name__)
+        pending.extend(cls.__subclasses__())
+    return names
+
+
+def python_files(directory: str) -> List[str]:
+    """Python files under a directory, skipping private files and folders."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(('__', '.')))
+        files.extend(os.path.abspath(os.path.join(dirpath, f)) for f in sorted(filenames)
+                     if f.endswith('.py') and not f.startswith('__'))
+    return files
+
+
+def find_classes(
+    directories: Sequence[str],
+    base_names: Iterable[str],
+    index: Optional[DiscoveryIndex] = None,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Find classes deriving, directly or through other discovered classes, from
+    any of the given base names.
+
+    Args:
+        directories: Directories searched recursively
+        base_names: Names of the accepted base classes (not returned themselves)
+        index: Parse cache (a fresh in-memory index if None)
+
+    Returns:
+        (file path, class info) pairs in file order
+    """
+    index = index if index is not None else DiscoveryIndex(path=None)
+    found: List[Tuple[str, Dict[str, Any]]] = []
+    for directory in directories:
+        for path in python_files(directory):
+            found.extend((path, info) for info in index.classes_in(path))
+    index.prune()
+    index.save()
+
+    roots = set(base_names)
+    accepted = set(roots)
+    changed = True
+    while changed:
+        changed = False
+        for _, info in found:
+            if info['name'] not in accepted and accepted.intersection(info['bases']):
+                accepted.add(info['name'])
+                changed = True
+    return [(path, info) for path, info in found
+            if info['name'] in accepted and info['name'] not in roots]
+
+
+_default_index: Optional[DiscoveryIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_discovery_index() -> DiscoveryIndex:
+    """Get the process-wide discovery index, loading it on first use."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = DiscoveryIndex()
+        return _default_index
+
+
+def discover_classes(
+    directory: str,
+    class_types: Sequence[type],
+    index: Optional[DiscoveryIndex] = None,
+) -> List[LazyClass]:
+    """
+    Lazily list the instrument classes defined under a directory.
+
+    Args:
+        directory: Setups directory searched recursively
+        class_types: Accepted base classes (not returned themselves)
+        index: Parse cache (the process-wide index if None)
+
+    Returns:
+        LazyClass stand-ins; nothing is imported
+    """
+    index = index if index is not None else get_discovery_index()
+    if type in class_types:
+        # Any class qualifies
+        return [LazyClass(path, info['name'], info['bases'])
+                for path in python_files(directory) for info in index.classes_in(path)]
+    return [LazyClass(path, info['name'], info['bases'])
+            for path, info in find_classes([directory], base_class_names(class_types), index)]
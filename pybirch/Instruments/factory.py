@@ -15,16 +15,168 @@ Usage:
     
     # Create instance with adapter
     instance = InstrumentFactory.create_instance(driver, adapter='GPIB::8::INSTR')
+
+    # List drivers without compiling them; the class is built on first use
+    lazy = InstrumentFactory.lazy_class(driver)
+    instance = lazy(name="Lock-in")
+
+Compiled driver code is cached on disk (see DriverCodeCache), so each driver
+version is compiled once per computer rather than once per process.
 """
 
 import numpy as np
 import pandas as pd
 from typing import Any, Dict, List, Optional, Type
+import hashlib
+import importlib.util
+import marshal
+import os
 import warnings
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CODE_CACHE_DIR = os.environ.get(
+    'PYBIRCH_DRIVER_CACHE',
+    os.path.join(os.path.expanduser('~'), '.pybirch', 'driver_cache'),
+)
+
+
+def driver_source_hash(name: str, version: int, source_code: str) -> str:
+    """Hash identifying one compiled version of a driver."""
+    digest = hashlib.sha256()
+    for part in (name, str(version), source_code):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class DriverCodeCache:
+    """On-disk cache of compiled driver code objects.
+    
+    Entries are marshalled code objects named '<driver id>-<version>-<hash>.code'
+    and tagged with the interpreter's bytecode magic number, so a cache shared
+    between Python versions simply misses. Writes are atomic; unreadable
+    entries are treated as misses.
+    """
+    
+    SUFFIX = '.code'
+    
+    def __init__(self, directory: str = DEFAULT_CODE_CACHE_DIR):
+        """Initialize the cache.
+        
+        Args:
+            directory: Directory holding the cache entries (created on first write)
+        """
+        self.directory = directory
+    
+    def _path(self, driver_id: Optional[int], version: int, source_hash: str) -> str:
+        return os.path.join(self.directory, f"{driver_id or 0}-{version}-{source_hash[:32]}{self.SUFFIX}")
+    
+    def load(self, driver_id: Optional[int], version: int, source_hash: str):
+        """Load a compiled code object, or None on a miss."""
+        try:
+            with open(self._path(driver_id, version, source_hash), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        magic = importlib.util.MAGIC_NUMBER
+        if not data.startswith(magic):
+            return None
+        try:
+            return marshal.loads(data[len(magic):])
+        except (EOFError, ValueError, TypeError):
+            return None
+    
+    def store(self, driver_id: Optional[int], version: int, source_hash: str, code) -> None:
+        """Write a compiled code object; failures only log a warning."""
+        path = self._path(driver_id, version, source_hash)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(importlib.util.MAGIC_NUMBER + marshal.dumps(code))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write driver code cache {path}: {e}")
+    
+    def entries(self, driver_id: Optional[int] = None) -> List[str]:
+        """File names of cached entries, optionally for one driver."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        prefix = f"{driver_id}-" if driver_id is not None else ""
+        return sorted(n for n in names if n.endswith(self.SUFFIX) and n.startswith(prefix))
+    
+    def prune(self, driver_id: int, keep_hashes: List[str]) -> int:
+        """Delete a driver's entries whose source hash is not in keep_hashes.
+        
+        Returns:
+            Number of entries removed
+        """
+        keep = {h[:32] for h in keep_hashes}
+        removed = 0
+        for name in self.entries(driver_id):
+            if name[:-len(self.SUFFIX)].rsplit('-', 1)[-1] in keep:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+            except OSError:
+                pass
+        return removed
+    
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        for name in self.entries():
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class LazyDriverClass:
+    """Stand-in for a driver class that is only compiled when first used.
+    
+    Calling it creates an instance; any other attribute access builds the
+    real class first and forwards to it.
+    """
+    
+    def __init__(self, factory: Type['InstrumentFactory'], driver: Dict):
+        self._factory = factory
+        self._driver = driver
+        self._class: Optional[type] = None
+        self.__name__ = driver.get('name', '')
+    
+    @property
+    def driver(self) -> Dict:
+        """The driver record this class is built from."""
+        return self._driver
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the real class has been built."""
+        return self._class is not None
+    
+    def resolve(self) -> type:
+        """Build (or fetch from cache) the real class."""
+        if self._class is None:
+            self._class = self._factory.create_class_from_driver(self._driver)
+        return self._class
+    
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+    
+    def __getattr__(self, attr: str):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+    
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"LazyDriverClass({self.__name__!r}, version={self._driver.get('version', 1)}, {state})"
+
 
 class InstrumentFactory:
     """Factory for creating instrument instances from database drivers.
@@ -39,6 +191,12 @@ class InstrumentFactory:
     # Class-level cache of driver versions for invalidation
     _version_cache: Dict[int, int] = {}
     
+    # Source hash of each cached class, so edited code is never served stale
+    _hash_cache: Dict[int, str] = {}
+    
+    # On-disk cache of compiled code objects (None disables it)
+    code_cache: Optional[DriverCodeCache] = DriverCodeCache() if DEFAULT_CODE_CACHE_DIR else None
+    
     def __init__(self, db_service=None):
         """Initialize the factory with optional database service.
         
@@ -210,18 +368,22 @@ class InstrumentFactory:
         if not source_code:
             raise ValueError("driver must have 'source_code' field")
         
+        source_hash = driver_source_hash(class_name, version, source_code)
+        
         # Check cache
         if driver_id:
             cached_version = cls._version_cache.get(driver_id)
-            if cached_version == version and driver_id in cls._class_cache:
+            if (cached_version == version and driver_id in cls._class_cache
+                    and cls._hash_cache.get(driver_id, source_hash) == source_hash):
                 return cls._class_cache[driver_id]
         
         # Create namespace with imports and base classes
         namespace = cls.create_namespace()
         
-        # Compile and execute the source code
+        # Compile (or load the compiled code from disk) and execute the source code
         try:
-            exec(source_code, namespace)
+            code = cls.compile_driver(driver, source_hash)
+            exec(code, namespace)
         except SyntaxError as e:
             raise SyntaxError(f"Syntax error in instrument '{class_name}': {e}")
         except NameError as e:
@@ -258,9 +420,103 @@ class InstrumentFactory:
         if driver_id:
             cls._class_cache[driver_id] = instrument_class
             cls._version_cache[driver_id] = version
+            cls._hash_cache[driver_id] = source_hash
         
         return instrument_class
     
+    @classmethod
+    def compile_driver(cls, driver: Dict, source_hash: Optional[str] = None):
+        """Get the compiled code object for a driver, using the on-disk cache.
+        
+        Args:
+            driver: Driver record with name, source_code and version
+            source_hash: Precomputed driver_source_hash (computed if None)
+        
+        Returns:
+            Code object ready to exec
+        
+        Raises:
+            SyntaxError: If the source code does not compile
+        """
+        name = driver.get('name', '')
+        version = driver.get('version', 1)
+        source_code = driver.get('source_code', '')
+        source_hash = source_hash or driver_source_hash(name, version, source_code)
+        
+        cache = cls.code_cache
+        if cache is not None:
+            code = cache.load(driver.get('id'), version, source_hash)
+            if code is not None:
+                return code
+        
+        code = compile(source_code, f"<driver {name} v{version}>", 'exec')
+        if cache is not None:
+            cache.store(driver.get('id'), version, source_hash, code)
+        return code
+    
+    @classmethod
+    def lazy_class(cls, driver: Dict) -> LazyDriverClass:
+        """Get a stand-in for a driver's class that compiles on first use.
+        
+        Args:
+            driver: Driver record as dictionary
+        
+        Returns:
+            LazyDriverClass; call it like the class to create an instance
+        """
+        driver_id = driver.get('id')
+        if driver_id and driver_id in cls._class_cache and cls._version_cache.get(driver_id) == driver.get('version', 1):
+            lazy = LazyDriverClass(cls, driver)
+            lazy._class = cls._class_cache[driver_id]
+            return lazy
+        return LazyDriverClass(cls, driver)
+    
+    def sync_with_versions(self, driver_id: Optional[int] = None) -> int:
+        """Invalidate cached code using the drivers' DriverVersion history.
+        
+        In-process classes built from anything other than a driver's current
+        version are dropped. On-disk entries are kept only for versions still
+        present in the history (so rollbacks stay fast) and for the current
+        source; everything else is deleted.
+        
+        Args:
+            driver_id: Driver to synchronize, or None for all drivers
+        
+        Returns:
+            Number of on-disk entries removed
+        """
+        if not self.db_service:
+            return 0
+        
+        if driver_id is not None:
+            drivers = [self.get_driver_by_id(driver_id)]
+        else:
+            drivers = self.get_available_drivers()
+        
+        removed = 0
+        for driver in drivers:
+            if not driver or not driver.get('id'):
+                continue
+            did = driver['id']
+            current_hash = driver_source_hash(driver.get('name', ''), driver.get('version', 1),
+                                              driver.get('source_code') or '')
+            if did in self._class_cache and self._hash_cache.get(did) != current_hash:
+                self.invalidate_cache(did)
+            
+            if self.code_cache is None:
+                continue
+            try:
+                history = self.db_service.get_driver_versions(did)
+            except Exception as e:
+                logger.warning(f"Could not read version history of driver {did}: {e}")
+                continue
+            keep = [current_hash] + [
+                driver_source_hash(driver.get('name', ''), v['version'], v.get('source_code') or '')
+                for v in history
+            ]
+            removed += self.code_cache.prune(did, keep)
+        return removed
+    
     @classmethod
     def create_instance(
         cls,
@@ -316,9 +572,11 @@ class InstrumentFactory:
         if driver_id:
             cls._class_cache.pop(driver_id, None)
             cls._version_cache.pop(driver_id, None)
+            cls._hash_cache.pop(driver_id, None)
         else:
             cls._class_cache.clear()
             cls._version_cache.clear()
+            cls._hash_cache.clear()
     
     @classmethod
     def validate_source_code(cls, source_code: str, class_name: str) -> Dict:
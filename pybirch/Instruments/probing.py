@@ -0,0 +1,297 @@
+"""
+Adapter Probing
+===============
+Concurrent adapter probing and instrument auto-pairing with a persistent cache.
+
+Auto-pairing tries candidate instrument classes against each VISA resource
+until one's check_connection() succeeds. Resources are probed concurrently,
+every probe runs under a timeout, and results are cached on disk keyed by the
+resource string and the device's *IDN? response, so re-pairing a known rack
+skips the probing entirely. A device swapped onto the same address answers
+with a different identity and is probed again.
+
+Usage:
+    from pybirch.Instruments.probing import AdapterProber
+
+    prober = AdapterProber(instrument_classes)
+    resources = prober.list_resources()         # One enumeration per refresh
+    pairs = prober.auto_pair(resources)         # resource -> class (or None)
+"""
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.pybirch', 'adapter_probe_cache.json')
+
+
+def class_label(cls: type) -> str:
+    """Name used to identify an instrument class in the cache."""
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+class ProbeCache:
+    """
+    Persistent map of (resource, identity) to the instrument class that answered.
+
+    Entries with no matching class are cached too, so unknown devices are not
+    probed against every class on each refresh.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH):
+        """
+        Initialize the cache.
+
+        Args:
+            path: JSON file backing the cache (None keeps it in memory only)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    @staticmethod
+    def key(resource: str, identity: str) -> str:
+        """Cache key for a resource and its identity response."""
+        return f"{resource}|{identity.strip()}"
+
+    def get(self, resource: str, identity: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached probe result.
+
+        Returns:
+            Dict with 'class' (label or None) and 'checked_at', or None if not cached
+        """
+        with self._lock:
+            return self._entries.get(self.key(resource, identity))
+
+    def put(self, resource: str, identity: str, cls: Optional[type], candidates: Sequence[type]):
+        """Record the result of probing a resource against a set of candidate classes."""
+        with self._lock:
+            self._entries[self.key(resource, identity)] = {
+                'class': class_label(cls) if cls is not None else None,
+                'candidates': sorted(class_label(c) for c in candidates),
+                'checked_at': datetime.now().isoformat(timespec='seconds'),
+            }
+
+    def forget(self, resource: Optional[str] = None):
+        """Drop cached results for one resource, or all of them."""
+        with self._lock:
+            if resource is None:
+                self._entries.clear()
+            else:
+                self._entries = {k: v for k, v in self._entries.items() if not k.startswith(f"{resource}|")}
+
+    def save(self):
+        """Write the cache to disk."""
+        if not self.path:
+            return
+        with self._lock:
+            data = dict(self._entries)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save adapter probe cache to {self.path}: {e}")
+
+    def _load(self):
+        """Read the cache from disk, ignoring a missing or corrupt file."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = data
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable adapter probe cache {self.path}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AdapterProber:
+    """
+    Pairs VISA resources with instrument classes by probing them concurrently.
+
+    Attributes:
+        instrument_classes: Candidate classes, tried in order
+        timeout: Seconds allowed for each identity query or connection check
+        max_workers: Number of resources probed at the same time
+        cache: ProbeCache for results (None disables caching)
+    """
+
+    def __init__(
+        self,
+        instrument_classes: Sequence[type],
+        resource_manager: Any = None,
+        cache: Optional[ProbeCache] = None,
+        timeout: float = 2.0,
+        max_workers: int = 8,
+        factory: Optional[Callable[[type, str], Any]] = None,
+    ):
+        """
+        Initialize the prober.
+
+        Args:
+            instrument_classes: Candidate classes, tried in order
+            resource_manager: pyvisa ResourceManager (created on first use if None)
+            cache: Probe result cache (None disables caching)
+            timeout: Seconds allowed for each identity query or connection check
+            max_workers: Number of resources probed at the same time
+            factory: Callable creating a candidate instrument for a resource
+                (default: cls(resource))
+        """
+        self.instrument_classes = list(instrument_classes)
+        self.cache = cache
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.factory = factory or (lambda cls, resource: cls(resource))
+        self._rm = resource_manager
+
+    @property
+    def resource_manager(self) -> Any:
+        """The pyvisa ResourceManager, created on first use."""
+        if self._rm is None:
+            import pyvisa
+            self._rm = pyvisa.ResourceManager()
+        return self._rm
+
+    def list_resources(self) -> List[str]:
+        """Enumerate VISA resources once (empty list if VISA is unavailable)."""
+        try:
+            return list(self.resource_manager.list_resources())
+        except Exception as e:
+            logger.warning(f"Could not list VISA resources: {e}")
+            return []
+
+    def identify(self, resource: str) -> str:
+        """
+        Query a resource's *IDN? response.
+
+        Returns:
+            The identity string, or '' if the device does not answer in time
+        """
+        try:
+            handle = self.resource_manager.open_resource(resource, timeout=int(self.timeout * 1000))
+        except Exception:
+            return ""
+        try:
+            return str(handle.query("*IDN?")).strip()
+        except Exception:
+            return ""
+        finally:
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+    def check(self, cls: type, resource: str) -> bool:
+        """
+        Run one candidate's connection check against a resource, with a timeout.
+
+        A check still running at the timeout counts as failed; its thread is
+        left to finish in the background.
+        """
+        result: Dict[str, bool] = {}
+
+        def probe():
+            try:
+                result['ok'] = bool(self.factory(cls, resource).check_connection())
+            except Exception as e:
+                logger.debug(f"Probe {cls.__name__} on {resource} raised: {e}")
+                result['ok'] = False
+
+        thread = threading.Thread(target=probe, name=f"probe_{resource}", daemon=True)
+        thread.start()
+        thread.join(self.timeout)
+        if thread.is_alive():
+            logger.info(f"Probe {cls.__name__} on {resource} timed out after {self.timeout}s")
+            return False
+        return result.get('ok', False)
+
+    def pair(self, resource: str) -> Optional[type]:
+        """
+        Find the instrument class for one resource.
+
+        Cached results for the same resource and identity are returned without
+        probing, as long as the cached class is still a candidate.
+
+        Returns:
+            The matching class, or None if no candidate connects
+        """
+        identity = self.identify(resource)
+        by_label = {class_label(cls): cls for cls in self.instrument_classes}
+
+        if self.cache is not None and identity:
+            cached = self.cache.get(resource, identity)
+            if cached is not None:
+                if cached.get('class') in by_label:
+                    return by_label[cached['class']]
+                # A negative result only holds for the candidates that were tried
+                if cached.get('class') is None and set(cached.get('candidates', [])) >= set(by_label):
+                    return None
+
+        match = None
+        for cls in self._ordered_candidates(identity):
+            if self.check(cls, resource):
+                match = cls
+                break
+
+        if self.cache is not None and identity:
+            self.cache.put(resource, identity, match, self.instrument_classes)
+        return match
+
+    def auto_pair(self, resources: Sequence[str]) -> Dict[str, Optional[type]]:
+        """
+        Pair several resources concurrently.
+
+        Args:
+            resources: Resource strings (placeholders are skipped)
+
+        Returns:
+            Resource -> matching class (None if nothing matched)
+        """
+        resources = [r for r in resources if not r.startswith("placeholder_")]
+        results: Dict[str, Optional[type]] = {}
+        if not resources or not self.instrument_classes:
+            return {r: None for r in resources}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(resources)),
+                                thread_name_prefix="adapter_probe_") as executor:
+            futures = {resource: executor.submit(self.pair, resource) for resource in resources}
+            # Identity query plus every candidate check, each bounded by the timeout
+            budget = self.timeout * (len(self.instrument_classes) + 1)
+            for resource, future in futures.items():
+                try:
+                    results[resource] = future.result(timeout=budget)
+                except FutureTimeoutError:
+                    results[resource] = None
+                except Exception as e:
+                    logger.warning(f"Probing {resource} failed: {e}")
+                    results[resource] = None
+
+        if self.cache is not None:
+            self.cache.save()
+        return results
+
+    def _ordered_candidates(self, identity: str) -> List[type]:
+        """Candidates whose name appears in the identity response first."""
+        if not identity:
+            return list(self.instrument_classes)
+        upper = identity.upper()
+
+        def mentioned(cls: type) -> bool:
+            names = {cls.__name__, str(getattr(cls, 'name', '') or '')}
+            return any(name and name.upper() in upper for name in names)
+
+        return sorted(self.instrument_classes, key=lambda cls: not mentioned(cls))
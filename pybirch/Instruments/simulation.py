@@ -0,0 +1,174 @@
+"""
+Instrument Timing Simulation
+============================
+Latency distributions and shared-bus contention for fake instruments.
+
+A fixed sleep per call makes the fake setup far more predictable than a real
+rig, where each operation has its own spread of latencies and instruments on
+one GPIB bus (or one multi-axis controller) wait for each other. Fake
+instruments built on SimulatedDelay can be given:
+
+- a Latency per operation ('connect', 'move', 'measure', ...), sampled on
+  every call, and
+- a SimulatedBus shared with other instruments; calls on one bus are
+  serialised, and the bus records how long callers waited for it.
+
+Usage:
+    from pybirch.Instruments.simulation import Latency, get_simulated_bus
+
+    lockin = FakeLockInAmplifier("LI")
+    lockin.set_latency("measure", Latency.lognormal(median=0.02, sigma=0.3))
+    lockin.set_latency("connect", Latency.uniform(0.2, 0.5))
+    lockin.bus = get_simulated_bus("GPIB0")   # Shared with other GPIB0 instruments
+"""
+
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence
+
+
+class Latency:
+    """
+    A distribution of operation latencies, in seconds.
+
+    Create one with the constructors (fixed, uniform, normal, lognormal,
+    empirical); sample() draws one latency. Pass a seed for reproducible runs.
+    """
+
+    def __init__(self, kind: str, params: Sequence[float], samples: Sequence[float] = (),
+                 seed: Optional[int] = None):
+        self.kind = kind
+        self.params = tuple(params)
+        self.samples = tuple(samples)
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def fixed(cls, seconds: float) -> 'Latency':
+        """Always the same latency."""
+        return cls('fixed', (seconds,))
+
+    @classmethod
+    def uniform(cls, low: float, high: float, seed: Optional[int] = None) -> 'Latency':
+        """Evenly spread between low and high."""
+        return cls('uniform', (low, high), seed=seed)
+
+    @classmethod
+    def normal(cls, mean: float, std: float, seed: Optional[int] = None) -> 'Latency':
+        """Normally distributed, never below zero."""
+        return cls('normal', (mean, std), seed=seed)
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float, seed: Optional[int] = None) -> 'Latency':
+        """Log-normal with the given median; long tail like real bus round-trips."""
+        return cls('lognormal', (median, sigma), seed=seed)
+
+    @classmethod
+    def empirical(cls, samples: Sequence[float], seed: Optional[int] = None) -> 'Latency':
+        """Drawn from recorded latencies (e.g. measured on the real rig)."""
+        if not samples:
+            raise ValueError("An empirical latency needs at least one sample")
+        return cls('empirical', (), samples=samples, seed=seed)
+
+    def sample(self) -> float:
+        """Draw one latency in seconds."""
+        if self.kind == 'fixed':
+            value = self.params[0]
+        elif self.kind == 'uniform':
+            value = self._rng.uniform(*self.params)
+        elif self.kind == 'normal':
+            value = self._rng.gauss(*self.params)
+        elif self.kind == 'lognormal':
+            median, sigma = self.params
+            value = self._rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        elif self.kind == 'empirical':
+            value = self._rng.choice(self.samples)
+        else:
+            raise ValueError(f"Unknown latency distribution '{self.kind}'")
+        return max(float(value), 0.0)
+
+    def __repr__(self) -> str:
+        if self.kind == 'empirical':
+            return f"Latency.empirical({len(self.samples)} samples)"
+        return f"Latency.{self.kind}{self.params}"
+
+
+class SimulatedBus:
+    """
+    A communication bus shared by simulated instruments.
+
+    Only one transaction runs on the bus at a time. Statistics show how much
+    of the time callers spent waiting for each other.
+
+    Attributes:
+        name: Bus name (usually the simulated adapter)
+        transactions: Number of completed transactions
+        busy_time: Seconds the bus was in use
+        wait_time: Seconds callers spent waiting for the bus
+    """
+
+    def __init__(self, name: str = "bus"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.transactions = 0
+        self.busy_time = 0.0
+        self.wait_time = 0.0
+
+    @contextmanager
+    def transaction(self) -> Iterator['SimulatedBus']:
+        """Hold the bus for one operation."""
+        requested = time.perf_counter()
+        with self._lock:
+            started = time.perf_counter()
+            try:
+                yield self
+            finally:
+                finished = time.perf_counter()
+                with self._stats_lock:
+                    self.transactions += 1
+                    self.wait_time += started - requested
+                    self.busy_time += finished - started
+
+    def reset_stats(self):
+        """Zero the statistics."""
+        with self._stats_lock:
+            self.transactions = 0
+            self.busy_time = 0.0
+            self.wait_time = 0.0
+
+    def __getstate__(self) -> dict:
+        # Locks can't be copied or pickled; copies get their own
+        state = self.__dict__.copy()
+        del state['_lock'], state['_stats_lock']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (f"SimulatedBus({self.name!r}, transactions={self.transactions}, "
+                f"busy={self.busy_time:.3f}s, waited={self.wait_time:.3f}s)")
+
+
+_buses: Dict[str, SimulatedBus] = {}
+_buses_lock = threading.Lock()
+
+
+def get_simulated_bus(adapter: str) -> SimulatedBus:
+    """Get the process-wide bus for a simulated adapter, creating it on first use."""
+    with _buses_lock:
+        bus = _buses.get(adapter)
+        if bus is None:
+            bus = _buses[adapter] = SimulatedBus(adapter)
+        return bus
+
+
+def reset_simulated_buses():
+    """Forget all process-wide buses (for tests and benchmarks)."""
+    with _buses_lock:
+        _buses.clear()
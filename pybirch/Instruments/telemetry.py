@@ -0,0 +1,270 @@
+"""
+Instrument Telemetry
+====================
+Rolling per-operation performance statistics for instruments.
+
+Instrument base classes time their own operations (connect, initialize,
+measure, move, settings, shutdown, and batched VISA transactions) into an
+InstrumentTelemetry: call and error counts, bytes transferred, and latency
+percentiles over the most recent calls. Recording is cheap and local; a
+TelemetryReporter pushes snapshots to sinks (the database's InstrumentStatus,
+the 'instruments' WebSocket room) on a fixed interval rather than per call.
+DatabaseExtension runs one for the instruments of each scan.
+
+Usage:
+    from pybirch.Instruments.telemetry import TelemetryReporter, equipment_sink, websocket_sink
+
+    reporter = TelemetryReporter(interval=10.0)
+    reporter.add_sink(equipment_sink(equipment_manager))
+    reporter.add_sink(websocket_sink(update_server))
+    reporter.track(lockin, instrument_id=12)
+    reporter.start()
+    ...
+    lockin.telemetry.snapshot()['measure']['p95']   # Seconds
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Latencies kept per operation for the percentiles
+DEFAULT_WINDOW = 256
+
+# Attribute assignments timed as operations
+TIMED_ATTRIBUTES = {'position': 'move', 'settings': 'settings'}
+
+
+class OperationStats:
+    """Counters and a rolling latency window for one operation."""
+
+    __slots__ = ('calls', 'errors', 'bytes_out', 'bytes_in', 'total_time', 'latencies')
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.calls = 0
+        self.errors = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.total_time = 0.0
+        self.latencies: deque = deque(maxlen=window)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary of the operation (latencies in seconds)."""
+        summary: Dict[str, Any] = {
+            'calls': self.calls,
+            'errors': self.errors,
+            'error_rate': self.errors / self.calls if self.calls else 0.0,
+            'bytes_out': self.bytes_out,
+            'bytes_in': self.bytes_in,
+            'mean': self.total_time / self.calls if self.calls else None,
+        }
+        if self.latencies:
+            p50, p95, p99 = np.percentile(np.fromiter(self.latencies, dtype=float), [50, 95, 99])
+            summary.update(p50=float(p50), p95=float(p95), p99=float(p99), max=max(self.latencies))
+        else:
+            summary.update(p50=None, p95=None, p99=None, max=None)
+        return summary
+
+
+class InstrumentTelemetry:
+    """
+    Thread-safe performance statistics of one instrument, per operation.
+
+    Attributes:
+        window: Number of recent latencies kept per operation
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._operations: Dict[str, OperationStats] = {}
+        self.since = time.time()
+
+    def record(self, operation: str, seconds: float, error: bool = False,
+               bytes_out: int = 0, bytes_in: int = 0):
+        """Record one call of an operation."""
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = OperationStats(self.window)
+            stats.calls += 1
+            stats.total_time += seconds
+            stats.latencies.append(seconds)
+            stats.bytes_out += bytes_out
+            stats.bytes_in += bytes_in
+            if error:
+                stats.errors += 1
+
+    @contextmanager
+    def timed(self, operation: str) -> Iterator[None]:
+        """Time a block as one call of an operation; exceptions count as errors."""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.record(operation, time.perf_counter() - start, error=True)
+            raise
+        self.record(operation, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Summary of every operation recorded so far."""
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in self._operations.items()}
+
+    def reset(self):
+        """Clear all statistics."""
+        with self._lock:
+            self._operations.clear()
+            self.since = time.time()
+
+    def __contains__(self, operation: str) -> bool:
+        return operation in self._operations
+
+    # Locks can't be copied or pickled; copies get their own
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class TelemetryMixin:
+    """
+    Gives an instrument a `telemetry` attribute and times its operations.
+
+    Assignments to the attributes in TIMED_ATTRIBUTES (position, settings)
+    are timed automatically; other operations use `with self._timed(...)`.
+    """
+
+    @property
+    def telemetry(self) -> InstrumentTelemetry:
+        """Performance statistics of this instrument (created on first use)."""
+        telemetry = self.__dict__.get('_telemetry')
+        if telemetry is None:
+            telemetry = self.__dict__['_telemetry'] = InstrumentTelemetry()
+        return telemetry
+
+    def _timed(self, operation: str):
+        return self.telemetry.timed(operation)
+
+    def __setattr__(self, name: str, value: Any):
+        operation = TIMED_ATTRIBUTES.get(name)
+        if operation is None:
+            super().__setattr__(name, value)
+            return
+        with self.telemetry.timed(operation):
+            super().__setattr__(name, value)
+
+
+Sink = Callable[[Any, Optional[int], Dict[str, Dict[str, Any]]], None]
+
+
+class TelemetryReporter:
+    """
+    Periodically pushes instrument telemetry snapshots to sinks.
+
+    Attributes:
+        interval: Seconds between pushes
+    """
+
+    def __init__(self, interval: float = 10.0):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._instruments: List[tuple] = []
+        self._sinks: List[Sink] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, instrument: Any, instrument_id: Optional[int] = None):
+        """Report an instrument's telemetry (instrument_id is its database ID, if any)."""
+        with self._lock:
+            if not any(entry[0] is instrument for entry in self._instruments):
+                self._instruments.append((instrument, instrument_id))
+
+    def untrack(self, instrument: Any):
+        """Stop reporting an instrument."""
+        with self._lock:
+            self._instruments = [entry for entry in self._instruments if entry[0] is not instrument]
+
+    def add_sink(self, sink: Sink):
+        """Add a callable receiving (instrument, instrument_id, snapshot)."""
+        self._sinks.append(sink)
+
+    def flush(self) -> int:
+        """
+        Push one snapshot of every tracked instrument now.
+
+        Returns:
+            Number of instruments reported
+        """
+        with self._lock:
+            instruments = list(self._instruments)
+        reported = 0
+        for instrument, instrument_id in instruments:
+            telemetry = instrument.__dict__.get('_telemetry')
+            if telemetry is None:
+                continue
+            snapshot = telemetry.snapshot()
+            for sink in self._sinks:
+                try:
+                    sink(instrument, instrument_id, snapshot)
+                except Exception as e:
+                    logger.warning(f"Telemetry sink failed for {getattr(instrument, 'name', instrument)}: {e}")
+            reported += 1
+        return reported
+
+    def start(self):
+        """Start pushing in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry_reporter", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True):
+        """Stop the background thread, pushing a final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+
+def equipment_sink(equipment_manager: Any) -> Sink:
+    """Sink storing telemetry in InstrumentStatus through an EquipmentManager."""
+    def sink(instrument, instrument_id, snapshot):
+        equipment_manager.update_telemetry(getattr(instrument, 'name', str(instrument)), snapshot)
+    return sink
+
+
+def instrument_status_sink(db_service: Any) -> Sink:
+    """Sink storing telemetry on the InstrumentStatus of the instrument_id it was tracked with."""
+    def sink(instrument, instrument_id, snapshot):
+        if instrument_id is not None:
+            db_service.update_instrument_status(instrument_id, telemetry=snapshot)
+    return sink
+
+
+def websocket_sink(update_server: Any) -> Sink:
+    """Sink broadcasting telemetry to the 'instruments' WebSocket room."""
+    def sink(instrument, instrument_id, snapshot):
+        update_server.broadcast_instrument_telemetry(
+            instrument_id=instrument_id,
+            instrument_name=getattr(instrument, 'name', str(instrument)),
+            telemetry=snapshot,
+        )
+    return sink
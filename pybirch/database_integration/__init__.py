@@ -10,6 +10,7 @@ The integration layer enables:
 - Equipment registry and settings management
 - Buffered data writes for performance
 - Queue-level tracking with multi-scan management
+- Distributed job queue with workers on the computers owning the instruments
 
 Usage:
     from database.services import DatabaseService
@@ -34,11 +35,17 @@ Usage:
     socketio = init_socketio(app)
     server = ScanUpdateServer(socketio)
     server.broadcast_scan_status('SCAN_001', 'running', progress=0.5)
+    
+    # Distributed execution: submit centrally, run workers on lab computers
+    JobManager(db).submit([scan1, scan2], lab_id=1)
+    worker = ScanWorker(db, instruments=[lock_in, x_stage])
+    worker.start()
 """
 
 from .managers.scan_manager import ScanManager
 from .managers.queue_manager import QueueManager
 from .managers.equipment_manager import EquipmentManager
+from .managers.job_manager import JobManager
 
 # DataManager requires pandas - import conditionally
 try:
@@ -55,6 +62,20 @@ except ImportError:
     DatabaseQueueExtension = None
     DatabaseQueue = None
 
+# Distributed workers run scans through DatabaseQueue
+try:
+    from .workers.scan_worker import ScanWorker
+except ImportError:
+    ScanWorker = None
+
+# Write-behind writer shared by all DatabaseExtensions in the process
+try:
+    from .workers.db_writer import DatabaseWriter, get_database_writer, shutdown_database_writer
+except ImportError:
+    DatabaseWriter = None
+    get_database_writer = None
+    shutdown_database_writer = None
+
 # Sync module for WebSocket support (optional flask-socketio)
 try:
     from .sync.websocket_server import ScanUpdateServer, init_socketio, get_socketio
@@ -78,11 +99,17 @@ __all__ = [
     'ScanManager',
     'QueueManager', 
     'EquipmentManager',
+    'JobManager',
     'DataManager',
     # Extensions
     'DatabaseExtension',
     'DatabaseQueueExtension',
     'DatabaseQueue',
+    # Distributed workers
+    'ScanWorker',
+    'DatabaseWriter',
+    'get_database_writer',
+    'shutdown_database_writer',
     # Sync/WebSocket
     'ScanUpdateServer',
     'init_socketio',
@@ -68,6 +68,11 @@ class DatabaseExtension(ScanExtension):
         buffer_size: int = 100,
         owner: Optional[str] = None,
         scan_settings: Optional['ScanSettings'] = None,
+        lab_id: Optional[int] = None,
+        write_behind: bool = True,
+        storage: str = 'chunks',
+        telemetry_interval: Optional[float] = 10.0,
+        update_server: Optional[Any] = None,
     ):
         """
         Initialize the DatabaseExtension.
@@ -80,19 +85,35 @@ class DatabaseExtension(ScanExtension):
             buffer_size: Number of data points to buffer before flushing
             owner: Owner/operator name (will use scan.owner if not provided)
             scan_settings: Optional ScanSettings to capture at init time
+            lab_id: Database lab ID to associate with scan
+            write_behind: Commit data and progress through the process-wide
+                DatabaseWriter instead of on the scan's save threads
+            storage: How measurement data is stored: 'chunks' (compressed
+                column blocks) or 'rows' (one row per data point); see DataManager
+            telemetry_interval: Seconds between instrument telemetry reports
+                while the scan runs (None disables them)
+            update_server: Optional ScanUpdateServer telemetry is also broadcast to
         """
         # Note: We don't call super().__init__() because ScanExtension raises NotImplementedError
         self.db = db_service
         self.sample_id = sample_id
         self.project_id = project_id
         self.queue_id = queue_id
+        self.lab_id = lab_id
         self.buffer_size = buffer_size
         self.owner = owner
         self._scan_settings = scan_settings
+        self.telemetry_interval = telemetry_interval
+        self.update_server = update_server
+        self.telemetry_reporter = None
+        
+        # Imported here: the workers package imports the extensions package
+        from ..workers.db_writer import get_database_writer
         
         # Initialize managers
+        self.writer = get_database_writer(db_service) if write_behind else None
         self.scan_manager = ScanManager(db_service)
-        self.data_manager = DataManager(db_service, buffer_size=buffer_size)
+        self.data_manager = DataManager(db_service, buffer_size=buffer_size, storage=storage, writer=self.writer)
         self.queue_manager = QueueManager(db_service) if queue_id else None
         
         # State tracking
@@ -148,6 +169,7 @@ class DatabaseExtension(ScanExtension):
             project_id=self.project_id,
             queue_id=self.queue_id,
             owner=self.owner,
+            lab_id=self.lab_id,
         )
         
         self._scan_id = self._db_scan['scan_id']
@@ -163,6 +185,8 @@ class DatabaseExtension(ScanExtension):
         
         self.scan_manager.start_scan(self._scan_id)
         self._started = True
+        self._start_telemetry()
+        self.log_event('INFO', "Scan started", phase='running')
         print(f"[DB] Scan started: {self._scan_id}")
         
         # Add log entry to queue if part of a queue
@@ -238,7 +262,8 @@ class DatabaseExtension(ScanExtension):
         if not self._db_scan:
             return
         
-        self.data_manager.flush(self.db_scan_id)
+        self.log_event('INFO', "Scan paused", phase='running')
+        self._flush_durably()
         self.scan_manager.pause_scan(self._scan_id)
         print(f"Database scan paused: {self._scan_id}")
     
@@ -248,8 +273,20 @@ class DatabaseExtension(ScanExtension):
             return
         
         self.scan_manager.resume_scan(self._scan_id)
+        self.log_event('INFO', "Scan resumed", phase='running')
         print(f"Database scan resumed: {self._scan_id}")
     
+    def on_progress(self, progress: Dict[str, Any]):
+        """Called with throttled progress updates while the scan runs."""
+        if not self._db_scan or self._completed:
+            return
+        
+        if self.writer is not None:
+            # Superseded updates are merged away by the writer
+            self.writer.update_progress(self.db_scan_id, progress)
+        else:
+            self.scan_manager.update_progress(self._scan_id, progress)
+    
     def on_complete(self, wandb_link: Optional[str] = None):
         """
         Called when scan completes successfully.
@@ -260,8 +297,16 @@ class DatabaseExtension(ScanExtension):
         if not self._db_scan or self._completed:
             return
         
-        # Flush any remaining data
-        self.data_manager.flush(self.db_scan_id)
+        # Flush any remaining data and wait until it is committed
+        self._stop_telemetry()
+        self.log_event('INFO', "Scan completed", phase='cleanup')
+        write_error = self._flush_durably()
+        if write_error:
+            # Data was lost: the scan must not be recorded as completed
+            self.scan_manager.fail_scan(self._scan_id, error_message=write_error)
+            self._completed = True
+            print(f"[DB] Scan failed: {self._scan_id} - {write_error}")
+            return
         
         # Update scan duration
         self.scan_manager.update_scan_duration(self._scan_id)
@@ -317,7 +362,14 @@ class DatabaseExtension(ScanExtension):
             return
         
         # Flush any data collected so far
-        self.data_manager.flush(self.db_scan_id)
+        self._stop_telemetry()
+        self.log_event('WARNING', "Scan aborted", phase='cleanup')
+        write_error = self._flush_durably()
+        if write_error:
+            self.scan_manager.fail_scan(self._scan_id, error_message=f"Aborted; {write_error}")
+            self._completed = True
+            print(f"[DB] Scan failed: {self._scan_id} - {write_error}")
+            return
         
         # Mark as aborted
         self.scan_manager.abort_scan(self._scan_id)
@@ -335,10 +387,13 @@ class DatabaseExtension(ScanExtension):
             return
         
         # Flush any data collected so far
-        self.data_manager.flush(self.db_scan_id)
+        self._stop_telemetry()
+        self.log_event('ERROR', f"Scan failed: {error}", phase='cleanup')
+        write_error = self._flush_durably()
+        error_message = f"{error}; {write_error}" if write_error else str(error)
         
         # Mark as failed
-        self.scan_manager.fail_scan(self._scan_id, error_message=str(error))
+        self.scan_manager.fail_scan(self._scan_id, error_message=error_message)
         self._completed = True
         print(f"[DB] Scan failed: {self._scan_id} - {error}")
     
@@ -364,7 +419,93 @@ class DatabaseExtension(ScanExtension):
     def flush(self):
         """Flush all buffered data to database."""
         if self._db_scan:
-            self.data_manager.flush(self.db_scan_id)
+            self._flush_durably()
+    
+    def log_event(self, level: str, message: str, phase: Optional[str] = None, **fields):
+        """
+        Record a scan log entry, through the write-behind writer when enabled.
+        
+        Args:
+            level: Log level ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+            message: Log message
+            phase: Scan phase ('setup', 'running', 'cleanup', 'analysis')
+            **fields: progress and extra_data (see DatabaseService.create_scan_log)
+        """
+        if not self._db_scan:
+            return
+        try:
+            if self.writer is not None:
+                self.writer.submit_scan_log(self.db_scan_id, level, message, phase=phase, **fields)
+            else:
+                self.db.create_scan_log(self.db_scan_id, level, message, phase=phase, **fields)
+        except Exception as e:
+            print(f"[DB] Failed to add scan log: {e}")
+    
+    def _start_telemetry(self):
+        """
+        Report the telemetry of the scan's instruments until the scan ends.
+        
+        Snapshots go to the InstrumentStatus of the database instrument with
+        the same name, and to the update server if there is one.
+        """
+        if self.telemetry_interval is None or self.telemetry_reporter is not None:
+            return
+        tree = getattr(self._scan_settings, 'scan_tree', None)
+        if tree is None or not hasattr(tree, 'get_all_instrument_items'):
+            return
+        instruments = [item.instrument_object.instrument for item in tree.get_all_instrument_items()]
+        if not instruments:
+            return
+        
+        from pybirch.Instruments.telemetry import TelemetryReporter, instrument_status_sink, websocket_sink
+        
+        reporter = TelemetryReporter(interval=self.telemetry_interval)
+        reporter.add_sink(instrument_status_sink(self.db))
+        if self.update_server is not None:
+            reporter.add_sink(websocket_sink(self.update_server))
+        for instrument in instruments:
+            reporter.track(instrument, instrument_id=self._instrument_db_id(instrument))
+        reporter.start()
+        self.telemetry_reporter = reporter
+    
+    def _stop_telemetry(self):
+        """Stop the telemetry reporter, pushing a final snapshot."""
+        if self.telemetry_reporter is None:
+            return
+        try:
+            self.telemetry_reporter.stop()
+        except Exception as e:
+            print(f"[DB] Failed to report instrument telemetry: {e}")
+        self.telemetry_reporter = None
+    
+    def _instrument_db_id(self, instrument: Any) -> Optional[int]:
+        """Database ID of the instrument with the same nickname or name, if any."""
+        if not hasattr(self.db, 'get_instrument_by_name'):
+            return None
+        for name in dict.fromkeys(filter(None, (getattr(instrument, 'nickname', None),
+                                                getattr(instrument, 'name', None)))):
+            try:
+                record = self.db.get_instrument_by_name(name)
+            except Exception:
+                return None
+            if record:
+                return record['id']
+        return None
+    
+    def _flush_durably(self) -> Optional[str]:
+        """
+        Flush buffered data and wait until the writer has committed it.
+        
+        Returns:
+            None if everything was committed, otherwise why it may not have been
+        """
+        self.data_manager.flush(self.db_scan_id)
+        if self.writer is None or self.writer.flush(self.db_scan_id, timeout=60.0):
+            return None
+        reason = self.writer.scan_error(self.db_scan_id) or "timed out waiting for pending writes"
+        message = f"Scan data was not fully written to the database ({reason})"
+        print(f"[DB] ERROR: {message}")
+        return message
     
     def get_data(self, measurement_name: str) -> pd.DataFrame:
         """
@@ -92,6 +92,10 @@ class DatabaseQueue(Queue):
         auto_create_db_record: bool = True,
         buffer_size: int = 100,
         update_server: Optional[Any] = None,
+        lab_id: Optional[int] = None,
+        manage_queue_status: bool = True,
+        write_behind: bool = True,
+        storage: str = 'chunks',
     ):
         """
         Initialize DatabaseQueue.
@@ -107,21 +111,36 @@ class DatabaseQueue(Queue):
             auto_create_db_record: If True, create DB record immediately
             buffer_size: Data buffer size for scan extensions
             update_server: Optional ScanUpdateServer for WebSocket broadcasts
+            lab_id: Database lab ID to associate with queue/scans
+            manage_queue_status: If False, this instance never writes queue-level
+                status or progress. Used by distributed workers that each run a
+                slice of a shared queue whose progress is derived from its jobs.
+            write_behind: Commit scan data, progress and logs through the
+                process-wide DatabaseWriter (see DatabaseExtension)
+            storage: How scan data is stored, 'chunks' or 'rows' (see DataManager)
         """
         # Initialize parent Queue
         super().__init__(QID=QID, scans=None, max_parallel_scans=max_parallel_scans)
         
+        # Imported here: the workers package imports the extensions package
+        from ..workers.db_writer import get_database_writer
+        
         # Database components
         self.db_service = db_service
+        self.writer = get_database_writer(db_service) if write_behind else None
         self.queue_manager = QueueManager(db_service)
         self.scan_manager = ScanManager(db_service)
-        self.data_manager = DataManager(db_service, buffer_size=buffer_size)
+        self.data_manager = DataManager(db_service, buffer_size=buffer_size, storage=storage, writer=self.writer)
         
         # Configuration
         self.project_id = project_id
         self.sample_id = sample_id
         self.operator = operator
+        self.lab_id = lab_id
         self.buffer_size = buffer_size
+        self.manage_queue_status = manage_queue_status
+        self.write_behind = write_behind
+        self.storage = storage
         
         # WebSocket integration
         self.update_server = update_server
@@ -167,6 +186,7 @@ class DatabaseQueue(Queue):
                 project_id=self.project_id,
                 execution_mode=self._execution_mode.name,
                 operator=self.operator,
+                lab_id=self.lab_id,
             )
             print(f"[DB Queue] Created: {self.db_queue_uuid} (ID: {self.db_queue_id})")
     
@@ -178,7 +198,7 @@ class DatabaseQueue(Queue):
         # Add state callback to track scan state changes
         self.add_state_callback(self._on_scan_state_change)
         
-        # Add progress callback (optional, for fine-grained tracking)
+        # Add progress callback (throttled by the queue's progress_interval)
         self.add_progress_callback(self._on_scan_progress)
     
     def _setup_websocket_integration(self):
@@ -266,13 +286,21 @@ class DatabaseQueue(Queue):
             print(f"[DB Queue] Warning: Failed to update scan state: {e}")
     
     def _on_scan_progress(self, scan_id: str, progress: float):
-        """Callback for scan progress updates."""
-        # Could be used for fine-grained progress tracking if needed
-        pass
+        """Callback for scan progress updates - records live progress on the scan."""
+        if not self._db_queue:
+            return
+        
+        try:
+            ext = self._scan_extensions.get(scan_id)
+            handle = self.get_handle_by_id(scan_id)
+            if ext and handle and handle.state == ScanState.RUNNING:
+                ext.on_progress(handle.progress_info())
+        except Exception as e:
+            print(f"[DB Queue] Warning: Failed to update scan progress: {e}")
     
     def _update_queue_progress(self):
         """Update queue progress in database."""
-        if not self._db_queue:
+        if not self._db_queue or not self.manage_queue_status:
             return
         
         try:
@@ -313,6 +341,10 @@ class DatabaseQueue(Queue):
                 buffer_size=self.buffer_size,
                 owner=self.operator or scan.owner,
                 scan_settings=scan.scan_settings,
+                lab_id=self.lab_id,
+                write_behind=self.write_behind,
+                storage=self.storage,
+                update_server=self.update_server,
             )
             
             # Add extension to scan
@@ -324,7 +356,7 @@ class DatabaseQueue(Queue):
             self._scan_extensions[handle.scan_id] = ext
             
             # Update total scans in database
-            if self._db_queue:
+            if self._db_queue and self.manage_queue_status:
                 self.queue_manager.update_progress(
                     self.db_queue_uuid,
                     completed_scans=0,
@@ -342,7 +374,7 @@ class DatabaseQueue(Queue):
             mode: Execution mode (SERIAL or PARALLEL)
         """
         # Update database queue status
-        if self._db_queue:
+        if self._db_queue and self.manage_queue_status:
             self.queue_manager.start_queue(self.db_queue_uuid)
         
         # Call parent start
@@ -352,28 +384,28 @@ class DatabaseQueue(Queue):
         """Pause with database update."""
         super().pause(scan_id)
         
-        if not scan_id and self._db_queue:
+        if not scan_id and self._db_queue and self.manage_queue_status:
             self.queue_manager.pause_queue(self.db_queue_uuid)
     
     def resume(self, scan_id: Optional[str] = None):
         """Resume with database update."""
         super().resume(scan_id)
         
-        if not scan_id and self._db_queue:
+        if not scan_id and self._db_queue and self.manage_queue_status:
             self.queue_manager.resume_queue(self.db_queue_uuid)
     
     def abort(self, scan_id: Optional[str] = None):
         """Abort with database update."""
         super().abort(scan_id)
         
-        if not scan_id and self._db_queue:
+        if not scan_id and self._db_queue and self.manage_queue_status:
             self.queue_manager.stop_queue(self.db_queue_uuid)
     
     def stop_queue(self):
         """Stop queue with database update."""
         super().stop_queue()
         
-        if self._db_queue:
+        if self._db_queue and self.manage_queue_status:
             self.queue_manager.stop_queue(self.db_queue_uuid)
     
     def wait_for_completion(self, timeout: Optional[float] = None) -> bool:
@@ -389,7 +421,7 @@ class DatabaseQueue(Queue):
         result = super().wait_for_completion(timeout)
         
         # Update final queue status
-        if result and self._db_queue:
+        if result and self._db_queue and self.manage_queue_status:
             all_completed = all(
                 h.is_finished() for h in self._scan_handles
             )
@@ -496,7 +528,8 @@ class DatabaseQueue(Queue):
             db_service=db_service,
             project_id=db_queue.get('project_id'),
             sample_id=db_queue.get('sample_id'),
-            operator=db_queue.get('operator'),
+            operator=db_queue.get('created_by'),
+            lab_id=db_queue.get('lab_id'),
             max_parallel_scans=max_parallel_scans,
             auto_create_db_record=False,  # Don't create new record
         )
@@ -3,6 +3,7 @@
 from .scan_manager import ScanManager
 from .queue_manager import QueueManager
 from .equipment_manager import EquipmentManager
+from .job_manager import JobManager
 
 # DataManager requires pandas - import conditionally
 try:
@@ -10,4 +11,4 @@ try:
 except ImportError:
     DataManager = None  # Will be None if pandas not available
 
-__all__ = ['ScanManager', 'QueueManager', 'EquipmentManager', 'DataManager']
+__all__ = ['ScanManager', 'QueueManager', 'EquipmentManager', 'JobManager', 'DataManager']
@@ -5,18 +5,20 @@ Manages measurement data persistence to the database.
 """
 
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 import numpy as np
 import pandas as pd
 
 try:
     from database.services import DatabaseService
     from database.models import MeasurementObject, MeasurementDataPoint, MeasurementDataArray
+    from database.blob_store import serialize_array
 except ImportError:
     DatabaseService = None
     MeasurementObject = None
     MeasurementDataPoint = None
     MeasurementDataArray = None
+    serialize_array = None
 
 
 class DataManager:
@@ -25,6 +27,10 @@ class DataManager:
     
     Handles buffered writes, batch inserts, and data retrieval
     for scan measurement data.
+    
+    DataFrames are stored either as one MeasurementDataPoint row per data
+    point (storage='rows') or as compressed column blocks
+    (storage='chunks', see database/chunk_storage.py). Reads combine both.
     """
     
     def __init__(
@@ -32,6 +38,9 @@ class DataManager:
         db_service: 'DatabaseService',
         buffer_size: int = 100,
         auto_flush: bool = True,
+        storage: str = 'rows',
+        chunk_rows: Optional[int] = None,
+        writer: Optional['DatabaseWriter'] = None,
     ):
         """
         Initialize the DataManager.
@@ -40,14 +49,26 @@ class DataManager:
             db_service: Database service instance for persistence operations
             buffer_size: Number of data points to buffer before flushing
             auto_flush: Whether to auto-flush when buffer is full
+            storage: 'rows' or 'chunks' (falls back to 'rows' if the service has no chunk storage)
+            chunk_rows: Rows per stored block in chunk storage (service default if None)
+            writer: Write-behind DatabaseWriter that commits flushed data in the
+                background (None writes synchronously on flush)
         """
+        if storage not in ('rows', 'chunks'):
+            raise ValueError(f"Unknown storage '{storage}' (expected 'rows' or 'chunks')")
         self.db = db_service
         self.buffer_size = buffer_size
         self.auto_flush = auto_flush
+        self.storage = storage if storage == 'rows' or hasattr(db_service, 'create_data_chunks') else 'rows'
+        self.chunk_rows = chunk_rows
+        self.writer = writer
         
         # Buffers: {scan_id: {measurement_name: [data_points]}}
         self._buffers: Dict[int, Dict[str, List[Dict]]] = {}
         
+        # Chunk storage buffers: {scan_id: {measurement_name: [(frame, first_sequence, timestamp)]}}
+        self._frame_buffers: Dict[int, Dict[str, List[tuple]]] = {}
+        
         # Measurement object cache: {(scan_id, measurement_name): db_id}
         self._measurement_objects: Dict[tuple, int] = {}
         
@@ -180,17 +201,48 @@ class DataManager:
                 columns=columns
             )
         
-        # Convert DataFrame rows to data points
-        count = 0
-        for idx, row in data.iterrows():
-            values = row.to_dict()
-            # Convert numpy types to native Python types
-            values = {k: self._convert_value(v) for k, v in values.items()}
-            self.save_data_point(scan_id, measurement_name, values)
-            count += 1
+        if self.storage == 'chunks':
+            return self._buffer_frame(scan_id, measurement_name, data)
+        
+        count = len(data)
+        if not count:
+            return 0
+        
+        # Convert whole columns to native Python values, then zip them into rows
+        names = list(data.columns)
+        columns = [self._convert_column(data.iloc[:, i]) for i in range(len(names))]
+        measurement_id = self._measurement_objects[key]
+        first = self._sequence_counters[key]
+        timestamp = datetime.now()
+        
+        buffer = self._buffers.setdefault(scan_id, {}).setdefault(measurement_name, [])
+        buffer.extend(
+            {
+                'measurement_object_id': measurement_id,
+                'sequence_index': first + i,
+                'values': dict(zip(names, row)),
+                'timestamp': timestamp,
+            }
+            for i, row in enumerate(zip(*columns))
+        )
+        self._sequence_counters[key] = first + count
+        
+        if self.auto_flush and len(buffer) >= self.buffer_size:
+            self.flush(scan_id, measurement_name)
         
         return count
     
+    def _buffer_frame(self, scan_id: int, measurement_name: str, data: pd.DataFrame) -> int:
+        """Queue a DataFrame for chunk storage, flushing once buffer_size rows are pending."""
+        key = (scan_id, measurement_name)
+        pending = self._frame_buffers.setdefault(scan_id, {}).setdefault(measurement_name, [])
+        pending.append((data.reset_index(drop=True), self._sequence_counters[key], datetime.now()))
+        self._sequence_counters[key] += len(data)
+        
+        if self.auto_flush and sum(len(frame) for frame, _, _ in pending) >= self.buffer_size:
+            self.flush(scan_id, measurement_name)
+        return len(data)
+    
     def save_array(
         self,
         scan_id: int,
@@ -198,16 +250,22 @@ class DataManager:
         data: np.ndarray,
         data_format: str = 'numpy',
         extra_data: Optional[Dict] = None,
+        codec: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Save an array (spectrum, image, etc.) to the database.
         
+        Identical arrays (e.g. a reference spectrum saved at every point) share
+        one compressed blob; see database/blob_store.py.
+        
         Args:
             scan_id: Database scan ID
             measurement_name: Name of the measurement
             data: NumPy array to save
-            data_format: Format identifier ('numpy', 'json')
+            data_format: Format identifier ('numpy' or 'raw')
             extra_data: Additional metadata
+            codec: Blob compression ('none', 'zlib', 'lzma', or 'zstd'/'lz4' if
+                installed; None for the fastest available)
             
         Returns:
             Dictionary with created data array record
@@ -222,30 +280,52 @@ class DataManager:
                 data_type='array'
             )
         
-        # Serialize array
-        if data_format == 'numpy':
-            import io
-            buffer = io.BytesIO()
-            np.save(buffer, data)
-            data_blob = buffer.getvalue()
-        else:
-            data_blob = data.tobytes()
-        
         array_data = {
             'measurement_object_id': self._measurement_objects[key],
             'sequence_index': self._sequence_counters.get(key, 0),
-            'data_blob': data_blob,
+            'data_blob': serialize_array(data, data_format),
+            'codec': codec,
             'data_format': data_format,
             'shape': list(data.shape),
             'dtype': str(data.dtype),
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now(),
             'extra_data': extra_data,
         }
         
         self._sequence_counters[key] = self._sequence_counters.get(key, 0) + 1
         
+        if self.writer is not None:
+            self.writer.submit_data_array(array_data, scan_id=scan_id)
+            return {k: v for k, v in array_data.items() if k not in ('data_blob', 'codec')}
         return self.db.create_measurement_data_array(array_data)
     
+    def get_arrays(self, scan_id: int, measurement_name: str) -> List[Dict[str, Any]]:
+        """
+        List the arrays saved for a measurement, without loading their data.
+        
+        Args:
+            scan_id: Database scan ID
+            measurement_name: Name of the measurement
+            
+        Returns:
+            Array records in sequence order (pass an 'id' to load_array())
+        """
+        key = (scan_id, measurement_name)
+        mo_id = self._measurement_objects.get(key)
+        
+        if not mo_id:
+            mo = self.db.get_measurement_object(scan_id, measurement_name)
+            if not mo:
+                return []
+            mo_id = mo['id']
+            self._measurement_objects[key] = mo_id
+        
+        return self.db.get_measurement_data_arrays(mo_id)
+    
+    def load_array(self, array_id: int) -> Optional[np.ndarray]:
+        """Load the data of an array saved with save_array()."""
+        return self.db.load_measurement_data_array(array_id)
+    
     def flush(self, scan_id: Optional[int] = None, measurement_name: Optional[str] = None):
         """
         Flush buffered data to the database.
@@ -257,16 +337,22 @@ class DataManager:
         if scan_id is not None and measurement_name is not None:
             # Flush specific measurement
             self._flush_measurement(scan_id, measurement_name)
+            self._flush_frames(scan_id, measurement_name)
         elif scan_id is not None:
             # Flush all measurements for a scan
             if scan_id in self._buffers:
                 for mname in list(self._buffers[scan_id].keys()):
                     self._flush_measurement(scan_id, mname)
+            for mname in list(self._frame_buffers.get(scan_id, {}).keys()):
+                self._flush_frames(scan_id, mname)
         else:
             # Flush everything
             for sid in list(self._buffers.keys()):
                 for mname in list(self._buffers[sid].keys()):
                     self._flush_measurement(sid, mname)
+            for sid in list(self._frame_buffers.keys()):
+                for mname in list(self._frame_buffers[sid].keys()):
+                    self._flush_frames(sid, mname)
     
     def _flush_measurement(self, scan_id: int, measurement_name: str):
         """Flush buffer for a specific measurement."""
@@ -289,8 +375,14 @@ class DataManager:
             print(f"[DataManager] ERROR: No measurement_id for {measurement_name}")
             return
         
+        if self.writer is not None:
+            # Committed by the writer thread, grouped with other pending writes
+            self.writer.submit_data_points([
+                {**dp, 'measurement_object_id': measurement_id} for dp in data_points
+            ], scan_id=scan_id)
+            print(f"[DataManager] Queued {len(data_points)} data points for {measurement_name}")
         # Bulk insert - service expects (measurement_id, data_points)
-        if hasattr(self.db, 'bulk_create_data_points'):
+        elif hasattr(self.db, 'bulk_create_data_points'):
             count = self.db.bulk_create_data_points(measurement_id, data_points)
             print(f"[DataManager] Flushed {count} data points for {measurement_name}")
         else:
@@ -302,12 +394,42 @@ class DataManager:
         # Clear buffer
         self._buffers[scan_id][measurement_name] = []
     
+    def _flush_frames(self, scan_id: int, measurement_name: str):
+        """Write buffered DataFrames of a measurement as column chunks."""
+        pending = self._frame_buffers.get(scan_id, {}).get(measurement_name)
+        if not pending:
+            return
+        measurement_id = self._measurement_objects.get((scan_id, measurement_name))
+        if not measurement_id:
+            print(f"[DataManager] ERROR: No measurement_id for {measurement_name}")
+            return
+        
+        frame = pd.concat([f for f, _, _ in pending], ignore_index=True) if len(pending) > 1 else pending[0][0]
+        sequence = np.concatenate([np.arange(first, first + len(f)) for f, first, _ in pending])
+        timestamps = np.concatenate([np.full(len(f), np.datetime64(t, 'ns')) for f, _, t in pending])
+        if self.writer is not None:
+            self.writer.submit_data_chunks(
+                measurement_id, frame,
+                sequence_indices=sequence, timestamps=timestamps, chunk_rows=self.chunk_rows,
+                scan_id=scan_id,
+            )
+            print(f"[DataManager] Queued {len(frame)} rows as chunks for {measurement_name}")
+        else:
+            count = self.db.create_data_chunks(
+                measurement_id, frame,
+                sequence_indices=sequence, timestamps=timestamps, chunk_rows=self.chunk_rows,
+            )
+            print(f"[DataManager] Flushed {count} rows as chunks for {measurement_name}")
+        
+        self._frame_buffers[scan_id][measurement_name] = []
+    
     def get_data(
         self,
         scan_id: int,
         measurement_name: str,
         start_index: Optional[int] = None,
         end_index: Optional[int] = None,
+        columns: Optional[List[str]] = None,
     ) -> pd.DataFrame:
         """
         Get measurement data as a DataFrame.
@@ -317,41 +439,60 @@ class DataManager:
             measurement_name: Name of the measurement
             start_index: Starting sequence index (inclusive)
             end_index: Ending sequence index (exclusive)
+            columns: Data columns to include (None for all)
             
         Returns:
             DataFrame with measurement data
         """
+        chunks = list(self.iter_data(scan_id, measurement_name, start_index, end_index, columns))
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    
+    def iter_data(
+        self,
+        scan_id: int,
+        measurement_name: str,
+        start_index: Optional[int] = None,
+        end_index: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        chunk_size: Optional[int] = None,
+        as_numpy: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Stream measurement data in fixed-size pieces, in sequence order.
+        
+        Args:
+            scan_id: Database scan ID
+            measurement_name: Name of the measurement
+            start_index: Starting sequence index (inclusive)
+            end_index: Ending sequence index (exclusive)
+            columns: Data columns to include (None for all)
+            chunk_size: Rows per piece
+            as_numpy: Yield dicts of column arrays instead of DataFrames
+            
+        Yields:
+            DataFrames (or dicts of arrays) read from chunk and row storage
+        """
         key = (scan_id, measurement_name)
         mo_id = self._measurement_objects.get(key)
         
         if not mo_id:
             # Try to find in database
-            mo = self.db.get_measurement_object_by_name(scan_id, measurement_name)
-            if mo:
-                mo_id = mo['id']
-                self._measurement_objects[key] = mo_id
-            else:
-                return pd.DataFrame()
-        
-        # Get data points
-        data_points = self.db.get_measurement_data(
-            mo_id, 
-            start_index=start_index, 
-            end_index=end_index
+            mo = self.db.get_measurement_object(scan_id, measurement_name)
+            if not mo:
+                return
+            mo_id = mo['id']
+            self._measurement_objects[key] = mo_id
+        
+        yield from self.db.iter_measurement_data(
+            mo_id,
+            columns=columns,
+            start_index=start_index,
+            end_index=end_index,
+            chunk_size=chunk_size,
+            as_numpy=as_numpy,
         )
-        
-        if not data_points:
-            return pd.DataFrame()
-        
-        # Convert to DataFrame
-        rows = []
-        for dp in data_points:
-            row = dp.get('values', {})
-            row['_sequence_index'] = dp.get('sequence_index')
-            row['_timestamp'] = dp.get('timestamp')
-            rows.append(row)
-        
-        return pd.DataFrame(rows)
     
     def get_data_count(self, scan_id: int, measurement_name: Optional[str] = None) -> int:
         """Get count of data points for a scan."""
@@ -364,11 +505,31 @@ class DataManager:
         if scan_id is not None:
             if scan_id in self._buffers:
                 del self._buffers[scan_id]
+            self._frame_buffers.pop(scan_id, None)
         else:
             self._buffers.clear()
+            self._frame_buffers.clear()
+    
+    def _convert_column(self, column: pd.Series) -> List[Any]:
+        """Convert a DataFrame column to native Python values, with None for NaN."""
+        kind = column.dtype.kind
+        if kind in 'iub':
+            return column.to_numpy().tolist()
+        if kind == 'f':
+            values = column.to_numpy(dtype=float)
+            missing = np.isnan(values)
+            converted = values.tolist()
+            if missing.any():
+                for i in np.flatnonzero(missing).tolist():
+                    converted[i] = None
+            return converted
+        # Object, datetime and extension columns: per-cell conversion
+        return [self._convert_value(v) for v in column.tolist()]
     
     def _convert_value(self, value: Any) -> Any:
         """Convert numpy types to native Python types."""
+        if isinstance(value, np.floating) and np.isnan(value):
+            return None
         if isinstance(value, (np.integer, np.floating)):
             return value.item()
         elif isinstance(value, np.ndarray):
@@ -100,6 +100,7 @@ class EquipmentManager:
         status: str,
         error_message: Optional[str] = None,
         current_settings: Optional[Dict] = None,
+        telemetry: Optional[Dict] = None,
     ) -> bool:
         """
         Update instrument status.
@@ -109,6 +110,7 @@ class EquipmentManager:
             status: New status ('available', 'in_use', 'disconnected', 'error', 'maintenance')
             error_message: Error message if status is 'error'
             current_settings: Current instrument settings
+            telemetry: Per-operation performance statistics
             
         Returns:
             True if successful, False otherwise
@@ -118,19 +120,50 @@ class EquipmentManager:
             return False
         
         update_data = {'status': status}
+        result = self.db.update_equipment(db_id, update_data)
+        if result is None:
+            return False
         
-        # If we have InstrumentStatus tracking
+        # Live status of the instruments belonging to this equipment, if any
         if hasattr(self.db, 'update_instrument_status'):
-            return self.db.update_instrument_status(
-                db_id, 
-                status, 
-                error_message=error_message,
-                current_settings=current_settings
-            )
+            for instrument_id in self._instrument_ids(db_id, instrument_name):
+                self.db.update_instrument_status(
+                    instrument_id,
+                    status,
+                    error_message=error_message,
+                    current_settings=current_settings,
+                    telemetry=telemetry,
+                )
+        return True
+    
+    def update_telemetry(self, instrument_name: str, telemetry: Dict) -> bool:
+        """
+        Store an instrument's performance telemetry without changing its status.
         
-        # Otherwise just update equipment
-        result = self.db.update_equipment(db_id, update_data)
-        return result is not None
+        Telemetry is kept on the InstrumentStatus rows of the instruments
+        belonging to the registered equipment.
+        
+        Args:
+            instrument_name: Name of the instrument
+            telemetry: Per-operation statistics (InstrumentTelemetry.snapshot())
+            
+        Returns:
+            True if stored for at least one instrument, False otherwise
+        """
+        db_id = self._registered_instruments.get(instrument_name)
+        if not db_id or not hasattr(self.db, 'update_instrument_status'):
+            return False
+        updated = [
+            self.db.update_instrument_status(instrument_id, telemetry=telemetry)
+            for instrument_id in self._instrument_ids(db_id, instrument_name)
+        ]
+        return any(updated)
+    
+    def _instrument_ids(self, equipment_id: int, instrument_name: str) -> List[int]:
+        """Instrument IDs for registered equipment (Equipment IDs are not Instrument IDs)."""
+        if not hasattr(self.db, 'get_equipment_instrument_ids'):
+            return []
+        return self.db.get_equipment_instrument_ids(equipment_id, name=instrument_name)
     
     def set_connected(self, instrument_name: str) -> bool:
         """Mark an instrument as connected."""
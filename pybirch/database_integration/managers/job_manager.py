@@ -0,0 +1,194 @@
+"""
+Job Manager
+===========
+Submits PyBirch scans to the distributed scan job queue in the database.
+
+Scans are enqueued centrally (e.g. from the GUI or a script) as serialized
+jobs. Worker processes on the lab computers then claim the jobs whose
+instruments are bound to their computer, see
+:class:`pybirch.database_integration.workers.ScanWorker`.
+"""
+
+from typing import Optional, Dict, Any, List, Iterable
+
+try:
+    from database.services import DatabaseService
+except ImportError:
+    DatabaseService = None
+
+from .queue_manager import QueueManager
+
+
+class JobManager:
+    """
+    Manages the distributed scan job queue.
+
+    This class serializes PyBirch Scan objects into ScanJob records, records
+    which instruments each scan requires, and exposes job status queries.
+    """
+
+    def __init__(self, db_service: 'DatabaseService'):
+        """
+        Initialize the JobManager.
+
+        Args:
+            db_service: Database service instance for persistence operations
+        """
+        self.db = db_service
+        self.queue_manager = QueueManager(db_service)
+
+    def submit(
+        self,
+        scans: Iterable['Scan'],
+        lab_id: Optional[int] = None,
+        name: Optional[str] = None,
+        project_id: Optional[int] = None,
+        sample_id: Optional[int] = None,
+        operator: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: int = 3,
+    ) -> Dict[str, Any]:
+        """
+        Create a database queue and enqueue one job per scan.
+
+        Args:
+            scans: PyBirch Scan objects to run
+            lab_id: Database lab ID for the queue and its scans
+            name: Queue name (optional)
+            project_id: Database project ID (optional)
+            sample_id: Database sample ID (optional)
+            operator: Operator name
+            priority: Job priority (higher runs first)
+            max_attempts: Claims allowed per job before it is failed
+
+        Returns:
+            Dictionary with created queue data and a 'jobs' list
+        """
+        db_queue = self.queue_manager.create_queue(
+            name=name,
+            sample_id=sample_id,
+            project_id=project_id,
+            execution_mode='PARALLEL',  # Jobs run concurrently across workers
+            operator=operator,
+            lab_id=lab_id,
+        )
+
+        jobs = [
+            self.enqueue_scan(
+                scan,
+                queue_id=db_queue['id'],
+                priority=priority,
+                max_attempts=max_attempts,
+                operator=operator,
+            )
+            for scan in scans
+        ]
+
+        db_queue = self.db.get_queue(db_queue['id']) or db_queue
+        db_queue['jobs'] = jobs
+        return db_queue
+
+    def enqueue_scan(
+        self,
+        scan: 'Scan',
+        queue_id: Optional[int] = None,
+        lab_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        sample_id: Optional[int] = None,
+        priority: int = 0,
+        max_attempts: int = 3,
+        operator: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Enqueue a single scan as a job.
+
+        Args:
+            scan: PyBirch Scan object
+            queue_id: Parent database queue ID (optional)
+            lab_id: Database lab ID (inherited from the queue if omitted)
+            project_id: Database project ID (inherited from the queue if omitted)
+            sample_id: Database sample ID (inherited from the queue if omitted)
+            priority: Job priority (higher runs first)
+            max_attempts: Claims allowed before the job is failed
+            operator: Operator name (defaults to scan.owner)
+
+        Returns:
+            Dictionary with created job data
+        """
+        data = {
+            'name': scan.scan_settings.scan_name,
+            'queue_id': queue_id,
+            'priority': priority,
+            'max_attempts': max_attempts,
+            'required_instruments': self.get_required_instruments(scan),
+            'scan_data': self.serialize_scan(scan),
+            'created_by': operator or getattr(scan, 'owner', None),
+        }
+        # Only pass ownership explicitly given, so the service can inherit from the queue
+        for key, value in (('lab_id', lab_id), ('project_id', project_id), ('sample_id', sample_id)):
+            if value is not None:
+                data[key] = value
+
+        return self.db.create_scan_job(data)
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get a job by database ID."""
+        return self.db.get_scan_job(job_id)
+
+    def get_jobs(self, queue_id: Optional[int] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get jobs, optionally filtered by parent queue and status."""
+        return self.db.get_scan_jobs(status=status, queue_id=queue_id)
+
+    def cancel_job(self, job_id: int) -> bool:
+        """Cancel a job. A worker running it aborts on its next heartbeat."""
+        return self.db.cancel_scan_job(job_id)
+
+    def requeue_expired(self) -> int:
+        """Return jobs of dead workers to the pending pool."""
+        return self.db.requeue_expired_scan_jobs()
+
+    @staticmethod
+    def get_required_instruments(scan: 'Scan') -> List[str]:
+        """
+        Get the names of all instruments used by a scan's tree.
+
+        Args:
+            scan: PyBirch Scan object
+
+        Returns:
+            Sorted list of unique instrument names
+        """
+        names = set()
+        scan_tree = getattr(scan.scan_settings, 'scan_tree', None)
+        root = getattr(scan_tree, 'root_item', None)
+        stack = list(getattr(root, 'child_items', []))
+        while stack:
+            item = stack.pop()
+            instrument_object = getattr(item, 'instrument_object', None)
+            instrument = getattr(instrument_object, 'instrument', None)
+            if instrument is not None and getattr(instrument, 'name', None):
+                names.add(instrument.name)
+            stack.extend(getattr(item, 'child_items', []))
+        return sorted(names)
+
+    @staticmethod
+    def serialize_scan(scan: 'Scan') -> bytes:
+        """
+        Serialize a scan for transport to a worker.
+
+        Uses the versioned snapshot format (pybirch.queue.snapshot), which
+        stores the scan definition as JSON; workers never unpickle job data.
+        Movement positions are copied into the serialized tree so they survive
+        without the instruments, and the worker rebinds its own instrument
+        objects by name. Extensions are not serialized; the worker attaches its
+        own database extension.
+
+        Args:
+            scan: PyBirch Scan object
+
+        Returns:
+            Snapshot bytes
+        """
+        from pybirch.queue.snapshot import dumps_scan
+
+        return dumps_scan(scan)
@@ -42,6 +42,7 @@ class QueueManager:
         queue_template_id: Optional[int] = None,
         execution_mode: str = 'SERIAL',
         operator: Optional[str] = None,
+        lab_id: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Create a database queue record.
@@ -53,6 +54,7 @@ class QueueManager:
             queue_template_id: Database queue template ID (optional)
             execution_mode: 'SERIAL' or 'PARALLEL'
             operator: Operator name
+            lab_id: Database lab ID (optional)
             
         Returns:
             Dictionary with created queue data
@@ -68,10 +70,12 @@ class QueueManager:
             'sample_id': sample_id,
             'project_id': project_id,
             'queue_template_id': queue_template_id,
-            'operator': operator,
+            'created_by': operator,  # Database uses 'created_by' instead of 'operator'
             'total_scans': 0,
             'completed_scans': 0,
         }
+        if lab_id is not None:
+            data['lab_id'] = lab_id
         
         db_queue = self.db.create_queue(data)
         self._active_queues[queue_id] = db_queue['id']
@@ -44,6 +44,7 @@ class ScanManager:
         project_id: Optional[int] = None,
         scan_template_id: Optional[int] = None,
         owner: Optional[str] = None,
+        lab_id: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Create a database scan record from PyBirch ScanSettings.
@@ -55,6 +56,7 @@ class ScanManager:
             project_id: Database project ID (optional)
             scan_template_id: Database scan template ID (optional)
             owner: Owner/operator name
+            lab_id: Database lab ID (optional)
             
         Returns:
             Dictionary with created scan data
@@ -87,6 +89,8 @@ class ScanManager:
             'project_id': project_id,
             'scan_template_id': scan_template_id,
         }
+        if lab_id is not None:
+            data['lab_id'] = lab_id
         
         # Handle user_fields as extra_data
         if hasattr(scan_settings, 'user_fields') and scan_settings.user_fields:
@@ -141,6 +145,14 @@ class ScanManager:
         result = self.db.update_scan(db_id, {'status': 'running'})
         return result is not None
     
+    def update_progress(self, scan_id: str, progress: Dict[str, Any]) -> bool:
+        """Record live progress (fraction, points, rate, ETA) for a running scan."""
+        db_id = self._active_scans.get(scan_id)
+        if not db_id:
+            return False
+        
+        return self.db.update_scan_progress(db_id, progress)
+    
     def complete_scan(self, scan_id: str, wandb_link: Optional[str] = None) -> bool:
         """
         Mark a scan as completed.
@@ -491,12 +491,18 @@ class WebSocketQueueBridge:
             logger.warning(f"Failed to broadcast state change: {e}")
     
     def _on_progress_update(self, scan_id: str, progress: float):
-        """Forward progress updates to WebSocket broadcast."""
+        """Forward progress updates (with points, rate and ETA) to WebSocket broadcast."""
         try:
+            handle = self.queue.get_handle_by_id(scan_id)
+            extra_data = {'queue_id': self.queue_id}
+            if handle is not None and hasattr(handle, 'progress_info'):
+                extra_data.update(handle.progress_info())
+                extra_data['progress'] = progress
             self.server.broadcast_scan_status(
                 scan_id=scan_id,
                 status='running',
-                progress=progress
+                progress=progress,
+                extra_data=extra_data
             )
         except Exception as e:
             logger.warning(f"Failed to broadcast progress: {e}")
@@ -382,6 +382,34 @@ class ScanUpdateServer:
         self.socketio.emit('instrument_position', payload, room=f'instrument_{instrument_id}')
         self.socketio.emit('instrument_position', payload, room='instruments')
     
+    def broadcast_instrument_telemetry(
+        self,
+        instrument_id: Optional[int],
+        instrument_name: str,
+        telemetry: Dict[str, Dict[str, Any]]
+    ):
+        """
+        Broadcast periodic instrument performance telemetry.
+        
+        Args:
+            instrument_id: Database ID of the instrument (None if not registered)
+            instrument_name: Human-readable instrument name
+            telemetry: Per-operation statistics (calls, errors, latency percentiles, bytes)
+        """
+        if not self.socketio:
+            return
+        
+        payload = {
+            'instrument_id': instrument_id,
+            'instrument_name': instrument_name,
+            'telemetry': telemetry,
+            'timestamp': datetime.utcnow().isoformat(),
+        }
+        
+        self.socketio.emit('instrument_telemetry', payload, room='instruments')
+        if instrument_id is not None:
+            self.socketio.emit('instrument_telemetry', payload, room=f'instrument_{instrument_id}')
+    
     def broadcast_log_entry(
         self,
         queue_id: str,
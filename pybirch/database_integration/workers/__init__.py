@@ -0,0 +1,6 @@
+"""Distributed queue workers for database integration."""
+
+from .scan_worker import ScanWorker
+from .db_writer import DatabaseWriter, get_database_writer, shutdown_database_writer
+
+__all__ = ['ScanWorker', 'DatabaseWriter', 'get_database_writer', 'shutdown_database_writer']
@@ -0,0 +1,354 @@
+"""
+Database Writer
+===============
+Write-behind writer thread that groups database writes into few transactions.
+
+Scans save data on their own threads; if each flush opens a session and
+commits, several measurements and parallel scans produce many small commits
+that contend for SQLite's write lock. Instead, producers submit writes to the
+process-wide DatabaseWriter and return immediately. Its thread drains the
+queue, merges whatever is pending from all scans (data points, chunk blocks,
+array blobs, scan logs, status and progress updates) and commits it with one
+DatabaseService.write_batch() call.
+
+- The queue is bounded: producers block when the writer falls behind.
+- flush() is a durability barrier: it returns once everything submitted
+  before it has been committed. Operations are tagged with their scan, and
+  flush(scan_id) reports False if one of that scan's writes was dropped
+  since its previous flush. Scans call it before they are marked complete.
+- Status and progress updates to the same scan within one batch are merged,
+  so only the latest values are written.
+
+Usage:
+    from pybirch.database_integration.workers.db_writer import get_database_writer
+
+    writer = get_database_writer(db)
+    writer.submit_data_points(rows, scan_id=scan_id)
+    writer.update_progress(scan_id, {'fraction': 0.5})
+    writer.flush(scan_id)       # Everything above is committed
+    print(writer.stats())
+"""
+
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    from database.services import DatabaseService
+except ImportError:
+    DatabaseService = None
+
+# Operation kinds, matching DatabaseService.write_batch() arguments
+DATA_POINTS = 'data_points'
+DATA_CHUNKS = 'data_chunks'
+DATA_ARRAYS = 'data_arrays'
+SCAN_LOGS = 'scan_logs'
+SCAN_UPDATES = 'scan_updates'
+SCAN_PROGRESS = 'scan_progress'
+_BARRIER = 'barrier'
+
+logger = logging.getLogger(__name__)
+
+
+class _Barrier:
+    """Flush marker in the queue; records the writes of its scan dropped before it."""
+
+    def __init__(self, scan_id: Optional[int] = None):
+        self.scan_id = scan_id
+        self.done = threading.Event()
+        self.dropped = 0
+
+
+class DatabaseWriter:
+    """
+    Background thread committing grouped writes through DatabaseService.write_batch().
+
+    Attributes:
+        db: Database service instance
+        max_pending: Queue capacity in operations; submitters block when it is full
+        max_batch: Most operations merged into one transaction
+        max_delay: Seconds to wait for more operations before committing a batch
+    """
+
+    def __init__(
+        self,
+        db_service: 'DatabaseService',
+        max_pending: int = 10000,
+        max_batch: int = 1000,
+        max_delay: float = 0.05,
+    ):
+        """
+        Initialize the writer (call start() to run it).
+
+        Args:
+            db_service: Database service instance
+            max_pending: Queue capacity in operations
+            max_batch: Most operations merged into one transaction
+            max_delay: Seconds to wait for more operations before committing a batch
+        """
+        self.db = db_service
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            'submitted': 0,
+            'operations_written': 0,
+            'rows_written': 0,
+            'transactions': 0,
+            'failed_operations': 0,
+            'max_queue_depth': 0,
+            'blocked_seconds': 0.0,
+            'commit_seconds': 0.0,
+        }
+        self.last_error: Optional[str] = None
+        # Scan ID (None for untagged writes) -> operations dropped since its last flush
+        self._drops: Dict[Optional[int], int] = {}
+        # Scan ID -> error of its last dropped operation
+        self._scan_errors: Dict[Optional[int], str] = {}
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the writer thread."""
+        if self.is_running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="database_writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        """Commit everything pending and stop the writer thread."""
+        if not self.is_running:
+            return
+        self.flush(timeout=timeout)
+        self._stopping.set()
+        self._queue.put((_BARRIER, None, None))
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    # -------------------------------------------------------------------------
+    # Producers
+    # -------------------------------------------------------------------------
+
+    def submit_data_points(self, rows: List[Dict[str, Any]], scan_id: Optional[int] = None):
+        """Queue MeasurementDataPoint rows (each with measurement_object_id) of a scan."""
+        if rows:
+            self._put((DATA_POINTS, list(rows), scan_id))
+
+    def submit_data_chunks(self, measurement_id: int, data, sequence_indices=None,
+                           timestamps=None, chunk_rows: Optional[int] = None,
+                           scan_id: Optional[int] = None):
+        """Queue a DataFrame for chunk storage (see DatabaseService.create_data_chunks)."""
+        if data is not None and len(data):
+            self._put((DATA_CHUNKS, {
+                'measurement_id': measurement_id,
+                'data': data,
+                'sequence_indices': sequence_indices,
+                'timestamps': timestamps,
+                'chunk_rows': chunk_rows,
+            }, scan_id))
+
+    def submit_data_array(self, row: Dict[str, Any], scan_id: Optional[int] = None):
+        """Queue a MeasurementDataArray row of a scan."""
+        self._put((DATA_ARRAYS, dict(row), scan_id))
+
+    def submit_scan_log(self, scan_id: int, level: str, message: str, phase: Optional[str] = None,
+                        progress: Optional[float] = None, extra_data: Optional[Dict[str, Any]] = None):
+        """Queue a ScanLog entry."""
+        self._put((SCAN_LOGS, {
+            'scan_id': scan_id, 'level': level, 'message': message, 'phase': phase,
+            'progress': progress, 'extra_data': extra_data, 'timestamp': datetime.utcnow(),
+        }, scan_id))
+
+    def update_scan(self, scan_id: int, fields: Dict[str, Any]):
+        """Queue scan field updates; later updates to the same field win."""
+        self._put((SCAN_UPDATES, (scan_id, dict(fields)), scan_id))
+
+    def update_progress(self, scan_id: int, progress: Dict[str, Any]):
+        """Queue a scan progress update; only the latest one per batch is written."""
+        self._put((SCAN_PROGRESS, (scan_id, progress), scan_id))
+
+    def flush(self, scan_id: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until everything submitted so far has been committed.
+
+        A write that fails even when retried on its own is dropped and counted
+        against its scan; the scan's next flush reports it and returns False.
+
+        Args:
+            scan_id: Scan whose dropped writes are reported (None for all writes)
+            timeout: Most seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the scan's earlier writes were all committed, False if one
+            was dropped or the timeout expired
+        """
+        if not self.is_running:
+            return self._take_drops(scan_id) == 0
+        barrier = _Barrier(scan_id)
+        self._put((_BARRIER, barrier, scan_id), count=False)
+        if not barrier.done.wait(timeout):
+            logger.error(f"Timed out after {timeout}s waiting for pending database writes")
+            return False
+        return barrier.dropped == 0
+
+    def scan_error(self, scan_id: Optional[int]) -> Optional[str]:
+        """Error of the last dropped write of a scan, if any."""
+        with self._stats_lock:
+            return self._scan_errors.get(scan_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Writer metrics: throughput, batching, queue depth and backpressure."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['operations_per_transaction'] = (
+            stats['operations_written'] / stats['transactions'] if stats['transactions'] else 0.0
+        )
+        stats['running'] = self.is_running
+        return stats
+
+    def _put(self, operation: tuple, count: bool = True):
+        if not self.is_running:
+            # Not started (or stopped): write through synchronously
+            if operation[0] != _BARRIER:
+                self._commit([operation])
+            return
+        start = time.perf_counter()
+        self._queue.put(operation)
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            if count:
+                self._stats['submitted'] += 1
+            self._stats['blocked_seconds'] += waited
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._queue.qsize())
+
+    def _take_drops(self, scan_id: Optional[int] = None) -> int:
+        """Return and reset the operations of a scan (None: of all scans) dropped since its last flush."""
+        with self._stats_lock:
+            if scan_id is None:
+                dropped = sum(self._drops.values())
+                self._drops.clear()
+            else:
+                dropped = self._drops.pop(scan_id, 0)
+        return dropped
+
+    # -------------------------------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------------------------------
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch and batch[-1][0] != _BARRIER:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            operations = [op for op in batch if op[0] != _BARRIER]
+            if operations:
+                self._commit(operations)
+            for kind, payload, _ in batch:
+                if kind == _BARRIER and payload is not None:
+                    payload.dropped = self._take_drops(payload.scan_id)
+                    payload.done.set()
+
+    def _commit(self, operations: List[tuple]):
+        """Write operations in one transaction, retrying them one by one if it fails."""
+        start = time.perf_counter()
+        try:
+            rows = self.db.write_batch(**self._merge(operations))
+        except Exception as e:
+            self.last_error = str(e)
+            logger.warning(f"Batch of {len(operations)} operations failed ({e}); retrying individually")
+            rows = 0
+            for operation in operations:
+                try:
+                    rows += self.db.write_batch(**self._merge([operation]))
+                except Exception as op_error:
+                    self.last_error = str(op_error)
+                    scan_id = operation[2] if len(operation) > 2 else None
+                    with self._stats_lock:
+                        self._stats['failed_operations'] += 1
+                        self._drops[scan_id] = self._drops.get(scan_id, 0) + 1
+                        self._scan_errors[scan_id] = str(op_error)
+                    logger.error(f"Dropped {operation[0]} write of scan {scan_id}: {op_error}")
+        with self._stats_lock:
+            self._stats['transactions'] += 1
+            self._stats['operations_written'] += len(operations)
+            self._stats['rows_written'] += rows
+            self._stats['commit_seconds'] += time.perf_counter() - start
+
+    @staticmethod
+    def _merge(operations: List[tuple]) -> Dict[str, Any]:
+        """Combine operations into DatabaseService.write_batch() arguments."""
+        merged: Dict[str, Any] = {
+            DATA_POINTS: [], DATA_CHUNKS: [], DATA_ARRAYS: [], SCAN_LOGS: [],
+            SCAN_UPDATES: {}, SCAN_PROGRESS: {},
+        }
+        for kind, payload, *_ in operations:
+            if kind == DATA_POINTS:
+                merged[DATA_POINTS].extend(payload)
+            elif kind == SCAN_UPDATES:
+                scan_id, fields = payload
+                merged[SCAN_UPDATES].setdefault(scan_id, {}).update(fields)
+            elif kind == SCAN_PROGRESS:
+                scan_id, progress = payload
+                merged[SCAN_PROGRESS][scan_id] = progress
+            else:
+                merged[kind].append(payload)
+        return merged
+
+
+_writer: Optional[DatabaseWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_database_writer(db_service: 'DatabaseService', **kwargs) -> DatabaseWriter:
+    """
+    Get the process-wide writer, creating and starting it on first use.
+
+    All DatabaseService instances in a process share one database engine
+    (database.session.init_db), so one writer serves them all.
+
+    Args:
+        db_service: Database service used if the writer has to be created
+        **kwargs: DatabaseWriter options used if the writer has to be created
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = DatabaseWriter(db_service, **kwargs)
+        if not _writer.is_running:
+            _writer.start()
+        return _writer
+
+
+def shutdown_database_writer(timeout: Optional[float] = 10.0):
+    """Commit pending writes and stop the process-wide writer."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.stop(timeout=timeout)
@@ -0,0 +1,351 @@
+"""
+Scan Worker
+===========
+Distributed queue worker that runs scan jobs on the computer owning their instruments.
+
+Each lab computer runs one or more `ScanWorker` instances against the shared
+database. A worker repeatedly:
+
+1. Claims the next job whose required instruments are bound to its computer
+   (ComputerBinding) and not leased by another running job
+2. Rebinds the job's scan tree to its local instrument objects
+3. Runs the scan through a `DatabaseQueue`, so scan records, data, logs and
+   state changes go through the usual database hooks
+4. Renews its lease with heartbeats while the scan runs, aborting the scan if
+   the lease is lost (job cancelled or reclaimed after a stall)
+5. Records the outcome on the job
+
+Usage:
+    from database.services import DatabaseService
+    from pybirch.database_integration import JobManager, ScanWorker
+
+    db = DatabaseService('path/to/db.db')
+
+    # Central side: submit scans
+    JobManager(db).submit([scan1, scan2], lab_id=1, name="Overnight run")
+
+    # On each lab computer: run a worker with the local instruments
+    worker = ScanWorker(db, instruments=[lock_in, x_stage])
+    worker.start()
+"""
+
+import socket
+import time
+import traceback
+import uuid
+from threading import Thread, Event
+from typing import Optional, Dict, Any, List, Callable, Union
+
+try:
+    from database.services import DatabaseService
+except ImportError:
+    DatabaseService = None
+
+from pybirch.queue.queue import ScanState
+from pybirch.scan.sessions import get_session_pool
+from ..extensions.database_queue import DatabaseQueue
+
+
+class ScanWorker:
+    """
+    Claims and executes distributed scan jobs from the database.
+
+    Attributes:
+        db_service: Database service instance
+        worker_id: Unique ID recorded as the lease owner of claimed jobs
+        computer_name: Hostname used to look up ComputerBindings
+        instruments: Local instrument objects keyed by name
+        jobs_completed: Number of jobs this worker finished successfully
+        jobs_failed: Number of jobs this worker failed or aborted
+    """
+
+    def __init__(
+        self,
+        db_service: 'DatabaseService',
+        instruments: Optional[Union[List[Any], Dict[str, Any]]] = None,
+        computer_name: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 30.0,
+        heartbeat_interval: Optional[float] = None,
+        poll_interval: float = 1.0,
+        scan_loader: Optional[Callable[[Dict[str, Any]], 'Scan']] = None,
+        operator: Optional[str] = None,
+        buffer_size: int = 100,
+    ):
+        """
+        Initialize the ScanWorker.
+
+        Args:
+            db_service: Database service instance
+            instruments: Local instrument objects (list or name -> instrument dict).
+                When given, only jobs whose instruments are all available here
+                are claimed, and loaded scan trees are rebound to these objects.
+            computer_name: Hostname for ComputerBinding lookup (default: this host)
+            worker_id: Unique worker ID (default: computer name plus a random suffix)
+            lease_seconds: Job lease duration; a worker that stops heartbeating
+                for this long loses its job to another worker
+            heartbeat_interval: Seconds between heartbeats (default: lease / 3)
+            poll_interval: Seconds to wait between claims when no job is available
+            scan_loader: Callable turning a claimed job dict into a Scan
+                (default: decode the 'scan_data' snapshot and rebind local instruments)
+            operator: Operator name recorded on the scans
+            buffer_size: Data buffer size for the scans' database extensions
+        """
+        self.db_service = db_service
+        self.computer_name = computer_name or socket.gethostname()
+        self.worker_id = worker_id or f"{self.computer_name}-{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval or lease_seconds / 3.0
+        self.poll_interval = poll_interval
+        self.scan_loader = scan_loader or self.load_scan
+        self.operator = operator
+        self.buffer_size = buffer_size
+
+        if isinstance(instruments, dict):
+            self.instruments: Dict[str, Any] = dict(instruments)
+        else:
+            self.instruments = {instr.name: instr for instr in (instruments or [])}
+
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.current_job: Optional[Dict[str, Any]] = None
+
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+    # ==================== Lifecycle ====================
+
+    def start(self, max_jobs: Optional[int] = None):
+        """
+        Run the worker loop in a background thread.
+
+        Args:
+            max_jobs: Stop after this many jobs (None runs until stop())
+        """
+        if self._thread and self._thread.is_alive():
+            raise RuntimeError(f"Worker {self.worker_id} is already running")
+
+        self._stop_event.clear()
+        self._thread = Thread(
+            target=self.run,
+            kwargs={'max_jobs': max_jobs},
+            name=f"ScanWorker_{self.worker_id}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, wait: bool = True, timeout: Optional[float] = None):
+        """
+        Stop the worker loop after the current job finishes.
+
+        Args:
+            wait: If True, block until the worker thread exits
+            timeout: Maximum time to wait in seconds
+        """
+        self._stop_event.set()
+        if wait and self._thread:
+            self._thread.join(timeout=timeout)
+
+    def is_running(self) -> bool:
+        """Check whether the background worker thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def run(self, max_jobs: Optional[int] = None, idle_timeout: Optional[float] = None):
+        """
+        Claim and run jobs until stopped.
+
+        Args:
+            max_jobs: Stop after this many jobs (None for no limit)
+            idle_timeout: Stop after this many seconds without a claimable job
+        """
+        print(f"[Worker] {self.worker_id} started on {self.computer_name}")
+        jobs_run = 0
+        idle_since = time.monotonic()
+
+        # Keep instrument sessions open between jobs; each job runs in its own queue
+        with get_session_pool().held():
+            while not self._stop_event.is_set():
+                job = self.run_once()
+                if job is not None:
+                    jobs_run += 1
+                    idle_since = time.monotonic()
+                    if max_jobs is not None and jobs_run >= max_jobs:
+                        break
+                    continue
+
+                if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                    break
+                self._stop_event.wait(self.poll_interval)
+
+        print(f"[Worker] {self.worker_id} stopped ({self.jobs_completed} completed, {self.jobs_failed} failed)")
+
+    def run_once(self) -> Optional[Dict[str, Any]]:
+        """
+        Claim a single job and run it to completion.
+
+        Returns:
+            The job as stored after execution, or None if nothing was claimable
+        """
+        job = self.claim()
+        if job is None:
+            return None
+
+        self.current_job = job
+        try:
+            self._execute_job(job)
+        finally:
+            self.current_job = None
+        return self.db_service.get_scan_job(job['id'])
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next job this worker can run.
+
+        Returns:
+            Claimed job dict (including 'scan_data'), or None
+        """
+        owned = self.db_service.get_instrument_names_for_computer(self.computer_name)
+        if self.instruments:
+            owned = [name for name in owned if name in self.instruments]
+
+        return self.db_service.claim_scan_job(
+            worker_id=self.worker_id,
+            computer_name=self.computer_name,
+            instrument_names=owned,
+            lease_seconds=self.lease_seconds,
+        )
+
+    # ==================== Job Execution ====================
+
+    def load_scan(self, job: Dict[str, Any]) -> 'Scan':
+        """
+        Default scan loader: decode the job's scan snapshot and bind local instruments.
+
+        Args:
+            job: Claimed job dictionary
+
+        Returns:
+            Scan ready to be enqueued
+
+        Raises:
+            SnapshotError: If 'scan_data' is not a scan snapshot (e.g. a job
+                pickled by an earlier version, which is never unpickled)
+        """
+        from pybirch.queue.snapshot import loads_scan
+
+        scan = loads_scan(job['scan_data'])
+        scan._data_buffer = {}
+        if self.instruments:
+            self.bind_instruments(scan)
+        return scan
+
+    def bind_instruments(self, scan: 'Scan'):
+        """
+        Attach this computer's instrument objects to a deserialized scan tree.
+
+        Tree items are matched by instrument name. Saved settings and movement
+        positions from the serialized tree are preserved.
+
+        Args:
+            scan: Scan whose tree items have no instrument objects
+
+        Raises:
+            KeyError: If the tree references an instrument not available here
+        """
+        try:
+            scan.scan_settings.scan_tree.bind_instruments(self.instruments)
+        except KeyError as e:
+            raise KeyError(f"{e.args[0]} on worker {self.worker_id}") from None
+
+    def _execute_job(self, job: Dict[str, Any]):
+        """Run a claimed job through a DatabaseQueue and record the outcome."""
+        job_id = job['id']
+        print(f"[Worker] {self.worker_id} claimed job {job_id} ({job.get('name')})")
+
+        try:
+            scan = self.scan_loader(job)
+        except Exception as e:
+            # The job cannot run here; don't retry it on the same broken payload forever
+            self.db_service.fail_scan_job(job_id, self.worker_id, f"Failed to load scan: {e}", retry=False)
+            self.jobs_failed += 1
+            print(f"[Worker] Job {job_id} failed to load: {e}")
+            return
+
+        db_queue = None
+        if job.get('queue_id'):
+            db_queue = self.db_service.get_queue(job['queue_id'])
+
+        # Queue-level status of a shared queue is derived from its jobs, so the
+        # per-job DatabaseQueue only writes scan records, data and logs
+        queue = DatabaseQueue(
+            QID=f"{self.worker_id}_job{job_id}",
+            db_service=self.db_service,
+            project_id=job.get('project_id'),
+            sample_id=job.get('sample_id'),
+            operator=self.operator or job.get('created_by'),
+            max_parallel_scans=1,
+            auto_create_db_record=db_queue is None,
+            buffer_size=self.buffer_size,
+            lab_id=job.get('lab_id'),
+            manage_queue_status=db_queue is None,
+        )
+        if db_queue is not None:
+            queue._db_queue = db_queue
+
+        handle = queue.enqueue(scan)
+        lease_lost = False
+
+        if not self.db_service.heartbeat_scan_job(job_id, self.worker_id, self.lease_seconds, status='running'):
+            # Hand the job back if we still hold it; nothing ran, so no attempt is used
+            self.db_service.release_scan_job(job_id, self.worker_id)
+            self.jobs_failed += 1
+            print(f"[Worker] Lost lease on job {job_id} before start")
+            return
+
+        try:
+            queue.start()
+            while not queue.wait_for_completion(timeout=self.heartbeat_interval):
+                if not self.db_service.heartbeat_scan_job(job_id, self.worker_id, self.lease_seconds):
+                    print(f"[Worker] Lost lease on job {job_id}; aborting scan")
+                    lease_lost = True
+                    queue.abort()
+                    queue.wait_for_completion()
+                    break
+        except Exception as e:
+            handle.state = ScanState.FAILED
+            handle.error = e
+            print(f"[Worker] Job {job_id} raised: {e}\n{traceback.format_exc()}")
+
+        if lease_lost:
+            # Another worker (or a cancel) owns the job now; nothing to report
+            self.jobs_failed += 1
+            return
+
+        db_scan_id = queue.get_db_scan_id(handle.scan_id)
+        result = {
+            'worker_id': self.worker_id,
+            'computer_name': self.computer_name,
+            'scan_state': handle.state.name,
+            'duration_seconds': handle.duration,
+        }
+
+        if handle.state == ScanState.COMPLETED:
+            self.db_service.complete_scan_job(
+                job_id, self.worker_id, status='completed', scan_id=db_scan_id, result=result
+            )
+            self.jobs_completed += 1
+            print(f"[Worker] Job {job_id} completed")
+        elif handle.state == ScanState.ABORTED:
+            self.db_service.complete_scan_job(
+                job_id, self.worker_id, status='aborted', scan_id=db_scan_id, result=result
+            )
+            self.jobs_failed += 1
+            print(f"[Worker] Job {job_id} aborted")
+        else:
+            error = str(handle.error) if handle.error else f"Scan ended in state {handle.state.name}"
+            self.db_service.fail_scan_job(job_id, self.worker_id, error, scan_id=db_scan_id)
+            self.jobs_failed += 1
+            print(f"[Worker] Job {job_id} failed: {error}")
+
+    def __repr__(self) -> str:
+        return f"ScanWorker(worker_id='{self.worker_id}', computer='{self.computer_name}', instruments={list(self.instruments)})"
@@ -0,0 +1,100 @@
+"""
+File Writer Extension
+=====================
+Scan extension that appends measurement data to CSV files as the scan runs.
+
+One file is written per measurement, named after the project, scan and
+measurement. The header is written with the first chunk of data; later chunks
+are appended, so a file always holds everything saved so far.
+
+Usage:
+    from pybirch.extensions.file_writer import FileWriterExtension
+
+    scan.scan_settings.extensions.append(FileWriterExtension("data/"))
+"""
+
+import os
+import re
+from threading import Lock
+from typing import Dict, Optional
+
+import pandas as pd
+
+from pybirch.extensions.scan_extensions import ScanExtension
+
+
+def _safe_filename(text: str) -> str:
+    """Replace characters that are not safe in file names."""
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', str(text)).strip('_') or "unnamed"
+
+
+class FileWriterExtension(ScanExtension):
+    """
+    Writes each measurement's data to a CSV file in an output directory.
+
+    Attributes:
+        output_dir: Directory the CSV files are written to
+        files: Measurement name -> path of the file written for it
+    """
+
+    def __init__(self, output_dir: str):
+        """
+        Initialize the FileWriterExtension.
+
+        Args:
+            output_dir: Directory for the CSV files (created if missing)
+        """
+        # Note: We don't call super().__init__() because ScanExtension raises NotImplementedError
+        self.output_dir = output_dir
+        self.files: Dict[str, str] = {}
+        self._prefix = "scan"
+        self._labels: Dict[str, str] = {}
+        self._lock = Lock()
+        self._scan_ref: Optional['Scan'] = None
+
+    def set_scan_reference(self, scan: 'Scan'):
+        """
+        Called by Scan.startup() to set a reference to the parent scan.
+
+        Args:
+            scan: The PyBirch Scan object
+        """
+        self._scan_ref = scan
+        settings = scan.scan_settings
+        self._prefix = _safe_filename(f"{settings.project_name}_{settings.scan_name}")
+
+        # Buffers are keyed by tree item IDs; name files after the instruments instead
+        self._labels = {}
+        seen: Dict[str, int] = {}
+        for item in settings.scan_tree.get_measurement_items():
+            if item.instrument_object is None:
+                continue
+            name = _safe_filename(item.instrument_object.instrument.name)
+            seen[name] = seen.get(name, 0) + 1
+            self._labels[item.unique_id()] = name if seen[name] == 1 else f"{name}_{seen[name]}"
+
+    def startup(self):
+        """Create the output directory and reset the files of a previous run."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.files = {}
+
+    def save_data(self, data: pd.DataFrame, measurement_name: str):
+        """Append a chunk of measurement data to its CSV file."""
+        if data.empty:
+            return
+        with self._lock:
+            path = self.files.get(measurement_name)
+            first_write = path is None
+            if first_write:
+                path = os.path.join(self.output_dir, f"{self._prefix}_{self._label(measurement_name)}.csv")
+                self.files[measurement_name] = path
+            data.to_csv(path, mode='w' if first_write else 'a', header=first_write, index=False)
+
+    def _label(self, measurement_name: str) -> str:
+        """File name part for a measurement."""
+        return self._labels.get(measurement_name) or _safe_filename(measurement_name)
+
+    def shutdown(self):
+        """Report the files written by this scan."""
+        for path in self.files.values():
+            print(f"[FileWriter] Wrote {path}")
@@ -4,10 +4,8 @@ import pandas as pd
 import time
 import os
 from pybirch.scan.movements import Movement
-import wandb
 from pybirch.scan.scan import Scan, ScanSettings
-from pymeasure.instruments import Instrument
-from pymeasure.experiment import Results, Procedure
+from pybirch.scan.sessions import SessionPool, get_session_pool
 import pickle
 from threading import Thread, Event, Lock
 from concurrent.futures import ThreadPoolExecutor, Future, as_completed
@@ -70,6 +68,10 @@ class ScanHandle:
     end_time: Optional[datetime] = None
     error: Optional[Exception] = None
     progress: float = 0.0  # 0.0 to 1.0
+    points_completed: int = 0
+    points_total: int = 0
+    rate: float = 0.0  # Points per second
+    eta_seconds: Optional[float] = None
     
     def __getstate__(self):
         """Get state for pickling - exclude unpickleable thread/future."""
@@ -97,6 +99,16 @@ class ScanHandle:
     def is_active(self) -> bool:
         return self.state in (ScanState.RUNNING, ScanState.PAUSED)
     
+    def progress_info(self) -> Dict[str, Any]:
+        """Progress details for status displays and subscribers."""
+        return {
+            "progress": self.progress,
+            "points_completed": self.points_completed,
+            "points_total": self.points_total,
+            "rate": self.rate,
+            "eta_seconds": self.eta_seconds,
+        }
+    
     def is_finished(self) -> bool:
         return self.state in (ScanState.COMPLETED, ScanState.ABORTED, ScanState.FAILED)
 
@@ -112,7 +124,8 @@ class Queue:
     - Progress tracking
     """
 
-    def __init__(self, QID: str, scans: Optional[List[Scan]] = None, max_parallel_scans: int = 4):
+    def __init__(self, QID: str, scans: Optional[List[Scan]] = None, max_parallel_scans: int = 4, progress_interval: float = 0.25,
+                 session_pool: Optional[SessionPool] = None, reuse_sessions: bool = True):
         self.QID = QID
         self._scan_handles: List[ScanHandle] = []
         self._state = QueueState.IDLE
@@ -137,10 +150,18 @@ class Queue:
         self._log_callbacks: List[Callable[[LogEntry], None]] = []
         self._log_history: deque[LogEntry] = deque(maxlen=10000)
         
-        # Progress callback
+        # Progress callback, called at most once per progress_interval seconds per scan
+        self.progress_interval = progress_interval
         self._progress_callbacks: List[Callable[[str, float], None]] = []
         self._state_callbacks: List[Callable[[str, ScanState], None]] = []
         
+        # Instrument sessions are borrowed by scans and kept open for the whole
+        # run, so instruments connect once per run instead of once per scan
+        self.session_pool: Optional[SessionPool] = None
+        self._reuse_sessions = reuse_sessions
+        if reuse_sessions:
+            self.session_pool = session_pool if session_pool is not None else get_session_pool()
+        
         # Add initial scans
         if scans:
             for scan in scans:
@@ -160,6 +181,7 @@ class Queue:
         state['_log_queue'] = None
         state['_stop_event'] = None
         state['_pause_event'] = None
+        state['session_pool'] = None
         return state
     
     def __setstate__(self, state):
@@ -179,6 +201,9 @@ class Queue:
             self._progress_callbacks = []
         if '_state_callbacks' not in self.__dict__:
             self._state_callbacks = []
+        if 'progress_interval' not in self.__dict__:
+            self.progress_interval = 0.25
+        self.session_pool = get_session_pool() if self.__dict__.get('_reuse_sessions', True) else None
 
     # ==================== Core Queue Operations ====================
 
@@ -340,6 +365,9 @@ class Queue:
 
     def _execute_scans(self, handles: List[ScanHandle]):
         """Internal method to execute scans (runs in background thread)."""
+        pool = self.session_pool
+        if pool is not None:
+            pool.hold()
         try:
             if self._execution_mode == ExecutionMode.SERIAL:
                 self._execute_serial(handles)
@@ -348,6 +376,9 @@ class Queue:
         except Exception as e:
             self._log("queue", self.QID, "ERROR", f"Queue execution error: {str(e)}")
         finally:
+            if pool is not None:
+                # Sessions unused by other runs are shut down here
+                pool.unhold()
             self._state = QueueState.IDLE
             self._log("queue", self.QID, "INFO", "Queue execution finished")
 
@@ -404,16 +435,27 @@ class Queue:
             self._notify_state_change(scan_id, ScanState.RUNNING)
             self._log(scan_id, scan_name, "INFO", "Scan started")
             
+            if hasattr(scan, 'session_pool'):
+                scan.session_pool = self.session_pool
+            
             # Startup phase
             self._log(scan_id, scan_name, "INFO", "Initializing scan...")
             scan.startup()
             self._log(scan_id, scan_name, "INFO", "Scan initialization complete")
             
-            # Execute with pause/stop checking
-            self._execute_scan_with_control(handle)
+            # Execute with pause/stop checking, forwarding throttled progress
+            on_progress = lambda update: self._on_scan_progress_update(handle, update)
+            if hasattr(scan, 'add_progress_callback'):
+                scan.progress_interval = self.progress_interval
+                scan.add_progress_callback(on_progress)
+            try:
+                self._execute_scan_with_control(handle)
+            finally:
+                if hasattr(scan, 'remove_progress_callback'):
+                    scan.remove_progress_callback(on_progress)
             
             # Check final state
-            if scan._stop_event.is_set():
+            if self._scan_stop_requested(scan):
                 if handle.state != ScanState.PAUSED:
                     handle.state = ScanState.ABORTED
                     scan.scan_settings.status = "Aborted"
@@ -438,38 +480,101 @@ class Queue:
                 self._log(scan_id, scan_name, "ERROR", f"Error during shutdown: {str(e)}")
             
             self._notify_state_change(scan_id, handle.state)
-            handle.progress = 1.0
-            self._notify_progress(scan_id, 1.0)
+            if handle.state == ScanState.COMPLETED:
+                handle.progress = 1.0
+                handle.eta_seconds = 0.0
+            self._notify_progress(scan_id, handle.progress)
+
+    def _on_scan_progress_update(self, handle: ScanHandle, update):
+        """Record a (throttled) progress update from a running scan and notify subscribers."""
+        handle.progress = update.fraction
+        handle.points_completed = update.completed
+        handle.points_total = update.total
+        handle.rate = update.rate
+        handle.eta_seconds = update.eta_seconds
+        self._notify_progress(handle.scan_id, update.fraction)
 
     def _execute_scan_with_control(self, handle: ScanHandle):
-        """Execute scan with pause/stop control integration."""
+        """Execute scan with pause/stop control integration.
+        
+        Scans with a cancellation token are paused and aborted in-loop at point
+        granularity; the queue's pause state is applied to the token before
+        the scan starts so scans launched while the queue is paused wait.
+        """
         scan = handle.scan
+        token = self._scan_token(scan)
         
-        # Store original stop event check
-        original_stop_check = lambda: (
-            self._stop_event.is_set() or 
-            scan._stop_event.is_set() or
-            not self._pause_event.is_set()
-        )
+        if token is not None and not self._pause_event.is_set() and not self._stop_event.is_set():
+            token.pause()
+            handle.state = ScanState.PAUSED
+            scan.scan_settings.status = "Paused"
+            self._notify_state_change(handle.scan_id, ScanState.PAUSED)
         
         # Execute the scan
         scan.execute()
 
+    @staticmethod
+    def _scan_token(scan: Scan):
+        """Get a scan's cancellation token, or None for scans without one."""
+        return getattr(scan, 'cancellation_token', None)
+
+    @classmethod
+    def _scan_stop_requested(cls, scan: Scan) -> bool:
+        """Check whether a scan was stopped or aborted."""
+        token = cls._scan_token(scan)
+        return scan._stop_event.is_set() or (token is not None and token.is_cancelled)
+
+    def _pause_handle(self, handle: ScanHandle):
+        """Pause a running scan in place, or stop it for a later restart if it has no token."""
+        token = self._scan_token(handle.scan)
+        if token is not None:
+            token.pause()
+        else:
+            handle.scan._stop_event.set()
+        handle.state = ScanState.PAUSED
+        handle.scan.scan_settings.status = "Paused"
+        self._notify_state_change(handle.scan_id, ScanState.PAUSED)
+
+    def _resume_handle(self, handle: ScanHandle):
+        """Resume a paused scan."""
+        token = self._scan_token(handle.scan)
+        handle.state = ScanState.RUNNING
+        handle.scan.scan_settings.status = "Running"
+        self._notify_state_change(handle.scan_id, ScanState.RUNNING)
+        if token is not None:
+            # The scan thread is blocked at its next point; just let it continue
+            token.resume()
+        else:
+            handle.scan._stop_event.clear()
+            # Re-execute scan in new thread if in serial mode
+            if self._execution_mode == ExecutionMode.SERIAL:
+                Thread(target=self._run_single_scan, args=(handle,), daemon=True).start()
+
+    def _abort_handle(self, handle: ScanHandle):
+        """Abort an active scan, interrupting in-flight instrument waits."""
+        token = self._scan_token(handle.scan)
+        handle.scan._stop_event.set()
+        if token is not None:
+            token.cancel("Scan aborted", source=self.QID)
+        handle.state = ScanState.ABORTED
+        handle.scan.scan_settings.status = "Aborted"
+        self._notify_state_change(handle.scan_id, ScanState.ABORTED)
+
     # ==================== Scan Control Operations ====================
 
     def pause(self, scan_id: Optional[str] = None):
         """Pause execution.
         
+        Running scans stop before their next point and hold their position
+        until resumed.
+        
         Args:
             scan_id: If provided, pause specific scan. Otherwise pause entire queue.
         """
         if scan_id:
             handle = self.get_handle_by_id(scan_id)
             if handle and handle.state == ScanState.RUNNING:
-                handle.scan._stop_event.set()
-                handle.state = ScanState.PAUSED
-                handle.scan.scan_settings.status = "Paused"
-                self._notify_state_change(scan_id, ScanState.PAUSED)
+                self._pause_handle(handle)
                 self._log(scan_id, handle.scan.scan_settings.scan_name, "INFO", "Scan paused")
         else:
             self._pause_event.clear()
@@ -477,10 +582,7 @@ class Queue:
             # Pause all running scans
             for handle in self._scan_handles:
                 if handle.state == ScanState.RUNNING:
-                    handle.scan._stop_event.set()
-                    handle.state = ScanState.PAUSED
-                    handle.scan.scan_settings.status = "Paused"
-                    self._notify_state_change(handle.scan_id, ScanState.PAUSED)
+                    self._pause_handle(handle)
             self._log("queue", self.QID, "INFO", "Queue paused")
 
     def resume(self, scan_id: Optional[str] = None):
@@ -492,27 +594,15 @@ class Queue:
         if scan_id:
             handle = self.get_handle_by_id(scan_id)
             if handle and handle.state == ScanState.PAUSED:
-                handle.scan._stop_event.clear()
-                handle.state = ScanState.RUNNING
-                handle.scan.scan_settings.status = "Running"
-                self._notify_state_change(scan_id, ScanState.RUNNING)
+                self._resume_handle(handle)
                 self._log(scan_id, handle.scan.scan_settings.scan_name, "INFO", "Scan resumed")
-                # Re-execute scan in new thread if in serial mode
-                if self._execution_mode == ExecutionMode.SERIAL:
-                    Thread(target=self._run_single_scan, args=(handle,), daemon=True).start()
         else:
             self._pause_event.set()
             self._state = QueueState.RUNNING
             # Resume all paused scans
             for handle in self._scan_handles:
                 if handle.state == ScanState.PAUSED:
-                    handle.scan._stop_event.clear()
-                    handle.state = ScanState.RUNNING
-                    handle.scan.scan_settings.status = "Running"
-                    self._notify_state_change(handle.scan_id, ScanState.RUNNING)
-                    # Re-execute in serial mode
-                    if self._execution_mode == ExecutionMode.SERIAL:
-                        Thread(target=self._run_single_scan, args=(handle,), daemon=True).start()
+                    self._resume_handle(handle)
             self._log("queue", self.QID, "INFO", "Queue resumed")
 
     def abort(self, scan_id: Optional[str] = None):
@@ -524,10 +614,7 @@ class Queue:
         if scan_id:
             handle = self.get_handle_by_id(scan_id)
             if handle and handle.is_active():
-                handle.scan._stop_event.set()
-                handle.state = ScanState.ABORTED
-                handle.scan.scan_settings.status = "Aborted"
-                self._notify_state_change(scan_id, ScanState.ABORTED)
+                self._abort_handle(handle)
                 self._log(scan_id, handle.scan.scan_settings.scan_name, "WARNING", "Scan aborted")
         else:
             self._stop_event.set()
@@ -536,10 +623,7 @@ class Queue:
             # Abort all active scans
             for handle in self._scan_handles:
                 if handle.is_active():
-                    handle.scan._stop_event.set()
-                    handle.state = ScanState.ABORTED
-                    handle.scan.scan_settings.status = "Aborted"
-                    self._notify_state_change(handle.scan_id, ScanState.ABORTED)
+                    self._abort_handle(handle)
             self._log("queue", self.QID, "WARNING", "Queue aborted")
 
     def restart(self, scan_id: str):
@@ -562,7 +646,13 @@ class Queue:
         handle.end_time = None
         handle.error = None
         handle.progress = 0.0
+        handle.points_completed = 0
+        handle.rate = 0.0
+        handle.eta_seconds = None
         handle.scan._stop_event.clear()
+        token = self._scan_token(handle.scan)
+        if token is not None:
+            token.reset()
         handle.scan.current_item = None
         
         # Reset instrument runtime states in the tree
@@ -707,6 +797,10 @@ class Queue:
                         "name": h.scan.scan_settings.scan_name,
                         "state": h.state.name,
                         "progress": h.progress,
+                        "points_completed": h.points_completed,
+                        "points_total": h.points_total,
+                        "rate": h.rate,
+                        "eta_seconds": h.eta_seconds,
                         "duration": h.duration,
                         "error": str(h.error) if h.error else None
                     }
@@ -729,11 +823,11 @@ class Queue:
                 "QID": self.QID,
                 "execution_mode": self._execution_mode.name,
                 "max_parallel_scans": self._max_parallel_scans,
+                "progress_interval": self.progress_interval,
+                "metadata": self.metadata,
                 "scans": [
                     {
-                        "scan_settings": h.scan.scan_settings.serialize(),
-                        "owner": h.scan.owner,
-                        "sample_id": h.scan.sample_id,
+                        **h.scan.serialize(),
                         "state": h.state.name,
                         "progress": h.progress
                     }
@@ -743,29 +837,60 @@ class Queue:
 
     @classmethod
     def deserialize(cls, data: dict) -> 'Queue':
-        """Deserialize a queue from a dictionary."""
+        """
+        Deserialize a queue from a dictionary.
+
+        Scans are restored with unbound tree items; instrument objects are
+        paired with them separately. Scans that were running when the queue was
+        saved come back as QUEUED.
+        """
         queue = cls(
             QID=data["QID"],
             max_parallel_scans=data.get("max_parallel_scans", 4)
         )
+        queue.progress_interval = data.get("progress_interval", 0.25)
         queue._execution_mode = ExecutionMode[data.get("execution_mode", "SERIAL")]
-        
-        # Note: Full scan deserialization requires instrument objects to be reconstructed
-        # This provides the structure, actual instrument pairing happens separately
-        
+        queue.metadata = dict(data.get("metadata") or {})
+
+        for scan_data in data.get("scans", []):
+            if "scan_settings" not in scan_data:
+                continue
+            handle = queue.enqueue(Scan.deserialize(scan_data))
+            state = ScanState.__members__.get(scan_data.get("state", "QUEUED"), ScanState.QUEUED)
+            if state in (ScanState.COMPLETED, ScanState.ABORTED, ScanState.FAILED):
+                handle.state = state
+                handle.progress = scan_data.get("progress", 0.0)
+
         return queue
 
-    def save(self, filepath: str):
-        """Save the queue to a pickle file."""
-        with open(filepath, 'wb') as f:
-            pickle.dump(self.serialize(), f)
+    def save(self, filepath: str, name: str = ""):
+        """
+        Save the queue to a snapshot file.
+
+        Args:
+            filepath: Destination path (conventionally ending in .pbq)
+            name: Optional display name stored in the snapshot header
+        """
+        from pybirch.queue import snapshot
+        snapshot.save_queue(self, filepath, name=name)
 
     @classmethod
     def load(cls, filepath: str) -> 'Queue':
-        """Load a queue from a pickle file."""
+        """
+        Load a queue from a snapshot file.
+
+        Pickle files written by earlier versions (either a pickled Queue or a
+        pickled serialize() dictionary) are still accepted.
+        """
+        from pybirch.queue import snapshot
+        if snapshot.is_snapshot(filepath):
+            return snapshot.load_queue(filepath, cls=cls)
+
         with open(filepath, 'rb') as f:
             data = pickle.load(f)
-            return cls.deserialize(data)
+        if isinstance(data, Queue):
+            return data
+        return cls.deserialize(data)
 
     def __repr__(self) -> str:
         return f"Queue(QID='{self.QID}', scans={self.size()}, state={self._state.name})"
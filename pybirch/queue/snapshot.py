@@ -0,0 +1,410 @@
+"""
+Versioned snapshot files for PyBirch queues and scans.
+
+Queues and scans used to be saved by pickling the whole object graph, which
+ties the files to the exact class layout, requires importing the GUI tree model
+to read anything, and forces a full load just to show a preset's name. A
+snapshot instead stores each scan's serialize() dictionary as a separately
+compressed JSON blob, preceded by a JSON header index:
+
+    +---------------------------------------------+
+    | magic b"PYBSNAP\\0" | version u16 | len u32  |  fixed 14-byte preamble
+    +---------------------------------------------+
+    | header (UTF-8 JSON)                          |  kind, queue fields, entries
+    +---------------------------------------------+
+    | zlib(JSON scan 0) | zlib(JSON scan 1) | ...  |  offsets/lengths in header
+    +---------------------------------------------+
+
+Each header entry carries the scan's name, type, owner, state, instrument set
+and payload size, so listings can be read without touching the payloads, and a
+single scan can be loaded from a multi-scan queue file by seeking to its blob.
+
+Usage:
+    from pybirch.queue import snapshot
+
+    snapshot.save_queue(queue, "overnight.pbq")
+
+    index = snapshot.read_index("overnight.pbq")     # Header only
+    for entry in index.entries:
+        print(entry.name, entry.instrument_names, entry.size)
+
+    scan = snapshot.load_scan("overnight.pbq", "iv_curve_3")
+    queue = snapshot.load_queue("overnight.pbq")
+"""
+
+from __future__ import annotations
+import io
+import json
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, List, Optional, Union, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pybirch.queue.queue import Queue
+    from pybirch.scan.scan import Scan
+
+
+MAGIC = b"PYBSNAP\x00"
+SNAPSHOT_VERSION = 1
+
+# Recommended file suffixes for queue and scan snapshots
+QUEUE_SUFFIX = ".pbq"
+SCAN_SUFFIX = ".pbs"
+
+_PREAMBLE = struct.Struct(">8sHI")
+
+PathOrFile = Union[str, os.PathLike, BinaryIO]
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is malformed or cannot be read."""
+
+
+@dataclass
+class SnapshotEntry:
+    """Header index entry describing one scan in a snapshot."""
+
+    index: int
+    name: str
+    project_name: str = ""
+    scan_type: str = ""
+    job_type: str = ""
+    owner: str = ""
+    sample_id: Optional[str] = None
+    state: Optional[str] = None
+    progress: float = 0.0
+    instruments: List[Dict[str, str]] = field(default_factory=list)
+    offset: int = 0  # Byte offset of the payload, relative to the end of the header
+    length: int = 0  # Compressed payload size in bytes
+    size: int = 0  # Uncompressed JSON size in bytes
+
+    @property
+    def instrument_names(self) -> List[str]:
+        """Names of the instruments used by this scan."""
+        return [instr.get("name", "") for instr in self.instruments]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class SnapshotIndex:
+    """Header of a snapshot file: container metadata plus one entry per scan."""
+
+    kind: str  # "queue" or "scan"
+    version: int
+    name: str = ""
+    created_at: str = ""
+    queue: Dict[str, Any] = field(default_factory=dict)
+    entries: List[SnapshotEntry] = field(default_factory=list)
+    payload_start: int = 0
+
+    @property
+    def names(self) -> List[str]:
+        """Scan names, in order."""
+        return [entry.name for entry in self.entries]
+
+    @property
+    def instrument_names(self) -> List[str]:
+        """Sorted union of the instruments used by all scans."""
+        return sorted({name for entry in self.entries for name in entry.instrument_names})
+
+    @property
+    def total_size(self) -> int:
+        """Uncompressed size of all scan payloads in bytes."""
+        return sum(entry.size for entry in self.entries)
+
+    def entry(self, key: Union[int, str]) -> SnapshotEntry:
+        """
+        Look up an entry by position or scan name.
+
+        Raises:
+            KeyError: If no scan matches
+        """
+        if isinstance(key, int):
+            try:
+                return self.entries[key]
+            except IndexError:
+                raise KeyError(f"Snapshot has no scan at index {key}") from None
+        for entry in self.entries:
+            if entry.name == key:
+                return entry
+        raise KeyError(f"Snapshot has no scan named '{key}'")
+
+
+# ==================== Writing ====================
+
+def save_queue(queue: 'Queue', target: PathOrFile, name: str = ""):
+    """
+    Write a queue snapshot.
+
+    Args:
+        queue: Queue to save
+        target: File path or writable binary file
+        name: Optional display name stored in the header (e.g. a preset name)
+    """
+    data = queue.serialize()
+    scans = data.pop("scans", [])
+    _write(target, "queue", scans, queue_fields=data, name=name or data.get("QID", ""))
+
+
+def save_scan(scan: 'Scan', target: PathOrFile, name: str = ""):
+    """
+    Write a single-scan snapshot.
+
+    Args:
+        scan: Scan to save
+        target: File path or writable binary file
+        name: Optional display name stored in the header
+    """
+    _write(target, "scan", [scan.serialize()], name=name or scan.scan_settings.scan_name)
+
+
+def dumps_scan(scan: 'Scan') -> bytes:
+    """Serialize a single scan to snapshot bytes."""
+    buffer = io.BytesIO()
+    save_scan(scan, buffer)
+    return buffer.getvalue()
+
+
+def _write(target: PathOrFile, kind: str, scans: List[Dict[str, Any]],
+           queue_fields: Optional[Dict[str, Any]] = None, name: str = ""):
+    """Encode scans and header, then write the file in one pass."""
+    entries = []
+    payloads = []
+    offset = 0
+    for i, scan_data in enumerate(scans):
+        raw = json.dumps(scan_data, default=_json_default, separators=(",", ":")).encode("utf-8")
+        blob = zlib.compress(raw)
+        entry = _entry_for(i, scan_data)
+        entry.offset = offset
+        entry.length = len(blob)
+        entry.size = len(raw)
+        entries.append(entry.to_dict())
+        payloads.append(blob)
+        offset += len(blob)
+
+    header = {
+        "kind": kind,
+        "version": SNAPSHOT_VERSION,
+        "name": name,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "queue": queue_fields or {},
+        "entries": entries,
+    }
+    header_bytes = json.dumps(header, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+    if isinstance(target, (str, os.PathLike)):
+        # Write to a temporary file first so a failed save never truncates an existing snapshot
+        tmp_path = f"{os.fspath(target)}.tmp"
+        with open(tmp_path, "wb") as f:
+            _write_parts(f, header_bytes, payloads)
+        os.replace(tmp_path, target)
+    else:
+        _write_parts(target, header_bytes, payloads)
+
+
+def _write_parts(f: BinaryIO, header_bytes: bytes, payloads: List[bytes]):
+    f.write(_PREAMBLE.pack(MAGIC, SNAPSHOT_VERSION, len(header_bytes)))
+    f.write(header_bytes)
+    for blob in payloads:
+        f.write(blob)
+
+
+def _entry_for(index: int, scan_data: Dict[str, Any]) -> SnapshotEntry:
+    """Build the header entry for a serialized scan."""
+    settings = scan_data.get("scan_settings", {})
+    return SnapshotEntry(
+        index=index,
+        name=settings.get("scan_name", ""),
+        project_name=settings.get("project_name", ""),
+        scan_type=settings.get("scan_type", ""),
+        job_type=settings.get("job_type", ""),
+        owner=scan_data.get("owner", "") or "",
+        sample_id=scan_data.get("sample_id"),
+        state=scan_data.get("state"),
+        progress=scan_data.get("progress", 0.0) or 0.0,
+        instruments=_collect_instruments(settings.get("scan_tree") or {}),
+    )
+
+
+def _collect_instruments(tree_data: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Unique instruments (name, type, adapter, class) referenced by a serialized scan tree."""
+    instruments: Dict[str, Dict[str, str]] = {}
+    stack = list((tree_data.get("root_item") or {}).get("child_items", []))
+    while stack:
+        item = stack.pop(0)
+        stack.extend(item.get("child_items", []))
+        instrument = (item.get("instrument_object") or {}).get("instrument", {})
+        name = instrument.get("name") or item.get("name", "")
+        if not name or name in instruments:
+            continue
+        instruments[name] = {
+            "name": name,
+            "type": item.get("type", ""),
+            "adapter": item.get("adapter", "") or instrument.get("adapter", ""),
+            "pybirch_class": instrument.get("pybirch_class", ""),
+        }
+    return list(instruments.values())
+
+
+def _json_default(value: Any) -> Any:
+    """Encode numpy values, sets and datetimes; refuse anything else.
+
+    Raises:
+        TypeError: For values that would not load back with their type
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} cannot be stored in a snapshot")
+
+
+# ==================== Reading ====================
+
+def is_snapshot(source: PathOrFile) -> bool:
+    """Check whether a file starts with the snapshot magic bytes."""
+    try:
+        with _open(source) as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_index(source: PathOrFile) -> SnapshotIndex:
+    """
+    Read only the header of a snapshot: names, sizes and instrument sets.
+
+    Args:
+        source: File path or readable binary file
+
+    Returns:
+        The snapshot's header index
+
+    Raises:
+        SnapshotError: If the file is not a snapshot or was written by a newer version
+    """
+    with _open(source) as f:
+        return _read_header(f)
+
+
+def load_scan(source: PathOrFile, key: Union[int, str] = 0) -> 'Scan':
+    """
+    Load one scan from a snapshot without decoding the others.
+
+    Args:
+        source: File path or readable binary file
+        key: Position or scan name within the snapshot
+
+    Returns:
+        The scan, with unbound tree items (no instrument objects attached)
+    """
+    from pybirch.scan.scan import Scan
+
+    return Scan.deserialize(load_scan_data(source, key))
+
+
+def load_scan_data(source: PathOrFile, key: Union[int, str] = 0) -> Dict[str, Any]:
+    """Load one scan's serialized dictionary from a snapshot."""
+    with _open(source) as f:
+        index = _read_header(f)
+        return _read_entry(f, index, index.entry(key))
+
+
+def loads_scan(data: bytes) -> 'Scan':
+    """Load the first scan from snapshot bytes produced by dumps_scan()."""
+    return load_scan(io.BytesIO(data))
+
+
+def load_queue(source: PathOrFile, cls: Optional[type] = None) -> 'Queue':
+    """
+    Load a full queue from a snapshot.
+
+    Args:
+        source: File path or readable binary file
+        cls: Queue class to construct (default: Queue)
+
+    Returns:
+        The restored queue
+    """
+    if cls is None:
+        from pybirch.queue.queue import Queue
+        cls = Queue
+
+    with _open(source) as f:
+        index = _read_header(f)
+        data = dict(index.queue)
+        data.setdefault("QID", index.name)
+        data["scans"] = [_read_entry(f, index, entry) for entry in index.entries]
+    return cls.deserialize(data)
+
+
+class _open:
+    """Context manager accepting a path or an already-open binary file (left open)."""
+
+    def __init__(self, source: PathOrFile):
+        self.source = source
+        self._owned: Optional[BinaryIO] = None
+
+    def __enter__(self) -> BinaryIO:
+        if isinstance(self.source, (str, os.PathLike)):
+            self._owned = open(self.source, "rb")
+            return self._owned
+        self.source.seek(0)
+        return self.source
+
+    def __exit__(self, *exc):
+        if self._owned is not None:
+            self._owned.close()
+
+
+def _read_header(f: BinaryIO) -> SnapshotIndex:
+    preamble = f.read(_PREAMBLE.size)
+    if len(preamble) < _PREAMBLE.size:
+        raise SnapshotError("File is too short to be a snapshot")
+    magic, version, header_length = _PREAMBLE.unpack(preamble)
+    if magic != MAGIC:
+        raise SnapshotError("Not a PyBirch snapshot file")
+    if version > SNAPSHOT_VERSION:
+        raise SnapshotError(f"Snapshot version {version} is newer than supported version {SNAPSHOT_VERSION}")
+
+    raw = f.read(header_length)
+    if len(raw) < header_length:
+        raise SnapshotError("Snapshot header is truncated")
+    try:
+        header = json.loads(raw.decode("utf-8"))
+    except ValueError as e:
+        raise SnapshotError(f"Snapshot header is corrupted: {e}") from e
+
+    return SnapshotIndex(
+        kind=header.get("kind", ""),
+        version=version,
+        name=header.get("name", ""),
+        created_at=header.get("created_at", ""),
+        queue=header.get("queue", {}),
+        entries=[SnapshotEntry(**entry) for entry in header.get("entries", [])],
+        payload_start=_PREAMBLE.size + header_length,
+    )
+
+
+def _read_entry(f: BinaryIO, index: SnapshotIndex, entry: SnapshotEntry) -> Dict[str, Any]:
+    f.seek(index.payload_start + entry.offset)
+    blob = f.read(entry.length)
+    if len(blob) < entry.length:
+        raise SnapshotError(f"Payload for scan '{entry.name}' is truncated")
+    try:
+        data = json.loads(zlib.decompress(blob).decode("utf-8"))
+    except (zlib.error, ValueError) as e:
+        raise SnapshotError(f"Payload for scan '{entry.name}' is corrupted: {e}") from e
+    return data
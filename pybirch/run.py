@@ -0,0 +1,385 @@
+"""
+Headless Scan Runner
+====================
+Runs a saved queue or scan from the command line, without the GUI.
+
+Instruments referenced by the saved scan trees are resolved by class name,
+first from the instrument drivers in the database (when --db is given), then
+from the Python files in the setups directories. Extensions are attached from
+the command line.
+
+Usage:
+    python -m pybirch.run overnight.pbq --output data/
+    python -m pybirch.run overnight.pbq --list
+    python -m pybirch.run overnight.pbq --scan "IV sweep" --db database/pybirch.db --lab-id 1
+    python -m pybirch.run raman.pbs --adapter "Lock-in=GPIB::8::INSTR" --websocket http://localhost:5000
+
+Exit status is 0 when every scan completed, 1 when any scan failed or was
+aborted, and 2 for usage, loading or instrument resolution errors.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+# The queue and discovery modules import pandas and the scan machinery; they
+# are imported where used so that --help and usage errors return at once
+if TYPE_CHECKING:
+    from pybirch.queue.queue import Queue
+
+DEFAULT_SETUPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "setups")
+
+
+class ResolutionError(Exception):
+    """Raised when an instrument referenced by a scan cannot be created."""
+
+
+class InstrumentResolver:
+    """
+    Creates instrument objects for the instruments referenced by saved scans.
+
+    Instruments are cached by name, so scans sharing an instrument share one
+    object, like they do in the GUI.
+
+    Attributes:
+        setups_dirs: Directories searched for instrument classes
+        adapters: Instrument name -> adapter overriding the saved one
+        instruments: Instrument name -> created instrument object
+    """
+
+    def __init__(self, setups_dirs: Sequence[str], db_service: Any = None,
+                 adapters: Optional[Dict[str, str]] = None):
+        """
+        Initialize the resolver.
+
+        Args:
+            setups_dirs: Directories searched for instrument classes
+            db_service: Optional DatabaseService whose drivers are tried first
+            adapters: Instrument name -> adapter overriding the saved one
+        """
+        self.setups_dirs = list(setups_dirs)
+        self.db_service = db_service
+        self.adapters = dict(adapters or {})
+        self.instruments: Dict[str, Any] = {}
+        self._classes: Dict[str, type] = {}
+
+    def resolve(self, name: str, class_name: str, adapter: str = "") -> Any:
+        """
+        Get the instrument object for a saved instrument, creating it if needed.
+
+        Args:
+            name: Instrument name stored in the scan tree
+            class_name: PyBirch class name stored in the scan tree
+            adapter: Adapter stored in the scan tree
+
+        Returns:
+            Instrument object
+
+        Raises:
+            ResolutionError: If no driver or setup class matches class_name
+        """
+        if name in self.instruments:
+            return self.instruments[name]
+
+        adapter = self.adapters.get(name, adapter)
+        if adapter == 'placeholder':
+            adapter = ""
+
+        instrument = self._from_database(name, class_name, adapter)
+        if instrument is None:
+            cls = self._find_class(class_name)
+            if cls is None:
+                raise ResolutionError(
+                    f"No instrument class '{class_name}' for '{name}' in the database or in {self.setups_dirs}"
+                )
+            instrument = self._instantiate(cls, name)
+            if adapter:
+                instrument.adapter = adapter
+
+        self.instruments[name] = instrument
+        return instrument
+
+    def _from_database(self, name: str, class_name: str, adapter: str) -> Any:
+        """Create the instrument from a database driver, if one matches."""
+        if self.db_service is None or not class_name:
+            return None
+        from pybirch.Instruments.factory import InstrumentFactory
+        factory = InstrumentFactory(self.db_service)
+        driver = factory.get_driver_by_name_or_class(class_name)
+        if driver is None:
+            return None
+        return InstrumentFactory.create_instance(driver, adapter=adapter, name=name)
+
+    def _find_class(self, class_name: str) -> Optional[type]:
+        """Find a class by name in the setups directories."""
+        if not class_name:
+            return None
+        if class_name in self._classes:
+            return self._classes[class_name]
+
+        from pybirch.Instruments.discovery import LazyClass, get_discovery_index, python_files
+
+        # Files are parsed, not imported, until one defines the class;
+        # sibling *_ui.py modules import Qt
+        index = get_discovery_index()
+        for setups_dir in self.setups_dirs:
+            for path in python_files(setups_dir):
+                if path.endswith('_ui.py'):
+                    continue
+                if any(info['name'] == class_name for info in index.classes_in(path)):
+                    index.save()
+                    cls = LazyClass(path, class_name).resolve()
+                    self._classes[class_name] = cls
+                    return cls
+        index.save()
+        return None
+
+    @staticmethod
+    def _instantiate(cls: type, name: str) -> Any:
+        """Construct an instrument, coping with the constructor signatures used by setups."""
+        try:
+            return cls(name=name)
+        except TypeError:
+            pass
+        try:
+            return cls(name)
+        except TypeError:
+            instrument = cls()
+            instrument.name = name
+            return instrument
+
+
+def saved_instruments(scan: Any) -> List[Dict[str, str]]:
+    """
+    List the unbound instruments of a loaded scan.
+
+    Returns:
+        One dict (name, pybirch_class, adapter) per instrument, in tree order
+    """
+    tree = scan.scan_settings.scan_tree
+    instruments: Dict[str, Dict[str, str]] = {}
+    for item in tree.unbound_items():
+        name = tree.instrument_name(item)
+        if name in instruments:
+            continue
+        data = (getattr(item, 'deserialized_instrument_data', None) or {}).get("instrument", {})
+        instruments[name] = {
+            "name": name,
+            "pybirch_class": data.get("pybirch_class", ""),
+            "adapter": data.get("adapter", "") or getattr(item, 'adapter', ""),
+        }
+    return list(instruments.values())
+
+
+def load_scans(path: str, selected: Sequence[str] = ()) -> List[Any]:
+    """
+    Load the scans of a saved queue or scan file.
+
+    Args:
+        path: Snapshot (.pbq/.pbs) or legacy pickled queue
+        selected: Scan names or indices to keep (all scans if empty)
+
+    Returns:
+        List of scans, in file order
+    """
+    from pybirch.queue import snapshot
+    from pybirch.queue.queue import Queue
+
+    if snapshot.is_snapshot(path):
+        index = snapshot.read_index(path)
+        if not selected:
+            return [snapshot.load_scan(path, entry.index) for entry in index.entries]
+        keys = [int(key) if key.isdigit() else key for key in selected]
+        return [snapshot.load_scan(path, index.entry(key).index) for key in keys]
+
+    scans = Queue.load(path).scans
+    if not selected:
+        return scans
+    chosen = []
+    for key in selected:
+        matches = [s for i, s in enumerate(scans) if s.scan_settings.scan_name == key or str(i) == key]
+        if not matches:
+            raise KeyError(f"No scan '{key}' in {path}")
+        chosen.extend(matches)
+    return chosen
+
+
+def print_index(path: str):
+    """Print the scans of a saved file without loading their payloads."""
+    from pybirch.queue import snapshot
+    from pybirch.queue.queue import Queue
+
+    if not snapshot.is_snapshot(path):
+        for i, scan in enumerate(Queue.load(path).scans):
+            print(f"{i:3d}  {scan.scan_settings.scan_name}")
+        return
+
+    index = snapshot.read_index(path)
+    print(f"{index.kind} '{index.name}' (version {index.version}, {len(index.entries)} scans)")
+    for entry in index.entries:
+        state = f" [{entry.state}]" if entry.state else ""
+        print(f"{entry.index:3d}  {entry.name}{state}  instruments: {', '.join(entry.instrument_names) or '-'}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m pybirch.run",
+        description="Run a saved PyBirch queue or scan without the GUI.",
+    )
+    parser.add_argument('file', help='Saved queue (.pbq), scan (.pbs) or legacy pickle')
+    parser.add_argument('--list', action='store_true', help='List the scans in the file and exit')
+    parser.add_argument('--scan', action='append', default=[], metavar='NAME_OR_INDEX',
+                        help='Run only this scan (repeatable)')
+    parser.add_argument('--setups', action='append', default=[], metavar='DIR',
+                        help=f'Directory searched for instrument classes (repeatable, default: {DEFAULT_SETUPS_DIR})')
+    parser.add_argument('--adapter', action='append', default=[], metavar='NAME=ADDRESS',
+                        help='Override the adapter of an instrument (repeatable)')
+    parser.add_argument('--db', metavar='PATH', help='Record scans and data in this database')
+    parser.add_argument('--lab-id', type=int, help='Database lab ID for the scans')
+    parser.add_argument('--project-id', type=int, help='Database project ID for the scans')
+    parser.add_argument('--sample-id', type=int, help='Database sample ID for the scans')
+    parser.add_argument('--operator', help='Operator name recorded on the scans')
+    parser.add_argument('--output', metavar='DIR', help='Write measurement data to CSV files in DIR')
+    parser.add_argument('--websocket', metavar='URL', help='Broadcast progress to a running PyBirch web server')
+    parser.add_argument('--parallel', type=int, default=0, metavar='N',
+                        help='Run up to N scans in parallel (default: serial)')
+    parser.add_argument('--dry-run', action='store_true', help='Resolve instruments but do not run')
+    return parser
+
+
+def _parse_adapters(pairs: Sequence[str]) -> Dict[str, str]:
+    """Parse NAME=ADDRESS pairs."""
+    adapters = {}
+    for pair in pairs:
+        name, sep, address = pair.partition('=')
+        if not sep or not name:
+            raise ValueError(f"Invalid --adapter '{pair}', expected NAME=ADDRESS")
+        adapters[name] = address
+    return adapters
+
+
+def _make_queue(args: argparse.Namespace, db_service: Any) -> 'Queue':
+    """Create the queue the scans are run in."""
+    from pybirch.queue.queue import Queue
+
+    qid = f"cli_{os.path.splitext(os.path.basename(args.file))[0]}"
+    max_parallel = max(args.parallel, 1)
+    if db_service is None:
+        return Queue(QID=qid, max_parallel_scans=max_parallel)
+
+    from pybirch.database_integration.extensions.database_queue import DatabaseQueue
+    return DatabaseQueue(
+        QID=qid,
+        db_service=db_service,
+        project_id=args.project_id,
+        sample_id=args.sample_id,
+        operator=args.operator,
+        max_parallel_scans=max_parallel,
+        lab_id=args.lab_id,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the command line interface.
+
+    Args:
+        argv: Arguments (default: sys.argv[1:])
+
+    Returns:
+        Process exit status
+    """
+    args = build_parser().parse_args(argv)
+
+    from pybirch.queue import snapshot
+    from pybirch.queue.queue import ExecutionMode, ScanState
+
+    if not os.path.isfile(args.file):
+        print(f"[Run] No such file: {args.file}", file=sys.stderr)
+        return 2
+
+    try:
+        if args.list:
+            print_index(args.file)
+            return 0
+        adapters = _parse_adapters(args.adapter)
+        scans = load_scans(args.file, args.scan)
+    except (KeyError, ValueError, snapshot.SnapshotError) as e:
+        print(f"[Run] {e.args[0] if e.args else e}", file=sys.stderr)
+        return 2
+
+    if not scans:
+        print("[Run] Nothing to run", file=sys.stderr)
+        return 2
+
+    db_service = None
+    if args.db:
+        from database.services import DatabaseService
+        db_service = DatabaseService(args.db)
+
+    resolver = InstrumentResolver(args.setups or [DEFAULT_SETUPS_DIR], db_service=db_service, adapters=adapters)
+    try:
+        for scan in scans:
+            for instrument in saved_instruments(scan):
+                resolver.resolve(instrument["name"], instrument["pybirch_class"], instrument["adapter"])
+            scan.scan_settings.scan_tree.bind_instruments(resolver.instruments)
+    except (ResolutionError, KeyError) as e:
+        print(f"[Run] {e.args[0] if e.args else e}", file=sys.stderr)
+        return 2
+
+    for name, instrument in resolver.instruments.items():
+        print(f"[Run] {name}: {type(instrument).__name__} ({getattr(instrument, 'adapter', '') or 'no adapter'})")
+    if args.dry_run:
+        print(f"[Run] Dry run: {len(scans)} scan(s) ready")
+        return 0
+
+    if args.output:
+        from pybirch.extensions.file_writer import FileWriterExtension
+        for scan in scans:
+            scan.scan_settings.extensions.append(FileWriterExtension(args.output))
+
+    queue = _make_queue(args, db_service)
+    queue.add_log_callback(lambda entry: print(entry, flush=True))
+    for scan in scans:
+        queue.enqueue(scan)
+
+    if args.websocket:
+        from pybirch.database_integration.sync.websocket_integration import (
+            setup_websocket_integration, create_websocket_scan_extension,
+        )
+        try:
+            bridge = setup_websocket_integration(queue, server_url=args.websocket)
+        except (ConnectionError, ValueError) as e:
+            print(f"[Run] {e}", file=sys.stderr)
+            return 2
+        for handle in queue._scan_handles:
+            handle.scan.scan_settings.extensions.append(
+                create_websocket_scan_extension(bridge.server, scan_id=handle.scan_id, queue_id=bridge.queue_id)
+            )
+
+    mode = ExecutionMode.PARALLEL if args.parallel > 1 else ExecutionMode.SERIAL
+    started = time.monotonic()
+    try:
+        queue.start(mode=mode)
+        while not queue.wait_for_completion(timeout=0.5):
+            pass
+    except KeyboardInterrupt:
+        print("[Run] Interrupted, aborting scans", file=sys.stderr)
+        queue.abort()
+        queue.wait_for_completion()
+
+    handles = list(queue._scan_handles)
+    completed = sum(1 for h in handles if h.state == ScanState.COMPLETED)
+    print(f"[Run] {completed}/{len(handles)} scans completed in {time.monotonic() - started:.1f}s")
+    for handle in handles:
+        if handle.state != ScanState.COMPLETED:
+            error = f": {handle.error}" if handle.error else ""
+            print(f"[Run] {handle.scan.scan_settings.scan_name} {handle.state.name}{error}", file=sys.stderr)
+    return 0 if completed == len(handles) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,14 +3,18 @@ PyBirch Scan Module
 
 This module provides core scanning functionality for the PyBirch framework:
 - Scan: Main scan execution engine
+- ScanTree/InstrumentTreeItem: Headless scan tree (no Qt required)
 - Movement/Measurement: Base instrument classes
 - State machines for item and scan states
 - Tree traversal for parallel execution
 - Cancellation tokens for clean abort handling
+- Plan-based progress and ETA tracking
+- Instrument session pooling across scans
 - Protocol definitions for type checking
 """
 
 from pybirch.scan.scan import Scan, ScanSettings, get_empty_scan
+from pybirch.scan.tree import ScanTree, InstrumentTreeItem
 from pybirch.scan.movements import Movement, VisaMovement, MovementItem
 from pybirch.scan.measurements import Measurement, VisaMeasurement, MeasurementItem
 from pybirch.scan.protocols import (
@@ -19,6 +23,8 @@ from pybirch.scan.protocols import (
     is_movement,
     is_measurement,
     get_instrument_type,
+    apply_settings,
+    read_position,
 )
 from pybirch.scan.state import (
     ItemState,
@@ -34,12 +40,26 @@ from pybirch.scan.cancellation import (
     CancellationError,
     CancellationType,
 )
+from pybirch.scan.progress import (
+    ProgressTracker,
+    ProgressUpdate,
+    count_planned_points,
+    format_eta,
+)
+from pybirch.scan.sessions import (
+    SessionPool,
+    InstrumentSession,
+    get_session_pool,
+)
 
 __all__ = [
     # Core
     "Scan",
     "ScanSettings",
     "get_empty_scan",
+    # Tree
+    "ScanTree",
+    "InstrumentTreeItem",
     # Instruments
     "Movement",
     "VisaMovement",
@@ -53,6 +73,8 @@ __all__ = [
     "is_movement",
     "is_measurement",
     "get_instrument_type",
+    "apply_settings",
+    "read_position",
     # State
     "ItemState",
     "ScanState",
@@ -67,4 +89,13 @@ __all__ = [
     "CancellationTokenSource",
     "CancellationError",
     "CancellationType",
+    # Progress
+    "ProgressTracker",
+    "ProgressUpdate",
+    "count_planned_points",
+    "format_eta",
+    # Sessions
+    "SessionPool",
+    "InstrumentSession",
+    "get_session_pool",
 ]
\ No newline at end of file
@@ -85,6 +85,8 @@ class CancellationToken:
         self._name = name
         self._cancelled = Event()
         self._paused = Event()
+        self._resumed = Event()  # Cleared while paused, so waiters block without polling
+        self._resumed.set()
         self._lock = Lock()
         self._info: Optional[CancellationInfo] = None
         self._callbacks: List[Callable[[CancellationInfo], None]] = []
@@ -142,6 +144,7 @@ class CancellationToken:
             )
             self._cancelled.set()
             self._paused.clear()  # Unpause if paused
+            self._resumed.set()
             
             logger.info(f"Cancellation requested: {reason} (type={cancellation_type.name})")
             
@@ -161,12 +164,14 @@ class CancellationToken:
         with self._lock:
             if not self._cancelled.is_set():
                 self._paused.set()
+                self._resumed.clear()
                 logger.info(f"Pause requested for token '{self._name}'")
     
     def resume(self) -> None:
         """Resume from pause."""
         with self._lock:
             self._paused.clear()
+            self._resumed.set()
             logger.info(f"Resume requested for token '{self._name}'")
     
     def check(self, throw_on_cancel: bool = True) -> bool:
@@ -196,14 +201,12 @@ class CancellationToken:
             timeout: Maximum time to wait (None = wait forever).
             
         Returns:
-            True if resumed, False if cancelled.
+            True if running (resumed or never paused), False if cancelled
+            or still paused when the timeout elapsed.
         """
-        while self._paused.is_set() and not self._cancelled.is_set():
-            # Poll periodically to check cancellation
-            self._paused.wait(timeout=timeout or 0.1)
-            if timeout is not None:
-                break
-        return not self._cancelled.is_set()
+        # cancel() and resume() both set _resumed, so this wakes on either
+        self._resumed.wait(timeout=timeout)
+        return not self._cancelled.is_set() and not self._paused.is_set()
     
     def wait_for_cancellation(self, timeout: Optional[float] = None) -> bool:
         """
@@ -226,6 +229,7 @@ class CancellationToken:
         with self._lock:
             self._cancelled.clear()
             self._paused.clear()
+            self._resumed.set()
             self._info = None
             logger.debug(f"Token '{self._name}' reset")
     
@@ -0,0 +1,204 @@
+"""
+Progress and ETA tracking for PyBirch scan execution.
+
+The scan plan (the instrument tree) determines how many measurement points a
+scan will take: every measurement runs once per combination of the positions
+of its ancestor movements. A ProgressTracker counts completed points against
+that total, keeps a rolling points/second rate, derives an ETA, and throttles
+updates so subscribers (GUI, database, WebSocket) receive a steady stream
+instead of one update per point.
+
+Usage:
+    from pybirch.scan.progress import ProgressTracker, count_planned_points
+
+    tracker = ProgressTracker(count_planned_points(scan_tree), min_interval=0.25)
+
+    # In the scan loop:
+    update = tracker.advance()      # Returns None while throttled
+    if update is not None:
+        publish(update)
+
+    publish(tracker.finish())       # Final update is never throttled
+"""
+
+from __future__ import annotations
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from threading import Lock
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class ProgressUpdate:
+    """Snapshot of a scan's progress."""
+
+    completed: int
+    total: int
+    fraction: float
+    rate: float  # Points per second over the rolling window
+    eta_seconds: Optional[float]
+    elapsed_seconds: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def count_planned_points(scan_tree: Any) -> int:
+    """
+    Count the measurement points a scan tree will take.
+
+    Each measurement item runs once per combination of positions of its
+    ancestor movement items. Movements without positions count as a single
+    position.
+
+    Args:
+        scan_tree: ScanTree (or any object with a root_item)
+
+    Returns:
+        Total number of planned measurement points (0 if the tree has no measurements)
+    """
+    root = getattr(scan_tree, 'root_item', None)
+    if root is None:
+        return 0
+
+    total = 0
+    # (item, number of times this item's subtree is entered)
+    stack = [(child, 1) for child in getattr(root, 'child_items', [])]
+    while stack:
+        item, repeats = stack.pop()
+        if getattr(item, 'type', '') == "Measurement":
+            total += repeats
+        elif getattr(item, 'type', '') == "Movement":
+            repeats *= max(_position_count(item), 1)
+        stack.extend((child, repeats) for child in getattr(item, 'child_items', []))
+    return total
+
+
+def _position_count(item: Any) -> int:
+    """Number of positions a movement tree item visits."""
+    positions = getattr(getattr(item, 'instrument_object', None), 'positions', None)
+    if positions is None or len(positions) == 0:
+        positions = getattr(item, 'movement_positions', None)
+    return len(positions) if positions is not None else 0
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """
+    Format an ETA for display, e.g. '45s', '3m 20s', '2h 05m'.
+
+    Args:
+        seconds: Remaining time in seconds (None if unknown)
+
+    Returns:
+        Human-readable duration, or '--' if unknown
+    """
+    if seconds is None:
+        return "--"
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+class ProgressTracker:
+    """
+    Thread-safe point counter with rolling rate, ETA and update throttling.
+
+    Attributes:
+        total: Planned number of points (0 if unknown)
+        completed: Points completed so far
+        min_interval: Minimum seconds between emitted updates
+        window: Seconds of history used for the rolling rate
+    """
+
+    def __init__(self, total: int, min_interval: float = 0.25, window: float = 10.0):
+        """
+        Initialize the tracker.
+
+        Args:
+            total: Planned number of points (0 if unknown)
+            min_interval: Minimum seconds between emitted updates (0 disables throttling)
+            window: Seconds of history used for the rolling rate
+        """
+        self.total = total
+        self.completed = 0
+        self.min_interval = min_interval
+        self.window = window
+
+        self._lock = Lock()
+        self._start = time.monotonic()
+        self._last_emit: Optional[float] = None
+        self._samples: deque = deque([(self._start, 0)])
+
+    def advance(self, points: int = 1) -> Optional[ProgressUpdate]:
+        """
+        Record completed points.
+
+        Args:
+            points: Number of points completed since the last call
+
+        Returns:
+            A ProgressUpdate if one is due, or None while throttled
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.completed += points
+            self._samples.append((now, self.completed))
+            while len(self._samples) > 2 and now - self._samples[0][0] > self.window:
+                self._samples.popleft()
+
+            if self._last_emit is not None and now - self._last_emit < self.min_interval:
+                return None
+            self._last_emit = now
+            return self._snapshot(now)
+
+    def snapshot(self) -> ProgressUpdate:
+        """Get the current progress without affecting throttling."""
+        with self._lock:
+            return self._snapshot(time.monotonic())
+
+    def finish(self) -> ProgressUpdate:
+        """Mark the scan complete and return the final (unthrottled) update."""
+        now = time.monotonic()
+        with self._lock:
+            self._last_emit = now
+            update = self._snapshot(now)
+        update.fraction = 1.0
+        update.eta_seconds = 0.0
+        return update
+
+    def _snapshot(self, now: float) -> ProgressUpdate:
+        """Build an update from the current state (caller holds the lock)."""
+        rate = self._rate()
+        fraction = 0.0
+        eta = None
+        if self.total > 0:
+            # Cap below 1.0; only finish() reports completion
+            fraction = min(self.completed / self.total, 0.999)
+            if rate > 0:
+                eta = max(self.total - self.completed, 0) / rate
+        return ProgressUpdate(
+            completed=self.completed,
+            total=self.total,
+            fraction=fraction,
+            rate=rate,
+            eta_seconds=eta,
+            elapsed_seconds=now - self._start,
+        )
+
+    def _rate(self) -> float:
+        """Points per second over the rolling window."""
+        first_time, first_count = self._samples[0]
+        last_time, last_count = self._samples[-1]
+        if last_time > first_time:
+            return (last_count - first_count) / (last_time - first_time)
+        return 0.0
+
+    def __repr__(self) -> str:
+        return f"ProgressTracker(completed={self.completed}, total={self.total})"
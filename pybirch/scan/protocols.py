@@ -238,3 +238,45 @@ def get_instrument_type(instrument: Any) -> str:
     elif is_measurement(instrument):
         return 'Measurement'
     return 'Unknown'
+
+
+def apply_settings(instrument: Any, settings: dict) -> dict:
+    """
+    Apply settings to an instrument, skipping ones it is known to have.
+    
+    Instruments built on pybirch.Instruments.base diff the settings against
+    their last known device state (see InstrumentSettingsMixin); other
+    instruments get the whole dict assigned.
+    
+    Args:
+        instrument: The instrument to configure.
+        settings: Desired settings.
+        
+    Returns:
+        The settings that were actually assigned.
+    """
+    apply = getattr(instrument, 'apply_settings', None)
+    if callable(apply):
+        return apply(settings)
+    instrument.settings = settings
+    return dict(settings)
+
+
+def read_position(instrument: Any) -> Any:
+    """
+    Read a movement instrument's position, from its read-back cache if it has one.
+    
+    Instruments built on pybirch.Instruments.base only query the hardware
+    when their cached position is stale (see
+    BaseMovementInstrument.cached_position); others are read directly.
+    
+    Args:
+        instrument: The movement instrument.
+        
+    Returns:
+        The current position.
+    """
+    cached = getattr(instrument, 'cached_position', None)
+    if callable(cached):
+        return cached()
+    return instrument.position
@@ -15,7 +15,7 @@ from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from itertools import compress
 from threading import Event, Lock
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -26,17 +26,24 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 from pybirch.scan.movements import Movement, MovementItem
 from pybirch.scan.measurements import Measurement, MeasurementItem
 from pybirch.extensions.scan_extensions import ScanExtension
+from pybirch.scan.cancellation import CancellationToken
+from pybirch.scan.progress import ProgressTracker, ProgressUpdate, count_planned_points
+from pybirch.scan.protocols import apply_settings, read_position
+from pybirch.scan.sessions import SessionPool
 
-# Optional GUI imports - only needed when using GUI
-if TYPE_CHECKING:
-    from GUI.widgets.scan_tree.treemodel import ScanTreeModel
-    from GUI.widgets.scan_tree.treeitem import InstrumentTreeItem
+from pybirch.scan.tree import ScanTree, InstrumentTreeItem
 
 logger = logging.getLogger(__name__)
 
+
+def _restore_scan_tree(data: Optional[dict]) -> ScanTree:
+    """Rebuild a scan tree from the dictionary produced by its serialize()."""
+    return ScanTree.from_dict(data)
+
+
 class ScanSettings:
     """A class to hold scan settings, including movement and measurement dictionaries."""
-    def __init__(self, project_name: str, scan_name: str, scan_type: str, job_type: str, ScanTree: Optional[ScanTreeModel | Any], extensions: list[ScanExtension] = [], additional_tags: list[str] = [], status: str = "Queued", user_fields: dict | None = None):
+    def __init__(self, project_name: str, scan_name: str, scan_type: str, job_type: str, ScanTree: Optional[ScanTree | Any], extensions: list[ScanExtension] = [], additional_tags: list[str] = [], status: str = "Queued", user_fields: dict | None = None):
         
         # Name of the project, e.g. 'rare_earth_tritellurides', 'trilayer_twisted_graphene', etc.
         self.project_name = project_name
@@ -87,38 +94,44 @@ class ScanSettings:
 
 
     def __getstate__(self):
-        """Prepare state for pickling - serialize ScanTreeModel to dict."""
+        """Prepare state for pickling - serialize the scan tree to a dict."""
         state = self.__dict__.copy()
-        # Serialize the scan_tree (ScanTreeModel) to a dictionary
+        # Serialize the scan_tree to a dictionary (instrument objects are not pickled)
         if hasattr(self, 'scan_tree') and self.scan_tree is not None:
             state['_scan_tree_data'] = self.scan_tree.serialize()
             del state['scan_tree']
         return state
     
+    @classmethod
+    def deserialize(cls, data: dict) -> 'ScanSettings':
+        """
+        Rebuild scan settings from a dictionary produced by serialize().
+
+        Tree items are restored without instrument objects; their saved
+        instrument data is kept on `deserialized_instrument_data` so they can
+        be rebound to live instruments. Extensions are not serialized and must
+        be attached by the caller.
+        """
+        settings = cls(
+            project_name=data.get("project_name", ""),
+            scan_name=data.get("scan_name", ""),
+            scan_type=data.get("scan_type", ""),
+            job_type=data.get("job_type", ""),
+            ScanTree=_restore_scan_tree(data.get("scan_tree")),
+            extensions=[],
+            additional_tags=list(data.get("additional_tags", [])),
+            status=data.get("status", "Queued"),
+            user_fields=dict(data.get("user_fields") or {}),
+        )
+        settings.wandb_link = data.get("wandb_link", "")
+        return settings
+
     def __setstate__(self, state):
-        """Restore state after unpickling - deserialize ScanTreeModel from dict."""
-        # Import at runtime since TYPE_CHECKING imports are not available at runtime
-        from GUI.widgets.scan_tree.treemodel import ScanTreeModel
-        from GUI.widgets.scan_tree.treeitem import InstrumentTreeItem
-        
+        """Restore state after unpickling - rebuild the scan tree from its dict."""
         # Restore scan_tree from serialized data
         scan_tree_data = state.pop('_scan_tree_data', None)
         self.__dict__.update(state)
-        
-        if scan_tree_data is not None:
-            self.scan_tree = ScanTreeModel()
-            # Restore root_item
-            self.scan_tree.root_item = InstrumentTreeItem.deserialize(scan_tree_data.get("root_item", {}))
-            # Restore state flags
-            self.scan_tree.completed = scan_tree_data.get("completed", False)
-            self.scan_tree.paused = scan_tree_data.get("paused", False)
-            self.scan_tree.stopped = scan_tree_data.get("stopped", False)
-            # Restore next_item if present
-            next_item_data = scan_tree_data.get("next_item")
-            if next_item_data:
-                self.scan_tree.next_item = InstrumentTreeItem.deserialize(next_item_data)
-        else:
-            self.scan_tree = ScanTreeModel()
+        self.scan_tree = _restore_scan_tree(scan_tree_data)
 
     def __repr__(self):
         return f"ScanSettings(project_name={self.project_name}, \nscan_name={self.scan_name}, \nscan_type={self.scan_type}, \njob_type={self.job_type})"
@@ -153,6 +166,16 @@ class Scan():
         self._data_buffer: Dict[str, List[Dict]] = {}
         self._buffer_lock = Lock()
         self._stop_event = Event()
+        # Pause/abort requests, checked at every scan point and passed to instruments
+        self.cancellation_token = CancellationToken(name=scan_settings.scan_name)
+        # Optional pool of connected instruments shared with other scans (set by Queue)
+        self.session_pool: Optional[SessionPool] = None
+        self._leased_instruments: List[Any] = []
+        # Progress reporting: minimum seconds between updates sent to callbacks
+        self.progress_interval: float = 0.25
+        self.progress: Optional[ProgressUpdate] = None
+        self._progress_tracker: Optional[ProgressTracker] = None
+        self._progress_callbacks: List[Callable[[ProgressUpdate], None]] = []
         self._executor = ThreadPoolExecutor(max_workers=max_workers, 
                                           thread_name_prefix='save_worker_')
         self._pending_futures: deque = deque(maxlen=100)  # Keep last 100 futures for error checking
@@ -248,11 +271,75 @@ class Scan():
         """Ensure all data is saved when the scan is destroyed."""
         self.shutdown()
 
+    # ==================== Progress ====================
+
+    def add_progress_callback(self, callback: Callable[[ProgressUpdate], None]):
+        """Register a callback for throttled progress updates (called from the scan thread)."""
+        self._progress_callbacks.append(callback)
+
+    def remove_progress_callback(self, callback: Callable[[ProgressUpdate], None]):
+        """Remove a progress callback."""
+        if callback in self._progress_callbacks:
+            self._progress_callbacks.remove(callback)
+
+    def _publish_progress(self, update: Optional[ProgressUpdate]):
+        """Store and broadcast a progress update (None means throttled)."""
+        if update is None:
+            return
+        self.progress = update
+        for callback in list(self._progress_callbacks):
+            try:
+                callback(update)
+            except Exception as e:
+                logger.error(f"Progress callback error: {e}")
+
+    # ==================== Pause / Abort ====================
+
+    def pause(self):
+        """Pause the scan before its next point. The scan thread blocks until resumed or aborted."""
+        self.cancellation_token.pause()
+
+    def resume(self):
+        """Resume a paused scan."""
+        self.cancellation_token.resume()
+
+    def abort(self, reason: str = "Scan aborted"):
+        """Abort the scan, interrupting in-flight instrument waits.
+
+        The scan stops before its next point and remembers its position in
+        `current_item`. Data from the interrupted point is discarded.
+        """
+        self._stop_event.set()
+        self.cancellation_token.cancel(reason)
+
+    @property
+    def is_paused(self) -> bool:
+        """Whether a pause has been requested and not yet resumed."""
+        return self.cancellation_token.is_pause_requested
+
+    @property
+    def stop_requested(self) -> bool:
+        """Whether the scan has been stopped or aborted."""
+        return self._stop_event.is_set() or self.cancellation_token.is_cancelled
+
+    def _checkpoint(self) -> bool:
+        """Point boundary: block while paused, then report whether to stop.
+
+        Returns:
+            True if the scan should stop, False to continue with the next point.
+        """
+        token = self.cancellation_token
+        if token.is_pause_requested and not self.stop_requested:
+            logger.info(f"Scan {self.scan_settings.scan_name} paused")
+            # Wake periodically so a bare _stop_event.set() also ends the pause
+            while not token.wait_if_paused(timeout=0.1):
+                if self.stop_requested:
+                    break
+            logger.info(f"Scan {self.scan_settings.scan_name} resumed")
+        return self.stop_requested
+
     def execute(self):
         """Execute the scan procedure using the FastForward traversal and move_next functionality."""
-        # Import at runtime since TYPE_CHECKING imports are not available at runtime
-        from GUI.widgets.scan_tree.treeitem import InstrumentTreeItem
-        
         print(f"\n[Scan.execute] ========== SCAN EXECUTION START ==========")
         print(f"[Scan.execute] Scan name: {self.scan_settings.scan_name}")
         print(f"[Scan.execute] Owner: {self.owner}")
@@ -275,6 +362,7 @@ class Scan():
         print(f"[Scan.execute] Connecting to instruments...")
         logger.info("Connecting to instruments...")
         connected_instruments = set()
+        bound_instruments = set()
         
         def connect_instrument(item):
             item_name = getattr(item, 'name', 'unknown')
@@ -286,6 +374,23 @@ class Scan():
                 # Get the actual instrument object
                 instr = item.instrument_object.instrument
                 print(f"[Scan.execute]   -> Instrument type: {type(instr).__name__}")
+
+                # Borrow a pooled session; connect() only runs for new sessions
+                if self.session_pool is not None and instr not in connected_instruments:
+                    try:
+                        pooled = self.session_pool.acquire(instr)
+                    except Exception as e:
+                        print(f"[Scan.execute]   -> ERROR connecting: {str(e)}")
+                        logger.error(f"Error connecting to instrument {instr}: {str(e)}")
+                        raise
+                    self._leased_instruments.append(pooled)
+                    connected_instruments.add(instr)
+                    print(f"[Scan.execute]   -> Borrowed session for {getattr(instr, 'name', instr.__class__.__name__)}")
+
+                # Let interruptible instrument waits see pause/abort requests
+                if hasattr(instr, 'cancellation_token'):
+                    instr.cancellation_token = self.cancellation_token
+                    bound_instruments.add(instr)
                     
                 # Only connect once per unique instrument
                 if instr not in connected_instruments:
@@ -316,7 +421,7 @@ class Scan():
                 try:
                     if item._runtime_initialized and hasattr(instr, 'initialize') and callable(instr.initialize):
                         instr.initialize()
-                        instr.settings = item._runtime_settings
+                        apply_settings(instr, item._runtime_settings)
                         instr_name = getattr(instr, 'name', instr.__class__.__name__)
                         logger.info(f"Initialized {instr_name}")
                 except Exception as e:
@@ -352,92 +457,121 @@ class Scan():
         first_iteration = True
         iteration_count = 0
 
-        # Main scan loop
-        print(f"[Scan.execute] Starting main scan loop...")
-        while True:
-            iteration_count += 1
-            print(f"\n[Scan.execute] === Loop iteration {iteration_count} ===")
-            print(f"[Scan.execute] current_item: name='{getattr(current_item, 'name', 'N/A')}', has_instrument_object={current_item.instrument_object is not None if hasattr(current_item, 'instrument_object') else 'N/A'}")
+        # Keep counting across a stop/restart; start fresh otherwise
+        if self._progress_tracker is None or self.current_item is None:
+            total_points = count_planned_points(self.scan_settings.scan_tree)
+            self._progress_tracker = ProgressTracker(total_points, min_interval=self.progress_interval)
+        tracker = self._progress_tracker
+        tracker.min_interval = self.progress_interval
+        self._publish_progress(tracker.snapshot())
+        completed = False
+
+        try:
+            # Main scan loop
+            print(f"[Scan.execute] Starting main scan loop...")
+            while True:
+                iteration_count += 1
+                print(f"\n[Scan.execute] === Loop iteration {iteration_count} ===")
+                print(f"[Scan.execute] current_item: name='{getattr(current_item, 'name', 'N/A')}', has_instrument_object={current_item.instrument_object is not None if hasattr(current_item, 'instrument_object') else 'N/A'}")
             
-            if hasattr(self, '_stop_event') and self._stop_event.is_set():
-                logger.info("Scan stopped by user")
-
-                # save current position in scan, in case it is necessary to continue
-                self.current_item = current_item
-
-                # save current settings for instruments that have already been initialized
-                traverse_and_save(root_item)
-                break
-
-            # Use FastForward to get the next item to process
-            ff = InstrumentTreeItem.FastForward(current_item)
-            ff = ff.new_item(current_item)
-            print(f"[Scan.execute] FastForward created from current_item")
-
-            while not ff.done and ff.current_item is not None:
-                print(f"[Scan.execute] Propagating from item: '{getattr(ff.current_item, 'name', 'N/A')}'")
-                ff = ff.current_item.propagate(ff)
-                if ff.done:
-                    print(f"[Scan.execute] FastForward done after propagate")
+                if self._checkpoint():
+                    logger.info("Scan stopped by user")
+
+                    # save current position in scan, in case it is necessary to continue
+                    self.current_item = current_item
+
+                    # save current settings for instruments that have already been initialized
+                    traverse_and_save(root_item)
+
+                    # Report where the scan stopped, regardless of throttling
+                    self._publish_progress(tracker.snapshot())
                     break
 
-            print(f"[Scan.execute] FastForward result: done={ff.done}, stack_size={len(ff.stack) if ff.stack else 0}, final_item={getattr(ff.final_item, 'name', None) if ff.final_item else None}")
+                # Use FastForward to get the next item to process
+                ff = InstrumentTreeItem.FastForward(current_item)
+                ff = ff.new_item(current_item)
+                print(f"[Scan.execute] FastForward created from current_item")
+
+                while not ff.done and ff.current_item is not None:
+                    print(f"[Scan.execute] Propagating from item: '{getattr(ff.current_item, 'name', 'N/A')}'")
+                    ff = ff.current_item.propagate(ff)
+                    if ff.done:
+                        print(f"[Scan.execute] FastForward done after propagate")
+                        break
+
+                print(f"[Scan.execute] FastForward result: done={ff.done}, stack_size={len(ff.stack) if ff.stack else 0}, final_item={getattr(ff.final_item, 'name', None) if ff.final_item else None}")
             
-            # Process the stack of items in parallel
-            if ff.stack:
-                print(f"[Scan.execute] Processing stack with {len(ff.stack)} items: {[getattr(item, 'name', 'N/A') for item in ff.stack]}")
-                logger.debug(f"Processing items in parallel: {[item.unique_id() for item in ff.stack]}")
+                # Process the stack of items in parallel
+                if ff.stack:
+                    print(f"[Scan.execute] Processing stack with {len(ff.stack)} items: {[getattr(item, 'name', 'N/A') for item in ff.stack]}")
+                    logger.debug(f"Processing items in parallel: {[item.unique_id() for item in ff.stack]}")
                 
-                with ThreadPoolExecutor(max_workers=min(len(ff.stack),self._max_workers)) as executor:
-                    # Submit all move_next tasks
-                    future_to_item = {
-                        executor.submit(item.move_next): item 
-                        for item in ff.stack
-                    }
+                    points_done = 0
+                    with ThreadPoolExecutor(max_workers=min(len(ff.stack),self._max_workers)) as executor:
+                        # Submit all move_next tasks
+                        future_to_item = {
+                            executor.submit(item.move_next): item 
+                            for item in ff.stack
+                        }
                     
-                    # Process results as they complete
-                    for future in as_completed(future_to_item):
-                        item = future_to_item[future]
-                        try:
-                            result = future.result()
-                            if isinstance(result, pd.DataFrame):
-                                # This was a measurement
-                                # Add movement positions to the result, including only the relevant, ancestral movements
-                                for movement_item in self.scan_settings.scan_tree.get_movement_items():
-                                    if movement_item.is_ancestor_of(item):
-                                        if movement_item.instrument_object is not None:
-                                            movement_instr = movement_item.instrument_object.instrument
-                                            if movement_instr is not None:
-                                                position_col = f"{movement_instr.position_column} M({movement_instr.position_units})"
-                                                result[position_col] = movement_instr.position
-
-                                # Save the measurement data
-                                self.save_data(result, item.unique_id())
-                        except Exception as exc:
-                            logger.error(f"{item.unique_id()} generated an exception: {exc}")
-                            # Optionally re-raise if you want the scan to stop on error
-                            # raise
-
-            # Check if we've completed all movements
-            all_items = list(self.scan_settings.scan_tree.get_all_instrument_items())
-            print(f"[Scan.execute] Checking completion: {len(all_items)} total instrument items")
-            for item in all_items:
-                item_name = getattr(item, 'name', 'N/A')
-                is_finished = item.finished()
-                has_instr = item.instrument_object is not None if hasattr(item, 'instrument_object') else False
-                print(f"[Scan.execute]   Item '{item_name}': finished={is_finished}, has_instrument_object={has_instr}")
+                        # Process results as they complete
+                        for future in as_completed(future_to_item):
+                            item = future_to_item[future]
+                            try:
+                                result = future.result()
+                                if self.cancellation_token.is_cancelled:
+                                    # Instrument waits were cut short; don't save a partial point
+                                    continue
+                                if isinstance(result, pd.DataFrame):
+                                    # This was a measurement
+                                    # Add movement positions to the result, including only the relevant, ancestral movements
+                                    for movement_item in self.scan_settings.scan_tree.get_movement_items():
+                                        if movement_item.is_ancestor_of(item):
+                                            if movement_item.instrument_object is not None:
+                                                movement_instr = movement_item.instrument_object.instrument
+                                                if movement_instr is not None:
+                                                    position_col = f"{movement_instr.position_column} M({movement_instr.position_units})"
+                                                    result[position_col] = read_position(movement_instr)
+
+                                    # Save the measurement data
+                                    self.save_data(result, item.unique_id())
+                                    points_done += 1
+                            except Exception as exc:
+                                logger.error(f"{item.unique_id()} generated an exception: {exc}")
+                                # Optionally re-raise if you want the scan to stop on error
+                                # raise
+
+                    if points_done:
+                        self._publish_progress(tracker.advance(points_done))
+
+                # Check if we've completed all movements
+                all_items = list(self.scan_settings.scan_tree.get_all_instrument_items())
+                print(f"[Scan.execute] Checking completion: {len(all_items)} total instrument items")
+                for item in all_items:
+                    item_name = getattr(item, 'name', 'N/A')
+                    is_finished = item.finished()
+                    has_instr = item.instrument_object is not None if hasattr(item, 'instrument_object') else False
+                    print(f"[Scan.execute]   Item '{item_name}': finished={is_finished}, has_instrument_object={has_instr}")
             
-            if all(item.finished() for item in all_items):
-                logger.info("All movements completed")
-                print(f"[Scan.execute] All movements completed - exiting loop")
-                break
-
-            # Get the next item to process
-            if ff.final_item is None:
-                print(f"[Scan.execute] final_item is None - exiting loop")
-                break
-            current_item = ff.final_item
-            print(f"[Scan.execute] Moving to next item: '{getattr(current_item, 'name', 'N/A')}'")
+                if all(item.finished() for item in all_items):
+                    logger.info("All movements completed")
+                    print(f"[Scan.execute] All movements completed - exiting loop")
+                    completed = True
+                    break
+
+                # Get the next item to process
+                if ff.final_item is None:
+                    print(f"[Scan.execute] final_item is None - exiting loop")
+                    break
+                current_item = ff.final_item
+                print(f"[Scan.execute] Moving to next item: '{getattr(current_item, 'name', 'N/A')}'")
+        finally:
+            # Tokens are per-scan; don't leave them attached to shared instruments
+            for instr in bound_instruments:
+                instr.cancellation_token = None
+
+        if completed and not self.stop_requested:
+            self._publish_progress(tracker.finish())
 
         # Final flush of any remaining data
         self.flush()
@@ -449,9 +583,17 @@ class Scan():
         for extension in self.extensions:
             extension.shutdown()
 
+        # Return pooled sessions; the pool decides when they are shut down
+        leased, self._leased_instruments = self._leased_instruments, []
+        if self.session_pool is not None:
+            for instr in leased:
+                self.session_pool.release(instr)
+
         # Shutdown all movement and measurement tools
         for item in self.scan_settings.scan_tree.get_all_instrument_items():
             if item.instrument_object is not None:
+                if any(item.instrument_object.instrument is instr for instr in leased):
+                    continue
                 try:
                     if hasattr(item.instrument_object.instrument, 'shutdown') and callable(item.instrument_object.instrument.shutdown):
                         item.instrument_object.instrument.shutdown()
@@ -467,6 +609,43 @@ class Scan():
         self.execute()
         self.shutdown()
 
+    def serialize(self) -> dict:
+        """
+        Serialize the scan definition into a JSON-compatible dictionary.
+
+        Runtime state (buffers, executors, callbacks, extensions) is not
+        included. Movement positions held only by the instrument objects are
+        copied into the serialized tree so they survive without the instruments.
+        """
+        settings = self.scan_settings.serialize()
+        _fill_movement_positions(self.scan_settings.scan_tree.root_item, settings["scan_tree"]["root_item"])
+        return {
+            "scan_settings": settings,
+            "owner": self.owner,
+            "sample_id": self.sample_id,
+            "buffer_size": self._buffer_size,
+            "progress_interval": self.progress_interval,
+            "tree_state": self.tree_state,
+        }
+
+    @classmethod
+    def deserialize(cls, data: dict) -> 'Scan':
+        """
+        Rebuild a scan from a dictionary produced by serialize().
+
+        The scan tree has no instrument objects attached; bind local
+        instruments before running it.
+        """
+        scan = cls(
+            scan_settings=ScanSettings.deserialize(data["scan_settings"]),
+            owner=data.get("owner", ""),
+            sample_id=data.get("sample_id"),
+            buffer_size=data.get("buffer_size", 1000),
+        )
+        scan.progress_interval = data.get("progress_interval", 0.25)
+        scan.tree_state = list(data.get("tree_state") or [])
+        return scan
+
     def __getstate__(self):
         """Prepare state for pickling - exclude unpicklable objects."""
         state = self.__dict__.copy()
@@ -474,7 +653,12 @@ class Scan():
         state.pop('_executor', None)
         state.pop('_buffer_lock', None)
         state.pop('_stop_event', None)
+        state.pop('cancellation_token', None)
+        state.pop('_progress_tracker', None)
+        state.pop('_progress_callbacks', None)
         state.pop('_pending_futures', None)
+        state.pop('session_pool', None)
+        state.pop('_leased_instruments', None)
         return state
     
     def __setstate__(self, state):
@@ -483,25 +667,38 @@ class Scan():
         # Recreate threading objects
         self._buffer_lock = Lock()
         self._stop_event = Event()
+        self.cancellation_token = CancellationToken(name=self.scan_settings.scan_name)
+        self._progress_tracker = None
+        self._progress_callbacks = []
+        self.__dict__.setdefault('progress_interval', 0.25)
+        self.__dict__.setdefault('progress', None)
         self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='save_worker_')
         self._pending_futures = deque(maxlen=100)
+        self.session_pool = None
+        self._leased_instruments = []
 
     def __repr__(self):
         return f"Scan(project_name={self.project_name}, scan_settings={self.scan_settings}, owner={self.owner})"
     def __str__(self):
         return self.__repr__()
 
+def _fill_movement_positions(item: Any, data: dict):
+    """Copy positions held by movement objects into serialized tree items lacking them."""
+    positions = getattr(getattr(item, 'instrument_object', None), 'positions', None)
+    if positions is not None and len(positions) > 0 and not data.get("movement_positions"):
+        data["movement_positions"] = [float(p) for p in positions]
+    for child, child_data in zip(getattr(item, 'child_items', []), data.get("child_items", [])):
+        _fill_movement_positions(child, child_data)
+
+
 def get_empty_scan() -> Scan:
     """Create an empty scan with default settings."""
-    # Import at runtime since TYPE_CHECKING imports are not available at runtime
-    from GUI.widgets.scan_tree.treemodel import ScanTreeModel
-    
     scan_settings = ScanSettings(
         project_name="default_project",
         scan_name="default_scan",
         scan_type="",
         job_type="",
-        ScanTree=ScanTreeModel(),
+        ScanTree=ScanTree(),
         additional_tags=[],
         status="Queued"
     )
@@ -0,0 +1,286 @@
+"""
+Instrument session pool for PyBirch scan execution.
+
+Without a pool, every scan connects all instruments in its tree when it starts
+and shuts them down when it ends, so a queue of short scans on one rig
+reconnects the same sessions over and over. A SessionPool keeps connected
+instruments alive between scans: scans borrow a session when they start and
+return it when they end, and sessions are only shut down when the pool is
+released by the last queue run using it, or after sitting idle too long.
+
+Sessions are keyed by instrument object: a scan always uses the objects in
+its own tree, so per-axis drivers sharing one controller adapter (e.g. the X
+and Y axes of a stage) keep separate sessions. Scans reuse a session by
+holding the same instrument object, as the scans of a queue or the jobs of a
+worker do.
+
+Usage:
+    from pybirch.scan.sessions import get_session_pool
+
+    pool = get_session_pool()
+    with pool.held():               # Keep sessions for the whole queue run
+        for scan in scans:
+            scan.session_pool = pool
+            scan.run_scan()         # Connects on first use, then borrows
+    # Unused sessions are shut down here
+"""
+
+from __future__ import annotations
+import time
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import RLock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SessionKey = Tuple[str, str, int]
+
+
+@dataclass
+class InstrumentSession:
+    """A connected instrument and its usage bookkeeping."""
+
+    key: SessionKey
+    instrument: Any
+    refcount: int = 0
+    connected_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    last_checked: float = field(default_factory=time.monotonic)
+    reconnects: int = 0
+
+    @property
+    def idle_seconds(self) -> float:
+        """Seconds since the session was last returned (0 while in use)."""
+        return 0.0 if self.refcount else time.monotonic() - self.last_used
+
+
+def session_key(instrument: Any) -> SessionKey:
+    """
+    Pool key for an instrument: its driver class, adapter and object identity.
+
+    The class and adapter are kept for logging; the identity keeps instruments
+    that share an adapter (several axes of one controller) apart. A session
+    holds its instrument, so the id cannot be reused while the session exists.
+    """
+    cls = type(instrument)
+    adapter = str(getattr(instrument, 'adapter', '') or '')
+    if not adapter or adapter == 'placeholder':
+        adapter = f"name:{getattr(instrument, 'name', '')}"
+    return (f"{cls.__module__}.{cls.__qualname__}", adapter, id(instrument))
+
+
+class SessionPool:
+    """
+    Thread-safe, reference-counted pool of connected instruments.
+
+    Attributes:
+        idle_timeout: Seconds an unused session is kept while the pool is held
+        health_check_interval: Minimum seconds between health checks of a
+            session; a borrowed session whose check_connection() fails is
+            reconnected
+    """
+
+    def __init__(self, idle_timeout: float = 300.0, health_check_interval: float = 30.0):
+        """
+        Initialize the pool.
+
+        Args:
+            idle_timeout: Seconds an unused session is kept while the pool is held
+            health_check_interval: Minimum seconds between health checks (0 checks on every borrow)
+        """
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._lock = RLock()
+        self._sessions: Dict[SessionKey, InstrumentSession] = {}
+        self._holds = 0
+
+    # ==================== Borrowing ====================
+
+    def acquire(self, instrument: Any) -> Any:
+        """
+        Borrow a connected session for an instrument.
+
+        If `instrument` already has a session it is reused (and
+        health-checked if due); otherwise `instrument` is connected and
+        becomes a new session.
+
+        Args:
+            instrument: Instrument the caller wants to use
+
+        Returns:
+            `instrument`, connected
+
+        Raises:
+            Exception: Whatever the instrument's connect() raises
+        """
+        key = session_key(instrument)
+        with self._lock:
+            self._reap_idle()
+            session = self._sessions.get(key)
+            if session is None:
+                _connect(instrument)
+                session = InstrumentSession(key=key, instrument=instrument)
+                self._sessions[key] = session
+                logger.info(f"Session opened: {key[0]} @ {key[1]}")
+            elif self._check_due(session) and not _is_healthy(session.instrument):
+                logger.warning(f"Session {key[0]} @ {key[1]} failed its health check; reconnecting")
+                _shutdown(session.instrument)
+                _connect(session.instrument)
+                session.reconnects += 1
+
+            session.refcount += 1
+            session.last_used = time.monotonic()
+            return session.instrument
+
+    def release(self, instrument: Any):
+        """
+        Return a borrowed session.
+
+        The session stays connected while the pool is held and the idle
+        timeout has not passed; an unheld pool closes it once unused.
+
+        Args:
+            instrument: Instrument returned by acquire()
+        """
+        with self._lock:
+            session = self._find(instrument)
+            if session is None or session.refcount == 0:
+                return
+            session.refcount -= 1
+            session.last_used = time.monotonic()
+            if session.refcount == 0 and self._holds == 0:
+                self._close(session)
+
+    # ==================== Holding ====================
+
+    def hold(self):
+        """Keep unused sessions open until the matching unhold()."""
+        with self._lock:
+            self._holds += 1
+
+    def unhold(self):
+        """End a hold; when the last hold ends, all unused sessions are closed."""
+        with self._lock:
+            self._holds = max(self._holds - 1, 0)
+            if self._holds == 0:
+                for session in list(self._sessions.values()):
+                    if session.refcount == 0:
+                        self._close(session)
+
+    @contextmanager
+    def held(self) -> Iterator['SessionPool']:
+        """Context manager around hold()/unhold(), e.g. for one queue run."""
+        self.hold()
+        try:
+            yield self
+        finally:
+            self.unhold()
+
+    @property
+    def is_held(self) -> bool:
+        """Whether a queue run (or other caller) currently holds the pool."""
+        return self._holds > 0
+
+    # ==================== Maintenance ====================
+
+    def reap_idle(self) -> int:
+        """
+        Close unused sessions idle for longer than idle_timeout.
+
+        Returns:
+            Number of sessions closed
+        """
+        with self._lock:
+            return self._reap_idle()
+
+    def close_all(self):
+        """Shut down every session, including ones still borrowed."""
+        with self._lock:
+            for session in list(self._sessions.values()):
+                self._close(session)
+
+    def sessions(self) -> List[InstrumentSession]:
+        """Current sessions (for status displays)."""
+        with self._lock:
+            return list(self._sessions.values())
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, instrument: Any) -> bool:
+        return self._find(instrument) is not None
+
+    def _reap_idle(self) -> int:
+        """Close expired idle sessions (caller holds the lock)."""
+        expired = [s for s in self._sessions.values()
+                   if s.refcount == 0 and s.idle_seconds > self.idle_timeout]
+        for session in expired:
+            self._close(session)
+        return len(expired)
+
+    def _check_due(self, session: InstrumentSession) -> bool:
+        """Whether a session should be health-checked now (and mark it checked)."""
+        now = time.monotonic()
+        if now - session.last_checked < self.health_check_interval:
+            return False
+        session.last_checked = now
+        return True
+
+    def _find(self, instrument: Any) -> Optional[InstrumentSession]:
+        """Session holding this instrument object."""
+        session = self._sessions.get(session_key(instrument))
+        return session if session is not None and session.instrument is instrument else None
+
+    def _close(self, session: InstrumentSession):
+        """Shut down a session and forget it (caller holds the lock)."""
+        self._sessions.pop(session.key, None)
+        _shutdown(session.instrument)
+        logger.info(f"Session closed: {session.key[0]} @ {session.key[1]}")
+
+    def __repr__(self) -> str:
+        return f"SessionPool(sessions={len(self._sessions)}, holds={self._holds})"
+
+
+def _connect(instrument: Any):
+    """Connect an instrument if it supports it."""
+    if hasattr(instrument, 'connect') and callable(instrument.connect):
+        instrument.connect()
+
+
+def _shutdown(instrument: Any):
+    """Shut down an instrument, logging instead of raising."""
+    try:
+        if hasattr(instrument, 'shutdown') and callable(instrument.shutdown):
+            instrument.shutdown()
+    except Exception as e:
+        logger.error(f"Error shutting down instrument {instrument}: {str(e)}")
+
+
+def _is_healthy(instrument: Any) -> bool:
+    """Run an instrument's connection check; instruments without one count as healthy."""
+    check = getattr(instrument, 'check_connection', None)
+    if not callable(check):
+        return True
+    try:
+        return bool(check())
+    except NotImplementedError:
+        return True
+    except Exception as e:
+        logger.warning(f"Health check of {instrument} raised: {str(e)}")
+        return False
+
+
+_default_pool: Optional[SessionPool] = None
+_default_pool_lock = RLock()
+
+
+def get_session_pool() -> SessionPool:
+    """Get the process-wide session pool, creating it on first use."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = SessionPool()
+        return _default_pool
@@ -23,7 +23,7 @@ from typing import TYPE_CHECKING, Optional, List, Dict, Set
 import logging
 
 if TYPE_CHECKING:
-    from GUI.widgets.scan_tree.treeitem import InstrumentTreeItem
+    from pybirch.scan.tree import InstrumentTreeItem
 
 logger = logging.getLogger(__name__)
 
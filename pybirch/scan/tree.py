@@ -0,0 +1,721 @@
+# Copyright (C) 2022 The Qt Company Ltd.
+# SPDX-License-Identifier: LicenseRef-Qt-Commercial OR BSD-3-Clause
+"""
+Headless scan tree for PyBirch.
+
+The scan tree describes what a scan does: movements are nested around the
+measurements they position, and each node carries its instrument, positions,
+semaphore and execution indices. This module holds the pure-Python core,
+InstrumentTreeItem and ScanTree, so scans can be built, pickled, sent to worker
+processes and run from scripts without importing Qt. The GUI's ScanTreeModel
+is a thin QAbstractItemModel adapter over ScanTree.
+
+Usage:
+    from pybirch.scan.tree import ScanTree, InstrumentTreeItem
+
+    root = InstrumentTreeItem()
+    stage = InstrumentTreeItem(root, MovementItem(x_stage, positions=[0.0, 1.0]))
+    root.child_items.append(stage)
+    stage.child_items.append(InstrumentTreeItem(stage, MeasurementItem(lock_in)))
+
+    tree = ScanTree(root_item=root)
+"""
+
+from __future__ import annotations
+from typing import Callable, Optional
+import logging
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from pybirch.scan.movements import Movement, VisaMovement, MovementItem
+from pybirch.scan.measurements import Measurement, VisaMeasurement, MeasurementItem
+from pybirch.scan.protocols import is_movement, is_measurement, apply_settings
+from pybirch.scan.traverser import TreeTraverser, propagate as _propagate
+
+logger = logging.getLogger(__name__)
+
+# Tri-state check values (same numbering as Qt.CheckState)
+UNCHECKED = 0
+PARTIALLY_CHECKED = 1
+CHECKED = 2
+
+
+## NEEDS TO BE TESTED ##
+class InstrumentTreeItem:
+    def __init__(self, parent: Optional[InstrumentTreeItem] = None, instrument_object: MovementItem | MeasurementItem | None = None, indices: list[int] = [], final_indices: list[int] = [], semaphore: str = "", _runtime_settings: dict | None = None):
+        self.instrument_object = instrument_object
+        self._runtime_settings = _runtime_settings if _runtime_settings is not None else {}
+        self.item_indices = indices
+        self.final_indices = final_indices
+        self.parent_item = parent
+        self.semaphore: str = semaphore
+        self.movement_positions: list = []
+        self.movement_entries: dict = {}
+        self.checked: bool = False  # Add checkbox state
+        self._runtime_initialized = False
+        self._unique_id = id(self)
+
+        self.deserialized_instrument_data: dict | None = None # To hold deserialized data temporarily
+
+        if self.instrument_object is None:
+            self.name = ""
+            self.type = ""
+            self.adapter = ""
+        else:
+            self.name = self.instrument_object.instrument.nickname
+            # Use protocol-based type detection
+            if is_movement(self.instrument_object.instrument):
+                self.type = "Movement"
+            elif is_measurement(self.instrument_object.instrument):
+                self.type = "Measurement"
+            else:
+                self.type = "Unknown"
+            self.adapter = self.instrument_object.instrument.adapter
+
+        self.child_items: list[InstrumentTreeItem] = []
+        self.instrument_object = instrument_object
+
+        self.headers = ["Name", "Type", "Adapter", "Semaphores"]
+        self.columns = [self.name, self.type, self.adapter, self.semaphore]
+
+        # Initialize indices for Movement objects if not provided
+        logger.debug(f"Initializing InstrumentTreeItem for instrument: {self.name if self.name else 'None'}")
+        if instrument_object is None:
+            logger.debug("No instrument object provided.")
+            self.item_indices = []
+            self.final_indices = []
+        elif is_movement(instrument_object.instrument):
+            if not self.item_indices:
+                self.item_indices = [0]
+            if not self.final_indices:
+                # Check if the movement object has positions attribute, otherwise default to 1
+                try:
+                    positions = getattr(instrument_object, 'positions', None)
+                    if positions and len(positions) > 0:
+                        self.final_indices = [len(positions) - 1]
+                    else:
+                        # Default if no positions attribute or empty positions
+                        self.final_indices = [1]
+                except Exception:
+                    # Default if any error accessing positions
+                    self.final_indices = [1]
+        else:
+            # For Measurement objects, indices are always [0] to [1]
+            self.item_indices = [0]
+            self.final_indices = [1]
+
+    def unique_id(self) -> str:
+        """Generate a unique identifier for this MovementItem based on its instrument and settings."""
+        if self.instrument_object is None:
+            return f"None__{self._unique_id}"
+        return f"{self.instrument_object.instrument.name}_{self.instrument_object.instrument.adapter}_{self._unique_id}"
+
+    def child(self, number: int) -> 'InstrumentTreeItem':
+        if number < 0 or number >= len(self.child_items):
+            return None  #type: ignore
+        return self.child_items[number]
+
+    def last_child(self):
+        return self.child_items[-1] if self.child_items else None
+
+    def child_count(self) -> int:
+        return len(self.child_items)
+
+    def child_number(self) -> int:
+        if self.parent_item:
+            return self.parent_item.child_items.index(self)
+        return 0
+
+    def insert_children(self, row: int, instruments: list[MovementItem | MeasurementItem]) -> bool:
+        if row < 0 or row > len(self.child_items):
+            return False
+
+        for i, instrument in enumerate(instruments):
+            item = InstrumentTreeItem(self, instrument_object=instrument)
+            self.child_items.insert(row + i, item)
+
+        return True
+
+    def parent(self):
+        return self.parent_item
+
+    def remove_children(self, position: int, count: int) -> bool:
+        if position < 0 or position + count > len(self.child_items):
+            return False
+
+        for row in range(count):
+            self.child_items.pop(position)
+
+        return True
+
+    def set_data(self, instrument_object: MovementItem | MeasurementItem | None = None, indices: list[int] = [], final_indices: list[int] = [], semaphore: str = "", checked: bool = False) -> bool:
+        self.instrument_object = instrument_object
+        self.item_indices = indices
+        self.final_indices = final_indices
+        self.semaphore = semaphore
+        self.checked = checked
+
+        if self.instrument_object is None:
+            self.name = ""
+            self.type = ""
+            self.adapter = ""
+        else:
+            self.name = self.instrument_object.instrument.nickname
+            # Use protocol-based type detection
+            if is_movement(self.instrument_object.instrument):
+                self.type = "Movement"
+            elif is_measurement(self.instrument_object.instrument):
+                self.type = "Measurement"
+            else:
+                self.type = "Unknown"
+            self.adapter = self.instrument_object.instrument.adapter
+
+        self.columns = [self.name, self.type, self.adapter, self.semaphore]
+        return True
+
+    def set_checked(self, checked: bool, update_children: bool = True, update_parent: bool = True) -> None:
+        """Set the checked state and optionally propagate to children/parent"""
+        self.checked = checked
+        
+        if update_children:
+            # Update all children to the same state
+            for child in self.child_items:
+                child.set_checked(checked, update_children=True, update_parent=False)
+        
+        if update_parent and self.parent_item:
+            self.parent_item._update_check_state_from_children()
+    
+    def _update_check_state_from_children(self) -> None:
+        """Update this item's check state based on children states"""
+        if not self.child_items:
+            return
+            
+        checked_count = sum(1 for child in self.child_items if child.checked)
+        
+        if checked_count == len(self.child_items):
+            self.checked = True
+        # elif checked_count == 0:
+            # self.checked = False
+
+        else:
+            # For partial states, we'll use False but the model will handle partial display
+            self.checked = False
+    
+    def check_state(self) -> int:
+        """
+        Get the tri-state check value: UNCHECKED, PARTIALLY_CHECKED or CHECKED.
+
+        The values match Qt.CheckState, so Qt adapters can convert directly.
+        """
+        if not self.child_items:
+            return CHECKED if self.checked else UNCHECKED
+        
+        # For parent items, check if we have a partial state
+        checked_count = sum(1 for child in self.child_items if child.checked)
+        
+        if checked_count == len(self.child_items):
+            return CHECKED
+        elif checked_count == 0:
+            return UNCHECKED
+        else:
+            return PARTIALLY_CHECKED
+
+    def get_check_state(self):
+        """Get the Qt check state (for use with Qt.CheckStateRole)"""
+        from PySide6.QtCore import Qt
+        return Qt.CheckState(self.check_state())
+
+    def finished(self) -> bool:
+        has_item_indices = bool(self.item_indices)
+        has_final_indices = bool(self.final_indices)
+        
+        # If we have an instrument but haven't been executed yet, we're not finished
+        # This prevents single-position movements from appearing "finished" before execution
+        if self.instrument_object is not None and not self._runtime_initialized:
+            print(f"[finished] item='{self.name}': has instrument but not yet executed -> finished=False")
+            return False
+        
+        if self.item_indices and self.final_indices:
+            result = self.item_indices == self.final_indices
+            print(f"[finished] item='{self.name}': item_indices={self.item_indices}, final_indices={self.final_indices} -> finished={result}")
+            return result
+        
+        # All other items are finished when they have been performed once
+        print(f"[finished] item='{self.name}': has_item_indices={has_item_indices}, has_final_indices={has_final_indices} -> finished=True (default)")
+        return True
+    
+    def reset_children_indices(self):
+        if self.child_items:
+            for child in self.child_items:
+                child.reset_indices()
+    
+    def reset_indices(self):
+        self.item_indices = [0]
+        self.reset_children_indices()
+
+    def move_next(self) -> pd.DataFrame | bool:
+        print(f"[move_next] item='{self.name}': instrument_object={self.instrument_object is not None}")
+        # Check if instrument_object exists before accessing it
+        if self.instrument_object is None:
+            print(f"[move_next] item='{self.name}': FAILED - no instrument_object!")
+            logger.warning(f"move_next called on item {self.name} with no instrument_object")
+            return False
+        if self.instrument_object.instrument is None:
+            print(f"[move_next] item='{self.name}': FAILED - instrument_object has no instrument!")
+            logger.warning(f"move_next called on item {self.name} with no instrument")
+            return False
+        print(f"[move_next] item='{self.name}': instrument={type(self.instrument_object.instrument).__name__}")
+            
+        if not self._runtime_initialized:
+            self._runtime_initialized = True
+            self.instrument_object.instrument.initialize()
+            apply_settings(self.instrument_object.instrument, self.instrument_object.settings)
+
+        
+        if is_movement(self.instrument_object.instrument):
+            if not self.item_indices or not self.final_indices:
+                return False
+            for i in reversed(range(len(self.item_indices))):
+                if self.item_indices[i] < self.final_indices[i]:
+                    self.item_indices[i] += 1
+                else:
+                    self.reset_indices()
+                target = self.instrument_object.positions[self.item_indices[i]]
+                self.instrument_object.instrument.position = target  #type: ignore
+                logger.debug(f"Moved to position {target}, with index {self.item_indices[i]} out of {self.final_indices[i]}")
+                return True
+            return False
+        
+        elif is_measurement(self.instrument_object.instrument):
+            self.item_indices = [1]
+            logger.debug(f"Performing measurement with instrument {self.instrument_object.instrument.name}")
+            return self.instrument_object.instrument.measurement_df() #type: ignore
+        
+        return False
+
+    def serialize(self) -> dict:
+        # Convert movement_positions to list if it's a numpy array
+        movement_positions = self.movement_positions
+        if hasattr(movement_positions, 'tolist'):  # numpy array
+            movement_positions = movement_positions.tolist()
+        elif not isinstance(movement_positions, list):
+            movement_positions = list(movement_positions) if movement_positions else []
+        
+        # Convert item_indices and final_indices to lists if they're numpy arrays
+        item_indices = self.item_indices
+        if hasattr(item_indices, 'tolist'):  # numpy array
+            item_indices = item_indices.tolist()
+        elif not isinstance(item_indices, list):
+            item_indices = list(item_indices) if item_indices else []
+            
+        final_indices = self.final_indices
+        if hasattr(final_indices, 'tolist'):  # numpy array
+            final_indices = final_indices.tolist()
+        elif not isinstance(final_indices, list):
+            final_indices = list(final_indices) if final_indices else []
+        
+        data = {
+            "name": self.name,
+            "type": self.type,
+            "adapter": self.adapter,
+            "semaphore": self.semaphore,
+            "item_indices": item_indices,
+            "final_indices": final_indices,
+            "movement_positions": movement_positions,
+            "movement_entries": self.movement_entries,
+            "checked": self.checked,
+            "instrument_object": self.instrument_object.serialize() if self.instrument_object else None,
+            "child_items": [child.serialize() for child in self.child_items]
+        }
+        #Traverse through the tree and find if any of the data is a numpy array. If so, raise an error and log the problematic data.
+        def check_for_numpy(data):
+            if isinstance(data, dict):
+                for key, value in data.items():
+                    if hasattr(value, 'tolist'):
+                        logger.error(f"Numpy array found in key '{key}': {value}")
+                        raise ValueError(f"Numpy array found in key '{key}'")
+                    check_for_numpy(value)
+            elif isinstance(data, list):
+                for item in data:
+                    check_for_numpy(item)
+        
+        check_for_numpy(data)
+        return data
+    
+    @staticmethod
+    def deserialize(data: dict, parent: Optional[InstrumentTreeItem] = None) -> InstrumentTreeItem:
+        instrument_object = None  # Placeholder, actual object reconstruction will occur later
+        item = InstrumentTreeItem(parent, instrument_object, data.get("item_indices", []), data.get("final_indices", []), data.get("semaphore", ""))
+        item.name = data.get("name", "")
+        item.type = data.get("type", "")
+        item.adapter = data.get("adapter", "")
+        item.movement_positions = data.get("movement_positions", [])
+        item.movement_entries = data.get("movement_entries", {})
+        item.checked = data.get("checked", False)
+        item.deserialized_instrument_data = data.get("instrument_object", None)
+        
+        
+        for child_data in data.get("child_items", []):
+            child_item = InstrumentTreeItem.deserialize(child_data, item)
+            item.child_items.append(child_item)
+        
+        return item
+
+    def find_pybirch_object(self, known_objects: list[type]) -> tuple[str, str, bool]:
+        # Returns a string of the PyBirch object class name, object name, and whether a match was found as a bool
+        # Takes, as input, a list of known PyBirch objects (Measurement, Movement, or subclasses) to search through
+        if self.deserialized_instrument_data is None:
+            return "", "", False
+        
+        if self.instrument_object is not None:
+            return self.instrument_object.instrument.name, self.instrument_object.instrument.__class__.__name__, True
+        
+        instrument_data = self.deserialized_instrument_data.get("instrument", {})
+
+        pybirch_class_name = instrument_data.get("pybirch_class", "")
+        name = instrument_data.get("name", "")
+        for obj in known_objects:
+            if obj.__class__.__name__ == pybirch_class_name and obj().name == name:
+                # Create an instrument_object with this instrument and the deserialized settings
+                instrument_instance = obj()
+                instrument_instance.deserialize(self.deserialized_instrument_data, initialize=False)
+                
+                return name, pybirch_class_name, True
+        return name, pybirch_class_name, False
+
+    def find_instrument_adapter(self, known_objects: list[str]) -> tuple[str, bool]:
+        # Returns a tuple of the instrument adapter string, and whether a match was found as a bool
+        if self.instrument_object is None or self.instrument_object.instrument is None:
+            return "", False
+        
+        if self.instrument_object.instrument.adapter and self.instrument_object.instrument.adapter in known_objects:
+            return self.instrument_object.instrument.adapter, True
+        
+        if self.deserialized_instrument_data is None:
+            return "", False
+        
+        instrument_data = self.deserialized_instrument_data.get("instrument", {})
+        adapter = instrument_data.get("adapter", "")
+        if adapter in known_objects:
+            self.instrument_object.instrument.adapter = adapter
+            return adapter, True
+        return adapter, False
+
+    def structure_to_dict(self) -> dict:
+         """Convert this tree item and all its children to a dictionary"""
+         result = {
+             'name': self.name,
+             'type': self.type,
+             'adapter': self.adapter,
+             'semaphore': self.semaphore,
+             'children': []
+         }
+         
+         # Recursively convert all children
+         for child in self.child_items:
+             result['children'].append(child.structure_to_dict())
+         
+         return result
+
+    # FastForward is now imported from traverser module
+    # Keep as inner class alias for backward compatibility
+    FastForward = TreeTraverser
+
+    def propagate(self, ff: TreeTraverser) -> TreeTraverser:
+        """
+        Propagate traversal to the next item in the tree.
+        
+        This is a convenience method that delegates to the traverser module.
+        """
+        return _propagate(self, ff)
+        
+    def is_ancestor_of(self, descendant: 'InstrumentTreeItem') -> bool:
+        """Check if this item is an ancestor of the given descendant item."""
+        current = descendant.parent_item
+        while current is not None:
+            if current == self:
+                return True
+            current = current.parent_item
+        return False
+
+
+class ScanTree:
+    """
+    Pure-Python scan tree: the root InstrumentTreeItem plus execution flags.
+
+    Attributes:
+        root_item: Invisible root; its children are the top-level instruments
+        completed: Whether the scan finished all points
+        paused: Whether the scan was paused
+        stopped: Whether the scan was stopped early
+        next_item: Item to resume from, if any
+    """
+
+    def __init__(self, filename: Optional[str] = None, root_item: Optional[InstrumentTreeItem] = None, update_interface: Optional[Callable] = None, next_item: Optional[InstrumentTreeItem] = None):
+        self.root_data: dict = {}
+        if filename:
+            self.restore_model_from_pickle(filename)
+        elif root_item:
+            self.root_item = root_item
+        else:
+            self.root_item = InstrumentTreeItem()
+
+        # Set the headers on the root item
+        self.root_item.headers = ["Name", "Type", "Adapter", "Semaphores"]
+        self.update_interface = update_interface
+        self.completed = False
+        self.paused = False
+        self.stopped = False
+        self.next_item = next_item
+
+    # Change notifications; no-ops here, overridden by view adapters such as ScanTreeModel
+
+    def _on_layout_changed(self) -> None:
+        """Called after the tree was replaced wholesale."""
+
+    def _on_check_states_changed(self) -> None:
+        """Called after check states changed across the tree."""
+
+    def serialize_model(self) -> dict:
+        return {
+            "root_data": self.root_data,
+            "root_item": self.root_item.serialize()
+        }
+
+    def deserialize_model(self, data: dict) -> None:
+        self.root_data = data.get("root_data", {})
+        self.root_item = InstrumentTreeItem.deserialize(data.get("root_item", {}))
+        self._on_layout_changed()
+
+    def pickle_model(self, filename: str) -> None:
+        with open(filename, 'wb') as f:
+            pickle.dump(self.serialize_model(), f)
+
+    def restore_model_from_pickle(self, filename: str):
+        with open(filename, 'rb') as input:
+            data = pickle.load(input)
+            self.deserialize_model(data)
+
+    def _repr_recursion(self, item: InstrumentTreeItem, indent: int = 0) -> str:
+        result = " " * indent + repr(item) + "\n"
+        for child in item.child_items:
+            result += self._repr_recursion(child, indent + 2)
+        return result
+
+    def __repr__(self) -> str:
+        return self._repr_recursion(self.root_item)
+
+    def get_selected_instruments(self) -> list[InstrumentTreeItem]:
+        """Return a list of selected (checked) instrument items."""
+        selected_items = []
+
+        def traverse(item: InstrumentTreeItem):
+            # Only include items that are checked and have a valid instrument object
+            if item.checked and item.instrument_object and item != self.root_item:
+                selected_items.append(item)
+            for child in item.child_items:
+                traverse(child)
+
+        traverse(self.root_item)
+        return selected_items
+
+    def set_all_checked(self, checked: bool) -> None:
+        """Set all items to checked or unchecked state."""
+        def traverse(item: InstrumentTreeItem):
+            item.set_checked(checked, update_children=False, update_parent=False)
+            for child in item.child_items:
+                traverse(child)
+
+        traverse(self.root_item)
+        self._on_check_states_changed()
+
+    def get_instrument_count(self) -> int:
+        """Return the total number of instrument items in the tree."""
+        count = 0
+
+        def traverse(item: InstrumentTreeItem):
+            nonlocal count
+            if item.instrument_object and item != self.root_item:
+                count += 1
+            for child in item.child_items:
+                traverse(child)
+
+        traverse(self.root_item)
+        return count
+
+    def get_movement_items(self) -> list[InstrumentTreeItem]:
+        """Return a list of all movement instrument items."""
+        movement_items = []
+
+        def traverse(item: InstrumentTreeItem):
+            if item.instrument_object and item.instrument_object.instrument.__base_class__() is Movement:
+                movement_items.append(item)
+            for child in item.child_items:
+                traverse(child)
+
+        traverse(self.root_item)
+        return movement_items
+
+    def get_measurement_items(self) -> list[InstrumentTreeItem]:
+        """Return a list of all measurement instrument items."""
+        measurement_items = []
+
+        def traverse(item: InstrumentTreeItem):
+            if item.instrument_object and item.instrument_object.instrument.__base_class__() is Measurement:
+                measurement_items.append(item)
+            for child in item.child_items:
+                traverse(child)
+
+        traverse(self.root_item)
+        return measurement_items
+
+    def get_all_instrument_items(self) -> list[InstrumentTreeItem]:
+        """Return a list of all instrument items."""
+        all_items = []
+
+        def traverse(item: InstrumentTreeItem):
+            if item.instrument_object:
+                all_items.append(item)
+            for child in item.child_items:
+                traverse(child)
+
+        traverse(self.root_item)
+        return all_items
+
+    def pair_all_pybirch_objects(self, pybirch_objects: list[type]) -> tuple[list[str], list[str], list[bool]]:
+        """Attempt to pair all instrument items with their corresponding PyBirch objects.
+        
+        Returns a tuple of three lists:
+        - A list of instrument item names.
+        - A list of found PyBirch object class names.
+        - A list of booleans indicating whether a match was found for each item.
+        """
+        instrument_names = []
+        found_classes = []
+        match_statuses = []
+
+        all_items = self.get_all_instrument_items()
+        for item in all_items:
+            name, class_name, found = item.find_pybirch_object(pybirch_objects)
+            instrument_names.append(name)
+            found_classes.append(class_name)
+            match_statuses.append(found)
+
+        return instrument_names, found_classes, match_statuses
+
+    def pair_all_instrument_adapters(self, known_adapters: list[str]) -> tuple[list[str], list[str], list[bool]]:
+        """Attempt to pair all instrument items with their corresponding adapters.
+        
+        Returns a tuple of three lists:
+        - A list of instrument item names.
+        - A list of found adapter strings.
+        - A list of booleans indicating whether a match was found for each item.
+        """
+        instrument_names = []
+        found_adapters = []
+        match_statuses = []
+
+        all_items = self.get_all_instrument_items()
+        for item in all_items:
+            adapter, found = item.find_instrument_adapter(known_adapters)
+            if item.instrument_object and item.instrument_object.instrument:
+                instrument_names.append(item.instrument_object.instrument.name)  # Use the instrument name from the first column
+            else:
+                instrument_names.append("Unknown Instrument")
+            found_adapters.append(adapter)
+            match_statuses.append(found)
+
+        return instrument_names, found_adapters, match_statuses
+
+    def unbound_items(self) -> list[InstrumentTreeItem]:
+        """Return the items restored from serialized data that have no instrument object yet."""
+        unbound = []
+        stack = list(self.root_item.child_items)
+        while stack:
+            item = stack.pop(0)
+            stack.extend(item.child_items)
+            if item.instrument_object is None:
+                unbound.append(item)
+        return unbound
+
+    @staticmethod
+    def instrument_name(item: InstrumentTreeItem) -> str:
+        """Name of the instrument a (possibly unbound) item refers to."""
+        if item.instrument_object is not None:
+            return item.instrument_object.instrument.name
+        data = getattr(item, 'deserialized_instrument_data', None) or {}
+        return data.get("instrument", {}).get("name") or item.name
+
+    def bind_instruments(self, instruments: dict) -> None:
+        """
+        Attach live instrument objects to the items of a deserialized tree.
+
+        Items are matched by instrument name. Saved settings and movement
+        positions from the serialized tree are preserved.
+
+        Args:
+            instruments: Mapping of instrument name to instrument object
+
+        Raises:
+            KeyError: If the tree references an instrument not in `instruments`
+        """
+        for item in self.unbound_items():
+            data = getattr(item, 'deserialized_instrument_data', None) or {}
+            name = self.instrument_name(item)
+            if name not in instruments:
+                raise KeyError(f"Instrument '{name}' is not available")
+
+            instrument = instruments[name]
+            settings = data.get("settings", {})
+            # Deserialized items without an instrument lose their indices, so
+            # reset them the way InstrumentTreeItem.__init__ does for new items
+            if item.type == "Movement" or hasattr(instrument, 'position'):
+                positions = np.array(getattr(item, 'movement_positions', []) or [])
+                item.instrument_object = MovementItem(instrument, positions=positions, settings=settings)
+                item.item_indices = [0]
+                item.final_indices = [len(positions) - 1] if len(positions) > 0 else [1]
+            else:
+                item.instrument_object = MeasurementItem(instrument, settings=settings)
+                item.item_indices = [0]
+                item.final_indices = [1]
+
+    def serialize(self) -> dict:
+        """Serialize the entire tree to a dictionary."""
+        return {
+            "all_instruments": [item.serialize() for item in self.get_all_instrument_items()],
+            "tree_structure": self.root_item.structure_to_dict(),
+            "root_item": self.root_item.serialize(),
+            "completed": self.completed,
+            "paused": self.paused,
+            "stopped": self.stopped,
+            "next_item": self.next_item.serialize() if self.next_item else None
+        }
+
+    def deserialize(self, data: dict) -> None:
+        """Deserialize the tree from a dictionary."""
+        self.root_item = InstrumentTreeItem.deserialize(data.get("root_item", {}))
+        self.completed = data.get("completed", False)
+        self.paused = data.get("paused", False)
+        self.stopped = data.get("stopped", False)
+        next_item_data = data.get("next_item", None)
+        if next_item_data:
+            self.next_item = InstrumentTreeItem.deserialize(next_item_data)
+        else:
+            self.next_item = None
+        self._on_layout_changed()
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> 'ScanTree':
+        """Build a tree from the dictionary produced by serialize()."""
+        tree = cls()
+        if data is not None:
+            tree.deserialize(data)
+        return tree
+
+    def __getstate__(self):
+        """Prepare state for pickling - drop the interface callback."""
+        state = self.__dict__.copy()
+        state['update_interface'] = None
+        return state
@@ -17,6 +17,7 @@ import numpy as np
 import time
 
 from pybirch.Instruments.base import (
+    SETTINGS_CACHE_RECONNECT,
     VisaBaseMeasurementInstrument,
     VisaBaseMovementInstrument,
 )
@@ -138,6 +139,11 @@ class RealMotionAxis(VisaBaseMovementInstrument):
     Replace the SCPI commands with your instrument's actual commands.
     """
     
+    # Homing leaves velocity and acceleration as they are, so the settings
+    # cache is only forgotten on reconnect. The lock-in above resets itself
+    # in _initialize_impl() and keeps the default SETTINGS_CACHE_INITIALIZE.
+    settings_cache_policy = SETTINGS_CACHE_RECONNECT
+    
     def __init__(self, name: str = "Stage X", adapter: str = "GPIB::1::INSTR", axis: int = 1):
         super().__init__(name, adapter)
         
@@ -47,12 +47,12 @@ class FakeLockInAmplifier(FakeMeasurementInstrument):
     
     def _initialize_impl(self):
         """Reset instrument to default state."""
-        self._delay()
+        self._delay("initialize")
         self._reset_settings_to_defaults()
     
     def _shutdown_impl(self):
         """Cleanup on shutdown."""
-        self._delay()
+        self._delay("shutdown")
     
     def _perform_measurement_impl(self) -> np.ndarray:
         """
@@ -61,7 +61,7 @@ class FakeLockInAmplifier(FakeMeasurementInstrument):
         Returns:
             2D array with shape (num_data_points, 3) containing X, Y, R data.
         """
-        self._delay()
+        self._delay("measure")
         n = self._num_data_points
         
         # Simulate noisy X and Y data
@@ -74,36 +74,36 @@ class FakeLockInAmplifier(FakeMeasurementInstrument):
     # Properties for direct access to settings (optional convenience)
     @property
     def sensitivity(self) -> float:
-        self._delay()
+        self._delay("query")
         return self._sensitivity
     
     @sensitivity.setter
     def sensitivity(self, value: float):
-        self._delay()
+        self._delay("settings")
         if value <= 0:
             raise ValueError("Sensitivity must be positive")
         self._sensitivity = value
     
     @property
     def time_constant(self) -> float:
-        self._delay()
+        self._delay("query")
         return self._time_constant
     
     @time_constant.setter
     def time_constant(self, value: float):
-        self._delay()
+        self._delay("settings")
         if value <= 0:
             raise ValueError("Time constant must be positive")
         self._time_constant = value
     
     @property
     def num_data_points(self) -> int:
-        self._delay()
+        self._delay("query")
         return self._num_data_points
     
     @num_data_points.setter
     def num_data_points(self, value: int):
-        self._delay()
+        self._delay("settings")
         if value <= 0:
             raise ValueError("Number of data points must be positive")
         self._num_data_points = value
@@ -45,22 +45,22 @@ class FakeMultimeter(SimulatedDelay):
 
     @property
     def current(self) -> float:
-        self._delay()
+        self._delay("query")
         return self._current
     
     @current.setter
     def current(self, value: float):
-        self._delay()
+        self._delay("settings")
         self._current = value
     
     @property
     def voltage(self) -> float:
-        self._delay()
+        self._delay("query")
         return self._voltage
     
     @voltage.setter
     def voltage(self, value: float):
-        self._delay()
+        self._delay("settings")
         self._voltage = value
 
 
@@ -87,7 +87,7 @@ class VoltageMeterMeasurement(FakeMeasurementInstrument):
     
     def _perform_measurement_impl(self) -> np.ndarray:
         """Measure current and voltage from the multimeter."""
-        self._delay()
+        self._delay("measure")
         n = self._num_data_points
         
         currents = np.full(n, self.instrument.current)
@@ -97,7 +97,7 @@ class VoltageMeterMeasurement(FakeMeasurementInstrument):
     
     def _initialize_impl(self):
         """Reset multimeter to zero."""
-        self._delay()
+        self._delay("initialize")
         self.instrument.current = 0.0
         self.instrument.voltage = 0.0
 
@@ -123,17 +123,17 @@ class CurrentSourceMovement(FakeMovementInstrument):
     
     @property
     def position(self) -> float:
-        self._delay()
+        self._delay("position")
         return self.instrument.current
     
     @position.setter
     def position(self, value: float):
-        self._delay()
+        self._delay("move")
         self.instrument.current = value
     
     def _initialize_impl(self):
         """Reset current to zero."""
-        self._delay()
+        self._delay("initialize")
         self.instrument.current = 0.0
 
 
@@ -50,7 +50,7 @@ class FakeSpectrometer(FakeMeasurementInstrument):
     
     def _initialize_impl(self):
         """Reset to default wavelength range."""
-        self._delay()
+        self._delay("initialize")
         self._reset_settings_to_defaults()
     
     def _perform_measurement_impl(self) -> np.ndarray:
@@ -60,7 +60,7 @@ class FakeSpectrometer(FakeMeasurementInstrument):
         Returns:
             2D array with columns [wavelength, intensity].
         """
-        self._delay()
+        self._delay("measure")
         
         # Filter by wavelength range
         mask = (
@@ -83,12 +83,12 @@ class FakeSpectrometer(FakeMeasurementInstrument):
     # Convenience properties with validation
     @property
     def left_wavelength(self) -> float:
-        self._delay()
+        self._delay("query")
         return self._left_wavelength
     
     @left_wavelength.setter
     def left_wavelength(self, value: float):
-        self._delay()
+        self._delay("settings")
         if value < 0:
             raise ValueError("Left wavelength must be non-negative")
         if value > self._right_wavelength:
@@ -97,12 +97,12 @@ class FakeSpectrometer(FakeMeasurementInstrument):
     
     @property
     def right_wavelength(self) -> float:
-        self._delay()
+        self._delay("query")
         return self._right_wavelength
     
     @right_wavelength.setter
     def right_wavelength(self, value: float):
-        self._delay()
+        self._delay("settings")
         if value < self._left_wavelength:
             raise ValueError("Right wavelength must be >= left wavelength")
         self._right_wavelength = value
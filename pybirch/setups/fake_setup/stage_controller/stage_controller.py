@@ -20,6 +20,7 @@ Usage:
 import numpy as np
 
 from pybirch.Instruments.base import FakeMovementInstrument, SimulatedDelay
+from pybirch.Instruments.simulation import SimulatedBus
 from pybirch.scan.movements import Movement
 
 
@@ -28,11 +29,14 @@ class FakeAxis(SimulatedDelay):
     A single axis of the fake linear stage controller.
     
     Each axis has its own position and limits, but shares a reference
-    to the parent controller for timing simulation.
+    to the parent controller for timing simulation: axes use the
+    controller's latencies and its bus, so calls on different axes wait
+    for each other like on a real multi-axis controller.
     """
 
     def __init__(self, axis: int, controller: "FakeLinearStageController"):
-        super().__init__(controller._wait)
+        super().__init__(controller._wait, bus=controller.bus)
+        self.latencies = controller.latencies
         self.axis = str(axis)
         self.controller = controller
         self._position = 0.0
@@ -41,12 +45,12 @@ class FakeAxis(SimulatedDelay):
 
     @property
     def position(self) -> float:
-        self._delay()
+        self._delay("position")
         return self._position
     
     @position.setter
     def position(self, value: float):
-        self._delay()
+        self._delay("move")
         if self._left_limit <= value <= self._right_limit:
             self._position = value
         else:
@@ -54,22 +58,22 @@ class FakeAxis(SimulatedDelay):
 
     @property
     def left_limit(self) -> float:
-        self._delay()
+        self._delay("query")
         return self._left_limit
     
     @left_limit.setter
     def left_limit(self, value: float):
-        self._delay()
+        self._delay("settings")
         self._left_limit = value
 
     @property
     def right_limit(self) -> float:
-        self._delay()
+        self._delay("query")
         return self._right_limit
 
     @right_limit.setter
     def right_limit(self, value: float):
-        self._delay()
+        self._delay("settings")
         self._right_limit = value
 
 
@@ -78,10 +82,13 @@ class FakeLinearStageController(SimulatedDelay):
     A fake 3-axis linear stage controller backend.
     
     This represents the hardware controller that manages X, Y, and Z axes.
+    All axes share one simulated bus; set per-operation latencies on the
+    controller with set_latency() ('move', 'position', 'query', 'settings').
     """
     
     def __init__(self, name: str = "Mock Linear Stage", wait: float = 0.0):
-        super().__init__(wait)
+        super().__init__(wait, bus=SimulatedBus(name))
+        self.latencies = {}  # Shared with the axes
         self.name = name
         self.x = FakeAxis(1, self)
         self.y = FakeAxis(2, self)
@@ -130,7 +137,7 @@ class FakeXStage(FakeMovementInstrument):
     
     def _initialize_impl(self):
         """Home the X axis."""
-        self._delay()
+        self._delay("initialize")
         self.controller.x.position = 0.0
     
     @property
@@ -184,7 +191,7 @@ class FakeYStage(FakeMovementInstrument):
     
     def _initialize_impl(self):
         """Home the Y axis."""
-        self._delay()
+        self._delay("initialize")
         self.controller.y.position = 0.0
     
     @property
@@ -237,7 +244,7 @@ class FakeZStage(FakeMovementInstrument):
     
     def _initialize_impl(self):
         """Home the Z axis."""
-        self._delay()
+        self._delay("initialize")
         self.controller.z.position = 0.0
     
     @property
@@ -0,0 +1,6 @@
+"""
+PyBirch Benchmarks
+
+Timing benchmarks for the scan engine. They are deselected by default; run
+them and show their measurements with: pytest -m benchmark -rP
+"""
@@ -0,0 +1,163 @@
+"""
+Abort and Pause Latency Benchmarks
+
+Measures how quickly a running scan reacts to control requests:
+
+- Abort during a long instrument wait (the wait must be interrupted)
+- Abort between points
+- Resume after a pause (time until the next point starts)
+
+Run with: pytest tests/benchmarks/test_abort_latency.py -m benchmark -rP
+"""
+
+import os
+import sys
+import time
+import statistics
+import threading
+
+import numpy as np
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from pybirch.scan.scan import Scan, ScanSettings
+from pybirch.scan.measurements import MeasurementItem
+from pybirch.scan.movements import MovementItem
+from pybirch.setups.fake_setup.lock_in_amplifier.lock_in_amplifier import FakeLockInAmplifier
+from pybirch.setups.fake_setup.stage_controller.stage_controller import FakeXStage
+
+try:
+    from GUI.widgets.scan_tree.treemodel import ScanTreeModel
+    from GUI.widgets.scan_tree.treeitem import InstrumentTreeItem
+except ImportError:
+    ScanTreeModel = None
+    InstrumentTreeItem = None
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(ScanTreeModel is None, reason="GUI dependencies not available"),
+]
+
+REPEATS = 5
+
+# Generous bound for loaded CI machines; typical latencies are a few ms
+MAX_LATENCY_SECONDS = 0.25
+
+
+class TimedLockInAmplifier(FakeLockInAmplifier):
+    """Fake lock-in with an interruptible integration time that signals each point."""
+
+    def __init__(self, name: str, integration_time: float):
+        super().__init__(name)
+        self.integration_time = integration_time
+        self.point_started = threading.Event()
+        self.point_times = []
+
+    def _perform_measurement_impl(self):
+        self.point_times.append(time.perf_counter())
+        self.point_started.set()
+        self._sleep(self.integration_time)
+        return super()._perform_measurement_impl()
+
+
+def build_scan(measurement, n_points: int = 20) -> Scan:
+    """1D stage scan (movement outer, measurement inner)."""
+    root = InstrumentTreeItem()
+    move_item = MovementItem(FakeXStage("Bench Stage"), positions=list(np.linspace(0, 10, n_points)), settings={})
+    move_tree_item = InstrumentTreeItem(parent=root, instrument_object=move_item)
+    root.child_items.append(move_tree_item)
+
+    meas_tree_item = InstrumentTreeItem(parent=move_tree_item, instrument_object=MeasurementItem(measurement, settings={}))
+    move_tree_item.child_items.append(meas_tree_item)
+
+    settings = ScanSettings(
+        project_name="benchmarks",
+        scan_name="latency",
+        scan_type="1D Scan",
+        job_type="Benchmark",
+        ScanTree=ScanTreeModel(root_item=root),
+        extensions=[],
+    )
+    return Scan(scan_settings=settings, owner="benchmark")
+
+
+def start_scan(scan: Scan) -> threading.Thread:
+    thread = threading.Thread(target=scan.execute, daemon=True)
+    thread.start()
+    return thread
+
+
+def report(label: str, samples):
+    print(f"\n{label}: median {statistics.median(samples) * 1e3:.2f} ms, "
+          f"max {max(samples) * 1e3:.2f} ms over {len(samples)} runs")
+
+
+@pytest.mark.parametrize("integration_time", [0.5, 2.0])
+def test_abort_latency_during_instrument_wait(integration_time):
+    """Abort while an instrument is integrating; latency must not depend on the wait."""
+    samples = []
+    for _ in range(REPEATS):
+        measurement = TimedLockInAmplifier("Bench Lock-In", integration_time)
+        scan = build_scan(measurement)
+        thread = start_scan(scan)
+        assert measurement.point_started.wait(timeout=5)
+
+        start = time.perf_counter()
+        scan.abort()
+        thread.join(timeout=10)
+        samples.append(time.perf_counter() - start)
+        assert not thread.is_alive()
+
+    report(f"abort during {integration_time:.1f} s wait", samples)
+    assert statistics.median(samples) < MAX_LATENCY_SECONDS
+
+
+def test_abort_latency_between_points():
+    """Abort a scan of short points; it must stop before the next point."""
+    samples = []
+    for _ in range(REPEATS):
+        measurement = TimedLockInAmplifier("Bench Lock-In", integration_time=0.0)
+        scan = build_scan(measurement, n_points=2000)
+        thread = start_scan(scan)
+        assert measurement.point_started.wait(timeout=5)
+
+        start = time.perf_counter()
+        scan.abort()
+        thread.join(timeout=10)
+        samples.append(time.perf_counter() - start)
+        assert not thread.is_alive()
+        assert len(measurement.point_times) < 2000
+
+    report("abort between points", samples)
+    assert statistics.median(samples) < MAX_LATENCY_SECONDS
+
+
+def test_resume_latency():
+    """Time from resume() to the start of the next point."""
+    samples = []
+    measurement = TimedLockInAmplifier("Bench Lock-In", integration_time=0.01)
+    scan = build_scan(measurement, n_points=200)
+    thread = start_scan(scan)
+    assert measurement.point_started.wait(timeout=5)
+
+    for _ in range(REPEATS):
+        scan.pause()
+        time.sleep(0.05)  # Let the in-flight point finish
+        paused_points = len(measurement.point_times)
+        time.sleep(0.05)
+        assert len(measurement.point_times) == paused_points
+
+        start = time.perf_counter()
+        scan.resume()
+        deadline = time.monotonic() + 5
+        while len(measurement.point_times) == paused_points and time.monotonic() < deadline:
+            time.sleep(0.0005)
+        samples.append(measurement.point_times[paused_points] - start)
+
+    scan.abort()
+    thread.join(timeout=10)
+
+    report("resume to next point", samples)
+    assert statistics.median(samples) < MAX_LATENCY_SECONDS
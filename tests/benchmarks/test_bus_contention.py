@@ -0,0 +1,71 @@
+"""
+Bus Contention Benchmarks
+
+Runs the same workload on fake instruments with realistic latency
+distributions, once with each instrument on its own simulated bus and once
+with all of them sharing one bus (like a GPIB rack or a multi-axis
+controller). Shared-bus runs should take about as long as all transactions
+back to back; separate buses should overlap.
+
+Run with: pytest tests/benchmarks/test_bus_contention.py -m benchmark -s
+"""
+
+import os
+import sys
+import time
+import threading
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from pybirch.Instruments.simulation import Latency, SimulatedBus
+from pybirch.setups.fake_setup.lock_in_amplifier.lock_in_amplifier import FakeLockInAmplifier
+
+pytestmark = pytest.mark.benchmark
+
+INSTRUMENTS = 3
+POINTS = 10
+
+
+def make_instruments(shared: bool):
+    bus = SimulatedBus("GPIB0")
+    instruments = []
+    for i in range(INSTRUMENTS):
+        lockin = FakeLockInAmplifier(f"LI{i}")
+        lockin.set_latency("measure", Latency.lognormal(median=0.004, sigma=0.25, seed=i))
+        lockin.bus = bus if shared else SimulatedBus(f"GPIB{i}")
+        instruments.append(lockin)
+    return instruments
+
+
+def run_concurrently(instruments):
+    def work(instrument):
+        for _ in range(POINTS):
+            instrument.perform_measurement()
+
+    threads = [threading.Thread(target=work, args=(instr,)) for instr in instruments]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def test_shared_bus_serialises_instruments():
+    separate = make_instruments(shared=False)
+    shared = make_instruments(shared=True)
+
+    separate_time = run_concurrently(separate)
+    shared_time = run_concurrently(shared)
+
+    bus = shared[0].bus
+    assert bus.transactions == INSTRUMENTS * POINTS
+    print(f"\n{INSTRUMENTS} instruments x {POINTS} points: "
+          f"{separate_time * 1000:.1f} ms on separate buses, {shared_time * 1000:.1f} ms on one bus "
+          f"(busy {bus.busy_time * 1000:.1f} ms, waited {bus.wait_time * 1000:.1f} ms)")
+    # On one bus the transactions cannot overlap
+    assert shared_time >= bus.busy_time * 0.95
+    assert shared_time > separate_time
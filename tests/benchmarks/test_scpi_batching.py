@@ -0,0 +1,55 @@
+"""
+SCPI Batching Benchmarks
+
+Compares reading a lock-in's X, Y, R and theta one query at a time with one
+batched transaction, over a simulated bus with GPIB-like round-trip latency.
+
+Run with: pytest tests/benchmarks/test_scpi_batching.py -m benchmark -s
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from pybirch.Instruments.batching import SimulatedTransport, CommandBatch
+
+pytestmark = pytest.mark.benchmark
+
+POINTS = 50
+
+# Typical GPIB query round-trip
+LATENCY_SECONDS = 0.002
+
+QUERIES = ["OUTP? 1", "OUTP? 2", "OUTP? 3", "OUTP? 4"]
+
+
+def make_transport():
+    return SimulatedTransport({"OUTP?": lambda channel: channel}, latency=LATENCY_SECONDS)
+
+
+def test_batched_reads_cut_round_trips():
+    serial = make_transport()
+    start = time.perf_counter()
+    for _ in range(POINTS):
+        values = [serial.query(q) for q in QUERIES]
+    serial_time = time.perf_counter() - start
+
+    batched = make_transport()
+    start = time.perf_counter()
+    for _ in range(POINTS):
+        with CommandBatch(batched) as batch:
+            results = [batch.query(q) for q in QUERIES]
+    batched_time = time.perf_counter() - start
+
+    assert values == [r.value for r in results] == ["1", "2", "3", "4"]
+    assert serial.round_trips == POINTS * len(QUERIES)
+    assert batched.round_trips == POINTS
+    print(f"\n{POINTS} points x {len(QUERIES)} reads: "
+          f"{serial_time * 1000:.1f} ms one-by-one, {batched_time * 1000:.1f} ms batched "
+          f"({serial_time / batched_time:.1f}x)")
+    assert batched_time < serial_time
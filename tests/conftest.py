@@ -67,6 +67,32 @@ def mock_wandb():
         }
 
 
+# =============================================================================
+# Per-user caches
+# =============================================================================
+
+@pytest.fixture(autouse=True)
+def isolated_driver_cache(tmp_path, monkeypatch):
+    """Keep compiled driver code in a temporary directory instead of ~/.pybirch/driver_cache."""
+    from pybirch.Instruments.factory import DriverCodeCache, InstrumentFactory
+    
+    directory = str(tmp_path / "driver_cache")
+    monkeypatch.setenv('PYBIRCH_DRIVER_CACHE', directory)  # Subprocesses
+    monkeypatch.setattr(InstrumentFactory, 'code_cache', DriverCodeCache(directory))
+    yield directory
+
+
+@pytest.fixture(autouse=True)
+def isolated_discovery_index(tmp_path, monkeypatch):
+    """Keep the driver discovery index in a temporary file instead of ~/.pybirch."""
+    from pybirch.Instruments import discovery
+    
+    path = str(tmp_path / "discovery_index.json")
+    monkeypatch.setenv('PYBIRCH_DISCOVERY_INDEX', path)  # Subprocesses
+    monkeypatch.setattr(discovery, '_default_index', discovery.DiscoveryIndex(path))
+    yield path
+
+
 # =============================================================================
 # Instrument Fixtures
 # =============================================================================
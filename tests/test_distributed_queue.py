@@ -0,0 +1,324 @@
+"""
+Tests for the distributed scan job queue and workers.
+
+Covers the lease-based claim protocol in DatabaseService (bindings, exclusivity,
+heartbeats, expiry, retries) and runs several ScanWorkers against a shared
+SQLite database using the fake instrument setup.
+
+Run with: pytest tests/test_distributed_queue.py -v
+"""
+
+import io
+import os
+import pickle
+import sys
+import time
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+os.environ["WANDB_MODE"] = "disabled"
+
+from database.services import DatabaseService
+from database.models import ScanJob
+from pybirch.database_integration import JobManager, ScanWorker
+from pybirch.queue.snapshot import SnapshotError, is_snapshot
+from pybirch.scan.scan import Scan, ScanSettings
+from pybirch.scan.measurements import MeasurementItem
+from pybirch.scan.movements import MovementItem
+from pybirch.setups.fake_setup.lock_in_amplifier.lock_in_amplifier import FakeLockInAmplifier
+from pybirch.setups.fake_setup.stage_controller.stage_controller import FakeXStage
+
+try:
+    from GUI.widgets.scan_tree.treemodel import ScanTreeModel
+    from GUI.widgets.scan_tree.treeitem import InstrumentTreeItem
+except ImportError:
+    ScanTreeModel = None
+    InstrumentTreeItem = None
+
+
+# =============================================================================
+# Fixtures and helpers
+# =============================================================================
+
+@pytest.fixture
+def db():
+    """Temporary database with a lab and instruments bound to two computers."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        service = DatabaseService(os.path.join(tmpdir, "distributed.db"))
+        lab = service.create_lab({"name": "Distributed Test Lab"})
+        service.test_lab_id = lab['id']
+
+        for name, computer in [("LI-A", "pc-a"), ("X-A", "pc-a"), ("LI-B", "pc-b")]:
+            instrument = service.create_instrument({"name": name, "lab_id": lab['id']})
+            service.bind_instrument_to_computer(instrument['id'], computer)
+
+        yield service
+
+
+def add_job(db, required, **kwargs):
+    """Create a job directly, without a serialized scan."""
+    data = {'name': f"job_{'_'.join(required)}", 'required_instruments': required, 'scan_data': b''}
+    data.update(kwargs)
+    return db.create_scan_job(data)
+
+
+def create_scan(name, measurement, movement=None, positions=None):
+    """Build a Scan around fake instruments (movement outer, measurement inner)."""
+    if ScanTreeModel is None:
+        pytest.skip("ScanTreeModel not available (GUI dependencies missing)")
+
+    root = InstrumentTreeItem()
+    parent = root
+    if movement is not None:
+        move_item = MovementItem(movement, positions=np.array(positions or [0.0, 1.0, 2.0]), settings={})
+        parent = InstrumentTreeItem(parent=root, instrument_object=move_item)
+        root.child_items.append(parent)
+
+    meas_item = MeasurementItem(measurement, settings={})
+    meas_tree_item = InstrumentTreeItem(parent=parent, instrument_object=meas_item)
+    parent.child_items.append(meas_tree_item)
+
+    settings = ScanSettings(
+        project_name="distributed",
+        scan_name=name,
+        scan_type="1D Scan" if movement else "Point Measurement",
+        job_type="Test",
+        ScanTree=ScanTreeModel(root_item=root),
+        extensions=[],
+        additional_tags=["test"],
+    )
+    return Scan(scan_settings=settings, owner="test_user")
+
+
+# =============================================================================
+# Claim protocol
+# =============================================================================
+
+class TestScanJobClaims:
+    """Tests for lease-based job claiming in DatabaseService."""
+
+    def test_claim_requires_bound_instruments(self, db):
+        job = add_job(db, ["LI-B"])
+
+        assert db.claim_scan_job("worker-a", "pc-a") is None
+
+        claimed = db.claim_scan_job("worker-b", "pc-b")
+        assert claimed['id'] == job['id']
+        assert claimed['status'] == 'claimed'
+        assert claimed['lease_owner'] == "worker-b"
+        assert claimed['attempts'] == 1
+
+    def test_claim_is_exclusive(self, db):
+        add_job(db, [])
+        assert db.claim_scan_job("worker-1", "pc-a") is not None
+        assert db.claim_scan_job("worker-2", "pc-a") is None
+
+    def test_concurrent_claims_each_job_once(self, db):
+        job_ids = {add_job(db, [])['id'] for _ in range(6)}
+        claims = []
+        lock = threading.Lock()
+
+        def claimer(worker_id):
+            while True:
+                job = db.claim_scan_job(worker_id, "pc-a")
+                if job is None:
+                    return
+                with lock:
+                    claims.append(job['id'])
+
+        threads = [threading.Thread(target=claimer, args=(f"worker-{i}",)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=30)
+
+        assert sorted(claims) == sorted(job_ids)
+
+    def test_leased_instruments_are_not_double_booked(self, db):
+        first = add_job(db, ["LI-A"])
+        add_job(db, ["LI-A", "X-A"])
+        other = add_job(db, ["X-A"], priority=-1)
+
+        assert db.claim_scan_job("worker-1", "pc-a")['id'] == first['id']
+        # Second job shares LI-A with the running job, so the X-A-only job is next
+        assert db.claim_scan_job("worker-2", "pc-a")['id'] == other['id']
+        assert db.claim_scan_job("worker-3", "pc-a") is None
+
+    def test_priority_order(self, db):
+        add_job(db, [], priority=0)
+        urgent = add_job(db, [], priority=5)
+        assert db.claim_scan_job("worker-1", "pc-a")['id'] == urgent['id']
+
+    def test_heartbeat_and_expired_lease_reclaim(self, db):
+        job = add_job(db, [])
+        db.claim_scan_job("worker-1", "pc-a", lease_seconds=0.05)
+        assert db.heartbeat_scan_job(job['id'], "worker-1", lease_seconds=0.05, status='running')
+        assert db.get_scan_job(job['id'])['status'] == 'running'
+
+        time.sleep(0.1)
+        reclaimed = db.claim_scan_job("worker-2", "pc-a")
+        assert reclaimed['id'] == job['id']
+        assert reclaimed['attempts'] == 2
+
+        # The stalled worker can no longer renew or report
+        assert not db.heartbeat_scan_job(job['id'], "worker-1")
+        assert not db.complete_scan_job(job['id'], "worker-1")
+        assert db.complete_scan_job(job['id'], "worker-2")
+        assert db.get_scan_job(job['id'])['status'] == 'completed'
+
+    def test_fail_retries_until_max_attempts(self, db):
+        job = add_job(db, [], max_attempts=2)
+
+        db.claim_scan_job("worker-1", "pc-a")
+        assert db.fail_scan_job(job['id'], "worker-1", "boom")
+        assert db.get_scan_job(job['id'])['status'] == 'pending'
+
+        db.claim_scan_job("worker-1", "pc-a")
+        assert db.fail_scan_job(job['id'], "worker-1", "boom again")
+        failed = db.get_scan_job(job['id'])
+        assert failed['status'] == 'failed'
+        assert failed['error_message'] == "boom again"
+        assert db.claim_scan_job("worker-1", "pc-a") is None
+
+    def test_requeue_expired(self, db):
+        job = add_job(db, [], max_attempts=1)
+        db.claim_scan_job("worker-1", "pc-a", lease_seconds=30)
+        with db.session_scope() as session:
+            session.query(ScanJob).filter(ScanJob.id == job['id']).update(
+                {ScanJob.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)}
+            )
+
+        assert db.requeue_expired_scan_jobs() == 1
+        assert db.get_scan_job(job['id'])['status'] == 'failed'
+
+    def test_racing_claims_on_a_shared_instrument(self, db, monkeypatch):
+        first = add_job(db, ["LI-A"])
+        add_job(db, ["LI-A", "X-A"])
+        assert db.claim_scan_job("worker-1", "pc-a")['id'] == first['id']
+
+        # worker-2 read the leases before worker-1's claim committed
+        leased = db._leased_instruments
+        reads = []
+
+        def stale_first_read(session, now, exclude_job_id=None):
+            reads.append(exclude_job_id)
+            return set() if len(reads) == 1 else leased(session, now, exclude_job_id)
+
+        monkeypatch.setattr(db, "_leased_instruments", stale_first_read)
+        assert db.claim_scan_job("worker-2", "pc-a") is None
+        assert [job['status'] for job in db.get_scan_jobs()] == ['claimed', 'pending']
+        assert db.get_scan_jobs()[1]['attempts'] == 0
+
+    def test_claim_fails_jobs_expired_on_last_attempt(self, db):
+        queue = db.create_queue({"name": "expiring", "lab_id": db.test_lab_id})
+        job = add_job(db, [], max_attempts=1, queue_id=queue['id'])
+        db.claim_scan_job("worker-1", "pc-a", lease_seconds=0.05)
+        time.sleep(0.1)
+
+        assert db.claim_scan_job("worker-2", "pc-a") is None
+        assert db.get_scan_job(job['id'])['status'] == 'failed'
+        assert db.get_queue(queue['id'])['status'] == 'failed'
+
+    def test_cancel_ends_lease(self, db):
+        job = add_job(db, [])
+        db.claim_scan_job("worker-1", "pc-a")
+        assert db.cancel_scan_job(job['id'])
+        assert not db.heartbeat_scan_job(job['id'], "worker-1")
+        assert db.get_scan_job(job['id'])['status'] == 'aborted'
+
+
+# =============================================================================
+# Workers
+# =============================================================================
+
+class TestScanWorkers:
+    """Run several workers against one SQLite database with fake instruments."""
+
+    def test_workers_run_jobs_on_owning_computers(self, db):
+        scans = [
+            create_scan("stage_scan", FakeLockInAmplifier(name="LI-A", wait=0.0), FakeXStage(name="X-A")),
+            create_scan("point_a", FakeLockInAmplifier(name="LI-A", wait=0.0)),
+            create_scan("point_b", FakeLockInAmplifier(name="LI-B", wait=0.0)),
+        ]
+        queue = JobManager(db).submit(scans, lab_id=db.test_lab_id, name="distributed")
+        assert [job['required_instruments'] for job in queue['jobs']] == [["LI-A", "X-A"], ["LI-A"], ["LI-B"]]
+
+        workers = [
+            ScanWorker(db, instruments=[FakeLockInAmplifier(name="LI-A", wait=0.0), FakeXStage(name="X-A")],
+                       computer_name="pc-a", worker_id="a1", poll_interval=0.05),
+            ScanWorker(db, instruments=[FakeLockInAmplifier(name="LI-A", wait=0.0), FakeXStage(name="X-A")],
+                       computer_name="pc-a", worker_id="a2", poll_interval=0.05),
+            ScanWorker(db, instruments=[FakeLockInAmplifier(name="LI-B", wait=0.0)],
+                       computer_name="pc-b", worker_id="b1", poll_interval=0.05),
+        ]
+        threads = [threading.Thread(target=w.run, kwargs={'idle_timeout': 1.0}) for w in workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=120)
+
+        jobs = {job['name']: job for job in db.get_scan_jobs(queue_id=queue['id'])}
+        assert all(job['status'] == 'completed' for job in jobs.values()), jobs
+        assert jobs['point_b']['lease_owner'] == "b1"
+        assert jobs['stage_scan']['lease_owner'] in ("a1", "a2")
+        assert jobs['point_a']['lease_owner'] in ("a1", "a2")
+
+        for job in jobs.values():
+            scan = db.get_scan(job['scan_id'])
+            assert scan['status'] == 'completed'
+            assert scan['queue_id'] == queue['id']
+            assert scan['progress']['points_completed'] > 0
+            assert db.get_data_point_count(job['scan_id']) > 0
+
+        db_queue = db.get_queue(queue['id'])
+        assert db_queue['status'] == 'completed'
+        assert db_queue['completed_scans'] == 3
+        assert sum(w.jobs_completed for w in workers) == 3
+
+    def test_worker_without_instrument_leaves_job_pending(self, db):
+        scan = create_scan("point_b", FakeLockInAmplifier(name="LI-B", wait=0.0))
+        job = JobManager(db).enqueue_scan(scan, lab_id=db.test_lab_id)
+
+        # pc-b owns LI-B in the database, but this worker has no local object for it
+        worker = ScanWorker(db, instruments=[FakeLockInAmplifier(name="LI-A", wait=0.0)],
+                            computer_name="pc-b", poll_interval=0.05)
+        assert worker.run_once() is None
+        assert db.get_scan_job(job['id'])['status'] == 'pending'
+
+    def test_jobs_are_stored_as_snapshots(self, db):
+        scan = create_scan("stage_scan", FakeLockInAmplifier(name="LI-A", wait=0.0), FakeXStage(name="X-A"),
+                           positions=[0.0, 0.5])
+        job = JobManager(db).enqueue_scan(scan, lab_id=db.test_lab_id)
+        with db.session_scope() as session:
+            data = session.get(ScanJob, job['id']).scan_data
+        assert is_snapshot(io.BytesIO(data))
+
+        worker = ScanWorker(db, instruments=[FakeLockInAmplifier(name="LI-A", wait=0.0), FakeXStage(name="X-A")],
+                            computer_name="pc-a")
+        loaded = worker.load_scan({'scan_data': data})
+        assert loaded.scan_settings.scan_name == "stage_scan"
+        move_item = loaded.scan_settings.scan_tree.root_item.child_items[0]
+        assert list(move_item.movement_positions) == [0.0, 0.5]
+
+        # Pickled payloads are rejected, never unpickled
+        with pytest.raises(SnapshotError):
+            worker.load_scan({'scan_data': pickle.dumps({"not": "a snapshot"})})
+
+    def test_job_lost_before_start_is_released(self, db, monkeypatch):
+        scan = create_scan("point_a", FakeLockInAmplifier(name="LI-A", wait=0.0))
+        job = JobManager(db).enqueue_scan(scan, lab_id=db.test_lab_id)
+        worker = ScanWorker(db, instruments=[FakeLockInAmplifier(name="LI-A", wait=0.0)],
+                            computer_name="pc-a", poll_interval=0.05)
+        monkeypatch.setattr(db, "heartbeat_scan_job", lambda *args, **kwargs: False)
+
+        worker.run_once()
+        released = db.get_scan_job(job['id'])
+        assert released['status'] == 'pending' and released['attempts'] == 0
+        assert worker.jobs_failed == 1
@@ -5,6 +5,7 @@ Tests cover:
 - InstrumentFactory: dynamic class creation, validation, caching
 - DatabaseService: CRUD for instrument drivers and computer bindings
 - get_computer_info: computer identification utility
+- Class discovery: static, cached listing of setups classes
 
 Run with: pytest tests/test_drivers.py -v
 """
@@ -353,6 +354,88 @@ class TestInstrumentFactory:
             InstrumentFactory.create_class_from_driver(driver)
 
 
+class TestDriverCodeCache:
+    """Tests for the on-disk compiled driver cache and lazy driver classes."""
+    
+    @pytest.fixture
+    def code_cache(self, tmp_path, monkeypatch):
+        from pybirch.Instruments.factory import InstrumentFactory, DriverCodeCache
+        cache = DriverCodeCache(str(tmp_path / "driver_cache"))
+        monkeypatch.setattr(InstrumentFactory, 'code_cache', cache)
+        InstrumentFactory.invalidate_cache()
+        yield cache
+        InstrumentFactory.invalidate_cache()
+    
+    def test_compiled_code_is_reused_across_processes(self, code_cache, sample_driver, monkeypatch):
+        """Test that a fresh in-process cache loads the code from disk instead of compiling."""
+        from pybirch.Instruments import factory
+        
+        factory.InstrumentFactory.create_class_from_driver(sample_driver)
+        assert len(code_cache.entries(1)) == 1
+        
+        # Simulate a new process: empty class cache, compiling disabled
+        factory.InstrumentFactory.invalidate_cache()
+        def no_compile(*args, **kwargs):
+            raise AssertionError("driver was recompiled")
+        monkeypatch.setattr(factory, 'compile', no_compile, raising=False)
+        
+        cls = factory.InstrumentFactory.create_class_from_driver(sample_driver)
+        assert cls.__name__ == 'TestMeasurementInstrument'
+    
+    def test_edited_source_is_recompiled(self, code_cache, sample_driver):
+        """Test that changing the source under the same version is not served stale."""
+        from pybirch.Instruments.factory import InstrumentFactory
+        
+        class1 = InstrumentFactory.create_class_from_driver(sample_driver)
+        sample_driver['source_code'] += "\nTestMeasurementInstrument.edited = True\n"
+        class2 = InstrumentFactory.create_class_from_driver(sample_driver)
+        
+        assert class1 is not class2
+        assert class2.edited is True
+        assert len(code_cache.entries(1)) == 2
+    
+    def test_lazy_class_compiles_on_first_use(self, code_cache, sample_driver):
+        """Test that listing a driver does not compile it until it is used."""
+        from pybirch.Instruments.factory import InstrumentFactory
+        
+        lazy = InstrumentFactory.lazy_class(sample_driver)
+        assert not lazy.is_loaded
+        assert lazy.__name__ == 'TestMeasurementInstrument'
+        assert code_cache.entries() == []
+        
+        instance = lazy(name="Lazy")
+        assert lazy.is_loaded
+        assert instance.name == "Lazy"
+        assert type(instance) is InstrumentFactory.create_class_from_driver(sample_driver)
+    
+    def test_sync_with_versions_prunes_unknown_entries(self, code_cache, db_service, sample_measurement_code):
+        """Test that the DriverVersion history decides which cached code survives."""
+        from pybirch.Instruments.factory import InstrumentFactory
+        
+        driver = db_service.create_driver({
+            'name': 'TestMeasurementInstrument',
+            'display_name': 'Test Measurement',
+            'instrument_type': 'measurement',
+            'source_code': sample_measurement_code,
+            'base_class': 'Measurement',
+        })
+        factory = InstrumentFactory(db_service)
+        old_class = factory.create_class_from_driver(driver)
+        
+        updated = db_service.update_driver(driver['id'], {
+            'source_code': sample_measurement_code + "\n# tuned\n",
+        })
+        assert updated['version'] == 2
+        factory.create_class_from_driver(updated)
+        # An entry for source no longer in the history (e.g. an edit that was never saved)
+        code_cache.store(driver['id'], 2, "f" * 64, compile("x = 1", "<stale>", "exec"))
+        assert len(code_cache.entries(driver['id'])) == 3
+        
+        assert factory.sync_with_versions() == 1
+        assert len(code_cache.entries(driver['id'])) == 2
+        assert factory.create_class_from_driver(updated) is not old_class
+
+
 class TestInstrumentFactoryValidation:
     """Tests for InstrumentFactory.validate_source_code."""
     
@@ -457,6 +540,196 @@ class TestGetComputerInfo:
         assert isinstance(info['computer_id'], str)
 
 
+class FakeResourceManager:
+    """VISA resource manager stand-in with fixed identities."""
+    
+    def __init__(self, identities):
+        self.identities = identities
+        self.opened = []
+    
+    def list_resources(self):
+        return tuple(self.identities)
+    
+    def open_resource(self, resource, timeout=None):
+        self.opened.append(resource)
+        identity = self.identities[resource]
+        
+        class Handle:
+            def query(self, command):
+                return identity
+            
+            def close(self):
+                pass
+        
+        return Handle()
+
+
+class ProbeLockIn:
+    """Candidate that only answers on GPIB::8."""
+    checks = []
+    
+    def __init__(self, adapter):
+        self.adapter = adapter
+    
+    def check_connection(self):
+        ProbeLockIn.checks.append(self.adapter)
+        return self.adapter == "GPIB::8::INSTR"
+
+
+class ProbeHangs:
+    """Candidate whose connection check never returns in time."""
+    
+    def __init__(self, adapter):
+        self.adapter = adapter
+    
+    def check_connection(self):
+        import time
+        time.sleep(1.0)
+        return True
+
+
+class TestAdapterProber:
+    """Tests for concurrent adapter probing and the probe cache."""
+    
+    def make_prober(self, tmp_path, classes):
+        from pybirch.Instruments.probing import AdapterProber, ProbeCache
+        rm = FakeResourceManager({
+            "GPIB::8::INSTR": "Stanford_Research_Systems,SR830,s/n1,ver1.07",
+            "GPIB::9::INSTR": "KEITHLEY INSTRUMENTS INC.,MODEL 2400,1,C30",
+        })
+        cache = ProbeCache(str(tmp_path / "probe_cache.json"))
+        return AdapterProber(classes, resource_manager=rm, cache=cache, timeout=0.2)
+    
+    def test_pairs_and_caches_by_identity(self, tmp_path):
+        """Test that known resources are paired from the cache without probing."""
+        from pybirch.Instruments.probing import ProbeCache
+        ProbeLockIn.checks = []
+        prober = self.make_prober(tmp_path, [ProbeLockIn])
+        
+        pairs = prober.auto_pair(prober.list_resources() + ["placeholder_1"])
+        assert pairs == {"GPIB::8::INSTR": ProbeLockIn, "GPIB::9::INSTR": None}
+        assert sorted(ProbeLockIn.checks) == ["GPIB::8::INSTR", "GPIB::9::INSTR"]
+        
+        # A new prober reading the saved cache does not probe again
+        ProbeLockIn.checks = []
+        prober.cache = ProbeCache(prober.cache.path)
+        assert prober.auto_pair(prober.list_resources()) == pairs
+        assert ProbeLockIn.checks == []
+        
+        # A different device on the same address is probed again
+        prober.resource_manager.identities["GPIB::8::INSTR"] = "OTHER,DEVICE,0,0"
+        prober.auto_pair(["GPIB::8::INSTR"])
+        assert ProbeLockIn.checks == ["GPIB::8::INSTR"]
+    
+    def test_probes_time_out_concurrently(self, tmp_path):
+        """Test that hanging probes are cut off and resources are probed in parallel."""
+        import time
+        prober = self.make_prober(tmp_path, [ProbeHangs, ProbeLockIn])
+        
+        start = time.monotonic()
+        pairs = prober.auto_pair(prober.list_resources())
+        elapsed = time.monotonic() - start
+        
+        assert pairs["GPIB::8::INSTR"] is ProbeLockIn
+        # Two resources, each with one 0.2 s timeout, probed side by side
+        assert elapsed < 0.6
+
+
+# =============================================================================
+# Instrument Class Discovery Tests
+# =============================================================================
+
+DISCOVERY_BASE = '''
+import sys
+from pybirch.scan.measurements import Measurement
+sys.modules.setdefault("discovery_imports", []).append(__name__)
+
+class LabMeasurement(Measurement):
+    pass
+
+class Helper:
+    pass
+'''
+
+DISCOVERY_CHILD = '''
+import sys
+from lab_base import LabMeasurement
+sys.modules.setdefault("discovery_imports", []).append(__name__)
+
+class LockIn(LabMeasurement):
+    def __init__(self, name="LockIn"):
+        super().__init__(name)
+'''
+
+
+class TestClassDiscovery:
+    """Tests for static, lazily imported instrument class discovery."""
+    
+    @pytest.fixture
+    def setups_dir(self, tmp_path):
+        base = tmp_path / "setups" / "rig"
+        base.mkdir(parents=True)
+        (base / "lab_base.py").write_text(DISCOVERY_BASE)
+        (base / "lock_in.py").write_text(DISCOVERY_CHILD)
+        (base / "broken.py").write_text("class Oops(:\n")
+        sys.modules.pop("discovery_imports", None)
+        yield base
+        sys.modules.pop("discovery_imports", None)
+    
+    def test_discovers_without_importing(self, setups_dir, tmp_path):
+        """Test that classes are found through base names and nothing is imported."""
+        from pybirch.Instruments.discovery import DiscoveryIndex, discover_classes
+        from pybirch.scan.measurements import Measurement
+        
+        index = DiscoveryIndex(path=str(tmp_path / "index.json"))
+        found = discover_classes(str(setups_dir.parent), (Measurement,), index=index)
+        
+        assert sorted(lazy.__name__ for lazy in found) == ["LabMeasurement", "LockIn"]
+        assert not any(lazy.is_loaded for lazy in found)
+        assert "discovery_imports" not in sys.modules
+        assert os.path.exists(index.path)
+    
+    def test_index_reparses_only_changed_files(self, setups_dir, tmp_path, monkeypatch):
+        """Test that the on-disk index is reused until a file's mtime or size changes."""
+        from pybirch.Instruments import discovery
+        
+        path = str(tmp_path / "index.json")
+        discovery.find_classes([str(setups_dir)], {"Measurement"}, index=discovery.DiscoveryIndex(path))
+        
+        parsed = []
+        original = discovery.parse_classes
+        monkeypatch.setattr(discovery, "parse_classes", lambda p: parsed.append(os.path.basename(p)) or original(p))
+        discovery.find_classes([str(setups_dir)], {"Measurement"}, index=discovery.DiscoveryIndex(path))
+        assert parsed == []
+        
+        (setups_dir / "lock_in.py").write_text(DISCOVERY_CHILD + "\nclass Extra(LockIn):\n    pass\n")
+        found = discovery.find_classes([str(setups_dir)], {"Measurement"}, index=discovery.DiscoveryIndex(path))
+        assert parsed == ["lock_in.py"]
+        assert "Extra" in [info['name'] for _, info in found]
+    
+    def test_lazy_class_imports_on_use(self, setups_dir, tmp_path):
+        """Test that the module is imported on instantiation and stand-ins compare equal."""
+        from pybirch.Instruments.discovery import DiscoveryIndex, LazyClass, discover_classes
+        from pybirch.scan.measurements import Measurement
+        
+        sys.path.insert(0, str(setups_dir))
+        try:
+            found = {lazy.__name__: lazy for lazy in
+                     discover_classes(str(setups_dir), (Measurement,), index=DiscoveryIndex(path=None))}
+            lock_in = found["LockIn"]
+            assert lock_in == LazyClass(str(setups_dir / "lock_in.py"), "LockIn")
+            
+            instrument = lock_in(name="LI")
+            assert instrument.name == "LI"
+            assert lock_in.is_loaded
+            assert isinstance(instrument, lock_in.resolve())
+            assert "lock_in" in sys.modules["discovery_imports"]
+        finally:
+            sys.path.remove(str(setups_dir))
+            for module in ("lab_base", "lock_in"):
+                sys.modules.pop(module, None)
+
+
 # =============================================================================
 # DatabaseService Instrument driver Tests
 # =============================================================================
@@ -10,12 +10,16 @@ the full GUI dependencies. Tests cover:
 - Measurement data format and values
 - Movement position control and limits
 - Serialization/deserialization
+- Settings cache (skipping redundant writes)
+- Batched SCPI transactions on a simulated transport
+- Latency distributions and shared-bus contention
 
 Run with: pytest tests/test_fake_instruments.py -v
 """
 
 import sys
 import os
+import time
 import logging
 import numpy as np
 import pandas as pd
@@ -47,6 +51,16 @@ from pybirch.setups.fake_setup.spectrometer.spectrometer import (
     FakeSpectrometer,
     SpectrometerMeasurement
 )
+from pybirch.Instruments.base import (
+    BaseMeasurementInstrument,
+    FakeMeasurementInstrument,
+    FakeMovementInstrument,
+    VisaBaseMeasurementInstrument,
+    SETTINGS_CACHE_INITIALIZE,
+    SETTINGS_CACHE_OFF,
+    SETTINGS_CACHE_RECONNECT,
+)
+from pybirch.Instruments.batching import BatchError, SimulatedTransport
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -732,6 +746,498 @@ class TestSerializationDeserialization:
         assert "settings" in data
 
 
+# =============================================================================
+# Settings Cache Tests
+# =============================================================================
+
+class WriteCountingInstrument(FakeMeasurementInstrument):
+    """Custom-settings instrument that records every key written to it."""
+    
+    def __init__(self, name="Counting", policy=None):
+        super().__init__(name)
+        if policy is not None:
+            self.settings_cache_policy = policy
+        self.data_columns = np.array(["value"])
+        self.data_units = np.array(["V"])
+        self.device = {}
+        self.writes = []
+    
+    @property
+    def settings(self) -> dict:
+        return dict(self.device)
+    
+    @settings.setter
+    def settings(self, settings: dict):
+        for key, value in settings.items():
+            self.writes.append(key)
+            self.device[key] = value
+    
+    def _perform_measurement_impl(self):
+        return np.array([[0.0]])
+
+
+class PositionSettingStage(FakeMovementInstrument):
+    """Stage whose settings include its position."""
+    
+    def __init__(self, name="Stage", policy=None):
+        super().__init__(name)
+        if policy is not None:
+            self.settings_cache_policy = policy
+        self.device_position = 0.0
+        self.velocity = 1.0
+    
+    @property
+    def position(self) -> float:
+        return self.device_position
+    
+    @position.setter
+    def position(self, value: float):
+        self.device_position = value
+    
+    @property
+    def settings(self) -> dict:
+        return {"position": self.position, "velocity": self.velocity}
+    
+    @settings.setter
+    def settings(self, settings: dict):
+        if "velocity" in settings:
+            self.velocity = settings["velocity"]
+        if "position" in settings:
+            self.position = settings["position"]
+
+
+class TestSettingsCache:
+    """Tests for the write-through settings cache on instrument base classes."""
+    
+    def test_only_changed_keys_are_written(self):
+        """Test that re-applying settings skips keys the device already has."""
+        instr = WriteCountingInstrument()
+        instr.apply_settings({"gain": 2, "offset": np.array([1.0, 2.0])})
+        assert instr.apply_settings({"gain": 2, "offset": np.array([1.0, 2.0])}) == {}
+        assert instr.apply_settings({"gain": 3, "offset": np.array([1.0, 2.0])}) == {"gain": 3}
+        
+        assert instr.writes == ["gain", "offset", "gain"]
+        assert instr.settings_cache_stats["skipped"] == 3
+        assert instr.settings_cache_stats["written"] == 3
+    
+    def test_direct_assignment_updates_known_state(self):
+        """Test that assigning settings directly keeps the cache in step."""
+        instr = WriteCountingInstrument()
+        instr.apply_settings({"gain": 2})
+        instr.settings = {"gain": 5}
+        instr.apply_settings({"gain": 2})
+        assert instr.device["gain"] == 2
+    
+    def test_invalidation_policies(self):
+        """Test which lifecycle events forget the known device state."""
+        initialize = WriteCountingInstrument(policy=SETTINGS_CACHE_INITIALIZE)
+        initialize.apply_settings({"gain": 2})
+        initialize.initialize()
+        initialize.apply_settings({"gain": 2})
+        assert initialize.writes == ["gain", "gain"]
+        
+        reconnect = WriteCountingInstrument(policy=SETTINGS_CACHE_RECONNECT)
+        reconnect.apply_settings({"gain": 2})
+        reconnect.initialize()
+        reconnect.apply_settings({"gain": 2})
+        assert reconnect.writes == ["gain"]
+        reconnect.shutdown()
+        reconnect.connect()
+        reconnect.apply_settings({"gain": 2})
+        assert reconnect.writes == ["gain", "gain"]
+        
+        off = WriteCountingInstrument(policy=SETTINGS_CACHE_OFF)
+        off.apply_settings({"gain": 2})
+        off.apply_settings({"gain": 2})
+        assert off.writes == ["gain", "gain"]
+    
+    def test_move_then_reapply_moves_back(self):
+        """Test that a move through the position setter is not hidden by the cache."""
+        stage = PositionSettingStage(policy=SETTINGS_CACHE_RECONNECT)
+        stage.apply_settings({"position": 1.0, "velocity": 5.0})
+        stage.position = 3.0
+        assert stage.apply_settings({"position": 1.0, "velocity": 5.0}) == {"position": 1.0}
+        assert stage.device_position == 1.0
+    
+    def test_reinitialized_scan_instruments_keep_the_cache(self):
+        """Test that the scan's initialize-then-apply sequence skips settings fake drivers still have."""
+        from pybirch.scan.protocols import apply_settings
+        
+        assert BaseMeasurementInstrument.settings_cache_policy == SETTINGS_CACHE_INITIALIZE
+        stage = FakeXStage("X")
+        settings = {"left_limit": -5.0, "right_limit": 50.0}
+        stage.initialize()
+        assert apply_settings(stage, settings) == settings
+        stage.initialize()
+        assert apply_settings(stage, settings) == {}
+        assert stage.settings_cache_stats["skipped"] == 2
+    
+    def test_auto_settings_defaults_are_known_after_initialize(self):
+        """Test that auto-settings instruments skip writes of their defaults."""
+        lockin = FakeLockInAmplifier(wait=0.0)
+        lockin.initialize()
+        changed = lockin.apply_settings({"sensitivity": 1.0, "time_constant": 0.5, "num_data_points": 10})
+        assert changed == {"time_constant": 0.5}
+        assert lockin.settings["time_constant"] == 0.5
+
+
+# =============================================================================
+# Command Batching Tests
+# =============================================================================
+
+class BatchedLockIn(VisaBaseMeasurementInstrument):
+    """VISA lock-in reading four outputs in one transaction."""
+    
+    def __init__(self, transport):
+        super().__init__("Batched Lock-In")
+        self.instrument = transport
+        self.data_columns = np.array(["X", "Y", "R", "theta"])
+        self.data_units = np.array(["V", "V", "V", "deg"])
+    
+    def _perform_measurement_impl(self):
+        values = self.query_many([f"OUTP? {i}" for i in range(1, 5)])
+        return np.array([[float(v) for v in values]])
+
+
+def lock_in_transport(latency=0.0):
+    return SimulatedTransport({"OUTP?": lambda channel: str(float(channel) / 10)}, latency=latency)
+
+
+class TestCommandBatching:
+    """Tests for batched SCPI transactions on VISA base instruments."""
+    
+    def test_queries_share_one_round_trip(self):
+        """Test that four reads cost one transaction and replies are split in order."""
+        transport = lock_in_transport()
+        lockin = BatchedLockIn(transport)
+        
+        data = lockin.perform_measurement()
+        
+        assert data.tolist() == [[0.1, 0.2, 0.3, 0.4]]
+        assert transport.round_trips == 1
+        assert transport.messages == ["OUTP? 1;OUTP? 2;OUTP? 3;OUTP? 4"]
+    
+    def test_mixed_writes_and_queries(self):
+        """Test that writes and queries keep their order within a batch."""
+        transport = SimulatedTransport()
+        lockin = BatchedLockIn(transport)
+        
+        with lockin.batch() as batch:
+            batch.write("SENS 5").write("OFLT 10")
+            sens = batch.query("SENS?")
+            batch.write("SENS 7")
+            sens_after = batch.query("SENS?")
+            assert not sens.ready
+        
+        assert (sens.value, sens_after.value) == ("5", "7")
+        assert int(sens_after) == 7
+        assert transport.round_trips == 1
+        
+        lockin.write_many(["ISRC 1", "ICPL 0"])
+        assert transport.messages[-1] == "ISRC 1;ICPL 0"
+        assert transport.state["ICPL"] == "0"
+    
+    def test_max_length_splits_transactions(self):
+        """Test that long batches are split to fit the instrument's input buffer."""
+        transport = lock_in_transport()
+        lockin = BatchedLockIn(transport)
+        lockin.batch_max_length = 16
+        
+        assert lockin.query_many([f"OUTP? {i}" for i in range(1, 5)]) == ["0.1", "0.2", "0.3", "0.4"]
+        assert transport.messages == ["OUTP? 1;OUTP? 2", "OUTP? 3;OUTP? 4"]
+    
+    def test_reply_count_mismatch_and_errors(self):
+        """Test that a short response raises and a failed block sends nothing."""
+        transport = SimulatedTransport({"OUTP?": "1.0"})
+        transport.query = lambda message: "1.0"
+        lockin = BatchedLockIn(transport)
+        with pytest.raises(BatchError):
+            lockin.query_many(["OUTP? 1", "OUTP? 2"])
+        
+        quiet = SimulatedTransport()
+        lockin = BatchedLockIn(quiet)
+        with pytest.raises(ValueError):
+            with lockin.batch() as batch:
+                batch.write("SENS 5")
+                raise ValueError("driver error")
+        assert quiet.round_trips == 0
+
+
+# =============================================================================
+# Timing Simulation Tests
+# =============================================================================
+
+class TestTimingSimulation:
+    """Tests for latency distributions and shared simulated buses."""
+    
+    def test_latency_distributions(self):
+        """Test that distributions are reproducible with a seed and never negative."""
+        from pybirch.Instruments.simulation import Latency
+        
+        first = [Latency.lognormal(0.01, 0.5, seed=3).sample() for _ in range(3)]
+        again = [Latency.lognormal(0.01, 0.5, seed=3).sample() for _ in range(3)]
+        assert first == again
+        
+        normal = Latency.normal(0.0, 1.0, seed=1)
+        assert all(normal.sample() >= 0.0 for _ in range(100))
+        assert 0.2 <= Latency.uniform(0.2, 0.3, seed=1).sample() <= 0.3
+        assert Latency.empirical([0.5], seed=1).sample() == 0.5
+        with pytest.raises(ValueError):
+            Latency.empirical([])
+    
+    def test_per_operation_latency(self):
+        """Test that operations use their own latency and fall back to the default."""
+        from pybirch.Instruments.simulation import Latency
+        
+        lockin = FakeLockInAmplifier(wait=0.0)
+        lockin.set_latency("measure", Latency.fixed(0.05))
+        lockin.set_latency("default", 0.001)
+        assert lockin._latency("measure") == 0.05
+        assert lockin._latency("connect") == 0.001
+        
+        start = time.perf_counter()
+        lockin.perform_measurement()
+        assert time.perf_counter() - start >= 0.05
+    
+    def test_shared_controller_serialises_axes(self):
+        """Test that axes on one controller wait for each other on its bus."""
+        import threading
+        
+        controller = FakeLinearStageController(wait=0.0)
+        controller.set_latency("move", 0.05)
+        
+        def move(axis):
+            axis.position = 10.0
+        
+        threads = [threading.Thread(target=move, args=(axis,)) for axis in (controller.x, controller.y)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert time.perf_counter() - start >= 0.1
+        assert controller.bus.transactions == 2
+        assert controller.bus.wait_time >= 0.04
+    
+    def test_bus_survives_copying(self):
+        """Test that instruments on a simulated bus can still be copied."""
+        import copy
+        
+        stage = FakeXStage("X")
+        stage.position = 5.0
+        restored = copy.deepcopy(stage)
+        restored.position = 6.0
+        assert restored.position == 6.0
+        assert stage.position == 5.0
+
+
+class ReadCountingStage(FakeMovementInstrument):
+    """Stage that records how often its position is queried."""
+    
+    def __init__(self, name="Counting Stage"):
+        super().__init__(name)
+        self.position_units = "mm"
+        self.position_column = "x"
+        self._position = 0.0
+        self.reads = 0
+    
+    @property
+    def position(self) -> float:
+        self.reads += 1
+        return self._position
+    
+    @position.setter
+    def position(self, value: float):
+        self._position = value
+
+
+class TestPositionCache:
+    """Tests for the position read-back cache of movement instruments."""
+    
+    def test_reads_once_per_move(self):
+        """Test that repeated reads between moves query the stage once."""
+        stage = ReadCountingStage()
+        stage.position = 3.0
+        assert stage.commanded_position == 3.0
+        assert [stage.cached_position() for _ in range(5)] == [3.0] * 5
+        assert stage.reads == 1
+        
+        stage.position = 4.0
+        assert stage.cached_position() == 4.0
+        assert stage.reads == 2
+    
+    def test_staleness_window_and_refresh(self):
+        """Test that old read-backs and explicit refreshes query the stage again."""
+        stage = ReadCountingStage()
+        stage.position_cache_max_age = 0.0
+        stage.cached_position()
+        stage.cached_position()
+        assert stage.reads == 2
+        
+        stage.position_cache_max_age = float("inf")
+        stage.refresh_position()
+        stage.cached_position()
+        assert stage.reads == 3
+        
+        stage.initialize()
+        stage.cached_position()
+        assert stage.reads == 4
+    
+    def test_read_position_helper(self):
+        """Test that the engine helper uses the cache when an instrument has one."""
+        from pybirch.scan.protocols import read_position
+        
+        stage = ReadCountingStage()
+        stage.position = 2.0
+        read_position(stage)
+        read_position(stage)
+        assert stage.reads == 1
+        
+        class PlainStage:
+            position = 7.0
+        assert read_position(PlainStage()) == 7.0
+
+
+class TestInstrumentTelemetry:
+    """Tests for per-operation telemetry on instrument base classes."""
+    
+    def test_operations_are_timed(self):
+        """Test that measurements, moves and settings writes are counted."""
+        lockin = FakeLockInAmplifier(wait=0.0)
+        lockin.connect()
+        for _ in range(3):
+            lockin.perform_measurement()
+        lockin.settings = lockin.settings
+        
+        stage = FakeXStage("X")
+        stage.position = 1.0
+        
+        snapshot = lockin.telemetry.snapshot()
+        assert snapshot["measure"]["calls"] == 3
+        assert snapshot["connect"]["calls"] == 1
+        assert "settings" in lockin.telemetry
+        assert snapshot["measure"]["p50"] <= snapshot["measure"]["p99"] <= snapshot["measure"]["max"]
+        assert stage.telemetry.snapshot()["move"]["calls"] == 1
+    
+    def test_errors_are_counted(self):
+        """Test that failing operations count towards the error rate."""
+        lockin = FakeLockInAmplifier(wait=0.0)
+        lockin.connect()
+        lockin._perform_measurement_impl = lambda: 1 / 0
+        with pytest.raises(ZeroDivisionError):
+            lockin.perform_measurement()
+        
+        stats = lockin.telemetry.snapshot()["measure"]
+        assert stats["calls"] == 1
+        assert stats["error_rate"] == 1.0
+    
+    def test_batches_record_bytes(self):
+        """Test that batched transactions record their size in both directions."""
+        lockin = BatchedLockIn(lock_in_transport())
+        lockin.perform_measurement()
+        
+        stats = lockin.telemetry.snapshot()["transaction"]
+        assert stats["calls"] == 1
+        assert stats["bytes_out"] == len(";".join(f"OUTP? {i}" for i in range(1, 5)))
+        assert stats["bytes_in"] > 0
+    
+    def test_reporter_pushes_snapshots(self):
+        """Test that the reporter pushes to sinks and skips idle instruments."""
+        from pybirch.Instruments.telemetry import TelemetryReporter, websocket_sink
+        
+        class FakeServer:
+            def __init__(self):
+                self.payloads = []
+            
+            def broadcast_instrument_telemetry(self, **payload):
+                self.payloads.append(payload)
+        
+        server = FakeServer()
+        reporter = TelemetryReporter(interval=60.0)
+        reporter.add_sink(websocket_sink(server))
+        reporter.add_sink(lambda *args: 1 / 0)  # A failing sink doesn't stop the others
+        
+        busy, idle = FakeLockInAmplifier(wait=0.0), FakeMultimeter(wait=0.0)
+        busy.perform_measurement()
+        reporter.track(busy, instrument_id=7)
+        reporter.track(idle)
+        
+        assert reporter.flush() == 1
+        assert server.payloads[0]["instrument_id"] == 7
+        assert server.payloads[0]["telemetry"]["measure"]["calls"] == 1
+    
+    def test_telemetry_is_stored_in_instrument_status(self, tmp_path):
+        """Test that telemetry pushes update InstrumentStatus without touching the status."""
+        from database.services import DatabaseService
+        
+        db = DatabaseService(str(tmp_path / "telemetry.db"))
+        lab = db.create_lab({"name": "Telemetry Lab"})
+        instrument = db.create_instrument({"name": "LI", "instrument_type": "measurement", "lab_id": lab["id"]})
+        
+        assert db.update_instrument_status(instrument["id"], status="connected")
+        assert db.update_instrument_status(instrument["id"], telemetry={"measure": {"calls": 4}})
+        
+        status = db.get_instrument_status(instrument["id"])
+        assert status["status"] == "connected"
+        assert status["telemetry"]["measure"]["calls"] == 4
+        assert not db.update_instrument_status(instrument["id"] + 1, telemetry={})
+    
+    def test_database_extension_reports_while_scan_runs(self, tmp_path):
+        """Test that DatabaseExtension runs a reporter from execute() until the scan ends."""
+        from types import SimpleNamespace
+        from database.services import DatabaseService
+        from pybirch.database_integration import DatabaseExtension
+        
+        db = DatabaseService(str(tmp_path / "reporting.db"))
+        lab = db.create_lab({"name": "Telemetry Lab"})
+        lockin = FakeLockInAmplifier(wait=0.0)
+        instrument = db.create_instrument({"name": lockin.nickname, "lab_id": lab["id"]})
+        item = SimpleNamespace(instrument_object=SimpleNamespace(instrument=lockin))
+        settings = SimpleNamespace(scan_tree=SimpleNamespace(get_all_instrument_items=lambda: [item]))
+        
+        extension = DatabaseExtension(db, scan_settings=settings, write_behind=False, telemetry_interval=60.0)
+        extension._start_telemetry()
+        reporter = extension.telemetry_reporter
+        assert reporter._thread.is_alive()
+        lockin.perform_measurement()
+        
+        extension._stop_telemetry()
+        assert extension.telemetry_reporter is None and reporter._thread is None
+        status = db.get_instrument_status(instrument["id"])
+        assert status["telemetry"]["measure"]["calls"] == 1
+    
+    def test_equipment_manager_maps_equipment_to_instruments(self, tmp_path):
+        """Test that EquipmentManager updates Equipment rows and its instruments' live status."""
+        from database.services import DatabaseService
+        from pybirch.database_integration import EquipmentManager
+        
+        db = DatabaseService(str(tmp_path / "equipment.db"))
+        lab = db.create_lab({"name": "Equipment Lab"})
+        # Unrelated instrument first, so Equipment and Instrument IDs differ
+        db.create_instrument({"name": "Other", "lab_id": lab["id"]})
+        equipment = db.create_equipment({"name": "Stage rack", "lab_id": lab["id"], "status": "available"})
+        instrument = db.create_instrument({"name": "X stage", "lab_id": lab["id"]})
+        with db.session_scope() as session:
+            from database.models import Instrument
+            session.get(Instrument, instrument["id"]).equipment_id = equipment["id"]
+        
+        manager = EquipmentManager(db)
+        manager._registered_instruments["X stage"] = equipment["id"]
+        
+        assert manager.update_status("X stage", "maintenance")
+        assert db.get_equipment(equipment["id"])["status"] == "maintenance"
+        assert db.get_instrument_status(instrument["id"])["status"] == "maintenance"
+        assert manager.set_in_use("X stage")
+        assert db.get_equipment(equipment["id"])["status"] == "in_use"
+        
+        assert manager.update_telemetry("X stage", {"move": {"calls": 2}})
+        status = db.get_instrument_status(instrument["id"])
+        assert status["telemetry"]["move"]["calls"] == 2
+        assert status["status"] == "in_use"
+        assert db.get_instrument_status(instrument["id"] - 1) is None
+
+
 # =============================================================================
 # Performance Tests
 # =============================================================================
@@ -585,5 +585,57 @@ class TestErrorHandling:
         assert page.queue.get_handle(last_idx).scan.scan_settings.scan_name == original_name
 
 
+
+# =============================================================================
+# Preset Tests
+# =============================================================================
+
+class TestPresetManager:
+    """Tests for queue and scan presets stored as snapshot files."""
+    
+    def test_queue_preset_roundtrip_and_info(self, tmp_path):
+        """Test saving a queue preset and reading its listing lazily."""
+        from GUI.widgets.preset_manager import PresetManager
+        manager = PresetManager(base_path=str(tmp_path))
+        
+        queue = Queue(QID="preset_queue")
+        scan = get_empty_scan()
+        scan.scan_settings.scan_name = "preset_scan"
+        queue.enqueue(scan)
+        
+        assert manager.save_queue_preset(0, queue, name="Morning")
+        assert manager.queue_preset_exists(0)
+        assert (tmp_path / "queue" / "preset_0.pbq").exists()
+        
+        info = manager.get_preset_info("queue", 0)
+        assert info["name"] == "Morning"
+        assert info["scans"] == ["preset_scan"]
+        
+        loaded = manager.load_queue_preset(0)
+        assert isinstance(loaded, Queue)
+        assert loaded.get_handle(0).scan.scan_settings.scan_name == "preset_scan"
+        
+        assert manager.delete_queue_preset(0)
+        assert not manager.queue_preset_exists(0)
+    
+    def test_legacy_pickle_scan_preset(self, tmp_path):
+        """Test that scan presets pickled by earlier versions still load."""
+        import pickle
+        from GUI.widgets.preset_manager import PresetManager
+        manager = PresetManager(base_path=str(tmp_path))
+        
+        scan = get_empty_scan()
+        with open(tmp_path / "scan" / "preset_1.pkl", 'wb') as f:
+            pickle.dump(scan, f)
+        
+        assert manager.scan_preset_exists(1)
+        assert manager.get_preset_info("scan", 1) is None
+        assert isinstance(manager.load_scan_preset(1), Scan)
+        
+        # Re-saving replaces the pickle with a snapshot
+        assert manager.save_scan_preset(1, scan)
+        assert not (tmp_path / "scan" / "preset_1.pkl").exists()
+        assert manager.get_preset_info("scan", 1)["scans"] == ["default_scan"]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
@@ -46,6 +46,8 @@ from pybirch.queue.queue import (
     ScanHandle
 )
 from pybirch.scan.scan import Scan, ScanSettings
+from pybirch.queue import snapshot
+from pybirch.scan.sessions import SessionPool
 from pybirch.scan.measurements import Measurement, MeasurementItem
 from pybirch.scan.movements import Movement, MovementItem
 
@@ -83,6 +85,42 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class CountingLockInAmplifier(FakeLockInAmplifier):
+    """Fake lock-in that counts its measurements, with an optional integration time."""
+    
+    def __init__(self, name: str, wait: float = 0.0, integration_time: float = 0.0):
+        super().__init__(name, wait)
+        self.integration_time = integration_time
+        self.calls = 0
+    
+    def _perform_measurement_impl(self):
+        self.calls += 1
+        self._sleep(self.integration_time)
+        return super()._perform_measurement_impl()
+
+
+class ConnectionCountingLockIn(FakeLockInAmplifier):
+    """Fake lock-in that counts connects and shutdowns, with a switchable health check."""
+    
+    def __init__(self, name: str, adapter: str = ""):
+        super().__init__(name, wait=0.0)
+        self.adapter = adapter
+        self.connects = 0
+        self.shutdowns = 0
+        self.healthy = True
+    
+    def connect(self):
+        self.connects += 1
+        return super().connect()
+    
+    def shutdown(self):
+        self.shutdowns += 1
+        super().shutdown()
+    
+    def check_connection(self) -> bool:
+        return self.healthy
+
+
 # =============================================================================
 # Test Fixtures
 # =============================================================================
@@ -549,6 +587,154 @@ class TestQueueStateCallbacks:
         logger.info("State callback registration test passed")
 
 
+class TestProgressReporting:
+    """Tests for plan-based progress, rate and ETA reporting."""
+    
+    @pytest.mark.skipif(ScanTreeModel is None, reason="GUI dependencies not available")
+    def test_fractional_progress(self):
+        """Test that running scans report increasing fractional progress."""
+        q = Queue(QID="progress_test", progress_interval=0.0)
+        scan = create_scan(
+            "progress_scan",
+            "test_project",
+            FakeLockInAmplifier("Lock-In", wait=0.0),
+            movement=FakeXStage("Stage"),
+            positions=list(np.linspace(0, 10, 20)),
+        )
+        handle = q.enqueue(scan)
+        updates = []
+        q.add_progress_callback(lambda scan_id, progress: updates.append(progress))
+        
+        q.start()
+        assert q.wait_for_completion(timeout=30)
+        
+        assert handle.state == ScanState.COMPLETED
+        assert handle.points_total == 20
+        assert handle.points_completed >= 19
+        assert handle.eta_seconds == 0.0
+        assert handle.rate > 0
+        
+        partial = [p for p in updates if 0.0 < p < 1.0]
+        assert len(partial) >= 10
+        assert partial == sorted(partial)
+        assert updates[-1] == 1.0
+        
+        status = q.get_status()["scans"][0]
+        assert status["points_total"] == 20
+    
+    @pytest.mark.skipif(ScanTreeModel is None, reason="GUI dependencies not available")
+    def test_progress_is_throttled(self):
+        """Test that progress_interval limits the update rate."""
+        q = Queue(QID="throttle_test", progress_interval=60.0)
+        scan = create_scan(
+            "throttled_scan",
+            "test_project",
+            FakeLockInAmplifier("Lock-In", wait=0.0),
+            movement=FakeXStage("Stage"),
+            positions=list(np.linspace(0, 10, 50)),
+        )
+        handle = q.enqueue(scan)
+        updates = []
+        q.add_progress_callback(lambda scan_id, progress: updates.append(progress))
+        
+        q.start()
+        assert q.wait_for_completion(timeout=30)
+        
+        # Initial snapshot, first point, final update and the queue's end-of-scan notification
+        assert len(updates) <= 4
+        assert updates[-1] == 1.0
+        assert handle.points_completed >= 49
+
+
+class TestSessionPool:
+    """Tests for reusing connected instruments across scans."""
+    
+    @pytest.mark.skipif(ScanTreeModel is None, reason="GUI dependencies not available")
+    def test_queue_connects_once_per_run(self):
+        """Test that scans in one queue run borrow the same session."""
+        pool = SessionPool()
+        lock_in = ConnectionCountingLockIn("Lock-In", adapter="GPIB::8::INSTR")
+        # Separate object on the same adapter: gets its own session, never swapped in
+        twin = ConnectionCountingLockIn("Lock-In", adapter="GPIB::8::INSTR")
+        q = Queue(QID="session_test", session_pool=pool)
+        for i, instrument in enumerate([lock_in, lock_in, twin]):
+            q.enqueue(create_scan(f"scan_{i}", "test_project", instrument))
+        
+        q.start()
+        assert q.wait_for_completion(timeout=30)
+        
+        assert all(h.state == ScanState.COMPLETED for h in q._scan_handles)
+        assert (lock_in.connects, lock_in.shutdowns) == (1, 1)
+        assert (twin.connects, twin.shutdowns) == (1, 1)
+        assert q.get_handle(2).scan.scan_settings.scan_tree.get_measurement_items()[0].instrument_object.instrument is twin
+        assert len(pool) == 0
+    
+    def test_axes_on_one_adapter_keep_their_sessions(self):
+        """Test that two instruments of one class on a shared adapter are never confused."""
+        pool = SessionPool()
+        x_axis = ConnectionCountingLockIn("X axis", adapter="GPIB::1::INSTR")
+        y_axis = ConnectionCountingLockIn("Y axis", adapter="GPIB::1::INSTR")
+        with pool.held():
+            assert pool.acquire(x_axis) is x_axis
+            assert pool.acquire(y_axis) is y_axis
+            assert len(pool) == 2
+            pool.release(x_axis)
+            pool.release(y_axis)
+            assert pool.acquire(y_axis) is y_axis
+            pool.release(y_axis)
+        assert (x_axis.connects, y_axis.connects) == (1, 1)
+        assert (x_axis.shutdowns, y_axis.shutdowns) == (1, 1)
+    
+    @pytest.mark.skipif(ScanTreeModel is None, reason="GUI dependencies not available")
+    def test_queue_without_session_reuse(self):
+        """Test that reuse_sessions=False keeps per-scan connect/shutdown."""
+        lock_in = ConnectionCountingLockIn("Lock-In")
+        q = Queue(QID="no_session_test", reuse_sessions=False)
+        for i in range(2):
+            q.enqueue(create_scan(f"scan_{i}", "test_project", lock_in))
+        
+        q.start()
+        assert q.wait_for_completion(timeout=30)
+        assert (lock_in.connects, lock_in.shutdowns) == (2, 2)
+    
+    def test_health_check_reconnects(self):
+        """Test that a borrowed session failing its health check is reconnected."""
+        pool = SessionPool(health_check_interval=0.0)
+        lock_in = ConnectionCountingLockIn("Lock-In")
+        with pool.held():
+            pool.release(pool.acquire(lock_in))
+            lock_in.healthy = False
+            assert pool.acquire(lock_in) is lock_in
+            pool.release(lock_in)
+            assert lock_in.connects == 2
+            assert pool.sessions()[0].reconnects == 1
+        assert lock_in.shutdowns == 2
+        assert len(pool) == 0
+    
+    def test_idle_sessions_expire(self):
+        """Test that unused sessions are closed after the idle timeout while held."""
+        pool = SessionPool(idle_timeout=0.05)
+        lock_in = ConnectionCountingLockIn("Lock-In")
+        pool.hold()
+        pool.release(pool.acquire(lock_in))
+        assert lock_in in pool
+        time.sleep(0.1)
+        assert pool.reap_idle() == 1
+        assert lock_in.shutdowns == 1
+        pool.unhold()
+    
+    def test_unheld_pool_closes_on_release(self):
+        """Test that without a hold, the last release shuts the session down."""
+        pool = SessionPool()
+        lock_in = ConnectionCountingLockIn("Lock-In")
+        pool.acquire(lock_in)
+        pool.acquire(lock_in)
+        pool.release(lock_in)
+        assert lock_in.shutdowns == 0
+        pool.release(lock_in)
+        assert (lock_in.connects, lock_in.shutdowns) == (1, 1)
+
+
 class TestSerialExecution:
     """Tests for serial scan execution."""
     
@@ -832,6 +1018,79 @@ class TestAbortPauseResume:
         logger.info(f"Single scan abort test passed (final state: {handle.state})")
 
 
+    @pytest.mark.skipif(ScanTreeModel is None, reason="GUI dependencies not available")
+    def test_pause_holds_scan_in_place(self, temp_sample_dir):
+        """Test that pause stops a scan between points and resume continues it."""
+        measurement = CountingLockInAmplifier("Pause Lock-In", wait=0.02)
+        scan = create_scan(
+            "pause_target",
+            "test_project",
+            measurement,
+            movement=FakeXStage("Pause Stage"),
+            positions=list(np.linspace(0, 20, 20)),
+        )
+        q = Queue(QID="pause_test")
+        handle = q.enqueue(scan)
+        
+        q.start(mode=ExecutionMode.SERIAL)
+        time.sleep(0.15)
+        q.pause(handle.scan_id)
+        time.sleep(0.1)  # Let the in-flight point finish
+        
+        paused_count = measurement.calls
+        time.sleep(0.3)
+        assert measurement.calls == paused_count
+        assert handle.state == ScanState.PAUSED
+        assert q._execution_thread.is_alive()
+        
+        q.resume(handle.scan_id)
+        assert q.wait_for_completion(timeout=10)
+        assert handle.state == ScanState.COMPLETED
+        assert measurement.calls > paused_count
+    
+    @pytest.mark.skipif(ScanTreeModel is None, reason="GUI dependencies not available")
+    def test_abort_interrupts_instrument_wait(self, temp_sample_dir):
+        """Test that abort cuts short a long instrument wait."""
+        measurement = CountingLockInAmplifier("Slow Lock-In", integration_time=5.0)
+        scan = create_scan("long_wait", "test_project", measurement)
+        q = Queue(QID="abort_wait_test")
+        handle = q.enqueue(scan)
+        
+        q.start(mode=ExecutionMode.SERIAL)
+        time.sleep(0.2)
+        assert measurement.calls == 1
+        start = time.monotonic()
+        q.abort(handle.scan_id)
+        
+        assert q.wait_for_completion(timeout=10)
+        assert time.monotonic() - start < 2.0
+        assert handle.state == ScanState.ABORTED
+        assert measurement.cancellation_token is None
+    
+    @pytest.mark.skipif(ScanTreeModel is None, reason="GUI dependencies not available")
+    def test_abort_paused_scan(self, temp_sample_dir):
+        """Test aborting a scan while it is paused."""
+        measurement = CountingLockInAmplifier("Lock-In", wait=0.02)
+        scan = create_scan(
+            "abort_paused",
+            "test_project",
+            measurement,
+            movement=FakeXStage("Stage"),
+            positions=list(np.linspace(0, 20, 20)),
+        )
+        q = Queue(QID="abort_paused_test")
+        handle = q.enqueue(scan)
+        
+        q.start(mode=ExecutionMode.SERIAL)
+        time.sleep(0.1)
+        q.pause()
+        time.sleep(0.1)
+        q.abort()
+        
+        assert q.wait_for_completion(timeout=5)
+        assert handle.state == ScanState.ABORTED
+
+
 class TestQueueSerialization:
     """Tests for queue serialization and deserialization."""
     
@@ -898,6 +1157,89 @@ class TestQueueSerialization:
         
         logger.info("Save/load test passed")
 
+    @pytest.mark.skipif(ScanTreeModel is None, reason="GUI dependencies not available")
+    def test_snapshot_index_and_single_scan_load(self, tmp_path):
+        """Snapshot listings come from the header; single scans load by name."""
+        q = Queue(QID="snapshot_test")
+        q.metadata = {"material": "graphene"}
+        q.enqueue(create_scan("point", "snap", FakeLockInAmplifier("LI-1")))
+        q.enqueue(create_scan("line", "snap", FakeLockInAmplifier("LI-2"),
+                              movement=FakeXStage("X-1"), positions=[0.0, 5.0, 10.0]))
+        q._scan_handles[0].state = ScanState.COMPLETED
+        q._scan_handles[0].progress = 1.0
+
+        path = tmp_path / "queue.pbq"
+        q.save(str(path), name="Overnight")
+        assert snapshot.is_snapshot(str(path))
+
+        index = snapshot.read_index(str(path))
+        assert index.kind == "queue"
+        assert index.version == snapshot.SNAPSHOT_VERSION
+        assert index.name == "Overnight"
+        assert index.names == ["point", "line"]
+        assert index.entry("line").instrument_names == ["X-1", "LI-2"]
+        assert index.entry(0).state == "COMPLETED"
+        assert index.instrument_names == ["LI-1", "LI-2", "X-1"]
+        assert all(entry.size > 0 for entry in index.entries)
+
+        scan = snapshot.load_scan(str(path), "line")
+        assert scan.scan_settings.scan_name == "line"
+        assert scan.owner == "test_user"
+        move_item = scan.scan_settings.scan_tree.root_item.child_items[0]
+        assert move_item.movement_positions == [0.0, 5.0, 10.0]
+        assert move_item.child_items[0].deserialized_instrument_data["instrument"]["name"] == "LI-2"
+
+        with pytest.raises(KeyError):
+            snapshot.load_scan(str(path), "missing")
+
+        q2 = Queue.load(str(path))
+        assert q2.QID == "snapshot_test"
+        assert q2.metadata == {"material": "graphene"}
+        assert [h.scan.scan_settings.scan_name for h in q2._scan_handles] == ["point", "line"]
+        assert q2._scan_handles[0].state == ScanState.COMPLETED
+        assert q2._scan_handles[1].state == ScanState.QUEUED
+
+    @pytest.mark.skipif(ScanTreeModel is None, reason="GUI dependencies not available")
+    def test_load_legacy_pickle(self, tmp_path):
+        """Queues pickled by earlier versions still load."""
+        q = Queue(QID="legacy")
+        q.enqueue(create_scan("old_scan", "legacy", FakeLockInAmplifier("LI")))
+
+        path = tmp_path / "legacy.pkl"
+        with open(path, 'wb') as f:
+            pickle.dump(q, f)
+
+        loaded = Queue.load(str(path))
+        assert loaded.QID == "legacy"
+        assert loaded.size() == 1
+
+    def test_rejects_invalid_snapshots(self, tmp_path):
+        """Non-snapshot and newer-version files raise SnapshotError."""
+        bad = tmp_path / "bad.pbq"
+        bad.write_bytes(b"not a snapshot at all")
+        assert not snapshot.is_snapshot(str(bad))
+        with pytest.raises(snapshot.SnapshotError):
+            snapshot.read_index(str(bad))
+
+        newer = tmp_path / "newer.pbq"
+        newer.write_bytes(snapshot.MAGIC + (snapshot.SNAPSHOT_VERSION + 1).to_bytes(2, "big") + (0).to_bytes(4, "big"))
+        with pytest.raises(snapshot.SnapshotError, match="newer"):
+            snapshot.read_index(str(newer))
+
+
+    @pytest.mark.skipif(ScanTreeModel is None, reason="GUI dependencies not available")
+    def test_unsupported_setting_types_are_refused(self, tmp_path):
+        """Values that would not load back with their type fail the save and keep the old file."""
+        q = Queue(QID="strict")
+        q.metadata = {"sample_path": tmp_path}  # pathlib.Path is not JSON
+        q.enqueue(create_scan("point", "strict", FakeLockInAmplifier("LI")))
+
+        path = tmp_path / "queue.pbq"
+        path.write_bytes(b"previous")
+        with pytest.raises(TypeError, match="PosixPath|WindowsPath"):
+            q.save(str(path))
+        assert path.read_bytes() == b"previous"
+
 
 class TestQueueStatus:
     """Tests for queue status reporting."""
@@ -0,0 +1,108 @@
+"""
+Tests for the headless scan runner (python -m pybirch.run).
+
+Saves scans built from the fake instrument setup, then loads and runs them
+through the command line entry point with instruments resolved from the
+setups directory.
+
+Run with: pytest tests/test_run_cli.py -v
+"""
+
+import os
+import sys
+import subprocess
+
+import numpy as np
+import pandas as pd
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+os.environ["WANDB_MODE"] = "disabled"
+
+from pybirch import run
+from pybirch.queue.queue import Queue
+from pybirch.scan.scan import Scan, ScanSettings
+from pybirch.scan.tree import ScanTree, InstrumentTreeItem
+from pybirch.scan.measurements import MeasurementItem
+from pybirch.scan.movements import MovementItem
+from pybirch.setups.fake_setup.lock_in_amplifier.lock_in_amplifier import FakeLockInAmplifier
+from pybirch.setups.fake_setup.stage_controller.stage_controller import FakeXStage
+
+
+def create_scan(name, positions=(0.0, 1.0, 2.0)):
+    """Build a headless 1D scan: fake stage outer, fake lock-in inner."""
+    root = InstrumentTreeItem()
+    move_item = MovementItem(FakeXStage(name="X"), positions=np.array(positions), settings={})
+    stage = InstrumentTreeItem(parent=root, instrument_object=move_item)
+    root.child_items.append(stage)
+    lock_in = InstrumentTreeItem(parent=stage, instrument_object=MeasurementItem(FakeLockInAmplifier(name="LI", wait=0.0), settings={}))
+    stage.child_items.append(lock_in)
+
+    settings = ScanSettings(
+        project_name="cli",
+        scan_name=name,
+        scan_type="1D Scan",
+        job_type="Test",
+        ScanTree=ScanTree(root_item=root),
+        extensions=[],
+        additional_tags=["test"],
+    )
+    return Scan(scan_settings=settings, owner="test_user")
+
+
+@pytest.fixture
+def queue_file(tmp_path):
+    """Queue snapshot with two scans."""
+    path = str(tmp_path / "overnight.pbq")
+    Queue(QID="overnight", scans=[create_scan("first"), create_scan("second")]).save(path)
+    return path
+
+
+class TestRunCLI:
+    """Tests for loading, resolving and running saved scans headlessly."""
+
+    def test_runs_queue_and_writes_csv(self, queue_file, tmp_path, capsys):
+        output = tmp_path / "data"
+        assert run.main([queue_file, "--output", str(output)]) == 0
+
+        files = sorted(os.listdir(output))
+        assert files == ["cli_first_LI.csv", "cli_second_LI.csv"]
+        df = pd.read_csv(output / files[0])
+        assert len(df) > 0
+        assert "2/2 scans completed" in capsys.readouterr().out
+
+    def test_list_and_select_scan(self, queue_file, capsys):
+        assert run.main([queue_file, "--list"]) == 0
+        out = capsys.readouterr().out
+        assert "first" in out and "second" in out
+        assert "LI" in out and "X" in out
+
+        scans = run.load_scans(queue_file, ["second"])
+        assert [s.scan_settings.scan_name for s in scans] == ["second"]
+
+    def test_dry_run_resolves_setup_classes(self, queue_file, capsys):
+        assert run.main([queue_file, "--dry-run", "--adapter", "LI=GPIB::8::INSTR"]) == 0
+        out = capsys.readouterr().out
+        assert "LI: FakeLockInAmplifier (GPIB::8::INSTR)" in out
+        assert "X: FakeXStage" in out
+
+    def test_unknown_scan_and_class_fail_with_usage_status(self, queue_file, tmp_path):
+        assert run.main([queue_file, "--scan", "missing"]) == 2
+        assert run.main([queue_file, "--setups", str(tmp_path)]) == 2
+
+    def test_import_does_not_load_qt(self):
+        code = "import sys, pybirch.run; print('PySide6' in sys.modules, 'wandb' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=project_root,
+                                capture_output=True, text=True, timeout=60)
+        assert result.stdout.strip() == "False False", result.stderr
+
+    def test_help_does_not_load_the_queue(self):
+        code = ("import sys, contextlib, io, pybirch.run\n"
+                "with contextlib.suppress(SystemExit), contextlib.redirect_stdout(io.StringIO()):\n"
+                "    pybirch.run.main(['--help'])\n"
+                "print('pandas' in sys.modules, 'pybirch.queue.queue' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", code], cwd=project_root,
+                                capture_output=True, text=True, timeout=60)
+        assert result.stdout.strip() == "False False", result.stderr
@@ -36,6 +36,8 @@ sys.path.insert(0, project_root)
 
 # Import PyBirch components
 from pybirch.scan.scan import Scan, ScanSettings, get_empty_scan
+from pybirch.scan.tree import ScanTree, CHECKED, PARTIALLY_CHECKED, UNCHECKED
+from pybirch.scan.tree import InstrumentTreeItem as CoreTreeItem
 from pybirch.scan.measurements import Measurement, MeasurementItem
 from pybirch.scan.movements import Movement, MovementItem
 from pybirch.scan.protocols import (
@@ -1012,6 +1014,97 @@ class TestScanTreeModel:
         assert "stopped" in data
 
 
+class TestHeadlessScanTree:
+    """Tests for the Qt-free ScanTree core."""
+    
+    def build_tree(self, movement, measurement):
+        root = CoreTreeItem()
+        move_tree = CoreTreeItem(parent=root, instrument_object=MovementItem(movement, positions=[0.0, 10.0], settings={}))
+        root.child_items.append(move_tree)
+        meas_tree = CoreTreeItem(parent=move_tree, instrument_object=MeasurementItem(measurement, settings={}))
+        move_tree.child_items.append(meas_tree)
+        return ScanTree(root_item=root)
+    
+    def test_tree_queries(self, mock_movement, mock_measurement):
+        """Test that the core tree answers the queries the scan engine uses."""
+        tree = self.build_tree(mock_movement, mock_measurement)
+        
+        assert tree.get_instrument_count() == 2
+        assert [item.type for item in tree.get_movement_items()] == ["Movement"]
+        assert [item.type for item in tree.get_measurement_items()] == ["Measurement"]
+    
+    def test_check_state(self, mock_movement, mock_measurement):
+        """Test tri-state check values without Qt."""
+        tree = self.build_tree(mock_movement, mock_measurement)
+        move_tree = tree.root_item.child_items[0]
+        
+        assert move_tree.check_state() == UNCHECKED
+        tree.set_all_checked(True)
+        assert move_tree.check_state() == CHECKED
+        
+        move_tree.child_items.append(CoreTreeItem(parent=move_tree))
+        assert move_tree.check_state() == PARTIALLY_CHECKED
+    
+    def test_from_dict_roundtrip(self, mock_movement, mock_measurement):
+        """Test rebuilding a core tree from its serialized form."""
+        tree = self.build_tree(mock_movement, mock_measurement)
+        tree.completed = True
+        
+        restored = ScanTree.from_dict(tree.serialize())
+        
+        assert isinstance(restored, ScanTree)
+        assert restored.completed
+        assert restored.root_item.child_items[0].type == "Movement"
+        assert restored.root_item.child_items[0].child_items[0].name == "TestMeasurement"
+    
+    def test_empty_scan_is_headless(self):
+        """Test that get_empty_scan builds a core tree, not a Qt model."""
+        scan = get_empty_scan()
+        
+        assert type(scan.scan_settings.scan_tree) is ScanTree
+        assert type(pickle.loads(pickle.dumps(scan)).scan_settings.scan_tree) is ScanTree
+    
+    def test_scan_pickles_to_process_without_qt(self, mock_movement, mock_measurement):
+        """Test that a pickled scan loads in a fresh process that never imports Qt."""
+        import subprocess
+        
+        settings = ScanSettings(
+            project_name="headless", scan_name="to_worker", scan_type="1D Scan",
+            job_type="Test", ScanTree=self.build_tree(mock_movement, mock_measurement),
+        )
+        data = pickle.dumps(Scan(scan_settings=settings, owner="test"))
+        
+        code = (
+            "import pickle, sys\n"
+            "scan = pickle.loads(sys.stdin.buffer.read())\n"
+            "names = [item.name for item in scan.scan_settings.scan_tree.root_item.child_items]\n"
+            "print(scan.scan_settings.scan_name, names, 'PySide6' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], input=data, capture_output=True,
+            cwd=project_root, timeout=60,
+        )
+        
+        assert result.returncode == 0, result.stderr.decode()
+        assert result.stdout.decode().strip() == "to_worker ['TestMovement'] False"
+    
+    @pytest.mark.skipif(not HAS_GUI, reason="GUI dependencies not available")
+    def test_qt_adapter_wraps_core_tree(self, mock_movement, mock_measurement):
+        """Test that ScanTreeModel is an adapter sharing the core tree's items."""
+        from PySide6.QtCore import Qt
+        tree = self.build_tree(mock_movement, mock_measurement)
+        tree.set_all_checked(True)
+        
+        model = ScanTreeModel.from_tree(tree)
+        
+        assert isinstance(model, ScanTree)
+        assert model.root_item is tree.root_item
+        assert model.rowCount() == 1
+        index = model.index(0, 0)
+        assert model.data(index, Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        assert model.data(index) == "TestMovement"
+
+
 # =============================================================================
 # Tests: Data Saving Pipeline
 # =============================================================================
@@ -1587,6 +1680,31 @@ class TestCancellationToken:
         assert token.is_cancelled
         assert not token.is_pause_requested  # Cleared by cancel
     
+    def test_wait_if_paused_blocks_until_resume(self):
+        """wait_if_paused() blocks while paused and wakes on resume()."""
+        token = CancellationToken()
+        assert token.wait_if_paused(timeout=0.01) is True
+        
+        token.pause()
+        assert token.wait_if_paused(timeout=0.05) is False
+        
+        import threading
+        threading.Timer(0.05, token.resume).start()
+        start = time.monotonic()
+        assert token.wait_if_paused(timeout=5) is True
+        assert time.monotonic() - start < 1.0
+    
+    def test_wait_if_paused_returns_on_cancel(self):
+        """cancel() releases threads waiting in wait_if_paused()."""
+        token = CancellationToken()
+        token.pause()
+        
+        import threading
+        threading.Timer(0.05, token.cancel).start()
+        start = time.monotonic()
+        assert token.wait_if_paused() is False
+        assert time.monotonic() - start < 1.0
+    
     def test_reset(self):
         """reset() clears all state."""
         token = CancellationToken()
@@ -1708,3 +1826,83 @@ class TestCancellationTokenSource:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
+
+
+# =============================================================================
+# Progress Tests
+# =============================================================================
+
+from pybirch.scan.progress import (
+    ProgressTracker,
+    ProgressUpdate,
+    count_planned_points,
+    format_eta,
+)
+
+
+class TestProgressTracker:
+    """Test plan-based progress counting, rate/ETA and throttling."""
+    
+    def test_count_planned_points(self, mock_movement, mock_measurement):
+        """Measurements run once per position of their ancestor movements."""
+        tree = create_simple_tree(mock_movement, mock_measurement, [0.0, 1.0, 2.0, 3.0])
+        assert count_planned_points(tree) == 4
+    
+    def test_count_planned_points_nested(self, mock_measurement):
+        """Nested movements multiply; sibling measurements add."""
+        if not HAS_GUI:
+            pytest.skip("GUI dependencies not available")
+        
+        root = InstrumentTreeItem()
+        outer = InstrumentTreeItem(parent=root, instrument_object=MovementItem(MockMovement("Y"), positions=[0, 1, 2], settings={}))
+        inner = InstrumentTreeItem(parent=outer, instrument_object=MovementItem(MockMovement("X"), positions=[0, 1], settings={}))
+        root.child_items.append(outer)
+        outer.child_items.append(inner)
+        inner.child_items.append(InstrumentTreeItem(parent=inner, instrument_object=MeasurementItem(mock_measurement, settings={})))
+        outer.child_items.append(InstrumentTreeItem(parent=outer, instrument_object=MeasurementItem(MockMeasurement("M2"), settings={})))
+        
+        assert count_planned_points(ScanTreeModel(root_item=root)) == 3 * 2 + 3
+    
+    def test_fraction_rate_and_eta(self):
+        """Progress reports fraction, rolling rate and ETA."""
+        tracker = ProgressTracker(total=10, min_interval=0.0)
+        time.sleep(0.05)
+        update = tracker.advance(5)
+        
+        assert isinstance(update, ProgressUpdate)
+        assert update.completed == 5
+        assert update.fraction == pytest.approx(0.5)
+        assert update.rate > 0
+        assert update.eta_seconds == pytest.approx(5 / update.rate)
+    
+    def test_throttling(self):
+        """Updates within min_interval of the last one are suppressed."""
+        tracker = ProgressTracker(total=100, min_interval=10.0)
+        
+        assert tracker.advance() is not None
+        assert all(tracker.advance() is None for _ in range(50))
+        assert tracker.completed == 51
+        assert tracker.snapshot().completed == 51
+    
+    def test_fraction_capped_until_finish(self):
+        """Overshooting the plan never reports completion; finish() does."""
+        tracker = ProgressTracker(total=2, min_interval=0.0)
+        assert tracker.advance(3).fraction < 1.0
+        
+        final = tracker.finish()
+        assert final.fraction == 1.0
+        assert final.eta_seconds == 0.0
+    
+    def test_unknown_total(self):
+        """Trees without measurements report no fraction or ETA."""
+        tracker = ProgressTracker(total=0, min_interval=0.0)
+        update = tracker.advance()
+        assert update.fraction == 0.0
+        assert update.eta_seconds is None
+    
+    def test_format_eta(self):
+        """ETAs are formatted for display."""
+        assert format_eta(None) == "--"
+        assert format_eta(42) == "42s"
+        assert format_eta(200) == "3m 20s"
+        assert format_eta(7500) == "2h 05m"